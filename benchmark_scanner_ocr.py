@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark do scanner de campos OCR
+Compara o ModalExtractorOCR (uma cascata de regex por campo) com o scanner
+compilado de passagem única, usando os textos OCR salvos em Pesquisa/
+
+Uso:
+    python benchmark_scanner_ocr.py [--repeticoes 20]
+"""
+
+import os
+import re
+import sys
+import glob
+import argparse
+from timeit import timeit
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.extractors.scanner_ocr import escanear_texto_ocr, limpar_texto_ocr, avaliar_qualidade_ocr
+
+SEPARADOR_DEBUG = "=" * 50 + "\n"
+
+
+def carregar_amostras(pasta: str = 'Pesquisa') -> list:
+    """Lê os arquivos ocr_texto_<inscricao>_<UF>.txt gerados pelo modo debug"""
+    amostras = []
+    for arquivo in sorted(glob.glob(os.path.join(pasta, '*', 'ocr_texto_*.txt'))):
+        try:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                partes = f.read().split(SEPARADOR_DEBUG)
+            if len(partes) < 2:
+                continue
+            inscricao = os.path.basename(arquivo).split('_')[2]
+            amostras.append((partes[1].strip(), inscricao))
+        except Exception as e:
+            print(f"⚠️ Erro ao ler {arquivo}: {e}")
+    return amostras
+
+
+def limpar_texto_antigo(texto: str) -> str:
+    """Versão anterior de DataExtractorCorrigido._limpar_texto_ocr (referência)"""
+    if not texto:
+        return ""
+    texto = re.sub(r'[^\w\s:()[\].-/áéíóúàèìòùâêîôûãõçñÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ]', ' ', texto)
+    texto = re.sub(r'\s+', ' ', texto)
+    texto = re.sub(r'\n\s*\n', '\n', texto)
+    return '\n'.join(linha.strip() for linha in texto.split('\n') if len(linha.strip()) > 1)
+
+
+def avaliar_qualidade_antiga(texto: str) -> int:
+    """Versão anterior de DataExtractorCorrigido._avaliar_qualidade_ocr (referência)"""
+    if not texto or len(texto) < 10:
+        return 0
+    score = 0
+    if len(texto) >= 50:
+        score += 20
+    elif len(texto) >= 30:
+        score += 10
+    for palavra in ['ADVOGAD', 'INSCRI', 'SECCIONAL', 'SITUA', 'REGULAR',
+                    'ENDERECO', 'TELEFONE', 'PROFISSIONAL']:
+        if palavra in texto.upper():
+            score += 8
+    if re.search(r'\d{3,}', texto):
+        score += 15
+    if len([l.strip() for l in texto.split('\n') if l.strip()]) >= 5:
+        score += 10
+    if len(re.findall(r'[^\w\s:()[\].-/áéíóúàèìòùâêîôûãõçñÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ]', texto)) > len(texto) * 0.1:
+        score -= 20
+    return min(100, max(0, score))
+
+
+class ModalExtractorOCR:
+    """Extração anterior em cascata, um regex por campo (referência)"""
+    
+    def extrair_nome_completo(self, texto_ocr: str) -> str:
+        """Extrai nome completo do texto OCR"""
+        padroes_nome = [
+            r'^([A-ZÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ][A-Za-záéíóúàèìòùâêîôûãõçñ\s]{8,60})',
+            r'Nome[:\s]*([A-ZÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ][A-Za-záéíóúàèìòùâêîôûãõçñ\s]{5,60})',
+            r'([A-ZÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ]{2,}(?:\s+[A-ZÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ]{2,})+)',
+        ]
+        
+        linhas = texto_ocr.split('\n')
+        
+        for linha in linhas[:5]:
+            linha = linha.strip()
+            for padrao in padroes_nome:
+                match = re.search(padrao, linha, re.MULTILINE)
+                if match:
+                    nome = match.group(1).strip()
+                    
+                    if (8 <= len(nome) <= 60 and 
+                        ' ' in nome and 
+                        len(nome.split()) >= 2 and
+                        not any(palavra in nome.upper() for palavra in 
+                               ['INSCRICAO', 'SECCIONAL', 'TELEFONE', 'ENDERECO']) and
+                        all(char.isalpha() or char.isspace() or char in 'ÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ' 
+                            for char in nome)):
+                        return nome
+        
+        return ""
+
+    def extrair_inscricao(self, texto_ocr: str, inscricao_original: str) -> str:
+        """Extrai número da inscrição do texto OCR"""
+        padroes_inscricao = [
+            r'Inscri[cç][aã]o[:\s]*(\d{4,8})',
+            r'N[uú]mero[:\s]*(\d{4,8})',
+            rf'({re.escape(inscricao_original)})',
+        ]
+        
+        for padrao in padroes_inscricao:
+            match = re.search(padrao, texto_ocr, re.IGNORECASE)
+            if match:
+                numero = match.group(1)
+                if numero.isdigit() and 4 <= len(numero) <= 8:
+                    return numero
+        
+        return inscricao_original
+
+    def extrair_telefones(self, texto_ocr: str) -> str:
+        """Extrai telefones do texto OCR"""
+        telefones_encontrados = []
+        
+        try:
+            padroes_telefone = [
+                r'Telefone\s*Profissional[:\s]*\((\d{2})\)\s*(\d{4,5})[-\s]?(\d{4})',
+                r'Telefone[:\s]*\((\d{2})\)\s*(\d{4,5})[-\s]?(\d{4})',
+                r'\((\d{2})\)\s*(\d{4,5})[-\s]?(\d{4})',
+                r'(\d{2})\s+(\d{4,5})[-\s]?(\d{4})',
+            ]
+            
+            for padrao in padroes_telefone:
+                matches = re.finditer(padrao, texto_ocr, re.IGNORECASE)
+                for match in matches:
+                    if len(match.groups()) == 3:
+                        ddd, num1, num2 = match.groups()
+                        telefone = f"({ddd}) {num1}-{num2}"
+                        
+                        if (len(ddd) == 2 and ddd.isdigit() and 
+                            len(num1) in [4, 5] and num1.isdigit() and 
+                            len(num2) == 4 and num2.isdigit()):
+                            
+                            if telefone not in telefones_encontrados:
+                                telefones_encontrados.append(telefone)
+            
+            return " | ".join(telefones_encontrados) if telefones_encontrados else ""
+            
+        except Exception as e:
+            print(f"⚠️ Erro ao extrair telefones: {e}")
+            return ""
+
+    def extrair_endereco_profissional(self, texto_ocr: str) -> str:
+        """Extrai endereço profissional do texto OCR"""
+        try:
+            padroes_endereco = [
+                r'Endere[cç]o\s+Profissional[:\s]*([^\n]+?)(?:Telefone|$)',
+                r'Endere[cç]o[:\s]*([^\n]+?)(?:Telefone|$)',
+                r'(RUA\s+[^,\n]+(?:,\s*N[°º]?\s*\d+)?[^,\n]*)',
+                r'(AVENIDA\s+[^,\n]+(?:,\s*N[°º]?\s*\d+)?[^,\n]*)',
+            ]
+            
+            for padrao in padroes_endereco:
+                match = re.search(padrao, texto_ocr, re.IGNORECASE)
+                if match:
+                    endereco = match.group(1).strip()
+                    
+                    # Limpar telefones do endereço
+                    endereco = re.sub(r'Telefone[:\s]*\([0-9\s\)\(-]+', '', endereco, flags=re.IGNORECASE)
+                    endereco = re.sub(r'\(\d{2}\)\s*\d{4,5}[-\s]?\d{4}', '', endereco)
+                    
+                    if 10 <= len(endereco) <= 200:
+                        return endereco.strip()
+            
+            return ""
+            
+        except Exception as e:
+            print(f"⚠️ Erro ao extrair endereço: {e}")
+            return ""
+
+    def extrair_situacao(self, texto_ocr: str) -> str:
+        """Extrai situação do advogado"""
+        padroes_situacao = [
+            r'SITUA[CÇ][AÃ]O\s+REGULAR',
+            r'REGULAR',
+            r'SITUA[CÇ][AÃ]O[:\s]*([A-Z\s]+)',
+            r'(ATIVO|ATIVA|LICENCIADO|LICENCIADA)',
+        ]
+        
+        for padrao in padroes_situacao:
+            match = re.search(padrao, texto_ocr, re.IGNORECASE)
+            if match:
+                if padrao in [r'SITUA[CÇ][AÃ]O\s+REGULAR', r'REGULAR']:
+                    return 'SITUAÇÃO REGULAR'
+                
+                situacao = match.group(1) if match.groups() else match.group(0)
+                situacao = situacao.strip().upper()
+                
+                if 'REGULAR' in situacao:
+                    return 'SITUAÇÃO REGULAR'
+                elif situacao in ['ATIVO', 'ATIVA']:
+                    return 'ATIVO'
+                elif 4 <= len(situacao) <= 30:
+                    return situacao
+        
+        return ""
+
+    def extrair_email(self, texto_ocr: str) -> str:
+        """Extrai email do texto OCR"""
+        padroes_email = [
+            r'Email[:\s]*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+            r'E-mail[:\s]*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+            r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
+        ]
+        
+        for padrao in padroes_email:
+            match = re.search(padrao, texto_ocr, re.IGNORECASE)
+            if match:
+                email = match.group(1) if match.groups() else match.group(0)
+                email = email.strip().lower()
+                
+                if ('@' in email and '.' in email and 
+                    5 <= len(email) <= 100 and
+                    not any(char in email for char in [' ', '\n', '\t'])):
+                    return email
+        
+        return ""
+
+    def extrair_data_inscricao(self, texto_ocr: str) -> str:
+        """Extrai data de inscrição"""
+        padroes_data = [
+            r'Data[:\s]*Inscri[cç][aã]o[:\s]*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
+            r'Inscrito\s+em[:\s]*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
+            r'(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
+        ]
+        
+        for padrao in padroes_data:
+            match = re.search(padrao, texto_ocr, re.IGNORECASE)
+            if match:
+                data = match.group(1) if match.groups() else match.group(0)
+                data = data.strip()
+                
+                if re.match(r'\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4}', data):
+                    return data
+        
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do scanner de campos OCR')
+    parser.add_argument('--repeticoes', type=int, default=20, help='Repetições sobre o conjunto de amostras')
+    parser.add_argument('--pasta', default='Pesquisa', help='Pasta com os textos OCR de debug')
+    args = parser.parse_args()
+
+    amostras = carregar_amostras(args.pasta)
+    if not amostras:
+        print(f"❌ Nenhum texto OCR encontrado em {args.pasta}/*/ocr_texto_*.txt")
+        return
+
+    print(f"📊 {len(amostras)} amostras, {args.repeticoes} repetições")
+
+    def extracao_antiga():
+        for texto, inscricao in amostras:
+            extrator = ModalExtractorOCR()
+            extrator.extrair_nome_completo(texto)
+            extrator.extrair_inscricao(texto, inscricao)
+            extrator.extrair_telefones(texto)
+            extrator.extrair_endereco_profissional(texto)
+            extrator.extrair_situacao(texto)
+            extrator.extrair_email(texto)
+            extrator.extrair_data_inscricao(texto)
+
+    def extracao_nova():
+        for texto, inscricao in amostras:
+            escanear_texto_ocr(texto, inscricao)
+
+    def limpeza_antiga():
+        for texto, _ in amostras:
+            avaliar_qualidade_antiga(limpar_texto_antigo(texto))
+
+    def limpeza_nova():
+        for texto, _ in amostras:
+            avaliar_qualidade_ocr(limpar_texto_ocr(texto))
+
+    # Conferir se limpeza/avaliação continuam equivalentes (a limpeza nova
+    # preserva as quebras de linha, então só as palavras são comparadas)
+    divergencias = sum(1 for texto, _ in amostras
+                       if limpar_texto_antigo(texto).split() != limpar_texto_ocr(texto).split()
+                       or avaliar_qualidade_antiga(texto) != avaliar_qualidade_ocr(texto))
+    print(f"🔍 Divergências limpeza/avaliação: {divergencias}")
+
+    for titulo, antiga, nova in (("Extração de campos", extracao_antiga, extracao_nova),
+                                 ("Limpeza + avaliação", limpeza_antiga, limpeza_nova)):
+        tempo_antigo = timeit(antiga, number=args.repeticoes)
+        tempo_novo = timeit(nova, number=args.repeticoes)
+        total = len(amostras) * args.repeticoes
+        print(f"\n⏱️ {titulo}")
+        print(f"   Antigo: {tempo_antigo / total * 1e6:8.1f} µs/texto")
+        print(f"   Novo:   {tempo_novo / total * 1e6:8.1f} µs/texto")
+        print(f"   Ganho:  {tempo_antigo / tempo_novo:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+# cache/__init__.py
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Módulo de armazenamento do cache de consultas OAB
+"""
+
+from .armazenamento_sqlite import ArmazenamentoSQLite, ARQUIVO_DB_PADRAO
+from .diario_cache import DiarioCache
+from .cache_lru import CacheLRU
+from .arquivo_registros import ArquivoRegistrosOAB, ARQUIVO_REGISTROS_PADRAO
+from .cache_fragmentado import CacheLRUFragmentado, ContadoresAtomicos
+from .filtro_bloom import FiltroBloom, ARQUIVO_FILTRO_PADRAO
+from .indice_faixas import IndiceFaixasOAB, ARQUIVO_FAIXAS_PADRAO
+from .indice_nomes import IndiceNomesOAB, normalizar_nome
+
+__all__ = ['ArmazenamentoSQLite', 'ARQUIVO_DB_PADRAO', 'DiarioCache', 'CacheLRU',
+           'ArquivoRegistrosOAB', 'ARQUIVO_REGISTROS_PADRAO', 'CacheLRUFragmentado', 'ContadoresAtomicos',
+           'FiltroBloom', 'ARQUIVO_FILTRO_PADRAO', 'IndiceFaixasOAB', 'ARQUIVO_FAIXAS_PADRAO',
+           'IndiceNomesOAB', 'normalizar_nome']
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Armazenamento do cache de consultas em SQLite
+Cada consulta é gravada com um upsert individual (sem reescrever o arquivo
+inteiro), a expiração é filtrada na própria query e a abertura não depende
+do tamanho do cache: nada é carregado até ser consultado. O modo WAL permite
+leituras enquanto outra conexão grava - vários processos podem compartilhar
+o mesmo banco, com reservas por chave para não consultarem a mesma OAB ao
+mesmo tempo. O JSON antigo (cache_oab.json) continua disponível como formato
+de importação/exportação
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .politica_cache import Validade, classificar_resultado, validade_por_classe, expirado
+from ..models.chave_oab import interpretar_oab
+
+ARQUIVO_DB_PADRAO = "cache_oab.db"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS consultas (
+    chave      TEXT PRIMARY KEY,
+    numero_oab TEXT NOT NULL,
+    estado     TEXT NOT NULL,
+    nome       TEXT,
+    erro       TEXT,
+    sucesso    INTEGER NOT NULL DEFAULT 0,
+    timestamp  REAL NOT NULL,
+    classe     TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_consultas_timestamp ON consultas (timestamp);
+CREATE TABLE IF NOT EXISTS estatisticas (
+    nome  TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reservas (
+    chave     TEXT PRIMARY KEY,
+    dono      TEXT NOT NULL,
+    expira_em REAL NOT NULL
+);
+"""
+
+_INDICE_CLASSE = "CREATE INDEX IF NOT EXISTS idx_consultas_classe ON consultas (classe, timestamp)"
+
+_COLUNAS = "chave, numero_oab, estado, nome, erro, sucesso, timestamp, classe"
+
+_SQL_UPSERT = f"""
+INSERT INTO consultas ({_COLUNAS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (chave) DO UPDATE SET
+    numero_oab = excluded.numero_oab,
+    estado     = excluded.estado,
+    nome       = excluded.nome,
+    erro       = excluded.erro,
+    sucesso    = excluded.sucesso,
+    timestamp  = excluded.timestamp,
+    classe     = excluded.classe
+"""
+
+
+def _para_epoch(timestamp) -> float:
+    """Timestamp ISO (formato do JSON) ou datetime -> segundos epoch"""
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    if timestamp:
+        return datetime.fromisoformat(timestamp).timestamp()
+    return time.time()
+
+
+def _linha_para_entrada(linha: tuple) -> Tuple[str, dict]:
+    """Linha da tabela -> (chave, entrada no formato do cache_oab.json)"""
+    chave, numero_oab, estado, nome, erro, sucesso, timestamp, classe = linha
+    return chave, {
+        'numero_oab': numero_oab,
+        'estado': estado,
+        'nome': nome,
+        'erro': erro,
+        'sucesso': bool(sucesso),
+        'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+        'classe': classe
+    }
+
+
+def _condicao_validade(validade: Validade) -> Tuple[str, List]:
+    """
+    Filtro SQL das entradas válidas (uniforme ou por classe)
+
+    Returns:
+        (trecho do WHERE, parâmetros)
+    """
+    agora = time.time()
+    partes, parametros = [], []
+    for classe, segundos in validade_por_classe(validade).items():
+        if segundos is None:
+            partes.append("classe = ?")
+            parametros.append(classe)
+        else:
+            partes.append("(classe = ? AND timestamp >= ?)")
+            parametros += [classe, agora - segundos]
+    return "(" + " OR ".join(partes) + ")", parametros
+
+
+class ArmazenamentoSQLite:
+    """Cache de consultas persistido em um banco SQLite local (modo WAL)"""
+
+    def __init__(self, arquivo: str = ARQUIVO_DB_PADRAO):
+        """
+        Args:
+            arquivo: Caminho do banco (criado se não existir)
+        """
+        self.arquivo = arquivo
+        self._lock = threading.Lock()
+
+        # Autocommit: cada upsert é uma transação curta
+        self.conexao = sqlite3.connect(arquivo, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        self.conexao.executescript(_ESQUEMA)
+        self._migrar_classe()
+        self.conexao.execute(_INDICE_CLASSE)
+
+        print(f"🗄️ Cache SQLite aberto: {arquivo}")
+
+    def _migrar_classe(self):
+        """Bancos criados antes da classe de resultado: cria e preenche a coluna"""
+        colunas = [linha[1] for linha in self.conexao.execute("PRAGMA table_info(consultas)")]
+        if 'classe' in colunas:
+            return
+
+        self.conexao.execute("ALTER TABLE consultas ADD COLUMN classe TEXT NOT NULL DEFAULT ''")
+        linhas = self.conexao.execute("SELECT chave, sucesso, erro FROM consultas").fetchall()
+        self.conexao.executemany(
+            "UPDATE consultas SET classe = ? WHERE chave = ?",
+            [(classificar_resultado(bool(sucesso), erro), chave) for chave, sucesso, erro in linhas]
+        )
+        print(f"🔧 Cache SQLite migrado: classe preenchida em {len(linhas)} entradas")
+
+    # ===========================================
+    # LEITURA
+    # ===========================================
+
+    def obter(self, chave: str, validade: Validade = None) -> Optional[dict]:
+        """
+        Busca uma entrada pela chave (índice da chave primária)
+
+        Args:
+            chave: Chave "NUMERO/ESTADO"
+            validade: Idade máxima aceita em segundos, uniforme ou por classe
+                (None = sem expiração)
+
+        Returns:
+            Entrada no formato do cache_oab.json ou None
+        """
+        condicao, parametros = _condicao_validade(validade)
+        with self._lock:
+            linha = self.conexao.execute(
+                f"SELECT {_COLUNAS} FROM consultas WHERE chave = ? AND {condicao}",
+                [chave] + parametros
+            ).fetchone()
+        return _linha_para_entrada(linha)[1] if linha else None
+
+    def iterar(self, validade: Validade = None) -> Iterator[Tuple[str, dict]]:
+        """Percorre as entradas válidas sem carregar a tabela inteira"""
+        condicao, parametros = _condicao_validade(validade)
+        with self._lock:
+            cursor = self.conexao.execute(f"SELECT {_COLUNAS} FROM consultas WHERE {condicao}", parametros)
+            linhas = cursor.fetchmany(1000)
+        while linhas:
+            for linha in linhas:
+                yield _linha_para_entrada(linha)
+            with self._lock:
+                linhas = cursor.fetchmany(1000)
+
+    def contar(self, validade: Validade = None) -> int:
+        """Quantidade de entradas válidas"""
+        condicao, parametros = _condicao_validade(validade)
+        with self._lock:
+            return self.conexao.execute(f"SELECT COUNT(*) FROM consultas WHERE {condicao}",
+                                        parametros).fetchone()[0]
+
+    # ===========================================
+    # ESCRITA
+    # ===========================================
+
+    @staticmethod
+    def _parametros(chave: str, entrada: dict) -> tuple:
+        return (
+            chave,
+            entrada['numero_oab'],
+            entrada['estado'],
+            entrada.get('nome'),
+            entrada.get('erro'),
+            1 if entrada.get('sucesso') else 0,
+            _para_epoch(entrada.get('timestamp')),
+            entrada.get('classe') or classificar_resultado(entrada.get('sucesso', False), entrada.get('erro'))
+        )
+
+    def gravar(self, chave: str, entrada: dict):
+        """Upsert de uma única entrada"""
+        with self._lock:
+            self.conexao.execute(_SQL_UPSERT, self._parametros(chave, entrada))
+
+    def gravar_varios(self, entradas: Dict[str, dict]) -> int:
+        """
+        Upsert de várias entradas em uma única transação
+
+        Returns:
+            Quantidade de entradas gravadas
+        """
+        parametros = [self._parametros(chave, entrada) for chave, entrada in entradas.items()]
+        with self._lock:
+            self.conexao.execute("BEGIN")
+            try:
+                self.conexao.executemany(_SQL_UPSERT, parametros)
+                self.conexao.execute("COMMIT")
+            except Exception:
+                self.conexao.execute("ROLLBACK")
+                raise
+        return len(parametros)
+
+    def remover(self, chave: str):
+        """Remove uma entrada"""
+        with self._lock:
+            self.conexao.execute("DELETE FROM consultas WHERE chave = ?", (chave,))
+
+    def remover_expirados(self, validade: Validade) -> int:
+        """
+        Apaga as entradas mais antigas que a validade da sua classe
+        (usa o índice classe + timestamp)
+
+        Returns:
+            Quantidade de entradas removidas
+        """
+        agora = time.time()
+        removidos = 0
+        with self._lock:
+            for classe, segundos in validade_por_classe(validade).items():
+                if segundos is None:
+                    continue
+                cursor = self.conexao.execute("DELETE FROM consultas WHERE classe = ? AND timestamp < ?",
+                                              (classe, agora - segundos))
+                removidos += cursor.rowcount
+        return removidos
+
+    def limpar(self):
+        """Apaga todas as entradas"""
+        with self._lock:
+            self.conexao.execute("DELETE FROM consultas")
+
+    # ===========================================
+    # ESTATÍSTICAS
+    # ===========================================
+
+    def carregar_estatisticas(self) -> Dict[str, int]:
+        """Estatísticas acumuladas das execuções anteriores"""
+        with self._lock:
+            return dict(self.conexao.execute("SELECT nome, valor FROM estatisticas").fetchall())
+
+    def gravar_estatisticas(self, estatisticas: Dict[str, int]):
+        """Grava as estatísticas do cache"""
+        with self._lock:
+            self.conexao.executemany(
+                "INSERT INTO estatisticas (nome, valor) VALUES (?, ?) "
+                "ON CONFLICT (nome) DO UPDATE SET valor = excluded.valor",
+                list(estatisticas.items())
+            )
+
+    def somar_estatisticas(self, incrementos: Dict[str, int]):
+        """Soma incrementos às estatísticas (seguro com vários processos gravando)"""
+        with self._lock:
+            self.conexao.executemany(
+                "INSERT INTO estatisticas (nome, valor) VALUES (?, ?) "
+                "ON CONFLICT (nome) DO UPDATE SET valor = valor + excluded.valor",
+                [(nome, valor) for nome, valor in incrementos.items() if valor]
+            )
+
+    # ===========================================
+    # RESERVAS ENTRE PROCESSOS
+    # ===========================================
+
+    def reservar(self, chave: str, dono: str, duracao_segundos: float) -> bool:
+        """
+        Reserva a chave para uma consulta (upsert atômico)
+
+        Args:
+            chave: Chave "NUMERO/ESTADO"
+            dono: Identificador do worker
+            duracao_segundos: Validade da reserva (protege contra worker que morreu)
+
+        Returns:
+            True se a reserva é deste dono (livre, vencida ou já dele)
+        """
+        agora = time.time()
+        with self._lock:
+            cursor = self.conexao.execute(
+                "INSERT INTO reservas (chave, dono, expira_em) VALUES (?, ?, ?) "
+                "ON CONFLICT (chave) DO UPDATE SET dono = excluded.dono, expira_em = excluded.expira_em "
+                "WHERE reservas.expira_em < ? OR reservas.dono = excluded.dono",
+                (chave, dono, agora + duracao_segundos, agora)
+            )
+            return cursor.rowcount > 0
+
+    def reservado_por_outro(self, chave: str, dono: str) -> bool:
+        """Verifica se outro worker tem reserva válida da chave"""
+        with self._lock:
+            return self.conexao.execute(
+                "SELECT 1 FROM reservas WHERE chave = ? AND dono != ? AND expira_em >= ?",
+                (chave, dono, time.time())
+            ).fetchone() is not None
+
+    def liberar_reserva(self, chave: str, dono: str):
+        """Libera a reserva (só o dono libera)"""
+        with self._lock:
+            self.conexao.execute("DELETE FROM reservas WHERE chave = ? AND dono = ?", (chave, dono))
+
+    def liberar_reservas_do_dono(self, padrao_dono: str) -> int:
+        """Libera as reservas de um worker (encerramento); aceita padrão LIKE"""
+        with self._lock:
+            return self.conexao.execute("DELETE FROM reservas WHERE dono LIKE ?", (padrao_dono,)).rowcount
+
+    # ===========================================
+    # IMPORTAÇÃO / EXPORTAÇÃO JSON
+    # ===========================================
+
+    def importar_json(self, arquivo: str, validade: Validade = None) -> int:
+        """
+        Importa um cache_oab.json para o banco
+
+        Args:
+            arquivo: Caminho do JSON
+            validade: Ignora entradas expiradas (None = importa todas)
+
+        Returns:
+            Quantidade de entradas importadas
+        """
+        try:
+            if not os.path.exists(arquivo):
+                print(f"📁 Arquivo de cache não encontrado: {arquivo}")
+                return 0
+
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+
+            entradas = {}
+            for chave, entrada in dados.get('cache', {}).items():
+                classe = entrada.get('classe') or classificar_resultado(entrada.get('sucesso', False),
+                                                                        entrada.get('erro'))
+                if not expirado(classe, _para_epoch(entrada.get('timestamp')), validade):
+                    # Chaves antigas com zeros à esquerda ("012345/SP") entram na forma canônica
+                    entradas[str(interpretar_oab(chave) or chave)] = dict(entrada, classe=classe)
+            importadas = self.gravar_varios(entradas)
+
+            if 'estatisticas' in dados:
+                self.gravar_estatisticas(dados['estatisticas'])
+
+            print(f"📥 Cache importado de {arquivo}: {importadas} entradas")
+            return importadas
+
+        except Exception as e:
+            print(f"⚠️ Erro ao importar cache JSON: {e}")
+            return 0
+
+    def exportar_json(self, arquivo: str, validade: Validade = None) -> int:
+        """
+        Exporta o banco no formato do cache_oab.json
+
+        Returns:
+            Quantidade de entradas exportadas
+        """
+        try:
+            dados_cache = dict(self.iterar(validade))
+
+            temporario = arquivo + ".tmp"
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'cache': dados_cache,
+                    'estatisticas': self.carregar_estatisticas()
+                }, f, indent=2, ensure_ascii=False)
+            os.replace(temporario, arquivo)
+
+            print(f"📤 Cache exportado para {arquivo}: {len(dados_cache)} entradas")
+            return len(dados_cache)
+
+        except Exception as e:
+            print(f"⚠️ Erro ao exportar cache JSON: {e}")
+            return 0
+
+    def fechar(self):
+        """Fecha a conexão (faz o checkpoint do WAL)"""
+        with self._lock:
+            try:
+                self.conexao.close()
+            except Exception:
+                pass
@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache de consultas em arquivo de registros mapeado em memória (mmap)
+Feito para o cadastro nacional inteiro (dezenas de milhões de OABs): a chave
+(UF + número) vira um inteiro de 8 bytes e o índice é uma tabela hash de
+posições fixas (16 bytes: chave + deslocamento) lida via mmap. Nome e erro
+ficam num arquivo de dados só de acréscimos. Abrir é instantâneo (nada é
+carregado) e a busca é O(1)
+
+Atomicidade: o registro é acrescentado ao arquivo de dados primeiro e só
+depois a posição do índice passa a apontar para ele; uma interrupção no meio
+deixa no máximo bytes órfãos no fim dos dados. Um único processo grava por
+vez; para vários workers use o ArmazenamentoSQLite
+"""
+
+import os
+import json
+import glob
+import mmap
+import struct
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+from .politica_cache import Validade, CLASSES_RESULTADO, classificar_resultado, expirado, validade_por_classe
+from .armazenamento_sqlite import _para_epoch
+from ..models.chave_oab import ChaveOAB, ESTADOS_VALIDOS, chave_oab, interpretar_oab
+
+ARQUIVO_REGISTROS_PADRAO = "cache_oab.idx"
+
+# Posições iniciais do índice (potência de 2) e ocupação máxima antes de dobrar
+CAPACIDADE_INICIAL_PADRAO = 1 << 16
+CARGA_MAXIMA = 0.7
+
+_MAGICO_INDICE = b'OABIDX01'
+_MAGICO_DADOS = b'OABDAT01'
+
+# Índice: mágico, capacidade, ocupadas (com chave), removidas, geração dos dados
+_CABECALHO_INDICE = struct.Struct('<8sQQQQ')
+_POSICAO = struct.Struct('<QQ')          # chave codificada, deslocamento nos dados (0 = removida)
+_CHAVE = struct.Struct('<Q')
+
+# Registro: chave, timestamp, classe|sucesso, bytes do nome, bytes do erro
+_REGISTRO = struct.Struct('<QdBHH')
+_BIT_SUCESSO = 0x80
+
+_ESTADOS = sorted(ESTADOS_VALIDOS)
+_INDICE_ESTADO = {estado: i + 1 for i, estado in enumerate(_ESTADOS)}
+
+# Multiplicador de Fibonacci para espalhar chaves próximas pela tabela
+_FIBONACCI = 0x9E3779B97F4A7C15
+_MASCARA_64 = (1 << 64) - 1
+
+
+def _codificar(chave: ChaveOAB) -> int:
+    """ChaveOAB -> inteiro de 8 bytes (UF nos bits altos, nunca 0)"""
+    if chave.numero >> 40:
+        raise ValueError(f"Número OAB fora do intervalo: {chave}")
+    return (_INDICE_ESTADO[chave.estado] << 40) | chave.numero
+
+
+def _interpretar_chave(chave: str) -> Optional[ChaveOAB]:
+    """Chave "NUMERO/ESTADO" (aceita também números curtos gravados pelo cache)"""
+    oab = interpretar_oab(chave)
+    if oab is None and '/' in chave:
+        oab = chave_oab(*chave.rsplit('/', 1))
+    return oab
+
+
+def _decodificar(codigo: int) -> ChaveOAB:
+    return chave_oab(codigo & ((1 << 40) - 1), _ESTADOS[(codigo >> 40) - 1])
+
+
+class ArquivoRegistrosOAB:
+    """Cache persistido em índice hash + dados de acréscimo, lidos via mmap"""
+
+    def __init__(self, arquivo: str = ARQUIVO_REGISTROS_PADRAO,
+                 capacidade_inicial: int = CAPACIDADE_INICIAL_PADRAO, sincronizar_disco: bool = False):
+        """
+        Args:
+            arquivo: Arquivo do índice (os dados ficam ao lado, em .<geração>.dat)
+            capacidade_inicial: Posições do índice ao criar (arredondado para potência de 2)
+            sincronizar_disco: fsync a cada registro (sobrevive também a queda do sistema)
+        """
+        self.arquivo = arquivo
+        self.sincronizar_disco = sincronizar_disco
+        self._base = os.path.splitext(arquivo)[0]
+        self._arquivo_estatisticas = self._base + ".estatisticas.json"
+        self._lock = threading.RLock()
+
+        if not os.path.exists(arquivo):
+            capacidade = 1 << max(4, (capacidade_inicial - 1).bit_length())
+            self._criar_indice(arquivo, capacidade, 0, 0, 1)
+            self._criar_dados(self._arquivo_dados(1))
+
+        self._abrir()
+        print(f"🗄️ Cache em registros aberto: {arquivo} ({self.ocupadas - self.removidas} entradas)")
+
+    # ===========================================
+    # ARQUIVOS
+    # ===========================================
+
+    def _arquivo_dados(self, geracao: int) -> str:
+        return f"{self._base}.{geracao}.dat"
+
+    @staticmethod
+    def _criar_indice(arquivo: str, capacidade: int, ocupadas: int, removidas: int, geracao: int):
+        """Índice vazio (arquivo esparso: só o cabeçalho ocupa disco)"""
+        with open(arquivo, 'wb') as f:
+            f.write(_CABECALHO_INDICE.pack(_MAGICO_INDICE, capacidade, ocupadas, removidas, geracao))
+            f.truncate(_CABECALHO_INDICE.size + capacidade * _POSICAO.size)
+
+    @staticmethod
+    def _criar_dados(arquivo: str):
+        with open(arquivo, 'wb') as f:
+            f.write(_MAGICO_DADOS)
+
+    def _abrir(self):
+        self._f_indice = open(self.arquivo, 'r+b')
+        self._indice = mmap.mmap(self._f_indice.fileno(), 0)
+        magico, self.capacidade, self.ocupadas, self.removidas, self.geracao = \
+            _CABECALHO_INDICE.unpack_from(self._indice, 0)
+        if magico != _MAGICO_INDICE:
+            raise ValueError(f"Arquivo de índice inválido: {self.arquivo}")
+
+        arquivo_dados = self._arquivo_dados(self.geracao)
+        self._f_dados = open(arquivo_dados, 'a+b')
+        self._dados = mmap.mmap(self._f_dados.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._dados[:len(_MAGICO_DADOS)] != _MAGICO_DADOS:
+            raise ValueError(f"Arquivo de dados inválido: {arquivo_dados}")
+
+        # Dados de gerações antigas sobram de uma compactação interrompida
+        for antigo in glob.glob(f"{self._base}.*.dat"):
+            if antigo != arquivo_dados:
+                os.remove(antigo)
+
+    def _fechar_mapas(self):
+        self._indice.close()
+        self._f_indice.close()
+        self._dados.close()
+        self._f_dados.close()
+
+    def _gravar_cabecalho(self):
+        _CABECALHO_INDICE.pack_into(self._indice, 0, _MAGICO_INDICE, self.capacidade,
+                                    self.ocupadas, self.removidas, self.geracao)
+
+    # ===========================================
+    # TABELA HASH
+    # ===========================================
+
+    def _procurar(self, codigo: int) -> Tuple[int, bool]:
+        """
+        Sondagem linear a partir do hash da chave
+
+        Returns:
+            (byte da posição no índice, se a chave já está lá)
+        """
+        bits = self.capacidade.bit_length() - 1
+        mascara = self.capacidade - 1
+        posicao = ((codigo * _FIBONACCI) & _MASCARA_64) >> (64 - bits)
+        while True:
+            inicio = _CABECALHO_INDICE.size + posicao * _POSICAO.size
+            atual = _CHAVE.unpack_from(self._indice, inicio)[0]
+            if atual == 0:
+                return inicio, False
+            if atual == codigo:
+                return inicio, True
+            posicao = (posicao + 1) & mascara
+
+    def _posicoes(self) -> Iterator[Tuple[int, int, int]]:
+        """Percorre as posições ocupadas: (byte no índice, chave, deslocamento)"""
+        for i in range(self.capacidade):
+            inicio = _CABECALHO_INDICE.size + i * _POSICAO.size
+            codigo, deslocamento = _POSICAO.unpack_from(self._indice, inicio)
+            if codigo:
+                yield inicio, codigo, deslocamento
+
+    def _reconstruir_indice(self, vivas, capacidade: int, geracao: int):
+        """Monta um índice novo com as chaves vivas e troca o atual atomicamente"""
+        while len(vivas) > capacidade * CARGA_MAXIMA:
+            capacidade *= 2
+        temporario = self.arquivo + ".tmp"
+        self._criar_indice(temporario, capacidade, len(vivas), 0, geracao)
+
+        self._fechar_mapas()
+        with open(temporario, 'r+b') as f:
+            novo = mmap.mmap(f.fileno(), 0)
+            self._indice, self.capacidade = novo, capacidade
+            for codigo, deslocamento in vivas:
+                inicio, _ = self._procurar(codigo)
+                _POSICAO.pack_into(novo, inicio, codigo, deslocamento)
+            novo.flush()
+            novo.close()
+        os.replace(temporario, self.arquivo)
+        self._abrir()
+
+    def _crescer(self):
+        """Dobra o índice (as posições removidas não são copiadas)"""
+        vivas = [(codigo, deslocamento) for _, codigo, deslocamento in self._posicoes() if deslocamento]
+        self._reconstruir_indice(vivas, self.capacidade * 2, self.geracao)
+
+    # ===========================================
+    # REGISTROS
+    # ===========================================
+
+    @staticmethod
+    def _codificar_registro(codigo: int, entrada: dict) -> bytes:
+        classe = entrada.get('classe') or classificar_resultado(entrada.get('sucesso', False), entrada.get('erro'))
+        nome = (entrada.get('nome') or '').encode('utf-8')[:0xFFFF]
+        erro = (entrada.get('erro') or '').encode('utf-8')[:0xFFFF]
+        marcador = CLASSES_RESULTADO.index(classe) | (_BIT_SUCESSO if entrada.get('sucesso') else 0)
+        return _REGISTRO.pack(codigo, _para_epoch(entrada.get('timestamp')), marcador,
+                              len(nome), len(erro)) + nome + erro
+
+    def _ler_registro(self, deslocamento: int) -> Tuple[int, float, str, dict]:
+        """Registro nos dados -> (chave, timestamp, classe, entrada do cache_oab.json)"""
+        if deslocamento + _REGISTRO.size > len(self._dados):
+            self._remapear_dados()
+        codigo, timestamp, marcador, tam_nome, tam_erro = _REGISTRO.unpack_from(self._dados, deslocamento)
+        inicio = deslocamento + _REGISTRO.size
+        if inicio + tam_nome + tam_erro > len(self._dados):
+            self._remapear_dados()
+        nome = self._dados[inicio:inicio + tam_nome].decode('utf-8')
+        erro = self._dados[inicio + tam_nome:inicio + tam_nome + tam_erro].decode('utf-8')
+
+        chave = _decodificar(codigo)
+        classe = CLASSES_RESULTADO[marcador & ~_BIT_SUCESSO]
+        return codigo, timestamp, classe, {
+            'numero_oab': chave.inscricao,
+            'estado': chave.estado,
+            'nome': nome or None,
+            'erro': erro or None,
+            'sucesso': bool(marcador & _BIT_SUCESSO),
+            'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+            'classe': classe
+        }
+
+    def _remapear_dados(self):
+        """O arquivo de dados cresceu desde o último mapeamento"""
+        self._dados.close()
+        self._dados = mmap.mmap(self._f_dados.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _acrescentar(self, registro: bytes) -> int:
+        """Acrescenta o registro aos dados e devolve o deslocamento"""
+        self._f_dados.seek(0, os.SEEK_END)
+        deslocamento = self._f_dados.tell()
+        self._f_dados.write(registro)
+        self._f_dados.flush()
+        if self.sincronizar_disco:
+            os.fsync(self._f_dados.fileno())
+        return deslocamento
+
+    @staticmethod
+    def _codigo(chave: str, entrada: Optional[dict] = None) -> int:
+        oab = _interpretar_chave(chave)
+        if oab is None and entrada:
+            oab = chave_oab(entrada.get('numero_oab'), entrada.get('estado', ''))
+        if oab is None:
+            raise ValueError(f"Chave OAB inválida: {chave}")
+        return _codificar(oab)
+
+    # ===========================================
+    # LEITURA
+    # ===========================================
+
+    def obter(self, chave: str, validade: Validade = None) -> Optional[dict]:
+        """
+        Busca uma entrada pela chave (O(1), sem carregar o arquivo)
+
+        Args:
+            chave: Chave "NUMERO/ESTADO"
+            validade: Idade máxima aceita em segundos, uniforme ou por classe
+                (None = sem expiração)
+
+        Returns:
+            Entrada no formato do cache_oab.json ou None
+        """
+        oab = _interpretar_chave(chave)
+        if oab is None:
+            return None
+
+        with self._lock:
+            inicio, encontrada = self._procurar(_codificar(oab))
+            if not encontrada:
+                return None
+            deslocamento = _POSICAO.unpack_from(self._indice, inicio)[1]
+            if not deslocamento:
+                return None
+            _, timestamp, classe, entrada = self._ler_registro(deslocamento)
+
+        return None if expirado(classe, timestamp, validade) else entrada
+
+    def iterar(self, validade: Validade = None) -> Iterator[Tuple[str, dict]]:
+        """Percorre as entradas válidas (varredura do índice)"""
+        with self._lock:
+            deslocamentos = [deslocamento for _, _, deslocamento in self._posicoes() if deslocamento]
+        for deslocamento in deslocamentos:
+            with self._lock:
+                codigo, timestamp, classe, entrada = self._ler_registro(deslocamento)
+            if not expirado(classe, timestamp, validade):
+                yield str(_decodificar(codigo)), entrada
+
+    def contar(self, validade: Validade = None) -> int:
+        """
+        Quantidade de entradas, direto do cabeçalho (sem varrer o índice)
+
+        Args:
+            validade: Aceita pela mesma interface do ArmazenamentoSQLite, mas
+                não filtra: as expiradas contam até remover_expirados()
+        """
+        return self.ocupadas - self.removidas
+
+    def contar_validas(self, validade: Validade = None) -> int:
+        """Quantidade de entradas dentro da validade (varre o índice inteiro)"""
+        if validade is None or all(segundos is None for segundos in validade_por_classe(validade).values()):
+            return self.contar()
+        return sum(1 for _ in self.iterar(validade))
+
+    # ===========================================
+    # ESCRITA
+    # ===========================================
+
+    def gravar(self, chave: str, entrada: dict):
+        """Acrescenta o registro e aponta a chave para ele"""
+        codigo = self._codigo(chave, entrada)
+        registro = self._codificar_registro(codigo, entrada)
+
+        with self._lock:
+            deslocamento = self._acrescentar(registro)
+            inicio, encontrada = self._procurar(codigo)
+
+            if encontrada:
+                if not _POSICAO.unpack_from(self._indice, inicio)[1]:
+                    self.removidas -= 1
+                    self._gravar_cabecalho()
+                _POSICAO.pack_into(self._indice, inicio, codigo, deslocamento)
+                return
+
+            if self.ocupadas + 1 > self.capacidade * CARGA_MAXIMA:
+                self._crescer()
+                inicio, _ = self._procurar(codigo)
+
+            # Contador primeiro: numa interrupção ele sobra, nunca falta
+            self.ocupadas += 1
+            self._gravar_cabecalho()
+            # Deslocamento antes da chave: a posição nunca aparece sem registro
+            _CHAVE.pack_into(self._indice, inicio + _CHAVE.size, deslocamento)
+            _CHAVE.pack_into(self._indice, inicio, codigo)
+
+    def gravar_varios(self, entradas: Dict[str, dict]) -> int:
+        """
+        Grava várias entradas
+
+        Returns:
+            Quantidade de entradas gravadas
+        """
+        with self._lock:
+            for chave, entrada in entradas.items():
+                self.gravar(chave, entrada)
+            self._indice.flush()
+        return len(entradas)
+
+    def _remover_posicao(self, inicio: int):
+        # A chave fica (a sondagem passa por ela); só o registro deixa de valer
+        _CHAVE.pack_into(self._indice, inicio + _CHAVE.size, 0)
+        self.removidas += 1
+
+    def remover(self, chave: str):
+        """Remove uma entrada"""
+        oab = _interpretar_chave(chave)
+        if oab is None:
+            return
+        with self._lock:
+            inicio, encontrada = self._procurar(_codificar(oab))
+            if encontrada and _POSICAO.unpack_from(self._indice, inicio)[1]:
+                self._remover_posicao(inicio)
+                self._gravar_cabecalho()
+
+    def remover_expirados(self, validade: Validade) -> int:
+        """
+        Remove as entradas mais antigas que a validade da sua classe
+
+        Returns:
+            Quantidade de entradas removidas
+        """
+        removidos = 0
+        with self._lock:
+            for inicio, _, deslocamento in list(self._posicoes()):
+                if not deslocamento:
+                    continue
+                _, timestamp, classe, _ = self._ler_registro(deslocamento)
+                if expirado(classe, timestamp, validade):
+                    self._remover_posicao(inicio)
+                    removidos += 1
+            self._gravar_cabecalho()
+        return removidos
+
+    def limpar(self):
+        """Apaga todas as entradas"""
+        with self._lock:
+            capacidade, geracao = self.capacidade, self.geracao
+            self._fechar_mapas()
+            self._criar_dados(self._arquivo_dados(geracao))
+            self._criar_indice(self.arquivo, capacidade, 0, 0, geracao)
+            self._abrir()
+
+    def compactar(self) -> int:
+        """
+        Reescreve os dados só com os registros vivos (os acréscimos acumulam
+        versões antigas e removidas). Índice e dados novos ganham uma nova
+        geração; a troca do índice é o ponto atômico
+
+        Returns:
+            Quantidade de entradas mantidas
+        """
+        with self._lock:
+            nova_geracao = self.geracao + 1
+            arquivo_dados = self._arquivo_dados(nova_geracao)
+            vivas = []
+            with open(arquivo_dados, 'wb') as f:
+                f.write(_MAGICO_DADOS)
+                for _, codigo, deslocamento in self._posicoes():
+                    if not deslocamento:
+                        continue
+                    _, _, _, entrada = self._ler_registro(deslocamento)
+                    vivas.append((codigo, f.tell()))
+                    f.write(self._codificar_registro(codigo, entrada))
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._reconstruir_indice(vivas, self.capacidade, nova_geracao)
+
+            print(f"🗜️ Cache em registros compactado: {len(vivas)} entradas")
+            return len(vivas)
+
+    # ===========================================
+    # ESTATÍSTICAS
+    # ===========================================
+
+    def carregar_estatisticas(self) -> Dict[str, int]:
+        """Estatísticas acumuladas das execuções anteriores"""
+        if not os.path.exists(self._arquivo_estatisticas):
+            return {}
+        with open(self._arquivo_estatisticas, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def gravar_estatisticas(self, estatisticas: Dict[str, int]):
+        """Grava as estatísticas do cache (troca atômica do arquivo)"""
+        temporario = self._arquivo_estatisticas + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(estatisticas, f, indent=2)
+        os.replace(temporario, self._arquivo_estatisticas)
+
+    def somar_estatisticas(self, incrementos: Dict[str, int]):
+        """Soma incrementos às estatísticas gravadas"""
+        with self._lock:
+            estatisticas = self.carregar_estatisticas()
+            for nome, valor in incrementos.items():
+                if valor:
+                    estatisticas[nome] = estatisticas.get(nome, 0) + valor
+            self.gravar_estatisticas(estatisticas)
+
+    # ===========================================
+    # IMPORTAÇÃO / EXPORTAÇÃO JSON
+    # ===========================================
+
+    def importar_json(self, arquivo: str, validade: Validade = None) -> int:
+        """
+        Importa um cache_oab.json para o arquivo de registros
+
+        Args:
+            arquivo: Caminho do JSON
+            validade: Ignora entradas expiradas (None = importa todas)
+
+        Returns:
+            Quantidade de entradas importadas
+        """
+        try:
+            if not os.path.exists(arquivo):
+                print(f"📁 Arquivo de cache não encontrado: {arquivo}")
+                return 0
+
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+
+            entradas = {}
+            for chave, entrada in dados.get('cache', {}).items():
+                classe = entrada.get('classe') or classificar_resultado(entrada.get('sucesso', False),
+                                                                        entrada.get('erro'))
+                if expirado(classe, _para_epoch(entrada.get('timestamp')), validade):
+                    continue
+                try:
+                    self._codigo(chave, entrada)
+                except ValueError:
+                    print(f"⚠️ Chave ignorada (OAB inválida): {chave}")
+                    continue
+                entradas[chave] = dict(entrada, classe=classe)
+            importadas = self.gravar_varios(entradas)
+
+            if 'estatisticas' in dados:
+                self.gravar_estatisticas(dados['estatisticas'])
+
+            print(f"📥 Cache importado de {arquivo}: {importadas} entradas")
+            return importadas
+
+        except Exception as e:
+            print(f"⚠️ Erro ao importar cache JSON: {e}")
+            return 0
+
+    def exportar_json(self, arquivo: str, validade: Validade = None) -> int:
+        """
+        Exporta os registros no formato do cache_oab.json
+
+        Returns:
+            Quantidade de entradas exportadas
+        """
+        try:
+            dados_cache = dict(self.iterar(validade))
+
+            temporario = arquivo + ".tmp"
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'cache': dados_cache,
+                    'estatisticas': self.carregar_estatisticas()
+                }, f, indent=2, ensure_ascii=False)
+            os.replace(temporario, arquivo)
+
+            print(f"📤 Cache exportado para {arquivo}: {len(dados_cache)} entradas")
+            return len(dados_cache)
+
+        except Exception as e:
+            print(f"⚠️ Erro ao exportar cache JSON: {e}")
+            return 0
+
+    def fechar(self):
+        """Grava o índice em disco e fecha os arquivos"""
+        with self._lock:
+            try:
+                self._indice.flush()
+                self._fechar_mapas()
+            except Exception:
+                pass
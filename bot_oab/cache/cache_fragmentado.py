@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache em memória seguro para várias threads (lock por fragmento)
+As chaves são distribuídas em N fragmentos, cada um com seu CacheLRU e seu
+lock: threads que consultam OABs diferentes raramente disputam o mesmo lock
+e a leitura nunca vê um fragmento no meio de uma remoção. Os contadores de
+estatísticas são incrementados de forma atômica
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .cache_lru import CacheLRU, INTERVALO_VARREDURA_PADRAO, medir_entrada
+
+FRAGMENTOS_PADRAO = 16
+
+
+class ContadoresAtomicos(dict):
+    """Dicionário de contadores com incremento atômico entre threads"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+
+    def incrementar(self, nome: str, valor: int = 1) -> int:
+        """Soma valor ao contador (criado com 0) e devolve o novo total"""
+        with self._lock:
+            total = self.get(nome, 0) + valor
+            self[nome] = total
+            return total
+
+    def copia(self) -> Dict[str, int]:
+        """Retrato consistente de todos os contadores"""
+        with self._lock:
+            return dict(self)
+
+    def update(self, *args, **kwargs):
+        with self._lock:
+            super().update(*args, **kwargs)
+
+
+class CacheLRUFragmentado:
+    """CacheLRU dividido em fragmentos independentes, cada um com seu lock"""
+
+    def __init__(self, fragmentos: int = FRAGMENTOS_PADRAO, max_entradas: Optional[int] = None,
+                 max_bytes: Optional[int] = None, expirado: Optional[Callable[[Any], bool]] = None,
+                 medir: Callable[[str, Any], int] = medir_entrada,
+                 intervalo_varredura: float = INTERVALO_VARREDURA_PADRAO):
+        """
+        Args:
+            fragmentos: Quantidade de fragmentos (locks independentes)
+            max_entradas: Máximo de entradas no total (dividido entre os fragmentos)
+            max_bytes: Máximo de bytes no total (dividido entre os fragmentos)
+            expirado: Função que diz se um valor expirou (None = nunca expira)
+            medir: Função que estima os bytes de uma entrada
+            intervalo_varredura: Intervalo mínimo entre varreduras de expirados
+
+        O descarte LRU é por fragmento (aproximado no total)
+        """
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.fragmentos: List[CacheLRU] = [
+            CacheLRU(max_entradas=-(-max_entradas // fragmentos) if max_entradas is not None else None,
+                     max_bytes=-(-max_bytes // fragmentos) if max_bytes is not None else None,
+                     expirado=expirado, medir=medir, intervalo_varredura=intervalo_varredura)
+            for _ in range(fragmentos)
+        ]
+        self._locks = [threading.Lock() for _ in range(fragmentos)]
+
+    def _fragmento(self, chave) -> Tuple[CacheLRU, threading.Lock]:
+        indice = hash(chave) % len(self.fragmentos)
+        return self.fragmentos[indice], self._locks[indice]
+
+    # ===========================================
+    # INTERFACE (a mesma do CacheLRU)
+    # ===========================================
+
+    def obter(self, chave, padrao: Any = None) -> Any:
+        fragmento, lock = self._fragmento(chave)
+        with lock:
+            return fragmento.obter(chave, padrao)
+
+    def inserir(self, chave, valor: Any):
+        fragmento, lock = self._fragmento(chave)
+        with lock:
+            fragmento.inserir(chave, valor)
+
+    def inserir_se_ausente(self, chave, valor: Any) -> bool:
+        """
+        Insere só se não houver entrada válida (verificação e inserção atômicas)
+
+        Returns:
+            True se a entrada foi inserida
+        """
+        fragmento, lock = self._fragmento(chave)
+        with lock:
+            if fragmento.obter(chave) is not None:
+                return False
+            fragmento.inserir(chave, valor)
+            return True
+
+    def remover(self, chave, padrao: Any = None) -> Any:
+        fragmento, lock = self._fragmento(chave)
+        with lock:
+            return fragmento.remover(chave, padrao)
+
+    def remover_expirados(self) -> int:
+        removidos = 0
+        for fragmento, lock in zip(self.fragmentos, self._locks):
+            with lock:
+                removidos += fragmento.remover_expirados()
+        return removidos
+
+    def limpar(self):
+        for fragmento, lock in zip(self.fragmentos, self._locks):
+            with lock:
+                fragmento.limpar()
+
+    def itens(self) -> Iterator[Tuple[Any, Any]]:
+        """Cópia das entradas (cada fragmento copiado sob o seu lock)"""
+        itens = []
+        for fragmento, lock in zip(self.fragmentos, self._locks):
+            with lock:
+                itens.extend(fragmento.itens())
+        return iter(itens)
+
+    def metricas(self) -> Dict[str, Optional[int]]:
+        """
+        Ocupação e descartes somados dos fragmentos, com os limites configurados
+
+        O pico de bytes de cada fragmento acontece em momentos diferentes e
+        não se soma: sai como bytes_maximo_fragmento (o maior entre eles)
+        """
+        total: Dict[str, Optional[int]] = {'max_entradas': self.max_entradas, 'max_bytes': self.max_bytes,
+                                           'bytes_maximo_fragmento': 0}
+        for fragmento, lock in zip(self.fragmentos, self._locks):
+            with lock:
+                metricas = fragmento.metricas()
+            total['bytes_maximo_fragmento'] = max(total['bytes_maximo_fragmento'], metricas.pop('bytes_maximo'))
+            for nome, valor in metricas.items():
+                total[nome] = total.get(nome, 0) + valor
+        return total
+
+    def __contains__(self, chave) -> bool:
+        fragmento, lock = self._fragmento(chave)
+        with lock:
+            return chave in fragmento
+
+    def __len__(self) -> int:
+        return sum(len(fragmento) for fragmento in self.fragmentos)
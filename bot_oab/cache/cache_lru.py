@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache em memória com capacidade limitada (LRU + expiração)
+Limita a quantidade de entradas e/ou os bytes residentes: ao passar do
+limite, as entradas expiradas saem primeiro e depois as menos usadas
+recentemente. Entradas expiradas também são descartadas no acesso. Um worker
+que roda por semanas fica com a memória estável
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Intervalo mínimo entre varreduras completas de expirados (segundos)
+INTERVALO_VARREDURA_PADRAO = 60.0
+
+
+def medir_entrada(chave: str, valor: Any) -> int:
+    """Estimativa dos bytes ocupados pela chave + valor (inclui os atributos)"""
+    tamanho = sys.getsizeof(chave) + sys.getsizeof(valor)
+    atributos = getattr(valor, '__dict__', None)
+    if atributos:
+        tamanho += sys.getsizeof(atributos)
+        tamanho += sum(sys.getsizeof(atributo) for atributo in atributos.values())
+    return tamanho
+
+
+class CacheLRU:
+    """Mapa chave -> valor limitado por entradas/bytes com descarte LRU"""
+
+    def __init__(self, max_entradas: Optional[int] = None, max_bytes: Optional[int] = None,
+                 expirado: Optional[Callable[[Any], bool]] = None,
+                 medir: Callable[[str, Any], int] = medir_entrada,
+                 intervalo_varredura: float = INTERVALO_VARREDURA_PADRAO):
+        """
+        Args:
+            max_entradas: Máximo de entradas (None = sem limite)
+            max_bytes: Máximo de bytes residentes estimados (None = sem limite)
+            expirado: Função que diz se um valor expirou (None = nunca expira)
+            medir: Função que estima os bytes de uma entrada
+            intervalo_varredura: Intervalo mínimo entre varreduras de expirados
+        """
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.expirado = expirado
+        self.medir = medir
+        self.intervalo_varredura = intervalo_varredura
+
+        self._dados: "OrderedDict[str, Any]" = OrderedDict()
+        self._tamanhos: Dict[str, int] = {}
+        self._ultima_varredura = 0.0
+        self.bytes_residentes = 0
+
+        self.estatisticas = {
+            'evicoes': 0,       # Entradas válidas descartadas por falta de espaço
+            'expiradas': 0,     # Entradas descartadas por expiração
+            'bytes_maximo': 0   # Maior ocupação estimada já alcançada
+        }
+
+    # ===========================================
+    # OPERAÇÕES INTERNAS
+    # ===========================================
+
+    def _descartar(self, chave: str) -> Any:
+        """Remove a entrada e atualiza a contabilidade de bytes"""
+        valor = self._dados.pop(chave)
+        self.bytes_residentes -= self._tamanhos.pop(chave, 0)
+        return valor
+
+    def _acima_do_limite(self) -> bool:
+        return ((self.max_entradas is not None and len(self._dados) > self.max_entradas) or
+                (self.max_bytes is not None and self.bytes_residentes > self.max_bytes))
+
+    def _liberar_espaco(self):
+        """Descarta expiradas e, se ainda faltar espaço, as menos usadas"""
+        if not self._acima_do_limite():
+            return
+
+        agora = time.monotonic()
+        if self.expirado and agora - self._ultima_varredura >= self.intervalo_varredura:
+            self._ultima_varredura = agora
+            self.remover_expirados()
+
+        while self._acima_do_limite() and self._dados:
+            chave = next(iter(self._dados))
+            valor = self._descartar(chave)
+            if self.expirado and self.expirado(valor):
+                self.estatisticas['expiradas'] += 1
+            else:
+                self.estatisticas['evicoes'] += 1
+
+    # ===========================================
+    # INTERFACE
+    # ===========================================
+
+    def obter(self, chave: str, padrao: Any = None) -> Any:
+        """
+        Valor da chave (marca como usada recentemente)
+
+        Returns:
+            Valor ou padrao se não existir / tiver expirado
+        """
+        valor = self._dados.get(chave)
+        if valor is None:
+            return padrao
+
+        if self.expirado and self.expirado(valor):
+            self._descartar(chave)
+            self.estatisticas['expiradas'] += 1
+            return padrao
+
+        self._dados.move_to_end(chave)
+        return valor
+
+    def inserir(self, chave: str, valor: Any):
+        """Insere/atualiza a entrada e aplica os limites"""
+        if chave in self._dados:
+            self._descartar(chave)
+
+        tamanho = self.medir(chave, valor)
+        self._dados[chave] = valor
+        self._tamanhos[chave] = tamanho
+        self.bytes_residentes += tamanho
+        self.estatisticas['bytes_maximo'] = max(self.estatisticas['bytes_maximo'], self.bytes_residentes)
+
+        self._liberar_espaco()
+
+    def remover(self, chave: str, padrao: Any = None) -> Any:
+        """Remove a entrada (se existir) e devolve o valor"""
+        if chave not in self._dados:
+            return padrao
+        return self._descartar(chave)
+
+    def remover_expirados(self) -> int:
+        """
+        Varre o cache inteiro removendo as entradas expiradas
+
+        Returns:
+            Quantidade de entradas removidas
+        """
+        if not self.expirado:
+            return 0
+
+        chaves = [chave for chave, valor in self._dados.items() if self.expirado(valor)]
+        for chave in chaves:
+            self._descartar(chave)
+        self.estatisticas['expiradas'] += len(chaves)
+        return len(chaves)
+
+    def limpar(self):
+        """Remove todas as entradas"""
+        self._dados.clear()
+        self._tamanhos.clear()
+        self.bytes_residentes = 0
+
+    def itens(self) -> Iterator[Tuple[str, Any]]:
+        """Cópia das entradas (da menos para a mais usada)"""
+        return iter(list(self._dados.items()))
+
+    def metricas(self) -> Dict[str, int]:
+        """Ocupação e descartes do cache"""
+        return {
+            'entradas': len(self._dados),
+            'bytes_residentes': self.bytes_residentes,
+            **self.estatisticas
+        }
+
+    def __contains__(self, chave: str) -> bool:
+        return chave in self._dados
+
+    def __len__(self) -> int:
+        return len(self._dados)
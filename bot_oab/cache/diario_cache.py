@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diário (journal) append-only do cache de consultas
+Cada consulta nova vira uma linha JSON acrescentada ao diário (O(1), sem
+reescrever o cache). A compactação junta o snapshot (cache_oab.json) com o
+diário, descarta chaves expiradas ou sobrescritas e troca o snapshot de forma
+atômica. Uma interrupção no meio da execução perde no máximo a linha que
+estava sendo escrita
+"""
+
+import os
+import json
+import glob
+import time
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .politica_cache import Validade, classificar_resultado, expirado
+
+ARQUIVO_SNAPSHOT_PADRAO = "cache_oab.json"
+
+# Linhas no diário que disparam a compactação em segundo plano
+LIMITE_REGISTROS_PADRAO = 500
+
+
+class DiarioCache:
+    """Snapshot JSON + diário JSONL com compactação em segundo plano"""
+
+    def __init__(self, arquivo_snapshot: str = ARQUIVO_SNAPSHOT_PADRAO,
+                 limite_registros: int = LIMITE_REGISTROS_PADRAO, sincronizar_disco: bool = False):
+        """
+        Args:
+            arquivo_snapshot: Cache compactado (mesmo formato do cache_oab.json)
+            limite_registros: Linhas no diário que disparam a compactação (0 = só manual)
+            sincronizar_disco: fsync a cada linha (sobrevive também a queda do sistema)
+        """
+        self.arquivo_snapshot = arquivo_snapshot
+        self.arquivo_diario = os.path.splitext(arquivo_snapshot)[0] + ".jsonl"
+        self.limite_registros = limite_registros
+        self.sincronizar_disco = sincronizar_disco
+
+        self.registros_diario = self._contar_linhas(self.arquivo_diario)
+        self.validade: Validade = None
+
+        self._lock = threading.Lock()
+        self._lock_compactacao = threading.Lock()
+        self._thread_compactacao: Optional[threading.Thread] = None
+        self._arquivo = open(self.arquivo_diario, 'a', encoding='utf-8')
+
+    # ===========================================
+    # ESCRITA
+    # ===========================================
+
+    def registrar(self, chave: str, entrada: dict):
+        """
+        Acrescenta uma entrada ao diário
+
+        Args:
+            chave: Chave "NUMERO/ESTADO"
+            entrada: Entrada no formato do cache_oab.json
+        """
+        linha = json.dumps({'chave': chave, 'entrada': entrada}, ensure_ascii=False) + "\n"
+
+        with self._lock:
+            self._arquivo.write(linha)
+            self._arquivo.flush()
+            if self.sincronizar_disco:
+                os.fsync(self._arquivo.fileno())
+            self.registros_diario += 1
+            compactar = self.limite_registros and self.registros_diario >= self.limite_registros
+
+        if compactar:
+            self.compactar_em_segundo_plano()
+
+    # ===========================================
+    # LEITURA
+    # ===========================================
+
+    @staticmethod
+    def _contar_linhas(arquivo: str) -> int:
+        if not os.path.exists(arquivo):
+            return 0
+        with open(arquivo, 'rb') as f:
+            return sum(1 for _ in f)
+
+    @staticmethod
+    def _ler_snapshot(arquivo: str) -> Tuple[Dict[str, dict], Dict[str, int]]:
+        if not os.path.exists(arquivo):
+            return {}, {}
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        return dados.get('cache', {}), dados.get('estatisticas', {})
+
+    @staticmethod
+    def _aplicar_diario(arquivo: str, entradas: Dict[str, dict]) -> int:
+        """Reaplica as linhas do diário (a última gravação de cada chave vence)"""
+        if not os.path.exists(arquivo):
+            return 0
+
+        aplicadas = 0
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            for linha in f:
+                linha = linha.strip()
+                if not linha:
+                    continue
+                try:
+                    registro = json.loads(linha)
+                except json.JSONDecodeError:
+                    # Linha truncada por uma interrupção no meio da escrita
+                    print(f"⚠️ Linha incompleta ignorada no diário: {arquivo}")
+                    continue
+                entradas[registro['chave']] = registro['entrada']
+                aplicadas += 1
+        return aplicadas
+
+    def _diarios_rotacionados(self) -> List[str]:
+        """Diários separados por uma compactação que não terminou"""
+        return sorted(glob.glob(self.arquivo_diario + ".*"))
+
+    def carregar(self) -> Tuple[Dict[str, dict], Dict[str, int]]:
+        """
+        Reconstrói o cache: snapshot + diários pendentes + diário atual
+
+        Returns:
+            (entradas por chave, estatísticas do snapshot)
+        """
+        try:
+            entradas, estatisticas = self._ler_snapshot(self.arquivo_snapshot)
+            aplicadas = 0
+            for arquivo in self._diarios_rotacionados() + [self.arquivo_diario]:
+                aplicadas += self._aplicar_diario(arquivo, entradas)
+
+            print(f"📂 Cache: {len(entradas)} entradas ({aplicadas} do diário)")
+            return entradas, estatisticas
+
+        except Exception as e:
+            print(f"⚠️ Erro ao carregar diário do cache: {e}")
+            return {}, {}
+
+    # ===========================================
+    # COMPACTAÇÃO
+    # ===========================================
+
+    def _rotacionar(self) -> Optional[str]:
+        """Separa o diário atual para compactação; novas linhas vão para um diário novo"""
+        with self._lock:
+            if self.registros_diario == 0:
+                return None
+            self._arquivo.close()
+            rotacionado = f"{self.arquivo_diario}.{time.time_ns()}"
+            os.replace(self.arquivo_diario, rotacionado)
+            self._arquivo = open(self.arquivo_diario, 'a', encoding='utf-8')
+            self.registros_diario = 0
+            return rotacionado
+
+    def compactar(self, validade: Validade = None,
+                  estatisticas: Optional[Dict[str, int]] = None) -> int:
+        """
+        Incorpora o diário ao snapshot e remove entradas expiradas
+
+        Args:
+            validade: Validade em segundos, uniforme ou por classe (None = mantém a atual)
+            estatisticas: Estatísticas a gravar no snapshot (None = mantém as atuais)
+
+        Returns:
+            Quantidade de entradas no snapshot
+        """
+        if validade is not None:
+            self.validade = validade
+
+        with self._lock_compactacao:
+            try:
+                self._rotacionar()
+                diarios = self._diarios_rotacionados()
+
+                entradas, estatisticas_snapshot = self._ler_snapshot(self.arquivo_snapshot)
+                for arquivo in diarios:
+                    self._aplicar_diario(arquivo, entradas)
+
+                if self.validade is not None:
+                    agora = time.time()
+                    entradas = {
+                        chave: entrada for chave, entrada in entradas.items()
+                        if not expirado(
+                            entrada.get('classe') or classificar_resultado(entrada.get('sucesso', False),
+                                                                           entrada.get('erro')),
+                            datetime.fromisoformat(entrada['timestamp']).timestamp(),
+                            self.validade, agora
+                        )
+                    }
+
+                temporario = self.arquivo_snapshot + ".tmp"
+                with open(temporario, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'cache': entradas,
+                        'estatisticas': estatisticas if estatisticas is not None else estatisticas_snapshot
+                    }, f, indent=2, ensure_ascii=False)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temporario, self.arquivo_snapshot)
+
+                # Só depois do snapshot novo no lugar os diários podem sair
+                for arquivo in diarios:
+                    os.remove(arquivo)
+
+                print(f"🗜️ Cache compactado: {len(entradas)} entradas ({len(diarios)} diários incorporados)")
+                return len(entradas)
+
+            except Exception as e:
+                print(f"⚠️ Erro ao compactar cache: {e}")
+                return 0
+
+    def compactar_em_segundo_plano(self):
+        """Dispara a compactação em uma thread (ignora se já houver uma rodando)"""
+        if self._thread_compactacao and self._thread_compactacao.is_alive():
+            return
+        self._thread_compactacao = threading.Thread(target=self.compactar, daemon=True)
+        self._thread_compactacao.start()
+
+    def fechar(self):
+        """Aguarda a compactação em andamento e fecha o diário"""
+        if self._thread_compactacao:
+            self._thread_compactacao.join()
+        with self._lock:
+            self._arquivo.close()
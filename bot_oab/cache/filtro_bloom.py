@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Filtro de Bloom das OABs já gravadas no cache
+Responde "com certeza não está no cache" sem consultar o banco: só as chaves
+que o filtro aceita seguem para a busca completa. Com 1% de falsos positivos
+o filtro ocupa ~1,2 byte por chave e é salvo entre execuções
+"""
+
+import os
+import math
+import struct
+import hashlib
+import threading
+from typing import Iterable, Optional
+
+ARQUIVO_FILTRO_PADRAO = "cache_oab.bloom"
+TAXA_FALSOS_POSITIVOS_PADRAO = 0.01
+CAPACIDADE_PADRAO = 100000
+
+_MAGICO = b'OABBLM01'
+# Mágico, bits, funções de hash, capacidade planejada, chaves incluídas, referência
+_CABECALHO = struct.Struct('<8sQIQQQ')
+
+
+class FiltroBloom:
+    """Conjunto probabilístico: sem falsos negativos, poucos falsos positivos"""
+
+    def __init__(self, capacidade: int = CAPACIDADE_PADRAO,
+                 taxa_falsos_positivos: float = TAXA_FALSOS_POSITIVOS_PADRAO):
+        """
+        Args:
+            capacidade: Quantidade de chaves prevista
+            taxa_falsos_positivos: Taxa de falsos positivos com a capacidade cheia
+        """
+        self.capacidade = max(1, capacidade)
+        self.taxa_falsos_positivos = taxa_falsos_positivos
+
+        self.total_bits = max(64, int(-self.capacidade * math.log(taxa_falsos_positivos) / math.log(2) ** 2))
+        self.funcoes = max(1, round(self.total_bits / self.capacidade * math.log(2)))
+        self.quantidade = 0
+        # Entradas no armazenamento quando o filtro foi salvo (detecta mudanças externas)
+        self.referencia = 0
+
+        self._bits = bytearray((self.total_bits + 7) // 8)
+        # OR em bytes não é atômico: sem o lock uma inclusão concorrente perderia bits
+        self._lock = threading.Lock()
+
+    def _posicoes(self, chave: str):
+        """k posições por hash duplo (h1 + i*h2) a partir de um único blake2b"""
+        resumo = hashlib.blake2b(chave.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', resumo)
+        h2 |= 1
+        for i in range(self.funcoes):
+            yield (h1 + i * h2) % self.total_bits
+
+    def adicionar(self, chave: str):
+        """Inclui a chave no filtro"""
+        posicoes = list(self._posicoes(chave))
+        with self._lock:
+            nova = False
+            for posicao in posicoes:
+                mascara = 1 << (posicao & 7)
+                if not self._bits[posicao >> 3] & mascara:
+                    self._bits[posicao >> 3] |= mascara
+                    nova = True
+            # Chave repetida não acende bit novo: não conta de novo
+            if nova:
+                self.quantidade += 1
+
+    def adicionar_varias(self, chaves: Iterable[str]) -> int:
+        """Inclui várias chaves; devolve quantas foram incluídas"""
+        incluidas = 0
+        for chave in chaves:
+            self.adicionar(chave)
+            incluidas += 1
+        return incluidas
+
+    def __contains__(self, chave: str) -> bool:
+        bits = self._bits
+        return all(bits[posicao >> 3] & (1 << (posicao & 7)) for posicao in self._posicoes(chave))
+
+    def __len__(self) -> int:
+        return self.quantidade
+
+    @property
+    def cheio(self) -> bool:
+        """Passou da capacidade planejada (a taxa de falsos positivos sobe)"""
+        return self.quantidade > self.capacidade
+
+    # ===========================================
+    # PERSISTÊNCIA
+    # ===========================================
+
+    def salvar(self, arquivo: str = ARQUIVO_FILTRO_PADRAO):
+        """Grava o filtro (troca atômica do arquivo)"""
+        temporario = arquivo + ".tmp"
+        with self._lock:
+            with open(temporario, 'wb') as f:
+                f.write(_CABECALHO.pack(_MAGICO, self.total_bits, self.funcoes, self.capacidade,
+                                        self.quantidade, self.referencia))
+                f.write(self._bits)
+        os.replace(temporario, arquivo)
+
+    @classmethod
+    def carregar(cls, arquivo: str = ARQUIVO_FILTRO_PADRAO) -> Optional['FiltroBloom']:
+        """
+        Lê o filtro salvo
+
+        Returns:
+            FiltroBloom ou None se o arquivo não existir / for inválido
+        """
+        if not os.path.exists(arquivo):
+            return None
+        try:
+            with open(arquivo, 'rb') as f:
+                magico, total_bits, funcoes, capacidade, quantidade, referencia = \
+                    _CABECALHO.unpack(f.read(_CABECALHO.size))
+                bits = bytearray(f.read())
+            if magico != _MAGICO or len(bits) != (total_bits + 7) // 8:
+                print(f"⚠️ Filtro de Bloom inválido, será reconstruído: {arquivo}")
+                return None
+        except (OSError, struct.error) as e:
+            print(f"⚠️ Erro ao ler filtro de Bloom: {e}")
+            return None
+
+        filtro = cls.__new__(cls)
+        filtro.capacidade = capacidade
+        filtro.taxa_falsos_positivos = None
+        filtro.total_bits = total_bits
+        filtro.funcoes = funcoes
+        filtro.quantidade = quantidade
+        filtro.referencia = referencia
+        filtro._bits = bits
+        filtro._lock = threading.Lock()
+        return filtro
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice de faixas de inscrição por seccional
+Aprende, a partir das inscrições confirmadas pelo site, um percentil alto
+dos números vistos em cada UF (um único número digitado errado que tenha
+passado não estica a faixa). Um número muito acima dele (ex.: SP 9999999
+quando as inscrições conhecidas vão até ~500000) provavelmente é erro de
+digitação e não deve ocupar o navegador antes das OABs prováveis
+"""
+
+import os
+import json
+import bisect
+import threading
+from typing import Dict, List, Optional
+
+from ..models.chave_oab import ChaveOAB, interpretar_oab
+from .politica_cache import CLASSE_SUCESSO
+
+ARQUIVO_FAIXAS_PADRAO = "cache_oab.faixas.json"
+
+# Referência da faixa: percentil dos números distintos confirmados na UF
+PERCENTIL_PADRAO = 0.99
+# Acima da referência: 5% ou 1000 inscrições (as novas)
+FOLGA_PADRAO = 0.05
+MARGEM_MINIMA_PADRAO = 1000
+# Com poucas OABs distintas confirmadas na UF o índice não opina
+AMOSTRAS_MINIMAS_PADRAO = 20
+
+# Só a consulta principal confirmada pelo site prova que a inscrição existe
+# (adicionais vêm de linhas extras da página e aquecidas não passaram pelo site)
+_CLASSES_CONFIRMADAS = (CLASSE_SUCESSO,)
+
+
+class IndiceFaixasOAB:
+    """Inscrições confirmadas por UF e a maior provável em cada uma"""
+
+    def __init__(self, percentil: float = PERCENTIL_PADRAO, folga: float = FOLGA_PADRAO,
+                 margem_minima: int = MARGEM_MINIMA_PADRAO, amostras_minimas: int = AMOSTRAS_MINIMAS_PADRAO):
+        """
+        Args:
+            percentil: Percentil dos números confirmados usado como referência
+                (1.0 = o maior; abaixo disso descarta os extremos)
+            folga: Fração acima da referência ainda considerada provável
+            margem_minima: Folga mínima em números de inscrição
+            amostras_minimas: OABs distintas confirmadas na UF para o índice opinar
+        """
+        self.percentil = percentil
+        self.folga = folga
+        self.margem_minima = margem_minima
+        self.amostras_minimas = amostras_minimas
+
+        # Números distintos confirmados por UF, ordenados (a mesma OAB gravada
+        # de novo não conta duas vezes)
+        self.numeros: Dict[str, List[int]] = {}
+        # Entradas no armazenamento quando o índice foi salvo
+        self.referencia = 0
+        self._lock = threading.Lock()
+
+    def aprender(self, chave, classe: str) -> bool:
+        """
+        Registra uma inscrição confirmada
+
+        Args:
+            chave: ChaveOAB (ou texto "NUMERO/UF")
+            classe: Classe do resultado no cache
+
+        Returns:
+            True se a entrada foi considerada
+        """
+        if classe not in _CLASSES_CONFIRMADAS:
+            return False
+        if not isinstance(chave, ChaveOAB):
+            chave = interpretar_oab(str(chave))
+            if chave is None:
+                return False
+
+        with self._lock:
+            numeros = self.numeros.setdefault(chave.estado, [])
+            posicao = bisect.bisect_left(numeros, chave.numero)
+            if posicao == len(numeros) or numeros[posicao] != chave.numero:
+                numeros.insert(posicao, chave.numero)
+        return True
+
+    def referencia_uf(self, estado: str) -> Optional[int]:
+        """Percentil dos números confirmados na UF (None = poucas amostras)"""
+        with self._lock:
+            numeros = self.numeros.get(estado, [])
+            if len(numeros) < self.amostras_minimas:
+                return None
+            return numeros[int(self.percentil * (len(numeros) - 1))]
+
+    def limite(self, estado: str) -> Optional[int]:
+        """Maior inscrição provável na UF (None = poucas amostras, sem opinião)"""
+        referencia = self.referencia_uf(estado)
+        if referencia is None:
+            return None
+        return max(int(referencia * (1 + self.folga)), referencia + self.margem_minima)
+
+    def improvavel(self, chave: ChaveOAB) -> bool:
+        """A inscrição está muito acima da maior já confirmada na UF"""
+        limite = self.limite(chave.estado)
+        return limite is not None and chave.numero > limite
+
+    def __len__(self) -> int:
+        return sum(len(numeros) for numeros in self.numeros.values())
+
+    # ===========================================
+    # PERSISTÊNCIA
+    # ===========================================
+
+    def salvar(self, arquivo: str = ARQUIVO_FAIXAS_PADRAO):
+        """Grava o índice (troca atômica do arquivo)"""
+        with self._lock:
+            dados = {
+                'referencia': self.referencia,
+                'numeros': {estado: list(numeros) for estado, numeros in self.numeros.items()}
+            }
+        temporario = arquivo + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, sort_keys=True)
+        os.replace(temporario, arquivo)
+
+    @classmethod
+    def carregar(cls, arquivo: str = ARQUIVO_FAIXAS_PADRAO, **parametros) -> Optional['IndiceFaixasOAB']:
+        """
+        Lê o índice salvo
+
+        Returns:
+            IndiceFaixasOAB ou None se o arquivo não existir / for inválido
+        """
+        if not os.path.exists(arquivo):
+            return None
+        try:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            indice = cls(**parametros)
+            indice.referencia = int(dados['referencia'])
+            indice.numeros = {estado: sorted({int(numero) for numero in numeros})
+                              for estado, numeros in dados['numeros'].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"⚠️ Índice de faixas inválido, será reconstruído: {e}")
+            return None
+        return indice
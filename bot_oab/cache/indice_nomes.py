@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice reverso nome -> OAB sobre os resultados já resolvidos
+Busca por prefixo do nome completo ou por palavras (cada palavra da busca
+casa com o início de uma palavra do nome), sem acentos e sem diferenciar
+maiúsculas: "jose da sil" encontra "JOSÉ DA SILVA" sem consultar o site
+"""
+
+import os
+import csv
+import json
+import bisect
+import heapq
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models.chave_oab import ChaveOAB, chave_oab, interpretar_oab
+
+LIMITE_RESULTADOS_PADRAO = 20
+
+
+def normalizar_nome(nome: str) -> str:
+    """Maiúsculas, sem acentos, só letras/números separados por um espaço"""
+    decomposto = unicodedata.normalize('NFKD', nome or "")
+    sem_acentos = ''.join(c for c in decomposto if not unicodedata.combining(c))
+    return ' '.join(''.join(c if c.isalnum() else ' ' for c in sem_acentos.upper()).split())
+
+
+class IndiceNomesOAB:
+    """Nome normalizado -> inscrições (busca por prefixo e por palavras)"""
+
+    def __init__(self):
+        self._nomes: Dict[ChaveOAB, str] = {}
+        self._normalizados: Dict[ChaveOAB, str] = {}
+        self._postagens: Dict[str, Set[ChaveOAB]] = {}
+
+        # Listas ordenadas refeitas sob demanda (bisect para os prefixos)
+        self._ordenados: List[Tuple[str, ChaveOAB]] = []
+        self._palavras: List[str] = []
+        self._sujo = False
+        self._lock = threading.Lock()
+
+    def adicionar(self, chave, nome: str) -> bool:
+        """
+        Inclui (ou atualiza) o nome de uma inscrição
+
+        Args:
+            chave: ChaveOAB (ou texto "NUMERO/UF" / "SP12345")
+            nome: Nome confirmado
+
+        Returns:
+            True se a entrada foi indexada
+        """
+        if not isinstance(chave, ChaveOAB):
+            chave = interpretar_oab(str(chave))
+        normalizado = normalizar_nome(nome)
+        if chave is None or not normalizado:
+            return False
+
+        with self._lock:
+            anterior = self._normalizados.get(chave)
+            if anterior == normalizado:
+                return True
+            if anterior is not None:
+                for palavra in anterior.split():
+                    self._postagens.get(palavra, set()).discard(chave)
+
+            self._nomes[chave] = nome.strip()
+            self._normalizados[chave] = normalizado
+            for palavra in normalizado.split():
+                self._postagens.setdefault(palavra, set()).add(chave)
+            self._sujo = True
+        return True
+
+    def adicionar_entradas(self, entradas: Iterable[Tuple[str, dict]]) -> int:
+        """
+        Indexa entradas do cache (chave, dict) com nome confirmado
+
+        Returns:
+            Quantidade de entradas indexadas
+        """
+        indexadas = 0
+        for chave, entrada in entradas:
+            if not entrada.get('sucesso') or not entrada.get('nome'):
+                continue
+            chave_canonica = chave_oab(entrada.get('numero_oab'), entrada.get('estado', '')) or chave
+            if self.adicionar(chave_canonica, entrada['nome']):
+                indexadas += 1
+        return indexadas
+
+    def adicionar_cache_json(self, arquivo: str) -> int:
+        """Indexa o cache_oab.json (formato de importação/exportação)"""
+        if not os.path.exists(arquivo):
+            return 0
+        try:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Erro ao ler {arquivo}: {e}")
+            return 0
+        return self.adicionar_entradas(dados.get('cache', {}).items())
+
+    def adicionar_exportados(self, pasta: str = "Pesquisa") -> int:
+        """
+        Indexa os resultados exportados pelo DataExporter (JSON e CSV)
+
+        Args:
+            pasta: Pasta das pesquisas (uma subpasta por sessão)
+
+        Returns:
+            Quantidade de resultados indexados
+        """
+        indexados = 0
+        for raiz, _, arquivos in os.walk(pasta):
+            for nome_arquivo in arquivos:
+                caminho = os.path.join(raiz, nome_arquivo)
+                try:
+                    if nome_arquivo.endswith('.json'):
+                        with open(caminho, 'r', encoding='utf-8') as f:
+                            linhas = json.load(f).get('resultados', [])
+                    elif nome_arquivo.endswith('.csv'):
+                        with open(caminho, 'r', newline='', encoding='utf-8') as f:
+                            linhas = list(csv.DictReader(f))
+                    else:
+                        continue
+                except (OSError, ValueError, AttributeError) as e:
+                    print(f"⚠️ Erro ao ler {caminho}: {e}")
+                    continue
+
+                for linha in linhas:
+                    if str(linha.get('sucesso')).lower() not in ('true', '1'):
+                        continue
+                    chave = chave_oab(linha.get('inscricao'), linha.get('estado') or '')
+                    if chave is not None and self.adicionar(chave, linha.get('nome') or ''):
+                        indexados += 1
+        return indexados
+
+    # ===========================================
+    # BUSCA
+    # ===========================================
+
+    def _ordenar(self):
+        """Refaz as listas ordenadas depois de inclusões"""
+        with self._lock:
+            if not self._sujo:
+                return
+            self._ordenados = sorted((normalizado, chave) for chave, normalizado in self._normalizados.items())
+            self._palavras = sorted(palavra for palavra, chaves in self._postagens.items() if chaves)
+            self._sujo = False
+
+    def _resultado(self, chaves: Iterable[ChaveOAB], limite: Optional[int]) -> List[Tuple[str, str, str]]:
+        """(inscrição, UF, nome) em ordem de nome"""
+        ordem = lambda chave: (self._normalizados[chave], chave)
+        if limite is None:
+            ordenadas = sorted(chaves, key=ordem)
+        else:
+            ordenadas = heapq.nsmallest(limite, chaves, key=ordem)
+        return [(chave.inscricao, chave.estado, self._nomes[chave]) for chave in ordenadas]
+
+    def buscar_prefixo(self, texto: str,
+                       limite: Optional[int] = LIMITE_RESULTADOS_PADRAO) -> List[Tuple[str, str, str]]:
+        """
+        Nomes que começam com o texto ("MARIA DA S" -> "MARIA DA SILVA ...")
+
+        Returns:
+            Lista de (inscrição, UF, nome)
+        """
+        prefixo = normalizar_nome(texto)
+        if not prefixo:
+            return []
+        self._ordenar()
+
+        chaves = []
+        posicao = bisect.bisect_left(self._ordenados, (prefixo,))
+        while posicao < len(self._ordenados) and self._ordenados[posicao][0].startswith(prefixo):
+            chaves.append(self._ordenados[posicao][1])
+            if limite is not None and len(chaves) >= limite:
+                break
+            posicao += 1
+        return self._resultado(chaves, limite)
+
+    def _chaves_da_palavra(self, prefixo: str) -> Set[ChaveOAB]:
+        """Inscrições com alguma palavra do nome começando pelo prefixo"""
+        chaves: Set[ChaveOAB] = set()
+        posicao = bisect.bisect_left(self._palavras, prefixo)
+        while posicao < len(self._palavras) and self._palavras[posicao].startswith(prefixo):
+            chaves |= self._postagens[self._palavras[posicao]]
+            posicao += 1
+        return chaves
+
+    def buscar_palavras(self, texto: str,
+                        limite: Optional[int] = LIMITE_RESULTADOS_PADRAO) -> List[Tuple[str, str, str]]:
+        """
+        Nomes que contêm todas as palavras da busca, em qualquer ordem e
+        posição ("silva jo" -> "JOSÉ DA SILVA", "JOANA SILVA")
+
+        Returns:
+            Lista de (inscrição, UF, nome)
+        """
+        palavras = normalizar_nome(texto).split()
+        if not palavras:
+            return []
+        self._ordenar()
+
+        conjuntos = sorted((self._chaves_da_palavra(palavra) for palavra in palavras), key=len)
+        chaves = set(conjuntos[0])
+        for conjunto in conjuntos[1:]:
+            chaves &= conjunto
+            if not chaves:
+                break
+        return self._resultado(chaves, limite)
+
+    def __len__(self) -> int:
+        return len(self._nomes)
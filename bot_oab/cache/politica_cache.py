@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Política de validade do cache por classe de resultado
+Um nome confirmado pode ficar meses no cache; "Inscrição não encontrada"
+fica alguns dias (a inscrição pode ser criada depois); timeouts e exceções
+do navegador ficam pouco tempo (ou nem são gravados) para não envenenar a
+chave com uma falha passageira
+"""
+
+import time
+from typing import Dict, Optional, Union
+
+CLASSE_SUCESSO = 'sucesso'
+CLASSE_NAO_ENCONTRADO = 'nao_encontrado'
+CLASSE_TRANSITORIO = 'transitorio'
+# Nome lido de outra linha da página de resultado (não foi a OAB consultada):
+# confiança menor, validade menor e nunca substitui uma consulta direta
+CLASSE_ADICIONAL = 'adicional'
+# Nome copiado de outra linha do banco (aquecimento): não foi confirmado pelo
+# site, vale pouco tempo e não entra no índice de faixas
+CLASSE_AQUECIDO = 'aquecido'
+
+CLASSES_RESULTADO = (CLASSE_SUCESSO, CLASSE_NAO_ENCONTRADO, CLASSE_TRANSITORIO, CLASSE_ADICIONAL,
+                     CLASSE_AQUECIDO)
+
+# Erros que confirmam que a inscrição não existe no CNA (resposta definitiva do site)
+ERROS_NAO_ENCONTRADO = ('Inscrição não encontrada', 'Nenhum resultado encontrado')
+
+# Validade padrão em horas (None = nunca expira, 0 = não grava no cache)
+VALIDADE_PADRAO_HORAS: Dict[str, Optional[float]] = {
+    CLASSE_SUCESSO: 24 * 180,
+    CLASSE_NAO_ENCONTRADO: 24 * 7,
+    CLASSE_TRANSITORIO: 1,
+    CLASSE_ADICIONAL: 24 * 30,
+    CLASSE_AQUECIDO: 24,
+}
+
+# Idade a partir da qual a entrada ainda vale, mas é renovada em segundo plano
+# (stale-while-revalidate; None = não renova antes de expirar)
+RENOVACAO_PADRAO_HORAS: Dict[str, Optional[float]] = {
+    CLASSE_SUCESSO: 24 * 30,
+    CLASSE_NAO_ENCONTRADO: 24,
+    CLASSE_TRANSITORIO: None,
+    CLASSE_ADICIONAL: 24 * 7,
+    CLASSE_AQUECIDO: None,
+}
+
+# Validade uniforme (segundos ou None) ou por classe
+Validade = Union[None, float, Dict[str, Optional[float]]]
+
+
+def classificar_resultado(sucesso: bool, erro: Optional[str]) -> str:
+    """
+    Classe do resultado de uma consulta
+
+    Args:
+        sucesso: Se a consulta trouxe o nome
+        erro: Mensagem de erro da consulta
+
+    Returns:
+        CLASSE_SUCESSO, CLASSE_NAO_ENCONTRADO ou CLASSE_TRANSITORIO
+    """
+    if sucesso:
+        return CLASSE_SUCESSO
+    if erro and any(erro.startswith(padrao) for padrao in ERROS_NAO_ENCONTRADO):
+        return CLASSE_NAO_ENCONTRADO
+    return CLASSE_TRANSITORIO
+
+
+def horas_para_segundos(validade_horas: Dict[str, Optional[float]]) -> Dict[str, Optional[float]]:
+    """Converte a política em horas para segundos"""
+    return {classe: (horas * 3600 if horas is not None else None)
+            for classe, horas in validade_horas.items()}
+
+
+def validade_por_classe(validade: Validade) -> Dict[str, Optional[float]]:
+    """Normaliza a validade (uniforme ou por classe) para segundos por classe"""
+    if isinstance(validade, dict):
+        return validade
+    return {classe: validade for classe in CLASSES_RESULTADO}
+
+
+def expirado(classe: str, timestamp: float, validade: Validade, agora: Optional[float] = None) -> bool:
+    """
+    Verifica se uma entrada expirou segundo a política
+
+    Args:
+        classe: Classe da entrada
+        timestamp: Momento da consulta (epoch)
+        validade: Validade uniforme ou por classe, em segundos
+        agora: Momento de referência (padrão: agora)
+
+    Returns:
+        True se a entrada não deve mais ser usada
+    """
+    segundos = validade_por_classe(validade).get(classe)
+    if segundos is None:
+        return False
+    return (agora if agora is not None else time.time()) - timestamp > segundos
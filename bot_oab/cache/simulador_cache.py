@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulador de políticas de cache sobre execuções passadas
+Reconstrói a sequência de consultas ao site a partir dos logs/, das sessões
+da pasta Pesquisa/ e de dumps de usuarios pendentes, e a reexecuta contra
+configurações candidatas (validade por classe, limite de entradas, fontes de
+aquecimento). Para cada configuração informa a taxa de acerto e quantas
+consultas ao site teriam sido evitadas
+"""
+
+import os
+import re
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.chave_oab import ChaveOAB, chave_oab, interpretar_oab
+from .cache_lru import CacheLRU
+from .politica_cache import (CLASSE_SUCESSO, VALIDADE_PADRAO_HORAS, classificar_resultado,
+                             expirado, horas_para_segundos)
+
+# Arquivos gravados por consulta dentro de uma sessão da pasta Pesquisa
+_ARQUIVO_CONSULTA = re.compile(r'^(?:modal_imagem|ocr_texto|OAB)_(\d+)_([A-Z]{2})(?:[_.]|$)')
+_PASTA_SESSAO = re.compile(r'^\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}$')
+_LINHA_LOG = re.compile(r'^\[(\d{2}):(\d{2}):(\d{2})\] (.*)$')
+_PROCESSANDO = re.compile(r'^Processando registro (\S+): (\S+)')
+_SUCESSO = re.compile(r'^SUCESSO: Registro (\S+)')
+_FALHA = re.compile(r'^ERRO: (?:Falha ao processar registro|Exceção no registro) (\S+)')
+
+
+@dataclass
+class EventoConsulta:
+    """Uma consulta (ou resultado já conhecido) em um momento do histórico"""
+    momento: float
+    chave: ChaveOAB
+    classe: Optional[str] = None  # None = resultado desconhecido
+    origem: str = ""
+
+
+@dataclass
+class ConfiguracaoCache:
+    """Configuração candidata do cache"""
+    nome: str
+    validade_horas: Dict[str, Optional[float]] = field(default_factory=lambda: dict(VALIDADE_PADRAO_HORAS))
+    max_entradas: Optional[int] = None
+    aquecimento: Tuple[str, ...] = ()  # Fontes de resultados já conhecidos
+
+    @classmethod
+    def de_dict(cls, item: Dict) -> 'ConfiguracaoCache':
+        validade = dict(VALIDADE_PADRAO_HORAS)
+        validade.update(item.get('validade_horas', {}))
+        return cls(nome=item['nome'], validade_horas=validade,
+                   max_entradas=item.get('max_entradas'),
+                   aquecimento=tuple(item.get('aquecimento', ())))
+
+
+# ===========================================
+# LEITURA DO HISTÓRICO
+# ===========================================
+
+def ler_logs(pasta: str = "logs") -> List[EventoConsulta]:
+    """
+    Consultas registradas nos logs de processamento do main.py
+    ("Processando registro <id>: SP12345" + SUCESSO/ERRO do mesmo registro)
+
+    Args:
+        pasta: Pasta dos arquivos .log
+
+    Returns:
+        Eventos em ordem cronológica (classe só nos sucessos)
+    """
+    eventos: List[EventoConsulta] = []
+    if not os.path.isdir(pasta):
+        return eventos
+
+    for nome_arquivo in sorted(os.listdir(pasta)):
+        if not nome_arquivo.endswith('.log'):
+            continue
+        caminho = os.path.join(pasta, nome_arquivo)
+        try:
+            with open(caminho, 'r', encoding='utf-8', errors='replace') as f:
+                linhas = f.read().splitlines()
+        except OSError as e:
+            print(f"⚠️ Erro ao ler {caminho}: {e}")
+            continue
+
+        inicio = None
+        for linha in linhas[:5]:
+            if linha.startswith("Iniciado em:"):
+                try:
+                    inicio = datetime.strptime(linha.split(":", 1)[1].strip(), "%d/%m/%Y %H:%M:%S")
+                except ValueError:
+                    pass
+        if inicio is None:
+            continue
+
+        # Horários sem data: virada de meia-noite quando o relógio volta
+        dia = inicio.replace(hour=0, minute=0, second=0, microsecond=0)
+        anterior = inicio
+        pendentes: Dict[str, EventoConsulta] = {}
+        for linha in linhas:
+            casamento = _LINHA_LOG.match(linha)
+            if not casamento:
+                continue
+            horas, minutos, segundos, mensagem = casamento.groups()
+            momento = dia + timedelta(hours=int(horas), minutes=int(minutos), seconds=int(segundos))
+            if momento < anterior - timedelta(hours=1):
+                dia += timedelta(days=1)
+                momento += timedelta(days=1)
+            anterior = momento
+
+            processando = _PROCESSANDO.match(mensagem)
+            if processando:
+                chave = interpretar_oab(processando.group(2))
+                if chave is not None:
+                    evento = EventoConsulta(momento.timestamp(), chave, origem='logs')
+                    pendentes[processando.group(1)] = evento
+                    eventos.append(evento)
+                continue
+
+            sucesso = _SUCESSO.match(mensagem)
+            if sucesso and sucesso.group(1) in pendentes:
+                pendentes.pop(sucesso.group(1)).classe = CLASSE_SUCESSO
+            elif _FALHA.match(mensagem):
+                # Falha sem o motivo no log: classe desconhecida
+                pendentes.pop(_FALHA.match(mensagem).group(1), None)
+
+    eventos.sort(key=lambda evento: evento.momento)
+    return eventos
+
+
+def _ler_resultados_exportados(caminho: str) -> List[Dict]:
+    """Linhas de um JSON/CSV gravado pelo DataExporter"""
+    try:
+        if caminho.endswith('.json'):
+            with open(caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            return dados.get('resultados', []) if isinstance(dados, dict) else []
+        if caminho.endswith('.csv'):
+            with open(caminho, 'r', newline='', encoding='utf-8') as f:
+                return list(csv.DictReader(f))
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Erro ao ler {caminho}: {e}")
+    return []
+
+
+def ler_pesquisas(pasta: str = "Pesquisa") -> List[EventoConsulta]:
+    """
+    Consultas das sessões da pasta Pesquisa (uma subpasta por sessão, com
+    imagens/textos OCR e resultados exportados por OAB consultada)
+
+    Args:
+        pasta: Pasta das pesquisas
+
+    Returns:
+        Eventos em ordem cronológica (classe quando houver resultado exportado)
+    """
+    eventos: List[EventoConsulta] = []
+    if not os.path.isdir(pasta):
+        return eventos
+
+    for sessao in sorted(os.listdir(pasta)):
+        caminho_sessao = os.path.join(pasta, sessao)
+        if not _PASTA_SESSAO.match(sessao) or not os.path.isdir(caminho_sessao):
+            continue
+        inicio = datetime.strptime(sessao, "%Y-%m-%d_%H-%M-%S").timestamp()
+
+        # Uma consulta por OAB na sessão (imagem, OCR e exportação são da mesma)
+        classes: Dict[ChaveOAB, Optional[str]] = {}
+        for nome_arquivo in sorted(os.listdir(caminho_sessao)):
+            casamento = _ARQUIVO_CONSULTA.match(nome_arquivo)
+            if casamento:
+                chave = chave_oab(casamento.group(1), casamento.group(2))
+                if chave is not None:
+                    classes.setdefault(chave, None)
+            if nome_arquivo.endswith(('.json', '.csv')):
+                for linha in _ler_resultados_exportados(os.path.join(caminho_sessao, nome_arquivo)):
+                    chave = chave_oab(linha.get('inscricao'), linha.get('estado') or '')
+                    if chave is not None:
+                        sucesso = str(linha.get('sucesso')).lower() in ('true', '1')
+                        classes[chave] = classificar_resultado(sucesso, linha.get('erro'))
+
+        # A ordem dentro da sessão não é registrada: um segundo entre consultas
+        for indice, (chave, classe) in enumerate(classes.items()):
+            eventos.append(EventoConsulta(inicio + indice, chave, classe, origem='pesquisa'))
+
+    eventos.sort(key=lambda evento: evento.momento)
+    return eventos
+
+
+def ler_pendentes(arquivo: str, momento: Optional[float] = None) -> List[EventoConsulta]:
+    """
+    Dump dos usuarios pendentes de erros_processados (uma execução)
+    Aceita texto (um usuario por linha), JSON (lista de textos ou de objetos
+    com 'usuario') ou CSV com a coluna 'usuario'
+
+    Args:
+        arquivo: Caminho do dump
+        momento: Momento da execução (padrão: data de modificação do arquivo)
+
+    Returns:
+        Um evento por linha pendente com OAB válida
+    """
+    try:
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            if arquivo.endswith('.json'):
+                dados = json.load(f)
+                usuarios = [item.get('usuario', '') if isinstance(item, dict) else str(item) for item in dados]
+            elif arquivo.endswith('.csv'):
+                usuarios = [linha.get('usuario', '') for linha in csv.DictReader(f)]
+            else:
+                usuarios = f.read().splitlines()
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"⚠️ Erro ao ler pendentes {arquivo}: {e}")
+        return []
+
+    if momento is None:
+        momento = os.path.getmtime(arquivo)
+
+    eventos = []
+    for indice, usuario in enumerate(usuarios):
+        chave = interpretar_oab(usuario or '')
+        if chave is not None:
+            eventos.append(EventoConsulta(momento + indice, chave, origem='pendentes'))
+    return eventos
+
+
+def ler_entradas_cache(entradas: Iterable[Tuple[str, Dict]], origem: str = 'cache') -> List[EventoConsulta]:
+    """
+    Resultados já conhecidos de um cache (cache_oab.json, SQLite ou registros),
+    para aquecimento: cada um passa a valer a partir do seu timestamp
+    """
+    eventos = []
+    for chave_texto, entrada in entradas:
+        chave = (chave_oab(entrada.get('numero_oab'), entrada.get('estado', ''))
+                 or interpretar_oab(chave_texto))
+        try:
+            momento = datetime.fromisoformat(entrada['timestamp']).timestamp()
+        except (KeyError, TypeError, ValueError):
+            continue
+        if chave is None:
+            continue
+        classe = entrada.get('classe') or classificar_resultado(bool(entrada.get('sucesso')), entrada.get('erro'))
+        eventos.append(EventoConsulta(momento, chave, classe, origem=origem))
+    eventos.sort(key=lambda evento: evento.momento)
+    return eventos
+
+
+# ===========================================
+# SIMULAÇÃO
+# ===========================================
+
+def simular(eventos: List[EventoConsulta], configuracao: ConfiguracaoCache,
+            aquecimento: Optional[Dict[str, List[EventoConsulta]]] = None,
+            classe_padrao: str = CLASSE_SUCESSO) -> Dict:
+    """
+    Reexecuta as consultas contra uma configuração do cache
+
+    Args:
+        eventos: Consultas em ordem cronológica
+        configuracao: Configuração candidata
+        aquecimento: Fonte -> resultados conhecidos (usados só pelas
+            configurações que listam a fonte)
+        classe_padrao: Classe assumida quando o resultado da consulta não é
+            conhecido em nenhuma fonte
+
+    Returns:
+        Dicionário com consultas, acertos, consultas ao site e descartes
+    """
+    validade = horas_para_segundos(configuracao.validade_horas)
+    relogio = [0.0]
+    cache = CacheLRU(max_entradas=configuracao.max_entradas,
+                     expirado=lambda valor: expirado(valor[0], valor[1], validade, relogio[0]))
+
+    # Resultado de uma consulta sem classe: o último conhecido para a OAB
+    conhecidas: Dict[ChaveOAB, str] = {}
+    for evento in eventos:
+        if evento.classe:
+            conhecidas[evento.chave] = evento.classe
+
+    # Um resultado conhecido só vale para consultas estritamente posteriores:
+    # no mesmo instante a consulta vem antes (a pasta Pesquisa é ao mesmo tempo
+    # fonte de consultas e de aquecimento e não pode acertar a si mesma)
+    linha_do_tempo = [(evento.momento, 0, evento) for evento in eventos]
+    for fonte in configuracao.aquecimento:
+        linha_do_tempo.extend((evento.momento, 1, evento) for evento in (aquecimento or {}).get(fonte, []))
+    linha_do_tempo.sort(key=lambda item: (item[0], item[1]))
+
+    resultado = {'configuracao': configuracao.nome, 'consultas': 0, 'acertos': 0,
+                 'consultas_site': 0, 'primeiras_consultas': 0, 'acertos_aquecimento': 0}
+    vistas = set()
+    for momento, conhecido, evento in linha_do_tempo:
+        relogio[0] = momento
+        if conhecido:
+            if validade.get(evento.classe) != 0 and cache.obter(evento.chave) is None:
+                cache.inserir(evento.chave, (evento.classe, momento, True))
+            continue
+
+        resultado['consultas'] += 1
+        valor = cache.obter(evento.chave)
+        if valor is not None:
+            resultado['acertos'] += 1
+            if valor[2]:
+                resultado['acertos_aquecimento'] += 1
+            continue
+
+        # Miss: consulta ao site e o resultado entra no cache (se a classe grava)
+        resultado['consultas_site'] += 1
+        if evento.chave not in vistas:
+            resultado['primeiras_consultas'] += 1
+            vistas.add(evento.chave)
+        classe = evento.classe or conhecidas.get(evento.chave, classe_padrao)
+        if validade.get(classe) != 0:
+            cache.inserir(evento.chave, (classe, momento, False))
+
+    metricas = cache.metricas()
+    resultado['evicoes'] = metricas['evicoes']
+    resultado['expiradas'] = metricas['expiradas']
+    resultado['taxa_acerto'] = resultado['acertos'] / resultado['consultas'] * 100 if resultado['consultas'] else 0.0
+    return resultado
+
+
+def simular_configuracoes(eventos: List[EventoConsulta], configuracoes: List[ConfiguracaoCache],
+                          aquecimento: Optional[Dict[str, List[EventoConsulta]]] = None,
+                          classe_padrao: str = CLASSE_SUCESSO) -> List[Dict]:
+    """Simula cada configuração; resultados da que mais evita consultas para a que menos evita"""
+    resultados = [simular(eventos, configuracao, aquecimento, classe_padrao) for configuracao in configuracoes]
+    resultados.sort(key=lambda item: item['consultas_site'])
+    return resultados
@@ -42,9 +42,19 @@ class BrowserConfig:
         }
         options.add_experimental_option("prefs", prefs)
         
+        # Log de performance (eventos de rede via CDP) para ler as imagens da
+        # modal direto do navegador, sem baixar de novo
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        
         driver = webdriver.Chrome(options=options)
         
         # Executar script para remover sinais de webdriver
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
         
+        # Habilitar domínio Network do CDP (Network.getResponseBody)
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+        except Exception as e:
+            print(f"⚠️ CDP Network indisponível: {e}")
+        
         return driver
\ No newline at end of file
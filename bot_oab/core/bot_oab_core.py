@@ -19,13 +19,15 @@ from ..extractors.data_extractors import DataExtractor
 from ..utils.data_exporters import DataExporter
 
 class BotOABCorrigido:
-    def __init__(self, headless: bool = False, timeout: int = 15):
+    def __init__(self, headless: bool = False, timeout: int = 15, ocr_detalhes=None):
         """
         Bot OAB corrigido - VERSÃO 2.0
         
         Args:
             headless: Se True, executa sem interface gráfica
             timeout: Tempo limite para aguardar elementos (segundos)
+            ocr_detalhes: OCRDetalhes para completar os resultados com a
+                imagem de detalhes (None = só os dados da linha)
         """
         self.timeout = timeout
         self.driver = BrowserConfig.setup_driver(headless)
@@ -34,7 +36,7 @@ class BotOABCorrigido:
         
         # 🔧 CORREÇÃO: Configurar DataExtractor com pasta de debug
         pasta_atual = self.data_exporter.obter_pasta_atual()
-        self.data_extractor = DataExtractor(self.driver, self.wait, pasta_atual)
+        self.data_extractor = DataExtractor(self.driver, self.wait, pasta_atual, ocr_detalhes=ocr_detalhes)
         
         print(f"🤖 Bot OAB v2.0 iniciado com sistema de pastas organizadas")
         print(f"📁 Pasta de pesquisas: {self.data_exporter.pasta_pesquisas}")
@@ -287,6 +289,10 @@ class BotOABCorrigido:
     
     def fechar(self):
         """Fecha o navegador e mostra informações finais - VERSÃO ATUALIZADA"""
+        # Extratores com recursos próprios (pool de downloads, sessões HTTP)
+        if hasattr(self.data_extractor, 'fechar'):
+            self.data_extractor.fechar()
+        
         if self.driver:
             self.driver.quit()
             print("🔒 Navegador fechado")
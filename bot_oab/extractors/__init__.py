@@ -2,9 +2,13 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Módulo de extratores de dados - VERSÃO SIMPLIFICADA SEM OCR
+Módulo de extratores de dados
 """
 
 from .data_extractors import DataExtractor, ModalExtractorGenerico
+from .ocr_detalhes import OCRDetalhes
+from .scanner_ocr import CamposOCR, escanear_texto_ocr, limpar_texto_ocr, avaliar_qualidade_ocr, aplicar_campos_ocr
 
-__all__ = ['DataExtractor', 'ModalExtractorGenerico']
\ No newline at end of file
+__all__ = ['DataExtractor', 'ModalExtractorGenerico', 'OCRDetalhes',
+           'CamposOCR', 'escanear_texto_ocr', 'limpar_texto_ocr', 'avaliar_qualidade_ocr',
+           'aplicar_campos_ocr']
\ No newline at end of file
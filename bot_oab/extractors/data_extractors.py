@@ -6,14 +6,24 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from ..models.resultado_oab import ResultadoOAB
+from ..models.chave_oab import normalizar_numero
 
 class DataExtractor:
     """Classe responsável pela extração de dados das páginas"""
     
-    def __init__(self, driver, wait, pasta_debug=None):
+    def __init__(self, driver, wait, pasta_debug=None, ocr_detalhes=None):
+        """
+        Args:
+            driver: WebDriver da consulta
+            wait: WebDriverWait do driver
+            pasta_debug: Pasta dos arquivos de debug
+            ocr_detalhes: OCRDetalhes que completa o resultado com a imagem de
+                detalhes (None = só os dados da linha)
+        """
         self.driver = driver
         self.wait = wait
         self.pasta_debug = pasta_debug
+        self.ocr_detalhes = ocr_detalhes
 
     def definir_pasta_debug(self, pasta_debug: str):
         """Define a pasta onde salvar arquivos de debug"""
@@ -21,7 +31,8 @@ class DataExtractor:
     
     def extrair_resultado(self, resultado: ResultadoOAB) -> ResultadoOAB:
         """
-        Extrai dados do resultado da consulta - VERSÃO SIMPLIFICADA SEM OCR
+        Extrai dados do resultado da consulta pela linha de resultado
+        (com ocr_detalhes, completa com a imagem de detalhes)
         
         Args:
             resultado: Objeto ResultadoOAB para preencher
@@ -65,8 +76,8 @@ class DataExtractor:
                     print(f"🔍 Resultado {i+1}: {inscricao_encontrada}/{uf_encontrada} - {nome_encontrado}")
                     
                     # VALIDAÇÃO CRÍTICA: Verificar se corresponde ao que foi pesquisado
-                    if self._validar_correspondencia(resultado.inscricao, resultado.estado, 
-                                                   inscricao_encontrada, uf_encontrada):
+                    if elemento_correto is None and self._validar_correspondencia(
+                            resultado.inscricao, resultado.estado, inscricao_encontrada, uf_encontrada):
                         
                         print(f"✅ Correspondência EXATA encontrada! {inscricao_encontrada}/{uf_encontrada}")
                         elemento_correto = elemento
@@ -76,10 +87,13 @@ class DataExtractor:
                         resultado.inscricao_verificada = inscricao_encontrada
                         resultado.estado_verificado = uf_encontrada
                         resultado.sucesso = True
-                        
-                        break
                     else:
-                        print(f"⚠️ Não corresponde: esperado {resultado.inscricao}/{resultado.estado.upper()}")
+                        # Outras inscrições da mesma página: o integrador aproveita no cache
+                        if inscricao_encontrada and uf_encontrada and nome_encontrado:
+                            resultado.resultados_adicionais.append(
+                                (inscricao_encontrada, uf_encontrada, nome_encontrado))
+                        if elemento_correto is None:
+                            print(f"⚠️ Não corresponde: esperado {resultado.inscricao}/{resultado.estado.upper()}")
                         continue
                         
                 except Exception as e:
@@ -88,6 +102,12 @@ class DataExtractor:
             
             if elemento_correto:
                 print(f"✅ Dados extraídos com sucesso: {resultado.nome}")
+                
+                # Telefone, endereço, situação: só na imagem de detalhes
+                if self.ocr_detalhes:
+                    resultado = self.ocr_detalhes.completar(self.driver, elemento_correto, resultado)
+                    if self.ocr_detalhes.modal_aberta:
+                        self.fechar_modal_imagem()
             else:
                 # Se não encontrou correspondência exata, tentar método antigo como fallback
                 print("🔄 Tentando método de fallback...")
@@ -102,28 +122,20 @@ class DataExtractor:
     def _normalizar_numero_oab(self, numero: str) -> str:
         """
         Normaliza número OAB para comparação
-        Remove zeros à esquerda e espaços
+        Remove zeros à esquerda, pontos e espaços
         
         Args:
             numero: Número a normalizar
             
         Returns:
-            Número normalizado
+            Número normalizado ou "" se houver outros caracteres (ex.: "12345-A")
         """
         if not numero:
             return ""
         
-        # Remover espaços e converter para string
-        numero_limpo = str(numero).strip()
-        
-        # Remover zeros à esquerda (importante para comparação)
-        numero_normalizado = numero_limpo.lstrip('0')
-        
-        # Se ficou vazio (era só zeros), retornar "0"
-        if not numero_normalizado:
-            numero_normalizado = "0"
-            
-        return numero_normalizado
+        # Mesma normalização da chave do cache (ChaveOAB)
+        valor = normalizar_numero(numero)
+        return str(valor) if valor is not None else ""
     
     def _validar_correspondencia(self, numero_busca: str, uf_busca: str, 
                                numero_encontrado: str, uf_encontrada: str) -> bool:
@@ -148,7 +160,7 @@ class DataExtractor:
         uf_encontrada_norm = uf_encontrada.strip().upper()
         
         # Comparar
-        numeros_iguais = numero_busca_norm == numero_encontrado_norm
+        numeros_iguais = bool(numero_busca_norm) and numero_busca_norm == numero_encontrado_norm
         ufs_iguais = uf_busca_norm == uf_encontrada_norm
         
         print(f"🔍 Validação: '{numero_busca_norm}' == '{numero_encontrado_norm}' ? {numeros_iguais}")
@@ -201,6 +213,11 @@ class DataExtractor:
         
         return resultado
 
+    def fechar(self):
+        """Libera os recursos do OCR de detalhes (sessão HTTP, servidor OCR)"""
+        if self.ocr_detalhes:
+            self.ocr_detalhes.fechar()
+    
     def fechar_modal_imagem(self):
         """Fecha qualquer modal de imagem que possa estar aberto"""
         try:
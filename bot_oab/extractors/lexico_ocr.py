@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Léxico OCR - nomes já resolvidos no cache + termos de endereço
+Gera o arquivo de user-words do Tesseract (viés do reconhecimento) e é usado
+na correção pós-OCR dos nomes. Atualizado de forma incremental: só os nomes
+novos do cache (armazenamento persistente ou cache_oab.json) são incorporados
+"""
+
+import os
+import json
+import time
+import difflib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+ARQUIVO_CACHE_PADRAO = "cache_oab.json"
+PASTA_LEXICO_PADRAO = "lexico_ocr"
+
+# Termos frequentes em endereços profissionais
+PALAVRAS_ENDERECO = (
+    'RUA', 'AVENIDA', 'AV', 'PRACA', 'PRAÇA', 'ALAMEDA', 'TRAVESSA', 'ESTRADA',
+    'RODOVIA', 'LARGO', 'VIADUTO', 'SALA', 'SALAS', 'ANDAR', 'CONJUNTO', 'CONJ',
+    'BLOCO', 'LOJA', 'EDIFICIO', 'EDIFÍCIO', 'TORRE', 'CENTRO', 'JARDIM', 'VILA',
+    'BAIRRO', 'PARQUE', 'SETOR', 'QUADRA', 'LOTE', 'CEP', 'NUMERO', 'NÚMERO',
+    'ESQUINA', 'FUNDOS', 'TERREO', 'TÉRREO', 'COMERCIAL', 'RESIDENCIAL',
+)
+
+# Palavras da própria modal da OAB
+PALAVRAS_MODAL = (
+    'INSCRICAO', 'INSCRIÇÃO', 'SECCIONAL', 'SUBSECAO', 'SUBSEÇÃO', 'ENDERECO',
+    'ENDEREÇO', 'PROFISSIONAL', 'TELEFONE', 'SITUACAO', 'SITUAÇÃO', 'REGULAR',
+    'ADVOGADO', 'ADVOGADA', 'ESTAGIARIO', 'ESTAGIÁRIO', 'ESTAGIARIA', 'ESTAGIÁRIA',
+)
+
+# Palavras de ligação dos nomes (não são corrigidas nem segmentadas sozinhas)
+CONECTIVOS_NOME = frozenset({'DA', 'DE', 'DO', 'DAS', 'DOS', 'E'})
+
+# Semelhança mínima para trocar uma palavra do OCR por uma do léxico
+SIMILARIDADE_MINIMA = 0.84
+
+# Intervalo mínimo entre duas leituras do armazenamento (segundos); cada
+# leitura percorre todas as entradas do cache
+INTERVALO_ATUALIZACAO_PADRAO = 300
+
+
+class LexicoOCR:
+    """Vocabulário de nomes resolvidos usado para enviesar e corrigir o OCR"""
+
+    def __init__(self, pasta: str = PASTA_LEXICO_PADRAO, arquivo_cache: str = ARQUIVO_CACHE_PADRAO,
+                 armazenamento=None, intervalo_atualizacao: float = INTERVALO_ATUALIZACAO_PADRAO):
+        """
+        Args:
+            pasta: Pasta do léxico compilado e do arquivo de user-words
+            arquivo_cache: cache_oab.json (usado quando não há armazenamento)
+            armazenamento: Armazenamento do CacheConsultas (ArmazenamentoSQLite,
+                ArquivoRegistrosOAB) lido via iterar()
+            intervalo_atualizacao: Segundos mínimos entre duas leituras do
+                armazenamento (o cache_oab.json é relido só quando muda)
+        """
+        self.pasta = pasta
+        self.arquivo_cache = arquivo_cache
+        self.armazenamento = armazenamento
+        self.intervalo_atualizacao = intervalo_atualizacao
+        self._ultima_leitura: Optional[float] = None
+        self.arquivo_palavras = os.path.join(pasta, "palavras_usuario.txt")
+        self.arquivo_estado = os.path.join(pasta, "estado_lexico.json")
+
+        # palavra -> frequência entre os nomes
+        self.palavras: Dict[str, int] = {}
+        self.nomes: Set[str] = set()
+        self.chaves_processadas: Set[str] = set()
+        self.mtime_cache = 0.0
+
+        # Índice por tamanho para acelerar a busca aproximada
+        self._indice: Dict[int, List[str]] = {}
+
+        if not os.path.exists(pasta):
+            os.makedirs(pasta)
+
+        self._carregar_estado()
+
+    # ===========================================
+    # PERSISTÊNCIA E ATUALIZAÇÃO INCREMENTAL
+    # ===========================================
+
+    def _carregar_estado(self):
+        """Carrega o léxico já compilado"""
+        try:
+            if not os.path.exists(self.arquivo_estado):
+                return
+
+            with open(self.arquivo_estado, 'r', encoding='utf-8') as f:
+                estado = json.load(f)
+
+            self.palavras = estado.get('palavras', {})
+            self.nomes = set(estado.get('nomes', []))
+            self.chaves_processadas = set(estado.get('chaves_processadas', []))
+            self.mtime_cache = estado.get('mtime_cache', 0.0)
+            self._reconstruir_indice()
+
+            print(f"📖 Léxico OCR carregado: {len(self.palavras)} palavras, {len(self.nomes)} nomes")
+
+        except Exception as e:
+            print(f"⚠️ Erro ao carregar léxico OCR: {e}")
+
+    def _salvar_estado(self):
+        """Grava o estado e o arquivo de user-words do Tesseract"""
+        estado = {
+            'palavras': self.palavras,
+            'nomes': sorted(self.nomes),
+            'chaves_processadas': sorted(self.chaves_processadas),
+            'mtime_cache': self.mtime_cache
+        }
+        with open(self.arquivo_estado, 'w', encoding='utf-8') as f:
+            json.dump(estado, f, ensure_ascii=False)
+
+        with open(self.arquivo_palavras, 'w', encoding='utf-8') as f:
+            for palavra in sorted(set(self.palavras) | set(PALAVRAS_ENDERECO) | set(PALAVRAS_MODAL)):
+                f.write(palavra + "\n")
+
+    def adicionar_nomes(self, nomes: Iterable[str]) -> int:
+        """
+        Incorpora nomes validados ao léxico
+
+        Returns:
+            Quantidade de nomes novos
+        """
+        novos = 0
+        for nome in nomes:
+            nome = ' '.join((nome or '').upper().split())
+            if not nome or nome in self.nomes:
+                continue
+            self.nomes.add(nome)
+            novos += 1
+            for palavra in nome.split():
+                if palavra.isalpha() and len(palavra) >= 2:
+                    if palavra not in self.palavras:
+                        self._indice.setdefault(len(palavra), []).append(palavra)
+                    self.palavras[palavra] = self.palavras.get(palavra, 0) + 1
+        return novos
+
+    def adicionar_entradas(self, entradas: Iterable[Tuple[str, dict]]) -> int:
+        """
+        Incorpora as entradas do cache (chave, dict) ainda não vistas com nome confirmado
+
+        Returns:
+            Quantidade de nomes novos
+        """
+        nomes_novos = []
+        for chave, entrada in entradas:
+            chave = str(chave)
+            if chave in self.chaves_processadas or not entrada.get('sucesso') or not entrada.get('nome'):
+                continue
+            self.chaves_processadas.add(chave)
+            nomes_novos.append(entrada['nome'])
+        return self.adicionar_nomes(nomes_novos)
+
+    def atualizar(self, forcar: bool = False) -> bool:
+        """
+        Incorpora só as entradas novas do cache: do armazenamento, se houver
+        (no máximo uma leitura por intervalo_atualizacao), senão do
+        cache_oab.json (verifica o mtime do arquivo)
+
+        Returns:
+            True se o léxico mudou
+        """
+        try:
+            if self.armazenamento is not None:
+                agora = time.monotonic()
+                if (not forcar and self._ultima_leitura is not None
+                        and agora - self._ultima_leitura < self.intervalo_atualizacao):
+                    return False
+                self._ultima_leitura = agora
+                novos = self.adicionar_entradas(self.armazenamento.iterar())
+            else:
+                if not os.path.exists(self.arquivo_cache):
+                    return False
+
+                mtime = os.path.getmtime(self.arquivo_cache)
+                if not forcar and mtime <= self.mtime_cache:
+                    return False
+
+                with open(self.arquivo_cache, 'r', encoding='utf-8') as f:
+                    dados = json.load(f)
+
+                novos = self.adicionar_entradas(dados.get('cache', {}).items())
+                self.mtime_cache = mtime
+
+            self._salvar_estado()
+
+            if novos:
+                print(f"📖 Léxico OCR atualizado: +{novos} nomes ({len(self.palavras)} palavras)")
+            return novos > 0
+
+        except Exception as e:
+            print(f"⚠️ Erro ao atualizar léxico OCR: {e}")
+            return False
+
+    def config_tesseract(self) -> str:
+        """Parâmetro do Tesseract com o arquivo de user-words"""
+        if not os.path.exists(self.arquivo_palavras):
+            self._salvar_estado()
+        return f'--user-words {self.arquivo_palavras}'
+
+    # ===========================================
+    # CORREÇÃO PÓS-OCR
+    # ===========================================
+
+    def _reconstruir_indice(self):
+        """Recria o índice tamanho -> palavras"""
+        self._indice = {}
+        for palavra in self.palavras:
+            self._indice.setdefault(len(palavra), []).append(palavra)
+
+    def _candidatos(self, palavra: str) -> List[str]:
+        """Palavras do léxico com tamanho próximo (±1 letra)"""
+        candidatos = []
+        for tamanho in (len(palavra) - 1, len(palavra), len(palavra) + 1):
+            candidatos.extend(self._indice.get(tamanho, ()))
+        return candidatos
+
+    def corrigir_palavra(self, palavra: str) -> str:
+        """Troca a palavra pela mais parecida do léxico (se for parecida o bastante)"""
+        if palavra in self.palavras or palavra in CONECTIVOS_NOME or len(palavra) < 3:
+            return palavra
+
+        parecidas = difflib.get_close_matches(palavra, self._candidatos(palavra), n=3, cutoff=SIMILARIDADE_MINIMA)
+        if not parecidas:
+            return palavra
+
+        # Entre as parecidas, a mais frequente nos nomes resolvidos
+        return max(parecidas, key=lambda p: self.palavras.get(p, 0))
+
+    def segmentar(self, palavra: str) -> Optional[List[str]]:
+        """
+        Separa palavras coladas pelo OCR (ex.: MARIADASILVA -> MARIA DA SILVA)
+
+        Returns:
+            Lista de palavras ou None se não houver segmentação só com o léxico
+        """
+        n = len(palavra)
+        vocabulario = self.palavras.keys() | CONECTIVOS_NOME
+        # melhor[i] = segmentação de palavra[:i] com menos partes
+        melhor: List[Optional[List[str]]] = [None] * (n + 1)
+        melhor[0] = []
+
+        for fim in range(2, n + 1):
+            for inicio in range(max(0, fim - 20), fim - 1):
+                if melhor[inicio] is None:
+                    continue
+                trecho = palavra[inicio:fim]
+                if trecho in vocabulario:
+                    candidata = melhor[inicio] + [trecho]
+                    if melhor[fim] is None or len(candidata) < len(melhor[fim]):
+                        melhor[fim] = candidata
+
+        resultado = melhor[n]
+        return resultado if resultado and len(resultado) > 1 else None
+
+    def corrigir_nome(self, nome: str) -> str:
+        """
+        Corrige um nome vindo do OCR usando os nomes já resolvidos
+
+        Args:
+            nome: Nome extraído pelo scanner
+
+        Returns:
+            Nome corrigido (ou o original se o léxico não ajudar)
+        """
+        if not nome or not self.palavras:
+            return nome
+
+        nome_upper = ' '.join(nome.upper().split())
+        if nome_upper in self.nomes:
+            return nome_upper
+
+        # Só palavra a palavra: trocar o nome inteiro por um parecido já
+        # resolvido poderia gravar o nome de outro advogado (homônimos parciais)
+        palavras = []
+        for palavra in nome_upper.split():
+            if palavra not in self.palavras and len(palavra) >= 10:
+                partes = self.segmentar(palavra)
+                if partes:
+                    palavras.extend(partes)
+                    continue
+            palavras.append(self.corrigir_palavra(palavra))
+
+        return ' '.join(palavras)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memória compartilhada para imagens do OCR
+A imagem é decodificada uma única vez para um bloco de shared memory e os
+workers a leem pelo nome do bloco, sem pickle nem cópia de megabytes por
+pedido. O dono do bloco libera (close + unlink) assim que o OCR termina;
+um semáforo limita quantos blocos existem ao mesmo tempo
+"""
+
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from multiprocessing import shared_memory, resource_tracker
+from typing import Dict, Iterator, Optional
+
+from PIL import Image
+
+# Modos que o PIL mapeia direto sobre o buffer (Image.frombuffer sem cópia)
+MODOS_SEM_COPIA = ('L', 'RGBA')
+
+# Máximo de imagens publicadas simultaneamente (controle de memória)
+MAX_BUFFERS_PADRAO = 64
+
+
+@dataclass(frozen=True)
+class DescritorImagem:
+    """Referência leve (picklável) a uma imagem em memória compartilhada"""
+    nome: str
+    largura: int
+    altura: int
+    modo: str
+    # Bloco criado por outro processo (não compartilha o resource_tracker do leitor)
+    externo: bool = False
+
+
+class GerenciadorMemoriaImagens:
+    """Publica imagens em shared memory e controla o ciclo de vida dos blocos"""
+
+    def __init__(self, max_buffers: int = MAX_BUFFERS_PADRAO):
+        self.max_buffers = max_buffers
+        self._semaforo = threading.BoundedSemaphore(max_buffers)
+        self._blocos: Dict[str, shared_memory.SharedMemory] = {}
+        self._lock = threading.Lock()
+
+    def publicar(self, imagem: Image.Image, timeout: Optional[float] = None) -> Optional[DescritorImagem]:
+        """
+        Copia os pixels da imagem para um bloco novo de shared memory
+
+        Args:
+            imagem: Imagem já decodificada
+            timeout: Espera máxima por um bloco livre (None = sem limite)
+
+        Returns:
+            DescritorImagem ou None se não houve bloco livre a tempo
+        """
+        if imagem.mode not in MODOS_SEM_COPIA:
+            imagem = imagem.convert('RGBA')
+
+        if not self._semaforo.acquire(timeout=timeout):
+            print("⚠️ Limite de imagens em memória compartilhada atingido")
+            return None
+
+        try:
+            pixels = imagem.tobytes()
+            bloco = shared_memory.SharedMemory(create=True, size=max(1, len(pixels)))
+            bloco.buf[:len(pixels)] = pixels
+        except Exception:
+            self._semaforo.release()
+            raise
+
+        with self._lock:
+            self._blocos[bloco.name] = bloco
+
+        return DescritorImagem(bloco.name, imagem.width, imagem.height, imagem.mode)
+
+    def liberar(self, descritor: DescritorImagem):
+        """Libera o bloco (close + unlink) e devolve a vaga do semáforo"""
+        with self._lock:
+            bloco = self._blocos.pop(descritor.nome, None)
+        if bloco is None:
+            return
+
+        try:
+            bloco.close()
+            bloco.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Erro ao liberar memória compartilhada {descritor.nome}: {e}")
+        finally:
+            self._semaforo.release()
+
+    def liberar_todos(self):
+        """Libera todos os blocos ainda publicados (encerramento)"""
+        with self._lock:
+            nomes = list(self._blocos)
+        for nome in nomes:
+            self.liberar(DescritorImagem(nome, 0, 0, ''))
+
+    @contextmanager
+    def emprestar(self, imagem: Image.Image) -> Iterator[DescritorImagem]:
+        """Publica a imagem durante o bloco with e libera ao sair"""
+        descritor = self.publicar(imagem)
+        try:
+            yield descritor
+        finally:
+            if descritor is not None:
+                self.liberar(descritor)
+
+    @property
+    def em_uso(self) -> int:
+        """Quantidade de blocos publicados"""
+        with self._lock:
+            return len(self._blocos)
+
+
+def _anexar_bloco(descritor: DescritorImagem) -> shared_memory.SharedMemory:
+    """Abre um bloco existente sem assumir a posse dele"""
+    try:
+        return shared_memory.SharedMemory(name=descritor.nome, track=False)
+    except TypeError:
+        # Python < 3.13: abrir sempre registra no resource_tracker. Blocos do
+        # próprio servidor já estão registrados no mesmo tracker (registro
+        # repetido não tem efeito); blocos externos precisam sair do registro
+        # para o tracker não tentar apagá-los no encerramento
+        bloco = shared_memory.SharedMemory(name=descritor.nome)
+        if descritor.externo:
+            try:
+                resource_tracker.unregister(bloco._name, 'shared_memory')
+            except Exception:
+                pass
+        return bloco
+
+
+def marcar_externo(descritor: DescritorImagem) -> DescritorImagem:
+    """Marca um descritor recebido de outro processo (ex.: ClienteOCR)"""
+    return replace(descritor, externo=True)
+
+
+@contextmanager
+def abrir_imagem(descritor: DescritorImagem) -> Iterator[Image.Image]:
+    """
+    Lê a imagem direto do bloco compartilhado (sem cópia) dentro do worker
+
+    Importante: a imagem só é válida dentro do bloco with; quem precisar
+    guardá-la deve fazer imagem.copy()
+    """
+    bloco = _anexar_bloco(descritor)
+    imagem = None
+    try:
+        imagem = Image.frombuffer(descritor.modo, (descritor.largura, descritor.altura),
+                                  bloco.buf, 'raw', descritor.modo, 0, 1)
+        yield imagem
+    finally:
+        # Soltar a view do buffer antes de fechar o bloco
+        if imagem is not None:
+            imagem.close()
+        del imagem
+        bloco.close()
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Motor OCR - VERSÃO COM PARADA POR VALIDAÇÃO E FUSÃO DE CAMPOS
+Usa a validação de cada campo para decidir quando parar, em vez de rodar
+toda a cascata de configurações x variantes de imagem. Cada campo guarda o
+melhor valor visto entre as passadas, comparado pela confiança do Tesseract
+(image_to_data) nas palavras que formam o próprio campo
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, Tuple, Optional, Dict, Iterable
+
+from PIL import Image, ImageEnhance, ImageFilter
+import pytesseract
+
+from .scanner_ocr import CamposOCR, escanear_texto_ocr, limpar_texto_ocr, avaliar_qualidade_ocr, nome_valido
+from .lexico_ocr import LexicoOCR
+
+# DDDs válidos no Brasil (Anatel)
+DDDS_VALIDOS = frozenset({
+    11, 12, 13, 14, 15, 16, 17, 18, 19,
+    21, 22, 24, 27, 28,
+    31, 32, 33, 34, 35, 37, 38,
+    41, 42, 43, 44, 45, 46, 47, 48, 49,
+    51, 53, 54, 55,
+    61, 62, 63, 64, 65, 66, 67, 68, 69,
+    71, 73, 74, 75, 77, 79,
+    81, 82, 83, 84, 85, 86, 87, 88, 89,
+    91, 92, 93, 94, 95, 96, 97, 98, 99,
+})
+
+# Palavras para casar o valor de um campo com as palavras lidas pelo Tesseract
+_PALAVRA = re.compile(r'\w+')
+
+# Campos que precisam estar validados para encerrar o OCR (padrão)
+CAMPOS_REQUERIDOS_PADRAO = ('nome', 'inscricao')
+
+
+@dataclass
+class LeituraOCR:
+    """Resultado de uma passada do Tesseract sobre uma variante da imagem"""
+    texto: str = ""
+    confianca: float = 0.0
+    config: str = ""
+    variante: str = ""
+    score: int = 0
+    campos: CamposOCR = field(default_factory=CamposOCR)
+    validada: bool = False
+    # campo -> confiança média das palavras que formam o valor
+    confiancas_campos: Dict[str, float] = field(default_factory=dict)
+
+
+def telefone_valido(telefone: str) -> bool:
+    """
+    Valida telefone no formato "(DD) NNNN-NNNN" ou "(DD) NNNNN-NNNN"
+
+    Args:
+        telefone: Telefone formatado pelo scanner
+
+    Returns:
+        True se o DDD existe e o número tem tamanho compatível
+    """
+    digitos = ''.join(c for c in telefone if c.isdigit())
+    if len(digitos) not in (10, 11):
+        return False
+    if int(digitos[:2]) not in DDDS_VALIDOS:
+        return False
+    # Celular (9 dígitos) sempre começa com 9
+    return len(digitos) == 10 or digitos[2] == '9'
+
+
+def _telefones_validos(campos: CamposOCR) -> bool:
+    """Todos os telefones encontrados com DDD/tamanho válidos"""
+    return bool(campos.telefone) and all(telefone_valido(t) for t in campos.telefone.split(" | "))
+
+
+# Validação individual de cada campo do CamposOCR
+VALIDADORES_CAMPOS = {
+    'nome': lambda campos: nome_valido(campos.nome),
+    'inscricao': lambda campos: campos.inscricao_confirmada,
+    'telefone': _telefones_validos,
+    'endereco': lambda campos: bool(campos.endereco),
+    'situacao': lambda campos: bool(campos.situacao),
+    'email': lambda campos: bool(campos.email),
+    'data_inscricao': lambda campos: bool(campos.data_inscricao),
+    'tipo': lambda campos: bool(campos.tipo),
+}
+
+
+def campos_validados(campos: CamposOCR) -> bool:
+    """Campos suficientes para encerrar o OCR: inscrição confirmada, nome e telefones válidos"""
+    if not campos.inscricao_confirmada or not nome_valido(campos.nome):
+        return False
+    return not campos.telefone or _telefones_validos(campos)
+
+
+def confianca_valor(valor, confiancas_palavras: Dict[str, float]) -> float:
+    """
+    Confiança de um valor extraído a partir das palavras que o formam
+
+    Args:
+        valor: Valor do campo (nome, inscrição, telefones...)
+        confiancas_palavras: Palavra (maiúsculas) -> confiança do Tesseract
+
+    Returns:
+        Média das confianças (palavra que o Tesseract não leu conta como 0)
+    """
+    palavras = _PALAVRA.findall(str(valor or '').upper())
+    if not palavras:
+        return 0.0
+    return sum(confiancas_palavras.get(palavra, 0.0) for palavra in palavras) / len(palavras)
+
+
+def _chave_leitura(leitura: LeituraOCR) -> tuple:
+    """Ordenação das leituras inteiras: validada > confiança > score heurístico"""
+    return (leitura.validada, leitura.confianca, leitura.score)
+
+
+class FusaoCampos:
+    """
+    Guarda, para cada campo, o melhor valor validado entre todas as passadas
+    (maior confiança nas palavras do próprio campo), em vez de escolher um
+    único texto vencedor
+    """
+
+    def __init__(self):
+        # campo -> (confiança, valor)
+        self.melhores: Dict[str, Tuple[float, object]] = {}
+        # Melhor leitura inteira (fallback para campos nunca validados)
+        self.melhor_leitura: Optional[LeituraOCR] = None
+
+    def adicionar(self, leitura: LeituraOCR) -> list:
+        """
+        Incorpora uma leitura
+
+        Returns:
+            Lista dos campos que melhoraram com esta leitura
+        """
+        melhorados = []
+        for campo, validador in VALIDADORES_CAMPOS.items():
+            if not validador(leitura.campos):
+                continue
+            confianca = leitura.confiancas_campos.get(campo, 0.0)
+            atual = self.melhores.get(campo)
+            if atual is None or confianca > atual[0]:
+                self.melhores[campo] = (confianca, getattr(leitura.campos, campo))
+                melhorados.append(campo)
+
+        if self.melhor_leitura is None or _chave_leitura(leitura) > _chave_leitura(self.melhor_leitura):
+            self.melhor_leitura = leitura
+
+        return melhorados
+
+    def completa(self, campos_requeridos: Iterable[str]) -> bool:
+        """Todos os campos requeridos já têm um valor validado"""
+        return all(campo in self.melhores for campo in campos_requeridos)
+
+    def campos(self) -> CamposOCR:
+        """CamposOCR combinado: valores validados + restante da melhor leitura"""
+        base = self.melhor_leitura.campos if self.melhor_leitura else CamposOCR()
+        combinado = CamposOCR(**vars(base))
+
+        for campo, (_, valor) in self.melhores.items():
+            if campo == 'inscricao':
+                combinado.inscricao_confirmada = True
+            setattr(combinado, campo, valor)
+
+        return combinado
+
+
+def _redimensionar_2x(imagem: Image.Image) -> Image.Image:
+    """RGB com o dobro do tamanho"""
+    if imagem.mode != 'RGB':
+        imagem = imagem.convert('RGB')
+    largura, altura = imagem.size
+    return imagem.resize((largura * 2, altura * 2), Image.Resampling.LANCZOS)
+
+
+# Variantes na ordem de tentativa: (nome, variante de origem, transformação)
+ETAPAS_VARIANTES = (
+    # 1. Original redimensionada
+    ('resize_2x', None, _redimensionar_2x),
+    # 2. Escala de cinza
+    ('gray', 'resize_2x', lambda img: img.convert('L')),
+    # 3. Alto contraste
+    ('high_contrast', 'gray', lambda img: ImageEnhance.Contrast(img).enhance(2.0)),
+    # 4. Brightness ajustado
+    ('bright', 'gray', lambda img: ImageEnhance.Brightness(img).enhance(1.2)),
+    # 5. Sharpening
+    ('sharp', 'gray', lambda img: img.filter(ImageFilter.SHARPEN)),
+    # 6. Versão combinada
+    ('combined', 'high_contrast', lambda img: ImageEnhance.Brightness(img.filter(ImageFilter.SHARPEN)).enhance(1.1)),
+)
+
+
+def gerar_variantes(imagem: Image.Image) -> Iterator[Tuple[str, Image.Image]]:
+    """
+    Gera as variantes pré-processadas sob demanda (só calcula a próxima se
+    a anterior não bastou). Uma transformação que falha é pulada junto com
+    as que dependem dela; a original só é usada se nenhuma variante saiu
+
+    Args:
+        imagem: Imagem original da modal
+
+    Yields:
+        (nome_variante, imagem_processada)
+    """
+    prontas: Dict[str, Image.Image] = {}
+    for nome, origem, transformar in ETAPAS_VARIANTES:
+        base = imagem if origem is None else prontas.get(origem)
+        if base is None:
+            continue
+        try:
+            variante = transformar(base)
+        except Exception as e:
+            print(f"⚠️ Erro no pré-processamento ({nome}): {e}")
+            continue
+        prontas[nome] = variante
+        yield nome, variante
+
+    if not prontas:
+        yield 'original', imagem
+
+
+def ler_com_confianca(imagem: Image.Image, config: str = '') -> Tuple[str, float, Dict[str, float]]:
+    """
+    Executa o Tesseract com image_to_data e remonta o texto por linha
+
+    Args:
+        imagem: Imagem (já pré-processada)
+        config: Parâmetros do Tesseract
+
+    Returns:
+        (texto, confiança média das palavras reconhecidas,
+         palavra em maiúsculas -> maior confiança com que foi lida)
+    """
+    dados = pytesseract.image_to_data(imagem, config=config, output_type=pytesseract.Output.DICT)
+
+    linhas = {}
+    confiancas = []
+    confiancas_palavras: Dict[str, float] = {}
+    for i, palavra in enumerate(dados['text']):
+        palavra = (palavra or '').strip()
+        if not palavra:
+            continue
+
+        try:
+            conf = float(dados['conf'][i])
+        except (TypeError, ValueError):
+            conf = -1.0
+        if conf >= 0:
+            confiancas.append(conf)
+            for parte in _PALAVRA.findall(palavra.upper()):
+                confiancas_palavras[parte] = max(conf, confiancas_palavras.get(parte, 0.0))
+
+        chave = (dados['block_num'][i], dados['par_num'][i], dados['line_num'][i])
+        linhas.setdefault(chave, []).append(palavra)
+
+    texto = '\n'.join(' '.join(palavras) for _, palavras in sorted(linhas.items()))
+    confianca = sum(confiancas) / len(confiancas) if confiancas else 0.0
+    return texto, confianca, confiancas_palavras
+
+
+class MotorOCR:
+    """Executa o OCR da modal parando quando os campos requeridos estão validados"""
+
+    def __init__(self, idioma: str = 'eng', lexico: Optional[LexicoOCR] = None):
+        self.idioma = idioma
+        # Léxico de nomes resolvidos (user-words + correção do nome)
+        self.lexico = lexico
+
+    def configuracoes(self) -> list:
+        """Configurações do Tesseract na ordem de tentativa"""
+        configuracoes = [
+            f'--oem 3 --psm 6 -l {self.idioma}',
+            '--oem 3 --psm 4',
+            '--oem 3 --psm 11',
+            '--oem 3 --psm 12',
+            '--psm 6',
+            ''  # Configuração padrão
+        ]
+        if self.lexico:
+            palavras_usuario = self.lexico.config_tesseract()
+            configuracoes = [f'{config} {palavras_usuario}'.strip() for config in configuracoes]
+        return configuracoes
+
+    def ler(self, imagem: Image.Image, config: str, variante: str, inscricao: str = "") -> LeituraOCR:
+        """Uma passada do Tesseract, já com campos extraídos e validados"""
+        texto, confianca, confiancas_palavras = ler_com_confianca(imagem, config)
+        texto_limpo = limpar_texto_ocr(texto)
+        campos = escanear_texto_ocr(texto_limpo, inscricao)
+
+        # Confiança de cada campo pelas palavras lidas (antes da correção do léxico)
+        confiancas_campos = {campo: confianca_valor(getattr(campos, campo), confiancas_palavras)
+                             for campo in VALIDADORES_CAMPOS}
+
+        if self.lexico and campos.nome:
+            campos.nome = self.lexico.corrigir_nome(campos.nome)
+
+        return LeituraOCR(
+            texto=texto_limpo,
+            confianca=confianca,
+            config=config,
+            variante=variante,
+            score=avaliar_qualidade_ocr(texto_limpo),
+            campos=campos,
+            validada=campos_validados(campos),
+            confiancas_campos=confiancas_campos
+        )
+
+    def reconhecer(self, imagem: Image.Image, inscricao: str = "",
+                   campos_requeridos: Iterable[str] = CAMPOS_REQUERIDOS_PADRAO) -> LeituraOCR:
+        """
+        Aplica OCR fundindo os campos entre as passadas
+
+        Args:
+            imagem: Imagem original da modal
+            inscricao: Número pesquisado (confirma a leitura)
+            campos_requeridos: Campos que precisam estar validados para parar
+
+        Returns:
+            LeituraOCR com o texto da melhor passada e os campos combinados
+        """
+        campos_requeridos = tuple(campos_requeridos)
+        fusao = FusaoCampos()
+        passadas = 0
+
+        # Incorporar nomes novos do cache (só relê se o arquivo mudou)
+        if self.lexico:
+            self.lexico.atualizar()
+
+        # Variantes calculadas uma vez e reaproveitadas entre as configurações
+        variantes_prontas = []
+        gerador = gerar_variantes(imagem)
+
+        for config in self.configuracoes():
+            indice = 0
+            while True:
+                if indice < len(variantes_prontas):
+                    nome_variante, img_processada = variantes_prontas[indice]
+                else:
+                    proxima = next(gerador, None)
+                    if proxima is None:
+                        break
+                    variantes_prontas.append(proxima)
+                    nome_variante, img_processada = proxima
+                indice += 1
+
+                try:
+                    leitura = self.ler(img_processada, config, nome_variante, inscricao)
+                except Exception:
+                    continue
+                passadas += 1
+
+                melhorados = fusao.adicionar(leitura)
+                if melhorados:
+                    print(f"   ✅ Campos melhorados ({nome_variante}): " + ', '.join(
+                        f"{campo} {leitura.confiancas_campos.get(campo, 0.0):.0f}" for campo in melhorados))
+
+                if fusao.completa(campos_requeridos):
+                    print(f"⚡ OCR encerrado após {passadas} passada(s)")
+                    return self._resultado(fusao)
+
+        return self._resultado(fusao)
+
+    @staticmethod
+    def _resultado(fusao: FusaoCampos) -> LeituraOCR:
+        """Monta a leitura final a partir da fusão"""
+        if fusao.melhor_leitura is None:
+            return LeituraOCR()
+
+        melhor = fusao.melhor_leitura
+        campos = fusao.campos()
+        return LeituraOCR(
+            texto=melhor.texto,
+            confianca=melhor.confianca,
+            config=melhor.config,
+            variante=melhor.variante,
+            score=melhor.score,
+            campos=campos,
+            validada=campos_validados(campos),
+            confiancas_campos={campo: confianca for campo, (confianca, _) in fusao.melhores.items()}
+        )
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR da imagem de detalhes (RenderDetail) usado pelo DataExtractor
+Depois que a linha da consulta é confirmada, baixa a imagem de detalhes da
+inscrição e completa o resultado com telefone, endereço, situação etc.
+O reconhecimento vai para o servidor OCR compartilhado (ClienteOCR), se
+configurado, ou para o MotorOCR local; no modo adiado a imagem só vai para o
+spool (SpoolOCR) e o OCR roda depois em lote
+"""
+
+import re
+import html
+import time
+import dataclasses
+from io import BytesIO
+from typing import Iterable, Optional
+
+import requests
+from PIL import Image
+from selenium.webdriver.common.by import By
+
+from ..models.resultado_oab import ResultadoOAB
+from .scanner_ocr import aplicar_campos_ocr
+from .motor_ocr import MotorOCR, LeituraOCR, CAMPOS_REQUERIDOS_PADRAO
+from .servico_ocr import ClienteOCR
+from .ocr_lote import SpoolOCR
+from .lexico_ocr import LexicoOCR
+
+URL_SITE = "https://cna.oab.org.br"
+
+# URL da imagem de detalhes (RenderDetail) dentro de JSON/HTML
+PADRAO_URL_RENDER_DETAIL = re.compile(r'["\'(]?((?:https?://cna\.oab\.org\.br)?/[^"\'()\s<>]*RenderDetail[^"\'()\s<>]*)', re.IGNORECASE)
+
+# URL de detalhes exposta pela linha de resultado (onclick, data-*, href)
+PADRAO_URL_DETALHE_LINHA = re.compile(r'["\'(]\s*((?:https?://cna\.oab\.org\.br)?/[^"\'()\s<>]*Detail[^"\'()\s<>]*)', re.IGNORECASE)
+
+# Imagem exibida na modal de detalhes (quando a linha não expõe a URL)
+SELETORES_IMAGEM_MODAL = "#imgDetail, img[src*='RenderDetail']"
+
+
+class OCRDetalhes:
+    """Busca a imagem de detalhes da linha confirmada e aplica o OCR"""
+
+    def __init__(self, cliente_ocr: Optional[ClienteOCR] = None, idioma: str = 'por',
+                 campos_requeridos: Iterable[str] = CAMPOS_REQUERIDOS_PADRAO,
+                 spool: Optional[SpoolOCR] = None, lexico: Optional[LexicoOCR] = None):
+        """
+        Args:
+            cliente_ocr: Cliente do servidor OCR compartilhado (None = OCR local)
+            idioma: Idioma do Tesseract no OCR local
+            campos_requeridos: Campos que precisam estar validados para parar a cascata
+            spool: Spool do OCR adiado (None = OCR na hora)
+            lexico: Léxico de nomes resolvidos do OCR local (user-words +
+                correção do nome)
+        """
+        self.cliente_ocr = cliente_ocr
+        self.spool = spool
+        self.campos_requeridos = tuple(campos_requeridos)
+        self.motor_ocr = MotorOCR(idioma=idioma, lexico=lexico)
+        # A última imagem veio da modal (o DataExtractor precisa fechá-la)
+        self.modal_aberta = False
+
+        self.sessao = requests.Session()
+        self.sessao.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Referer': URL_SITE + '/',
+            'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8'
+        })
+
+    def completar(self, driver, elemento, resultado: ResultadoOAB) -> ResultadoOAB:
+        """
+        Completa o resultado com os campos da imagem de detalhes
+
+        Args:
+            driver: WebDriver da consulta (cookies e modal)
+            elemento: Linha de resultado que corresponde à consulta
+            resultado: Resultado já preenchido com os dados da linha
+
+        Returns:
+            O próprio resultado (sem alteração se a imagem não foi obtida ou
+            foi para o spool)
+        """
+        try:
+            imagem = self.obter_imagem(driver, elemento)
+            if imagem is None:
+                print("⚠️ Imagem de detalhes não obtida, mantidos os dados da linha")
+                return resultado
+
+            if self.spool:
+                self.spool.adicionar(imagem, resultado)
+                return resultado
+
+            leitura = self.reconhecer(imagem, resultado.inscricao)
+            if not leitura.texto:
+                print("❌ OCR não conseguiu extrair texto da imagem de detalhes")
+                return resultado
+
+            # O nome da linha de resultado vale mais que o lido por OCR
+            return aplicar_campos_ocr(dataclasses.replace(leitura.campos, nome=""), resultado)
+
+        except Exception as e:
+            print(f"⚠️ Erro no OCR da imagem de detalhes: {e}")
+            return resultado
+
+    def reconhecer(self, imagem: Image.Image, inscricao: str = "") -> LeituraOCR:
+        """OCR no servidor compartilhado, ou local se ele não estiver configurado/respondendo"""
+        leitura = None
+        if self.cliente_ocr:
+            print("🔍 Enviando imagem ao servidor OCR...")
+            leitura = self.cliente_ocr.reconhecer(imagem, inscricao, self.campos_requeridos)
+
+        if leitura is None:
+            print("🔍 Aplicando OCR local...")
+            leitura = self.motor_ocr.reconhecer(imagem, inscricao, self.campos_requeridos)
+        return leitura
+
+    # ===========================================
+    # IMAGEM DE DETALHES
+    # ===========================================
+
+    def obter_imagem(self, driver, elemento) -> Optional[Image.Image]:
+        """Imagem pela URL exposta na linha; se ela não existir, pela modal de detalhes"""
+        self.sessao.cookies.update({cookie['name']: cookie['value'] for cookie in driver.get_cookies()})
+        self.modal_aberta = False
+
+        url = self._url_da_linha(elemento)
+        if url:
+            print(f"📥 Imagem de detalhes derivada da linha: {url}")
+            return self._baixar(url)
+
+        self.modal_aberta = True
+        url = self._url_da_modal(driver, elemento)
+        if url:
+            print(f"📥 Imagem de detalhes da modal: {url}")
+            return self._baixar(url)
+        return None
+
+    @staticmethod
+    def _url_da_linha(elemento) -> str:
+        """URL de detalhes nos atributos onclick/data-*/href da linha ("" se não houver)"""
+        try:
+            match = PADRAO_URL_DETALHE_LINHA.search(html.unescape(elemento.get_attribute('outerHTML') or ''))
+            return match.group(1) if match else ""
+        except Exception:
+            return ""
+
+    @staticmethod
+    def _url_da_modal(driver, elemento) -> str:
+        """Abre a modal de detalhes da linha e lê o src da imagem"""
+        try:
+            driver.execute_script("arguments[0].scrollIntoView(); arguments[0].click();", elemento)
+            limite = time.time() + 10
+            while time.time() < limite:
+                for imagem in driver.find_elements(By.CSS_SELECTOR, SELETORES_IMAGEM_MODAL):
+                    src = imagem.get_attribute('src')
+                    if src:
+                        return src
+                time.sleep(0.5)
+        except Exception as e:
+            print(f"⚠️ Modal de detalhes não abriu: {e}")
+        return ""
+
+    def _baixar(self, url: str, seguir_indirecao: bool = True) -> Optional[Image.Image]:
+        """
+        Baixa a imagem (aceita a URL de detalhe que devolve o caminho da RenderDetail)
+
+        Args:
+            url: URL da imagem ou do endpoint de detalhe
+            seguir_indirecao: Segue o caminho devolvido pelo endpoint (uma vez só)
+        """
+        try:
+            if url.startswith('/'):
+                url = URL_SITE + url
+
+            response = self.sessao.get(url, timeout=30)
+            response.raise_for_status()
+
+            if not response.headers.get('Content-Type', '').startswith('image/'):
+                match = PADRAO_URL_RENDER_DETAIL.search(response.text.replace('\\/', '/'))
+                if not match or not seguir_indirecao:
+                    return None
+                return self._baixar(html.unescape(match.group(1)), seguir_indirecao=False)
+
+            imagem = Image.open(BytesIO(response.content))
+            imagem.load()
+            return imagem
+
+        except Exception as e:
+            print(f"❌ Erro ao baixar imagem de detalhes: {e}")
+            return None
+
+    def fechar(self):
+        """Fecha a sessão HTTP e a conexão com o servidor OCR"""
+        self.sessao.close()
+        if self.cliente_ocr:
+            self.cliente_ocr.fechar()
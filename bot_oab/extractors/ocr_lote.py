@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OCR adiado em lote
+Durante a consulta as imagens de detalhes são só gravadas em um spool
+(Config.OCR_ADIADO); depois (ex.: enriquecimento noturno) uma única execução
+do Tesseract reconhece a lista inteira de imagens, amortizando a
+inicialização do processo e o carregamento do modelo, e os campos são
+gravados de volta nos ResultadoOAB (o integrador leva os nomes ao cache e ao
+Supabase)
+"""
+
+import os
+import csv
+import json
+import subprocess
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+import pytesseract
+
+from ..models.resultado_oab import ResultadoOAB
+from .scanner_ocr import escanear_texto_ocr, limpar_texto_ocr, aplicar_campos_ocr
+from .motor_ocr import MotorOCR, gerar_variantes, campos_validados
+from .lexico_ocr import LexicoOCR
+
+PASTA_SPOOL_PADRAO = "ocr_adiado"
+ARQUIVO_REGISTROS = "registros.jsonl"
+
+
+class SpoolOCR:
+    """Fila em disco de imagens aguardando o OCR em lote"""
+
+    def __init__(self, pasta: str = PASTA_SPOOL_PADRAO):
+        self.pasta = pasta
+        self.pasta_imagens = os.path.join(pasta, "imagens")
+        self.arquivo_registros = os.path.join(pasta, ARQUIVO_REGISTROS)
+
+        if not os.path.exists(self.pasta_imagens):
+            os.makedirs(self.pasta_imagens)
+            print(f"📁 Pasta de OCR adiado criada: {self.pasta}")
+
+    def adicionar(self, imagem: Image.Image, resultado: ResultadoOAB) -> str:
+        """
+        Grava a imagem original e o resultado atual (o pré-processamento é
+        feito uma única vez, na hora do lote ou da cascata)
+
+        Args:
+            imagem: Imagem original da modal
+            resultado: Resultado da consulta (sem os campos do OCR)
+
+        Returns:
+            Caminho da imagem gravada
+        """
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        caminho = os.path.join(self.pasta_imagens, f"OAB_{resultado.inscricao}_{resultado.estado}_{timestamp}.png")
+
+        imagem.save(caminho, format='PNG')
+
+        registro = {'imagem': caminho, 'processado': False, 'resultado': asdict(resultado)}
+        with open(self.arquivo_registros, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+        print(f"📥 Imagem enviada para OCR adiado: {os.path.basename(caminho)}")
+        return caminho
+
+    def carregar_registros(self) -> List[dict]:
+        """Lê todos os registros do spool"""
+        if not os.path.exists(self.arquivo_registros):
+            return []
+
+        registros = []
+        with open(self.arquivo_registros, 'r', encoding='utf-8') as f:
+            for linha in f:
+                linha = linha.strip()
+                if not linha:
+                    continue
+                try:
+                    registros.append(json.loads(linha))
+                except json.JSONDecodeError as e:
+                    print(f"⚠️ Registro inválido ignorado no spool: {e}")
+        return registros
+
+    def gravar_registros(self, registros: List[dict]):
+        """Regrava o spool (troca atômica do arquivo)"""
+        temporario = self.arquivo_registros + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            for registro in registros:
+                f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        os.replace(temporario, self.arquivo_registros)
+
+    def pendentes(self) -> List[dict]:
+        """Registros ainda sem OCR"""
+        return [r for r in self.carregar_registros() if not r.get('processado')]
+
+
+def preparar_imagens_lote(imagens: List[str], pasta_trabalho: str) -> Dict[int, str]:
+    """
+    Gera a variante da primeira passada de cada imagem do spool, ignorando
+    as que não existem ou não abrem
+
+    Args:
+        imagens: Caminhos das imagens originais do spool
+        pasta_trabalho: Onde gravar as imagens preparadas
+
+    Returns:
+        {índice da imagem original: caminho da imagem preparada}
+    """
+    pasta_lote = os.path.join(pasta_trabalho, "lote")
+    os.makedirs(pasta_lote, exist_ok=True)
+
+    preparadas = {}
+    for indice, caminho in enumerate(imagens):
+        try:
+            with Image.open(caminho) as imagem:
+                _, imagem_processada = next(gerar_variantes(imagem))
+        except Exception as e:
+            print(f"⚠️ Imagem ignorada no lote ({caminho}): {e}")
+            continue
+
+        caminho_preparado = os.path.join(pasta_lote, f"{indice}.png")
+        imagem_processada.save(caminho_preparado)
+        preparadas[indice] = caminho_preparado
+
+    return preparadas
+
+
+def executar_tesseract_lote(imagens: List[str], pasta_trabalho: str,
+                            config: str = '--oem 3 --psm 6', idioma: str = 'por') -> Dict[int, Tuple[str, float]]:
+    """
+    Reconhece todas as imagens em UMA execução do Tesseract (arquivo de lista + saída TSV)
+
+    Args:
+        imagens: Caminhos das imagens (a ordem define o page_num do TSV)
+        pasta_trabalho: Onde gravar a lista e a saída
+        config: Parâmetros do Tesseract
+        idioma: Idioma do Tesseract
+
+    Returns:
+        {índice da imagem: (texto, confiança média)}
+    """
+    arquivo_lista = os.path.join(pasta_trabalho, "lista_imagens.txt")
+    base_saida = os.path.join(pasta_trabalho, "saida_lote")
+
+    with open(arquivo_lista, 'w', encoding='utf-8') as f:
+        f.write("\n".join(os.path.abspath(imagem) for imagem in imagens) + "\n")
+
+    comando = [pytesseract.pytesseract.tesseract_cmd, arquivo_lista, base_saida, '-l', idioma]
+    comando += config.split() + ['tsv']
+
+    print(f"⚙️ Executando Tesseract em lote: {len(imagens)} imagens")
+    subprocess.run(comando, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+    # page_num (1..N) identifica a imagem da lista
+    linhas_por_pagina: Dict[int, Dict[tuple, List[str]]] = {}
+    confiancas_por_pagina: Dict[int, List[float]] = {}
+
+    with open(base_saida + ".tsv", 'r', encoding='utf-8') as f:
+        leitor = csv.DictReader(f, delimiter='\t', quoting=csv.QUOTE_NONE)
+        for linha in leitor:
+            palavra = (linha.get('text') or '').strip()
+            if linha.get('level') != '5' or not palavra:
+                continue
+
+            pagina = int(linha['page_num']) - 1
+            chave = (int(linha['block_num']), int(linha['par_num']), int(linha['line_num']))
+            linhas_por_pagina.setdefault(pagina, {}).setdefault(chave, []).append(palavra)
+
+            try:
+                conf = float(linha['conf'])
+            except (TypeError, ValueError):
+                conf = -1.0
+            if conf >= 0:
+                confiancas_por_pagina.setdefault(pagina, []).append(conf)
+
+    textos = {}
+    for pagina, linhas in linhas_por_pagina.items():
+        texto = '\n'.join(' '.join(palavras) for _, palavras in sorted(linhas.items()))
+        confiancas = confiancas_por_pagina.get(pagina, [])
+        textos[pagina] = (texto, sum(confiancas) / len(confiancas) if confiancas else 0.0)
+
+    return textos
+
+
+def processar_spool(spool: SpoolOCR, idioma: str = 'por', fallback_individual: bool = True,
+                    remover_imagens: bool = True, lexico: Optional[LexicoOCR] = None) -> List[ResultadoOAB]:
+    """
+    Executa o OCR adiado de todos os pendentes e grava os campos de volta nos registros
+
+    Args:
+        spool: Spool com as imagens pendentes
+        idioma: Idioma do Tesseract
+        fallback_individual: Reprocessa com o MotorOCR (cascata) as leituras não validadas
+        remover_imagens: Apaga as imagens já processadas
+        lexico: Léxico de nomes resolvidos (user-words + correção do nome)
+
+    Returns:
+        Lista de ResultadoOAB atualizados
+    """
+    registros = spool.carregar_registros()
+    indices_pendentes = [i for i, r in enumerate(registros) if not r.get('processado')]
+
+    if not indices_pendentes:
+        print("📭 Nenhuma imagem pendente de OCR")
+        return []
+
+    imagens = [registros[i]['imagem'] for i in indices_pendentes]
+    config = '--oem 3 --psm 6'
+    if lexico:
+        lexico.atualizar()
+        config += ' ' + lexico.config_tesseract()
+
+    preparadas = preparar_imagens_lote(imagens, spool.pasta)
+    try:
+        ordem = sorted(preparadas)
+        textos_lote = executar_tesseract_lote([preparadas[i] for i in ordem], spool.pasta,
+                                              config=config, idioma=idioma) if ordem else {}
+        # page_num do TSV -> posição entre os pendentes
+        textos = {ordem[pagina]: texto for pagina, texto in textos_lote.items()}
+    except Exception as e:
+        print(f"❌ Erro no Tesseract em lote: {e}")
+        return []
+    finally:
+        for caminho in preparadas.values():
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+
+    motor = MotorOCR(idioma=idioma, lexico=lexico) if fallback_individual else None
+    resultados = []
+    validados = 0
+
+    for posicao, indice in enumerate(indices_pendentes):
+        registro = registros[indice]
+        if posicao not in preparadas:
+            # Imagem ausente/ilegível: sai da fila para não travar os próximos lotes
+            registro['processado'] = True
+            registro['erro'] = "Imagem ausente ou ilegível"
+            continue
+
+        resultado = ResultadoOAB(**registro['resultado'])
+
+        texto, _ = textos.get(posicao, ("", 0.0))
+        campos = escanear_texto_ocr(limpar_texto_ocr(texto), resultado.inscricao)
+        if lexico and campos.nome:
+            campos.nome = lexico.corrigir_nome(campos.nome)
+
+        if not campos_validados(campos) and motor:
+            try:
+                print(f"🔁 Leitura fraca para {resultado.inscricao}/{resultado.estado}, usando cascata")
+                with Image.open(registro['imagem']) as imagem:
+                    campos = motor.reconhecer(imagem, resultado.inscricao).campos
+            except Exception as e:
+                print(f"⚠️ Erro no OCR individual: {e}")
+
+        if campos_validados(campos):
+            validados += 1
+
+        resultado = aplicar_campos_ocr(campos, resultado)
+        registro['resultado'] = asdict(resultado)
+        registro['processado'] = True
+        resultados.append(resultado)
+
+        if remover_imagens:
+            try:
+                os.remove(registro['imagem'])
+            except OSError:
+                pass
+
+    spool.gravar_registros(registros)
+    ignoradas = len(indices_pendentes) - len(preparadas)
+    print(f"✅ OCR adiado concluído: {len(resultados)} imagens, {validados} leituras validadas"
+          + (f", {ignoradas} ignoradas" if ignoradas else ""))
+    return resultados
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scanner de campos OCR - VERSÃO EM PASSAGEM ÚNICA
+Todos os padrões são compilados uma única vez (no import do módulo) e o texto
+da modal é percorrido uma só vez para preencher todos os campos do ResultadoOAB
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List
+
+from ..models.resultado_oab import ResultadoOAB
+
+# Classes de caracteres usadas nos padrões de nome
+MAIUSCULAS = 'A-ZÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ'
+MINUSCULAS = 'a-záéíóúàèìòùâêîôûãõçñ'
+
+# Palavras da modal que encerram um candidato a nome (rótulos e tipos)
+_ROTULOS_MODAL = r'(?i:inscri|seccional|subse|telefone|endere|situa|regular|advogad|estagi|profissional|nome\b)'
+
+# Palavras que invalidam um nome
+PALAVRAS_INVALIDAS_NOME = ('INSCRICAO', 'SECCIONAL', 'TELEFONE', 'ENDERECO')
+
+# Palavras-chave usadas na avaliação de qualidade do OCR
+PALAVRAS_IMPORTANTES_OCR = ('ADVOGAD', 'INSCRI', 'SECCIONAL', 'SITUA', 'REGULAR',
+                            'ENDERECO', 'TELEFONE', 'PROFISSIONAL')
+
+# ===========================================
+# PADRÕES COMPILADOS
+# ===========================================
+
+# Limpeza: caracteres fora do conjunto permitido e espaços/tabs viram um único
+# espaço; as quebras de linha são preservadas (nome e endereço dependem delas)
+_RE_SEPARADORES = re.compile(r'[^\w\n:()\[\]./]+')
+
+# Espaços nas bordas das linhas e linhas vazias
+_RE_QUEBRAS = re.compile(r' *\n[ \n]*')
+
+# Avaliação: caracteres estranhos, números de inscrição
+_RE_CARACTERES_ESTRANHOS = re.compile(r'[^\w\s:()\[\]./]')
+_RE_NUMERO_LONGO = re.compile(r'\d{3,}')
+
+# Limpeza de telefones que sobram dentro do endereço
+_RE_TELEFONE_ROTULADO = re.compile(r'Telefone[:\s]*\([0-9\s\)\(-]+', re.IGNORECASE)
+_RE_TELEFONE_SIMPLES = re.compile(r'\(\d{2}\)\s*\d{4,5}[-\s]?\d{4}')
+
+# Tokenizador: uma alternativa por tipo de campo, testadas na ordem abaixo
+_PADRAO_TOKENS = re.compile(rf"""
+    (?P<email>[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{{2,}})
+  | (?P<telefone>\((?P<ddd>\d{{2}})\)\s*(?P<prefixo>\d{{4,5}})[-\s]?(?P<sufixo>\d{{4}}))
+  | (?P<data>\d{{1,2}}[/-]\d{{1,2}}[/-]\d{{4}})
+  | (?i:inscri[cç][aã]o|n[uú]mero)[:\s]*(?P<inscricao>\d{{4,8}})(?!\d)
+  | (?i:endere[cç]o(?:\s*profissional)?)[:\s]*(?P<endereco>[^\n]*?)(?=(?i:telefone)|\n|\Z)
+  | (?P<logradouro>(?i:rua|avenida)\s+[^,\n]+(?:,\s*N[°º]?\s*\d+)?[^,\n]*)
+  | (?i:situa[cç][aã]o)[:\s]*(?P<situacao>[A-Za-zÇçÃã][A-Za-zÇçÃã ]{{2,29}})
+  | (?P<regular>(?i:regular))
+  | (?P<ativo>(?i:ativ[oa]|licenciad[oa]))
+  | (?P<tipo>(?i:advogad[oa]|estagi[aá]ri[oa]))
+  | (?i:nome\b)[:\s]*(?P<nome_rotulado>[{MAIUSCULAS}][{MAIUSCULAS}{MINUSCULAS} ]{{5,60}})
+  | (?<![^\n])(?P<nome_linha>(?!{_ROTULOS_MODAL})[{MAIUSCULAS}][{MAIUSCULAS}{MINUSCULAS}]+(?:[ ]+(?!{_ROTULOS_MODAL})[{MAIUSCULAS}{MINUSCULAS}]+)+)
+  | (?P<nome>(?!{_ROTULOS_MODAL})[{MAIUSCULAS}]{{2,}}(?:[ ]+(?!{_ROTULOS_MODAL})[{MAIUSCULAS}]{{2,}})+)
+  | (?P<telefone_solto>(?P<ddd_solto>\d{{2}})\s+(?P<prefixo_solto>\d{{4,5}})[-\s]?(?P<sufixo_solto>\d{{4}}))
+  | (?P<numero>\d+)
+""", re.VERBOSE)
+
+# Só os nomes das primeiras linhas são considerados (cabeçalho da modal)
+MAX_LINHAS_NOME = 5
+
+# Ordem de preferência dos candidatos a nome dentro de uma mesma linha
+# (início de linha > rótulo "Nome:" > sequência de palavras em maiúsculas)
+_PRIORIDADE_NOME = {'nome_linha': 0, 'nome_rotulado': 1, 'nome': 2}
+
+
+@dataclass
+class CamposOCR:
+    """Campos extraídos do texto OCR da modal"""
+    nome: str = ""
+    inscricao: str = ""
+    telefone: str = ""
+    endereco: str = ""
+    situacao: str = ""
+    email: str = ""
+    data_inscricao: str = ""
+    tipo: str = ""
+    inscricao_confirmada: bool = False
+
+
+def limpar_texto_ocr(texto: str) -> str:
+    """Limpa texto extraído do OCR mantendo uma linha por linha da modal"""
+    if not texto:
+        return ""
+
+    texto_limpo = _RE_QUEBRAS.sub('\n', _RE_SEPARADORES.sub(' ', texto)).strip()
+    return texto_limpo if len(texto_limpo) > 1 else ""
+
+
+def avaliar_qualidade_ocr(texto: str) -> int:
+    """Avalia qualidade do texto extraído (0-100)"""
+    if not texto or len(texto) < 10:
+        return 0
+
+    score = 0
+
+    # Pontos por comprimento
+    if len(texto) >= 50:
+        score += 20
+    elif len(texto) >= 30:
+        score += 10
+
+    # Pontos por palavras-chave
+    texto_upper = texto.upper()
+    score += 8 * sum(1 for palavra in PALAVRAS_IMPORTANTES_OCR if palavra in texto_upper)
+
+    # Pontos por números (inscrição)
+    if _RE_NUMERO_LONGO.search(texto):
+        score += 15
+
+    # Pontos por estrutura
+    if sum(1 for linha in texto.split('\n') if linha.strip()) >= 5:
+        score += 10
+
+    # Penalizar caracteres estranhos
+    if len(_RE_CARACTERES_ESTRANHOS.findall(texto)) > len(texto) * 0.1:
+        score -= 20
+
+    return min(100, max(0, score))
+
+
+def nome_valido(nome: str) -> bool:
+    """Valida candidato a nome extraído do OCR"""
+    return (8 <= len(nome) <= 60 and
+            ' ' in nome and
+            len(nome.split()) >= 2 and
+            not any(palavra in nome.upper() for palavra in PALAVRAS_INVALIDAS_NOME) and
+            all(char.isalpha() or char.isspace() for char in nome))
+
+
+def _normalizar_numero(numero: str) -> str:
+    """Remove zeros à esquerda para comparar inscrições"""
+    return numero.strip().lstrip('0') or "0"
+
+
+def _limpar_endereco(endereco: str) -> str:
+    """Remove telefones que ficaram grudados no endereço"""
+    endereco = _RE_TELEFONE_ROTULADO.sub('', endereco)
+    endereco = _RE_TELEFONE_SIMPLES.sub('', endereco)
+    return endereco.strip()
+
+
+def escanear_texto_ocr(texto_ocr: str, inscricao_original: str = "") -> CamposOCR:
+    """
+    Percorre o texto OCR uma única vez e extrai todos os campos
+
+    Args:
+        texto_ocr: Texto extraído (já limpo) da imagem da modal
+        inscricao_original: Número pesquisado (usado para confirmar a inscrição)
+
+    Returns:
+        CamposOCR com os campos encontrados
+    """
+    campos = CamposOCR()
+    if not texto_ocr:
+        campos.inscricao = inscricao_original
+        return campos
+
+    # Candidatos a nome: (linha, prioridade, valor)
+    candidatos_nome = []
+    telefones: List[str] = []
+    telefones_soltos: List[str] = []
+    endereco_rotulado = ""
+    logradouro = ""
+    situacao_rotulada = ""
+    regular = False
+    ativo = ""
+    inscricao_rotulada = ""
+    inscricao_confirmada = False
+    inscricao_busca = _normalizar_numero(inscricao_original) if inscricao_original else ""
+
+    linha_atual = 0
+    posicao_linha = 0
+
+    for match in _PADRAO_TOKENS.finditer(texto_ocr):
+        tipo_token = match.lastgroup
+        inicio = match.start()
+
+        if tipo_token in _PRIORIDADE_NOME:
+            linha_atual += texto_ocr.count('\n', posicao_linha, inicio)
+            posicao_linha = inicio
+            if linha_atual >= MAX_LINHAS_NOME:
+                continue
+
+            prioridade = _PRIORIDADE_NOME[tipo_token]
+            candidatos_nome.append((linha_atual, prioridade, match.group(tipo_token).strip()))
+
+        elif tipo_token == 'telefone':
+            telefone = f"({match.group('ddd')}) {match.group('prefixo')}-{match.group('sufixo')}"
+            if telefone not in telefones:
+                telefones.append(telefone)
+
+        elif tipo_token == 'telefone_solto':
+            telefone = f"({match.group('ddd_solto')}) {match.group('prefixo_solto')}-{match.group('sufixo_solto')}"
+            if telefone not in telefones_soltos:
+                telefones_soltos.append(telefone)
+
+        elif tipo_token == 'inscricao':
+            if not inscricao_rotulada:
+                inscricao_rotulada = match.group('inscricao')
+
+        elif tipo_token == 'numero':
+            if inscricao_busca and not inscricao_confirmada:
+                inscricao_confirmada = _normalizar_numero(match.group('numero')) == inscricao_busca
+
+        elif tipo_token == 'endereco':
+            if not endereco_rotulado:
+                endereco_rotulado = match.group('endereco').strip()
+
+        elif tipo_token == 'logradouro':
+            if not logradouro:
+                logradouro = match.group('logradouro').strip()
+
+        elif tipo_token == 'situacao':
+            valor = match.group('situacao').strip().upper()
+            if 'REGULAR' in valor:
+                regular = True
+            elif not situacao_rotulada:
+                situacao_rotulada = valor
+
+        elif tipo_token == 'regular':
+            regular = True
+
+        elif tipo_token == 'ativo':
+            if not ativo:
+                ativo = match.group('ativo').upper()
+
+        elif tipo_token == 'tipo':
+            if not campos.tipo:
+                campos.tipo = match.group('tipo').upper()
+
+        elif tipo_token == 'email':
+            if not campos.email:
+                email = match.group('email').strip().lower()
+                if 5 <= len(email) <= 100:
+                    campos.email = email
+
+        elif tipo_token == 'data':
+            if not campos.data_inscricao:
+                campos.data_inscricao = match.group('data')
+
+    # Nome: primeira linha válida, respeitando a prioridade dos padrões
+    for _, _, nome in sorted(candidatos_nome, key=lambda c: (c[0], c[1])):
+        if nome_valido(nome):
+            campos.nome = nome
+            break
+
+    # Inscrição: rótulo explícito > número pesquisado presente no texto > original
+    if inscricao_rotulada:
+        campos.inscricao = inscricao_rotulada
+        inscricao_confirmada = inscricao_confirmada or _normalizar_numero(inscricao_rotulada) == inscricao_busca
+    else:
+        campos.inscricao = inscricao_original
+    campos.inscricao_confirmada = bool(inscricao_busca) and inscricao_confirmada
+
+    # Telefones: formatados com parênteses primeiro, depois os soltos
+    for telefone in telefones_soltos:
+        if telefone not in telefones:
+            telefones.append(telefone)
+    campos.telefone = " | ".join(telefones)
+
+    # Endereço: rótulo explícito > logradouro (RUA/AVENIDA)
+    for endereco in (endereco_rotulado, logradouro):
+        if endereco:
+            endereco = _limpar_endereco(endereco)
+            if 10 <= len(endereco) <= 200:
+                campos.endereco = endereco
+                break
+
+    # Situação
+    if regular:
+        campos.situacao = 'SITUAÇÃO REGULAR'
+    elif situacao_rotulada and 4 <= len(situacao_rotulada) <= 30:
+        campos.situacao = 'ATIVO' if situacao_rotulada in ('ATIVO', 'ATIVA') else situacao_rotulada
+    elif ativo:
+        campos.situacao = 'ATIVO' if ativo in ('ATIVO', 'ATIVA') else ativo
+
+    return campos
+
+
+def aplicar_campos_ocr(campos: CamposOCR, resultado: ResultadoOAB) -> ResultadoOAB:
+    """
+    Copia os campos extraídos do OCR para o ResultadoOAB
+
+    Args:
+        campos: Campos do scanner/motor OCR
+        resultado: Resultado da consulta (nome só é trocado por um mais longo)
+
+    Returns:
+        O próprio resultado atualizado
+    """
+    try:
+        # Nome completo
+        if campos.nome and len(campos.nome) > len(resultado.nome or ''):
+            resultado.nome = campos.nome
+            print(f"✅ Nome atualizado: {resultado.nome}")
+
+        # Inscrição
+        if campos.inscricao:
+            resultado.numero_carteira = campos.inscricao
+            print(f"✅ Número carteira: {resultado.numero_carteira}")
+
+        # Telefones
+        if campos.telefone:
+            resultado.telefone = campos.telefone
+            print(f"✅ Telefones: {resultado.telefone}")
+
+        # Endereço
+        if campos.endereco:
+            resultado.endereco = campos.endereco
+            print(f"✅ Endereço: {resultado.endereco}")
+
+        # Situação
+        if campos.situacao:
+            resultado.situacao = campos.situacao
+            print(f"✅ Situação: {resultado.situacao}")
+
+        # Email
+        if campos.email:
+            resultado.email = campos.email
+            print(f"✅ Email: {resultado.email}")
+
+        # Data de inscrição
+        if campos.data_inscricao:
+            resultado.data_inscricao = campos.data_inscricao
+            print(f"✅ Data inscrição: {resultado.data_inscricao}")
+
+        # Tipo (só quando a busca não trouxe)
+        if campos.tipo and not resultado.tipo:
+            resultado.tipo = campos.tipo
+            print(f"✅ Tipo: {resultado.tipo}")
+
+        return resultado
+
+    except Exception as e:
+        print(f"❌ Erro ao aplicar campos do OCR: {e}")
+        return resultado
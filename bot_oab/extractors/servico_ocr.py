@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serviço OCR compartilhado - servidor local + cliente
+Um único processo servidor concentra o Tesseract para vários bots: recebe os
+bytes da imagem de qualquer DataExtractor, agrupa os pedidos de
+clientes diferentes em lotes e distribui para um pool fixo de workers.
+As imagens chegam aos workers por memória compartilhada (só o descritor é
+serializado)
+"""
+
+import os
+import time
+import queue
+import threading
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, Future
+from multiprocessing.connection import Listener, Client
+from typing import Iterable, List, Optional, Tuple, Union
+
+from PIL import Image
+
+from .motor_ocr import MotorOCR, LeituraOCR, CAMPOS_REQUERIDOS_PADRAO
+from .memoria_compartilhada import (GerenciadorMemoriaImagens, DescritorImagem, abrir_imagem,
+                                    marcar_externo, MAX_BUFFERS_PADRAO)
+
+# Endereço padrão: localhost (no Linux/macOS pode ser um caminho de Unix socket)
+ENDERECO_PADRAO = ('localhost', 6010)
+
+# Pedido: (bytes PNG ou descritor em memória compartilhada, inscrição, campos requeridos)
+PedidoOCR = Tuple[Union[bytes, DescritorImagem], str, Tuple[str, ...]]
+
+# Motor do processo worker (criado uma vez no initializer do pool)
+_motor_worker: Optional[MotorOCR] = None
+
+
+def _inicializar_worker(idioma: str):
+    """Carrega o motor OCR uma única vez por processo do pool"""
+    global _motor_worker
+    _motor_worker = MotorOCR(idioma=idioma)
+
+
+def _reconhecer_lote(pedidos: List[PedidoOCR]) -> List[LeituraOCR]:
+    """Executa o OCR de um lote de pedidos dentro do worker"""
+    resultados = []
+    for imagem, inscricao, campos_requeridos in pedidos:
+        try:
+            if isinstance(imagem, DescritorImagem):
+                # Leitura direta do bloco compartilhado, sem cópia
+                with abrir_imagem(imagem) as imagem_pil:
+                    resultados.append(_motor_worker.reconhecer(imagem_pil, inscricao, campos_requeridos))
+            else:
+                imagem_pil = Image.open(BytesIO(imagem))
+                resultados.append(_motor_worker.reconhecer(imagem_pil, inscricao, campos_requeridos))
+        except Exception as e:
+            print(f"❌ Erro no OCR do lote ({inscricao}): {e}")
+            resultados.append(LeituraOCR())
+    return resultados
+
+
+def _endereco_familia(endereco) -> Optional[str]:
+    """Tupla (host, porta) usa TCP; string usa Unix socket"""
+    return 'AF_UNIX' if isinstance(endereco, str) else None
+
+
+class ServidorOCR:
+    """Servidor OCR local com agrupamento de pedidos em lotes"""
+
+    def __init__(self, chave: bytes, endereco=ENDERECO_PADRAO,
+                 workers: Optional[int] = None, tamanho_lote: int = 8,
+                 espera_lote: float = 0.05, idioma: str = 'por',
+                 max_buffers: int = MAX_BUFFERS_PADRAO):
+        """
+        Args:
+            chave: Chave de autenticação compartilhada com os clientes
+                (obrigatória: os pedidos recebidos são desserializados com pickle)
+            endereco: (host, porta) ou caminho do Unix socket
+            workers: Processos OCR (padrão: núcleos da máquina)
+            tamanho_lote: Máximo de pedidos agrupados por lote
+            espera_lote: Tempo máximo (s) esperando completar um lote
+            idioma: Idioma do Tesseract
+            max_buffers: Máximo de imagens em memória compartilhada ao mesmo tempo
+        """
+        if not chave:
+            raise ValueError("Chave de autenticação do servidor OCR não configurada")
+
+        self.endereco = endereco
+        self.chave = chave
+        self.workers = workers or os.cpu_count() or 1
+        self.tamanho_lote = tamanho_lote
+        self.espera_lote = espera_lote
+        self.idioma = idioma
+
+        self.memoria = GerenciadorMemoriaImagens(max_buffers)
+        self.fila: "queue.Queue[Tuple[PedidoOCR, Future]]" = queue.Queue()
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.listener: Optional[Listener] = None
+        self.ativo = False
+
+        self.estatisticas = {'pedidos': 0, 'lotes': 0, 'clientes': 0}
+
+    def iniciar(self):
+        """Sobe o pool de workers e atende conexões até parar()"""
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_inicializar_worker,
+            initargs=(self.idioma,)
+        )
+        self.listener = Listener(self.endereco, family=_endereco_familia(self.endereco), authkey=self.chave)
+        self.ativo = True
+
+        threading.Thread(target=self._agrupar_lotes, daemon=True).start()
+        print(f"🚀 Servidor OCR em {self.endereco} ({self.workers} workers, lote {self.tamanho_lote})")
+
+        try:
+            while self.ativo:
+                try:
+                    conexao = self.listener.accept()
+                except OSError:
+                    break
+                self.estatisticas['clientes'] += 1
+                threading.Thread(target=self._atender_cliente, args=(conexao,), daemon=True).start()
+        finally:
+            self.parar()
+
+    def parar(self):
+        """Encerra o listener e o pool"""
+        if not self.ativo:
+            return
+        self.ativo = False
+
+        try:
+            self.listener.close()
+        except Exception:
+            pass
+
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.memoria.liberar_todos()
+        print(f"🛑 Servidor OCR encerrado: {self.estatisticas['pedidos']} pedidos em "
+              f"{self.estatisticas['lotes']} lotes")
+
+    def _atender_cliente(self, conexao):
+        """Recebe pedidos de um cliente e devolve as leituras na mesma ordem"""
+        try:
+            while self.ativo:
+                try:
+                    pedido = conexao.recv()
+                except EOFError:
+                    break
+
+                # Decodificar uma vez para memória compartilhada (o cliente
+                # pode já ter mandado um descritor próprio)
+                imagem, inscricao, campos_requeridos = pedido
+                descritor_servidor = None
+                if isinstance(imagem, bytes):
+                    try:
+                        descritor_servidor = self.memoria.publicar(Image.open(BytesIO(imagem)))
+                    except Exception as e:
+                        print(f"❌ Imagem inválida recebida ({inscricao}): {e}")
+                        conexao.send(LeituraOCR())
+                        continue
+                    pedido = (descritor_servidor, inscricao, campos_requeridos)
+                elif isinstance(imagem, DescritorImagem):
+                    pedido = (marcar_externo(imagem), inscricao, campos_requeridos)
+
+                futuro = Future()
+                self.fila.put((pedido, futuro))
+
+                try:
+                    leitura = futuro.result()
+                except Exception as e:
+                    print(f"❌ Erro no pedido OCR: {e}")
+                    leitura = LeituraOCR()
+                finally:
+                    # Bloco liberado assim que a leitura termina
+                    if descritor_servidor is not None:
+                        self.memoria.liberar(descritor_servidor)
+
+                conexao.send(leitura)
+        except Exception as e:
+            print(f"⚠️ Cliente OCR desconectado: {e}")
+        finally:
+            conexao.close()
+
+    def _agrupar_lotes(self):
+        """Junta pedidos de clientes diferentes e distribui os lotes aos workers"""
+        while self.ativo:
+            try:
+                primeiro = self.fila.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            lote = [primeiro]
+            limite = time.monotonic() + self.espera_lote
+            while len(lote) < self.tamanho_lote:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(self.fila.get(timeout=restante))
+                except queue.Empty:
+                    break
+
+            self.estatisticas['pedidos'] += len(lote)
+            self.estatisticas['lotes'] += 1
+
+            # Divide o lote entre os workers (um sub-lote por processo)
+            tamanho_parte = max(1, -(-len(lote) // self.workers))
+            for inicio in range(0, len(lote), tamanho_parte):
+                parte = lote[inicio:inicio + tamanho_parte]
+                try:
+                    futuro_lote = self.executor.submit(_reconhecer_lote, [pedido for pedido, _ in parte])
+                except Exception as e:
+                    for _, futuro in parte:
+                        futuro.set_exception(e)
+                    continue
+                futuro_lote.add_done_callback(lambda f, parte=parte: self._entregar(f, parte))
+
+    @staticmethod
+    def _entregar(futuro_lote: Future, parte: list):
+        """Repassa o resultado do sub-lote para cada pedido"""
+        try:
+            leituras = futuro_lote.result()
+        except Exception as e:
+            for _, futuro in parte:
+                futuro.set_exception(e)
+            return
+
+        for (_, futuro), leitura in zip(parte, leituras):
+            futuro.set_result(leitura)
+
+
+class ClienteOCR:
+    """Cliente do ServidorOCR usado pelo OCRDetalhes do DataExtractor"""
+
+    def __init__(self, chave: bytes, endereco=ENDERECO_PADRAO,
+                 memoria_compartilhada: bool = False):
+        """
+        Args:
+            chave: Chave de autenticação do servidor
+            endereco: (host, porta) ou caminho do Unix socket
+            memoria_compartilhada: Publica a imagem em shared memory e envia só
+                o descritor (apenas com o servidor na mesma máquina)
+        """
+        self.endereco = endereco
+        self.chave = chave
+        self.conexao = None
+        self.lock = threading.Lock()
+        self.memoria = GerenciadorMemoriaImagens(max_buffers=4) if memoria_compartilhada else None
+
+    def conectar(self) -> bool:
+        """Conecta ao servidor (False se ele não estiver rodando)"""
+        try:
+            self.conexao = Client(self.endereco, family=_endereco_familia(self.endereco), authkey=self.chave)
+            print(f"🔗 Conectado ao servidor OCR: {self.endereco}")
+            return True
+        except Exception as e:
+            print(f"⚠️ Servidor OCR indisponível ({self.endereco}): {e}")
+            self.conexao = None
+            return False
+
+    def reconhecer(self, imagem: Image.Image, inscricao: str = "",
+                   campos_requeridos: Iterable[str] = CAMPOS_REQUERIDOS_PADRAO) -> Optional[LeituraOCR]:
+        """
+        Envia a imagem ao servidor e aguarda a leitura
+
+        Returns:
+            LeituraOCR ou None se o servidor não respondeu (usar OCR local)
+        """
+        with self.lock:
+            if self.conexao is None and not self.conectar():
+                return None
+
+            descritor = None
+            try:
+                if self.memoria:
+                    descritor = self.memoria.publicar(imagem)
+                    conteudo = descritor
+                else:
+                    buffer = BytesIO()
+                    imagem.save(buffer, format='PNG')
+                    conteudo = buffer.getvalue()
+
+                self.conexao.send((conteudo, inscricao, tuple(campos_requeridos)))
+                return self.conexao.recv()
+            except Exception as e:
+                print(f"❌ Erro no servidor OCR: {e}")
+                self.fechar()
+                return None
+            finally:
+                if descritor is not None:
+                    self.memoria.liberar(descritor)
+
+    def fechar(self):
+        """Fecha a conexão com o servidor"""
+        if self.conexao is not None:
+            try:
+                self.conexao.close()
+            except Exception:
+                pass
+            self.conexao = None
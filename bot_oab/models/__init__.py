@@ -6,7 +6,8 @@ Módulo de modelos de dados
 """
 
 from .resultado_oab import ResultadoOAB
+from .chave_oab import ChaveOAB, chave_oab, interpretar_oab, normalizar_numero
 
-__all__ = ['ResultadoOAB']
+__all__ = ['ResultadoOAB', 'ChaveOAB', 'chave_oab', 'interpretar_oab', 'normalizar_numero']
 
 # =====================================
\ No newline at end of file
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Identificador canônico de uma inscrição OAB (UF + número inteiro)
+Um único parser para o usuario do banco (SP012345), a chave do cache
+(12345/SP) e os números lidos do site: zeros à esquerda, espaços e pontos
+não geram mais chaves diferentes para a mesma inscrição
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+ESTADOS_VALIDOS = frozenset({
+    'AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DF', 'ES', 'GO',
+    'MA', 'MT', 'MS', 'MG', 'PA', 'PB', 'PR', 'PE', 'PI',
+    'RJ', 'RN', 'RS', 'RO', 'RR', 'SC', 'SP', 'SE', 'TO'
+})
+
+# Dígitos aceitos no usuario do banco (com zeros à esquerda)
+MIN_DIGITOS = 4
+MAX_DIGITOS = 8
+
+# "SP012345", "SP 12345", "SP/12345", "12345/SP", "12.345-SP"
+_PADRAO_UF_NUMERO = re.compile(r'^([A-Z]{2})[\s/\-]*([\d.\s]+)$')
+_PADRAO_NUMERO_UF = re.compile(r'^([\d.\s]+)[\s/\-]*([A-Z]{2})$')
+_NAO_DIGITOS = re.compile(r'\D')
+
+# Número da inscrição em texto: só dígitos, pontos e espaços ("12.345", " 012345 ")
+_PADRAO_NUMERO = re.compile(r'^[\d.\s]*\d[\d.\s]*$')
+
+
+class ChaveOAB(NamedTuple):
+    """Inscrição OAB: UF + número (sem zeros à esquerda)"""
+    estado: str
+    numero: int
+
+    @property
+    def inscricao(self) -> str:
+        """Número como texto, no formato usado nas consultas ao site"""
+        return str(self.numero)
+
+    @property
+    def usuario(self) -> str:
+        """Formato da coluna usuario do banco (ex.: SP12345)"""
+        return f"{self.estado}{self.numero}"
+
+    def __str__(self) -> str:
+        # Formato histórico da chave do cache: "NUMERO/ESTADO"
+        return f"{self.numero}/{self.estado}"
+
+
+def normalizar_numero(numero) -> Optional[int]:
+    """
+    Número da inscrição como inteiro (sem zeros à esquerda, pontos e espaços)
+
+    Texto com qualquer outro caractere (letras, hífen, barra) é rejeitado:
+    "12345-A" ou "E12345" não viram a inscrição 12345
+
+    Returns:
+        Inteiro positivo ou None se não houver número válido
+    """
+    if isinstance(numero, int):
+        valor = numero
+    else:
+        texto = str(numero or '')
+        if not _PADRAO_NUMERO.match(texto):
+            return None
+        valor = int(_NAO_DIGITOS.sub('', texto))
+    return valor if valor > 0 else None
+
+
+def chave_oab(numero, estado: str) -> Optional[ChaveOAB]:
+    """
+    Chave a partir do número e da UF já separados
+
+    Args:
+        numero: Número da inscrição (texto com zeros/pontos ou inteiro)
+        estado: UF
+
+    Returns:
+        ChaveOAB ou None se a UF ou o número forem inválidos
+    """
+    estado = (estado or '').strip().upper()
+    if estado not in ESTADOS_VALIDOS:
+        return None
+
+    valor = normalizar_numero(numero)
+    return ChaveOAB(estado, valor) if valor is not None else None
+
+
+@lru_cache(maxsize=65536)
+def interpretar_oab(texto: str) -> Optional[ChaveOAB]:
+    """
+    Parser único da OAB em texto (usuario do banco ou chave do cache)
+
+    Aceita "SP012345", "SP 12345", "SP/12345" e "12345/SP". O número precisa
+    ter de 4 a 8 dígitos (contando zeros à esquerda) e não pode ser só zeros
+
+    Args:
+        texto: OAB em texto
+
+    Returns:
+        ChaveOAB ou None se não for uma OAB válida
+    """
+    if not texto:
+        return None
+
+    texto = texto.strip().upper()
+    encontrado = _PADRAO_UF_NUMERO.match(texto)
+    if encontrado:
+        estado, numero = encontrado.groups()
+    else:
+        encontrado = _PADRAO_NUMERO_UF.match(texto)
+        if not encontrado:
+            return None
+        numero, estado = encontrado.groups()
+
+    digitos = _NAO_DIGITOS.sub('', numero)
+    if not MIN_DIGITOS <= len(digitos) <= MAX_DIGITOS:
+        return None
+
+    return chave_oab(digitos, estado)
@@ -4,8 +4,10 @@
 Modelos de dados para o Bot OAB
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from .chave_oab import ChaveOAB, chave_oab
 
 @dataclass
 class ResultadoOAB:
@@ -21,4 +23,11 @@ class ResultadoOAB:
     numero_carteira: str = ""
     erro: str = ""
     sucesso: bool = False
-    detalhes_completos: str = ""
\ No newline at end of file
+    detalhes_completos: str = ""
+    # Outras linhas da página de resultado: (inscrição, UF, nome)
+    resultados_adicionais: List[Tuple[str, str, str]] = field(default_factory=list)
+
+    @property
+    def chave(self) -> Optional[ChaveOAB]:
+        """Identificador canônico da inscrição (None se número/UF inválidos)"""
+        return chave_oab(self.inscricao, self.estado)
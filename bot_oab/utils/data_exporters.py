@@ -41,9 +41,18 @@ class DataExporter:
         
         return self.pasta_atual
     
+    @staticmethod
+    def _identificacao(resultado: ResultadoOAB):
+        """Inscrição, UF e OAB (SP12345) canônicas; mantém o original se inválido"""
+        chave = resultado.chave
+        if chave is None:
+            return resultado.inscricao, resultado.estado, f"{resultado.estado}{resultado.inscricao}"
+        return chave.inscricao, chave.estado, chave.usuario
+    
     def _gerar_nome_arquivo(self, resultado: ResultadoOAB, extensao: str):
         """Gera nome do arquivo baseado na inscrição e estado"""
-        nome_base = f"OAB_{resultado.inscricao}_{resultado.estado}"
+        inscricao, estado, _ = self._identificacao(resultado)
+        nome_base = f"OAB_{inscricao}_{estado}"
         
         # Se há nome do advogado, incluir nas primeiras palavras
         if resultado.nome:
@@ -77,17 +86,19 @@ class DataExporter:
         caminho_completo = os.path.join(pasta_destino, arquivo)
         
         with open(caminho_completo, 'w', newline='', encoding='utf-8') as csvfile:
+            # 'oab' no fim: as colunas anteriores mantêm a posição de sempre
             campos = ['inscricao', 'estado', 'nome', 'tipo', 'situacao', 
                      'endereco', 'telefone', 'email', 'data_inscricao', 
-                     'numero_carteira', 'sucesso', 'erro', 'detalhes_completos']
+                     'numero_carteira', 'sucesso', 'erro', 'detalhes_completos', 'oab']
             
             writer = csv.DictWriter(csvfile, fieldnames=campos)
             writer.writeheader()
             
             for resultado in resultados:
+                inscricao, estado, oab = self._identificacao(resultado)
                 writer.writerow({
-                    'inscricao': resultado.inscricao,
-                    'estado': resultado.estado,
+                    'inscricao': inscricao,
+                    'estado': estado,
                     'nome': resultado.nome,
                     'tipo': resultado.tipo,
                     'situacao': resultado.situacao,
@@ -98,7 +109,8 @@ class DataExporter:
                     'numero_carteira': resultado.numero_carteira,
                     'sucesso': resultado.sucesso,
                     'erro': resultado.erro,
-                    'detalhes_completos': resultado.detalhes_completos
+                    'detalhes_completos': resultado.detalhes_completos,
+                    'oab': oab
                 })
                 
         print(f"💾 CSV salvo em: {caminho_completo}")
@@ -135,9 +147,10 @@ class DataExporter:
         }
         
         for resultado in resultados:
+            inscricao, estado, oab = self._identificacao(resultado)
             dados['resultados'].append({
-                'inscricao': resultado.inscricao,
-                'estado': resultado.estado,
+                'inscricao': inscricao,
+                'estado': estado,
                 'nome': resultado.nome,
                 'tipo': resultado.tipo,
                 'situacao': resultado.situacao,
@@ -148,7 +161,8 @@ class DataExporter:
                 'numero_carteira': resultado.numero_carteira,
                 'sucesso': resultado.sucesso,
                 'erro': resultado.erro,
-                'detalhes_completos': resultado.detalhes_completos
+                'detalhes_completos': resultado.detalhes_completos,
+                'oab': oab
             })
             
         with open(caminho_completo, 'w', encoding='utf-8') as jsonfile:
@@ -183,7 +197,8 @@ class DataExporter:
             # Detalhes de cada resultado
             for i, resultado in enumerate(resultados, 1):
                 txtfile.write(f"\n{'-' * 40}\n")
-                txtfile.write(f"CONSULTA {i}: OAB {resultado.inscricao}/{resultado.estado}\n")
+                inscricao, estado, _ = self._identificacao(resultado)
+                txtfile.write(f"CONSULTA {i}: OAB {inscricao}/{estado}\n")
                 txtfile.write(f"{'-' * 40}\n")
                 
                 if resultado.sucesso:
@@ -11,6 +11,9 @@ import sys
 import time
 import re
 import json
+import queue
+import socket
+import threading
 from typing import List, Dict, Optional, Tuple, Set
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -28,9 +31,35 @@ except ImportError:
 # Adicionar o diretório atual ao Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from config import Config
+
 # Importar o bot OAB existente
 from bot_oab.models.resultado_oab import ResultadoOAB
+from bot_oab.models.chave_oab import ChaveOAB, chave_oab, interpretar_oab
 from bot_oab.core.bot_oab_core import BotOABCorrigido
+from bot_oab.extractors.ocr_detalhes import OCRDetalhes
+from bot_oab.extractors.servico_ocr import ClienteOCR
+from bot_oab.extractors.ocr_lote import SpoolOCR
+from bot_oab.extractors.lexico_ocr import LexicoOCR
+from bot_oab.cache import (ArmazenamentoSQLite, ArquivoRegistrosOAB, DiarioCache, CacheLRUFragmentado,
+                           ContadoresAtomicos, FiltroBloom, IndiceFaixasOAB, IndiceNomesOAB,
+                           ARQUIVO_DB_PADRAO)
+from bot_oab.cache.filtro_bloom import CAPACIDADE_PADRAO as CAPACIDADE_FILTRO_PADRAO
+from bot_oab.cache.politica_cache import (classificar_resultado, horas_para_segundos, expirado,
+                                          CLASSES_RESULTADO, CLASSE_TRANSITORIO, CLASSE_ADICIONAL,
+                                          CLASSE_SUCESSO, CLASSE_NAO_ENCONTRADO, CLASSE_AQUECIDO)
+
+# Cache L2 compartilhado entre máquinas (uma linha por OAB; chave estado + numero)
+TABELA_CACHE_L2 = "cache_consultas_oab"
+# Upsert condicional (só grava consultas mais novas que a linha existente);
+# DDL da função no readme_completo.md
+FUNCAO_GRAVAR_CACHE_L2 = "gravar_cache_consultas_oab"
+# Só respostas diretas do site vão para o L2: falhas passageiras e linhas
+# adicionais ficam no cache local (não sobrescrevem a resposta de outra máquina)
+CLASSES_CACHE_L2 = (CLASSE_SUCESSO, CLASSE_NAO_ENCONTRADO)
+
+# OAB reservada por outro worker além da espera: os registros ficam pendentes
+ERRO_EM_CONSULTA = "OAB em consulta por outro worker"
 
 @dataclass
 class RegistroErro:
@@ -49,10 +78,38 @@ class ResultadoCache:
     erro: Optional[str] = None
     sucesso: bool = False
     timestamp: datetime = None
+    classe: str = ''  # sucesso / nao_encontrado / transitorio / adicional / aquecido
     
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now()
+        if not self.classe:
+            self.classe = classificar_resultado(self.sucesso, self.erro)
+    
+    def para_dict(self) -> Dict:
+        """Converte para o formato de entrada do cache_oab.json"""
+        return {
+            'numero_oab': self.numero_oab,
+            'estado': self.estado,
+            'nome': self.nome,
+            'erro': self.erro,
+            'sucesso': self.sucesso,
+            'timestamp': self.timestamp.isoformat(),
+            'classe': self.classe
+        }
+    
+    @classmethod
+    def de_dict(cls, item: Dict) -> 'ResultadoCache':
+        """Cria a partir de uma entrada do cache_oab.json"""
+        return cls(
+            numero_oab=item['numero_oab'],
+            estado=item['estado'],
+            nome=item.get('nome'),
+            erro=item.get('erro'),
+            sucesso=item.get('sucesso', False),
+            timestamp=datetime.fromisoformat(item['timestamp']),
+            classe=item.get('classe', '')
+        )
 
 class CacheConsultas:
     """
@@ -60,41 +117,141 @@ class CacheConsultas:
     Mantém resultados de consultas anteriores para reutilização
     """
     
-    def __init__(self, expirar_apos_horas: int = 24):
+    def __init__(self, expirar_apos_horas: int = 24, armazenamento: Optional[ArmazenamentoSQLite] = None,
+                 diario: Optional[DiarioCache] = None,
+                 validade_por_classe: Optional[Dict[str, Optional[float]]] = None,
+                 max_entradas: Optional[int] = None, max_bytes: Optional[int] = None,
+                 compartilhado: bool = False,
+                 renovar_apos_horas: Optional[Dict[str, Optional[float]]] = None,
+                 fragmentos: int = 16, arquivo_filtro: Optional[str] = None,
+                 taxa_falsos_filtro: float = 0.01, arquivo_faixas: Optional[str] = None,
+                 compartilhar_l2: bool = False):
         """
         Inicializa o sistema de cache
         
         Args:
             expirar_apos_horas: Horas após as quais o cache expira (0 = nunca expira)
+            armazenamento: Banco SQLite do cache (None = arquivo JSON único)
+            diario: Diário append-only + snapshot JSON (alternativa ao SQLite)
+            validade_por_classe: Horas de validade por classe de resultado
+                (None = nunca expira, 0 = não grava); substitui expirar_apos_horas
+            max_entradas: Máximo de entradas em memória (None = sem limite;
+                ignorado sem SQLite/registros/diário)
+            max_bytes: Máximo de bytes em memória (None = sem limite; ignorado
+                sem SQLite/registros/diário)
+            compartilhado: Vários processos usam o mesmo banco SQLite; uma OAB
+                em consulta por um worker é reservada e os demais aguardam
+            renovar_apos_horas: Idade por classe a partir da qual a entrada,
+                ainda válida, deve ser renovada em segundo plano (None = nunca)
+            fragmentos: Fragmentos do cache em memória, cada um com seu lock
+                (várias threads podem usar o mesmo CacheConsultas)
+            arquivo_filtro: Filtro de Bloom das chaves do banco, salvo entre
+                execuções (None = sem filtro; ignorado no modo compartilhado)
+            taxa_falsos_filtro: Taxa de falsos positivos do filtro de Bloom
+            arquivo_faixas: Índice das inscrições confirmadas por UF, salvo
+                entre execuções (None = aprendido só na memória)
+            compartilhar_l2: Consultas novas entram numa fila para gravação
+                em lote no cache L2 (tabela no Supabase)
+        
+        Com limites, as entradas descartadas da memória continuam no SQLite /
+        registros / diário; no modo JSON puro a memória é a única cópia do
+        cache_oab.json e os limites não se aplicam
         """
-        self.cache: Dict[str, ResultadoCache] = {}  # chave: "NUMERO/ESTADO"
         self.expirar_apos = timedelta(hours=expirar_apos_horas) if expirar_apos_horas > 0 else None
         
-        # Estatísticas
-        self.estatisticas = {
+        # Validade em segundos por classe (sucesso / nao_encontrado / transitorio)
+        if validade_por_classe is not None:
+            self.validade = horas_para_segundos(validade_por_classe)
+        else:
+            uniforme = self.expirar_apos.total_seconds() if self.expirar_apos else None
+            self.validade = {classe: uniforme for classe in CLASSES_RESULTADO}
+        
+        # Expiração "suave" (stale-while-revalidate), sempre antes da validade
+        self.renovacao = horas_para_segundos(renovar_apos_horas) if renovar_apos_horas else None
+        
+        # No modo JSON puro uma entrada descartada sumiria do cache_oab.json
+        if armazenamento is None and diario is None and (max_entradas or max_bytes):
+            print("ℹ️ Cache só em JSON: limites de memória ignorados")
+            max_entradas = max_bytes = None
+        
+        # chave: ChaveOAB -> ResultadoCache (LRU com expiração no acesso, lock por fragmento)
+        self.cache = CacheLRUFragmentado(fragmentos=fragmentos, max_entradas=max_entradas,
+                                         max_bytes=max_bytes, expirado=self._cache_expirado)
+        
+        self.armazenamento = armazenamento
+        self.diario = diario
+        if self.diario:
+            self.diario.validade = self.validade
+        
+        # Cache entre processos (exige o SQLite)
+        self.compartilhado = compartilhado and armazenamento is not None
+        self.identificador = f"{socket.gethostname()}:{os.getpid()}"
+        
+        # Pré-filtro das chaves gravadas: OAB ausente não chega a ir ao banco.
+        # Outros processos gravam no banco compartilhado sem passar pelo filtro
+        self.arquivo_filtro = arquivo_filtro if armazenamento is not None and not self.compartilhado else None
+        self.taxa_falsos_filtro = taxa_falsos_filtro
+        self.filtro: Optional[FiltroBloom] = None
+        
+        # Inscrições confirmadas por UF (aponta números improváveis)
+        self.arquivo_faixas = arquivo_faixas if armazenamento is not None else None
+        self.faixas = IndiceFaixasOAB()
+        
+        # Consultas novas aguardando o envio em lote ao cache L2
+        self.compartilhar_l2 = compartilhar_l2
+        self._fila_l2: List[Dict] = []
+        self._lock_l2 = threading.Lock()
+        
+        # Índice reverso nome -> OAB (montado na primeira busca)
+        self._indice_nomes: Optional[IndiceNomesOAB] = None
+        
+        # Estatísticas (incrementadas por várias threads)
+        self.estatisticas = ContadoresAtomicos({
             'consultas_cache': 0,      # Quantas vezes usou cache
             'consultas_novas': 0,      # Quantas consultas novas foram feitas
             'cache_hits': 0,           # Sucessos do cache
             'cache_misses': 0,         # Cache miss (não tinha no cache)
             'duplicatas_evitadas': 0   # Consultas duplicadas evitadas
-        }
+        })
+        # Valores já gravados no banco (o SQLite recebe só os incrementos)
+        self._estatisticas_gravadas: Dict[str, int] = {}
+        self._lock_persistencia = threading.Lock()
         
         print("🔄 Sistema de cache inicializado")
-        if self.expirar_apos:
+        if validade_por_classe is not None:
+            for classe, horas in validade_por_classe.items():
+                descricao = "nunca expira" if horas is None else ("não armazenado" if horas == 0 else f"{horas:g}h")
+                print(f"⏰ Validade '{classe}': {descricao}")
+        elif self.expirar_apos:
             print(f"⏰ Cache expira após: {expirar_apos_horas}h")
         else:
             print("♾️ Cache nunca expira (válido por toda a sessão)")
     
-    def _gerar_chave(self, numero_oab: str, estado: str) -> str:
-        """Gera chave única para o cache"""
-        return f"{numero_oab.strip()}/{estado.strip().upper()}"
+    def _gerar_chave(self, numero_oab: str, estado: str) -> ChaveOAB:
+        """
+        Gera chave única para o cache (SP012345 e SP12345 caem na mesma entrada)
+        Em disco a chave é gravada como texto: str(chave) == "NUMERO/ESTADO"
+        """
+        chave = chave_oab(numero_oab, estado)
+        if chave is None:
+            # OAB fora do padrão: mantém a chave textual antiga
+            return f"{str(numero_oab).strip()}/{estado.strip().upper()}"
+        return chave
+    
+    def _chave_de_entrada(self, chave: str, item: Dict):
+        """Chave canônica de uma entrada lida do JSON/diário"""
+        return (chave_oab(item.get('numero_oab'), item.get('estado', ''))
+                or interpretar_oab(chave) or chave)
     
     def _cache_expirado(self, resultado: ResultadoCache) -> bool:
-        """Verifica se o resultado do cache expirou"""
-        if not self.expirar_apos:
+        """Verifica se o resultado do cache expirou (validade da sua classe)"""
+        return expirado(resultado.classe, resultado.timestamp.timestamp(), self.validade)
+    
+    def precisa_renovar(self, resultado: ResultadoCache) -> bool:
+        """Verifica se a entrada, ainda válida, já passou da idade de renovação"""
+        if not self.renovacao:
             return False
-        
-        return datetime.now() - resultado.timestamp > self.expirar_apos
+        return expirado(resultado.classe, resultado.timestamp.timestamp(), self.renovacao)
     
     def consultar_cache(self, numero_oab: str, estado: str) -> Optional[ResultadoCache]:
         """
@@ -109,22 +266,29 @@ class CacheConsultas:
         """
         chave = self._gerar_chave(numero_oab, estado)
         
-        if chave in self.cache:
-            resultado = self.cache[chave]
-            
-            # Verificar se expirou
-            if self._cache_expirado(resultado):
-                print(f"⏰ Cache expirado para {chave}")
-                del self.cache[chave]
-                self.estatisticas['cache_misses'] += 1
-                return None
-            
+        # Expiradas são descartadas no próprio acesso
+        em_memoria = chave in self.cache
+        resultado = self.cache.obter(chave)
+        if em_memoria and resultado is None:
+            print(f"⏰ Cache expirado para {chave}")
+        
+        # Com SQLite só as entradas já consultadas ficam em memória
+        if resultado is None and self.armazenamento and self._pode_estar_armazenada(chave):
+            try:
+                entrada = self.armazenamento.obter(str(chave), self.validade)
+                if entrada:
+                    resultado = ResultadoCache.de_dict(entrada)
+                    self.cache.inserir(chave, resultado)
+            except Exception as e:
+                print(f"⚠️ Erro ao consultar cache SQLite: {e}")
+        
+        if resultado is not None:
             print(f"🎯 Cache HIT: {chave} → {resultado.nome or resultado.erro}")
-            self.estatisticas['cache_hits'] += 1
-            self.estatisticas['consultas_cache'] += 1
+            self.estatisticas.incrementar('cache_hits')
+            self.estatisticas.incrementar('consultas_cache')
             return resultado
         else:
-            self.estatisticas['cache_misses'] += 1
+            self.estatisticas.incrementar('cache_misses')
             return None
     
     def salvar_cache(self, numero_oab: str, estado: str, resultado: ResultadoOAB):
@@ -145,11 +309,318 @@ class CacheConsultas:
             erro=resultado.erro if not resultado.sucesso else None,
             sucesso=resultado.sucesso
         )
+        self.estatisticas.incrementar('consultas_novas')
+        
+        # Falhas passageiras com validade 0 não envenenam a chave
+        if self.validade.get(resultado_cache.classe) == 0:
+            self.cache.remover(chave)
+            print(f"⏭️ Cache SKIP ({resultado_cache.classe}): {chave} → {resultado_cache.erro}")
+            return
+        
+        self.cache.inserir(chave, resultado_cache)
+        self._gravar_persistente(chave, resultado_cache)
+        
+        if self.compartilhar_l2 and resultado_cache.classe in CLASSES_CACHE_L2:
+            with self._lock_l2:
+                self._fila_l2.append(resultado_cache.para_dict())
+        
+        print(f"💾 Cache SAVE ({resultado_cache.classe}): {chave} → {resultado_cache.nome or resultado_cache.erro}")
+    
+    # ===========================================
+    # COORDENAÇÃO ENTRE PROCESSOS
+    # ===========================================
+    
+    def _dono_reserva(self) -> str:
+        """Identificador do worker (processo + thread)"""
+        return f"{self.identificador}:{threading.get_ident()}"
+    
+    def reservar_consulta(self, numero_oab: str, estado: str, duracao_segundos: float = 180) -> bool:
+        """
+        Reserva a OAB para consulta no site (só no modo compartilhado)
+        
+        Returns:
+            True se este worker deve consultar; False se outro já está consultando
+        """
+        if not self.compartilhado:
+            return True
+        try:
+            return self.armazenamento.reservar(str(self._gerar_chave(numero_oab, estado)),
+                                               self._dono_reserva(), duracao_segundos)
+        except Exception as e:
+            print(f"⚠️ Erro ao reservar consulta: {e}")
+            return True
+    
+    def aguardar_consulta(self, numero_oab: str, estado: str, timeout: float = 120,
+                          intervalo: float = 0.5) -> Optional[ResultadoCache]:
+        """
+        Aguarda o resultado da consulta feita por outro worker
+        
+        Returns:
+            ResultadoCache gravado pelo outro worker ou None (reserva liberada
+            sem resultado, ou tempo esgotado)
+        """
+        chave = self._gerar_chave(numero_oab, estado)
+        limite = time.monotonic() + timeout
+        
+        while time.monotonic() < limite:
+            try:
+                entrada = self.armazenamento.obter(str(chave), self.validade)
+                if entrada:
+                    resultado = ResultadoCache.de_dict(entrada)
+                    self.cache.inserir(chave, resultado)
+                    self.estatisticas.incrementar('cache_hits')
+                    self.estatisticas.incrementar('consultas_cache')
+                    self.estatisticas.incrementar('duplicatas_evitadas')
+                    print(f"🤝 Resultado de outro worker: {chave} → {resultado.nome or resultado.erro}")
+                    return resultado
+                if not self.armazenamento.reservado_por_outro(str(chave), self._dono_reserva()):
+                    return None
+            except Exception as e:
+                print(f"⚠️ Erro ao aguardar consulta de outro worker: {e}")
+                return None
+            time.sleep(intervalo)
+        
+        return None
+    
+    def liberar_consulta(self, numero_oab: str, estado: str):
+        """Libera a reserva da OAB"""
+        if not self.compartilhado:
+            return
+        try:
+            self.armazenamento.liberar_reserva(str(self._gerar_chave(numero_oab, estado)), self._dono_reserva())
+        except Exception as e:
+            print(f"⚠️ Erro ao liberar reserva: {e}")
+    
+    def em_cache(self, numero_oab: str, estado: str) -> bool:
+        """Verifica se há entrada válida para a OAB (sem contar nas estatísticas)"""
+        chave = self._gerar_chave(numero_oab, estado)
+        if self.cache.obter(chave) is not None:
+            return True
+        if self.armazenamento and self._pode_estar_armazenada(chave):
+            try:
+                return self.armazenamento.obter(str(chave), self.validade) is not None
+            except Exception:
+                return False
+        return False
+    
+    def improvavel(self, numero_oab: str, estado: str) -> bool:
+        """A inscrição está muito acima da maior já confirmada na UF"""
+        chave = self._gerar_chave(numero_oab, estado)
+        return isinstance(chave, ChaveOAB) and self.faixas.improvavel(chave)
+    
+    def importar_compartilhado(self, entradas: Dict[ChaveOAB, Dict]) -> int:
+        """
+        Inclui as entradas lidas do cache L2 (mantém a local se for mais recente)
+        
+        Args:
+            entradas: ChaveOAB -> entrada no formato do cache_oab.json
+            
+        Returns:
+            Quantidade de entradas incluídas
+        """
+        incluidas = 0
+        for chave, item in entradas.items():
+            try:
+                resultado_cache = ResultadoCache.de_dict(item)
+            except (KeyError, ValueError):
+                continue
+            if self.validade.get(resultado_cache.classe) == 0 or self._cache_expirado(resultado_cache):
+                continue
+            
+            atual = self.cache.obter(chave)
+            if atual is None and self.armazenamento and self._pode_estar_armazenada(chave):
+                try:
+                    entrada = self.armazenamento.obter(str(chave), self.validade)
+                    atual = ResultadoCache.de_dict(entrada) if entrada else None
+                except Exception as e:
+                    print(f"⚠️ Erro ao consultar cache SQLite: {e}")
+            if atual is not None and atual.timestamp.timestamp() >= resultado_cache.timestamp.timestamp():
+                continue
+            self.cache.inserir(chave, resultado_cache)
+            self._gravar_persistente(chave, resultado_cache)
+            incluidas += 1
+        
+        if incluidas:
+            self.estatisticas.incrementar('entradas_l2', incluidas)
+        return incluidas
+    
+    def retirar_fila_l2(self) -> List[Dict]:
+        """Entradas aguardando envio ao cache L2 (a fila é esvaziada)"""
+        with self._lock_l2:
+            fila, self._fila_l2 = self._fila_l2, []
+        return fila
+    
+    def tamanho_fila_l2(self) -> int:
+        """Consultas novas ainda não enviadas ao cache L2"""
+        with self._lock_l2:
+            return len(self._fila_l2)
+    
+    def devolver_fila_l2(self, entradas: List[Dict]):
+        """Recoloca na fila entradas cujo envio falhou"""
+        with self._lock_l2:
+            self._fila_l2[:0] = entradas
+    
+    def indice_nomes(self) -> IndiceNomesOAB:
+        """Índice nome -> OAB de todas as entradas com nome (banco ou memória)"""
+        if self._indice_nomes is None:
+            indice = IndiceNomesOAB()
+            if self.armazenamento:
+                indice.adicionar_entradas(self.armazenamento.iterar())
+            else:
+                indice.adicionar_entradas((str(chave), resultado.para_dict())
+                                          for chave, resultado in self.cache.itens())
+            self._indice_nomes = indice
+        return self._indice_nomes
+    
+    def buscar_nome(self, texto: str, prefixo: bool = False, limite: Optional[int] = 20) -> List[Tuple[str, str, str]]:
+        """
+        Procura no cache as OABs de um nome já resolvido (sem acentos,
+        sem diferenciar maiúsculas)
+        
+        Args:
+            texto: Nome ou parte dele
+            prefixo: True = o nome começa com o texto; False = contém todas as
+                palavras (cada uma como início de palavra)
+            limite: Máximo de resultados (None = todos)
+            
+        Returns:
+            Lista de (inscrição, UF, nome)
+        """
+        indice = self.indice_nomes()
+        if prefixo:
+            return indice.buscar_prefixo(texto, limite)
+        return indice.buscar_palavras(texto, limite)
+    
+    def _pode_estar_armazenada(self, chave) -> bool:
+        """Consulta o filtro de Bloom: False = com certeza não está no banco"""
+        if self.filtro is None or str(chave) in self.filtro:
+            return True
+        self.estatisticas.incrementar('filtro_descartes')
+        return False
+    
+    def aquecer(self, numero_oab: str, estado: str, nome: str) -> bool:
+        """
+        Inclui no cache um nome já resolvido fora do bot (ex.: outra linha do
+        banco) na classe 'aquecido': validade curta e fora do índice de faixas
+        
+        Args:
+            numero_oab: Número da OAB
+            estado: Estado da OAB
+            nome: Nome já validado
+            
+        Returns:
+            True se a entrada foi incluída (False se já havia entrada válida)
+        """
+        if self.validade.get(CLASSE_AQUECIDO) == 0:
+            return False
+        
+        # Entrada válida na memória ou no banco (ex.: confirmada pelo site) prevalece
+        if self.em_cache(numero_oab, estado):
+            return False
+        
+        chave = self._gerar_chave(numero_oab, estado)
+        resultado_cache = ResultadoCache(numero_oab=numero_oab, estado=estado, nome=nome, sucesso=True,
+                                         classe=CLASSE_AQUECIDO)
+        if not self.cache.inserir_se_ausente(chave, resultado_cache):
+            return False
+        self.estatisticas.incrementar('entradas_aquecidas')
+        self._gravar_persistente(chave, resultado_cache)
+        
+        return True
+    
+    def salvar_adicionais(self, resultados_adicionais: List[Tuple[str, str, str]],
+                          consultada: Optional[ChaveOAB] = None) -> int:
+        """
+        Aproveita as outras linhas da página de resultado como entradas de menor
+        confiança (classe 'adicional'): validade própria e nunca substituem uma
+        entrada já existente
+        
+        Args:
+            resultados_adicionais: Tuplas (inscrição, UF, nome) lidas do site
+            consultada: OAB consultada (ignorada se aparecer na lista)
+            
+        Returns:
+            Quantidade de entradas incluídas
+        """
+        if self.validade.get(CLASSE_ADICIONAL) == 0:
+            return 0
+        
+        incluidas = 0
+        for inscricao, uf, nome in resultados_adicionais:
+            chave = chave_oab(inscricao, uf)
+            if chave is None or chave == consultada or not nome:
+                continue
+            if self.em_cache(chave.inscricao, chave.estado):
+                continue
+            
+            resultado_cache = ResultadoCache(numero_oab=chave.inscricao, estado=chave.estado, nome=nome,
+                                             sucesso=True, classe=CLASSE_ADICIONAL)
+            if self.cache.inserir_se_ausente(chave, resultado_cache):
+                self._gravar_persistente(chave, resultado_cache)
+                incluidas += 1
+        
+        if incluidas:
+            self.estatisticas.incrementar('entradas_adicionais', incluidas)
+            print(f"🧺 Cache: {incluidas} OAB(s) aproveitada(s) da mesma página de resultado")
+        return incluidas
+    
+    def atualizar_nome(self, numero_oab: str, estado: str, nome: str) -> Optional[str]:
+        """
+        Grava um nome obtido depois da consulta (ex.: OCR adiado da imagem de
+        detalhes) na entrada da OAB
+        
+        Args:
+            numero_oab: Número da OAB
+            estado: Estado da OAB
+            nome: Nome lido
+            
+        Returns:
+            Nome que a entrada tinha antes ("" se não havia nome) ou None se
+            a entrada já tinha esse nome
+        """
+        chave = self._gerar_chave(numero_oab, estado)
+        anterior = self.cache.obter(chave)
+        if anterior is None and self.armazenamento and self._pode_estar_armazenada(chave):
+            try:
+                entrada = self.armazenamento.obter(str(chave), self.validade)
+                anterior = ResultadoCache.de_dict(entrada) if entrada else None
+            except Exception as e:
+                print(f"⚠️ Erro ao consultar cache SQLite: {e}")
+        
+        nome_anterior = (anterior.nome or "") if anterior is not None and anterior.sucesso else ""
+        if nome_anterior == nome:
+            return None
+        
+        resultado_cache = ResultadoCache(numero_oab=numero_oab, estado=estado, nome=nome, sucesso=True)
+        self.cache.inserir(chave, resultado_cache)
+        self._gravar_persistente(chave, resultado_cache)
+        if self.compartilhar_l2:
+            with self._lock_l2:
+                self._fila_l2.append(resultado_cache.para_dict())
         
-        self.cache[chave] = resultado_cache
-        self.estatisticas['consultas_novas'] += 1
+        print(f"📝 Cache: nome de {chave} atualizado → {nome}")
+        return nome_anterior
+    
+    def _gravar_persistente(self, chave, resultado_cache: ResultadoCache):
+        """Upsert imediato no SQLite e/ou uma linha no diário (sem reescrever o cache inteiro)"""
+        self.faixas.aprender(chave, resultado_cache.classe)
+        if self._indice_nomes is not None and resultado_cache.sucesso and resultado_cache.nome:
+            self._indice_nomes.adicionar(chave, resultado_cache.nome)
+        
+        if self.armazenamento:
+            try:
+                self.armazenamento.gravar(str(chave), resultado_cache.para_dict())
+                if self.filtro is not None:
+                    self.filtro.adicionar(str(chave))
+            except Exception as e:
+                print(f"⚠️ Erro ao gravar cache SQLite: {e}")
         
-        print(f"💾 Cache SAVE: {chave} → {resultado_cache.nome or resultado_cache.erro}")
+        # Uma linha no diário: a consulta sobrevive a uma interrupção
+        if self.diario:
+            try:
+                self.diario.registrar(str(chave), resultado_cache.para_dict())
+            except Exception as e:
+                print(f"⚠️ Erro ao gravar diário do cache: {e}")
     
     def contar_duplicatas(self, lista_oabs: List[Tuple[str, str]]) -> Dict[str, int]:
         """
@@ -205,36 +676,188 @@ class CacheConsultas:
         print(f"💾 Consultas em cache: {self.estatisticas['consultas_cache']}")
         print(f"🔍 Consultas novas: {self.estatisticas['consultas_novas']}")
         print(f"⚡ Duplicatas evitadas: {self.estatisticas['duplicatas_evitadas']}")
+        if self.filtro is not None:
+            print(f"🌸 Descartadas pelo filtro de Bloom: {self.estatisticas.get('filtro_descartes', 0)}")
         
         if total_consultas > 0:
             taxa_cache = (self.estatisticas['consultas_cache'] / total_consultas * 100)
             print(f"📈 Taxa de cache: {taxa_cache:.1f}%")
         
-        print(f"🗃️ Entradas no cache: {len(self.cache)}")
+        print(f"🗃️ Entradas no cache: {self.total_entradas()}")
+        
+        metricas = self.cache.metricas()
+        print(f"🧠 Em memória: {metricas['entradas']} entradas (~{metricas['bytes_residentes'] / 1024:.1f} KB)")
+        if metricas['max_entradas'] is not None or metricas['max_bytes'] is not None:
+            limite_entradas = metricas['max_entradas'] if metricas['max_entradas'] is not None else "sem limite"
+            limite_bytes = f"{metricas['max_bytes'] / 1024:.1f} KB" if metricas['max_bytes'] is not None else "sem limite"
+            print(f"📏 Limites: {limite_entradas} entradas, {limite_bytes}")
+        if metricas['evicoes'] or metricas['expiradas']:
+            print(f"♻️ Descartes: {metricas['evicoes']} por capacidade, {metricas['expiradas']} expiradas")
+    
+    def total_entradas(self) -> int:
+        """
+        Quantidade de entradas válidas (no banco, se houver; no arquivo de
+        registros, as gravadas, incluindo expiradas ainda não removidas)
+        """
+        if self.armazenamento:
+            try:
+                return self.armazenamento.contar(self.validade)
+            except Exception as e:
+                print(f"⚠️ Erro ao contar cache SQLite: {e}")
+        return len(self.cache)
     
     def limpar_cache(self):
         """Limpa todo o cache"""
-        self.cache.clear()
+        self.cache.limpar()
+        if self.armazenamento:
+            self.armazenamento.limpar()
+        if self.filtro is not None:
+            self.filtro = FiltroBloom(capacidade=self.filtro.capacidade,
+                                      taxa_falsos_positivos=self.taxa_falsos_filtro)
         print("🗑️ Cache limpo")
     
+    def remover_expirados(self) -> int:
+        """
+        Remove as entradas expiradas da memória e do banco
+        
+        Returns:
+            Quantidade de entradas removidas
+        """
+        removidos = self.cache.remover_expirados()
+        
+        # No SQLite a limpeza é um DELETE pelo índice classe + timestamp
+        if self.armazenamento:
+            try:
+                removidos += self.armazenamento.remover_expirados(self.validade)
+            except Exception as e:
+                print(f"⚠️ Erro ao limpar cache SQLite: {e}")
+        
+        return removidos
+    
+    def carregar(self, arquivo_json: str = "cache_oab.json"):
+        """
+        Carrega o cache persistente
+        Com SQLite só as estatísticas são lidas (as entradas são buscadas sob
+        demanda); um banco vazio importa o JSON existente uma única vez
+        """
+        if self.diario:
+            entradas, estatisticas = self.diario.carregar()
+            for chave, item in entradas.items():
+                try:
+                    resultado = ResultadoCache.de_dict(item)
+                except (KeyError, ValueError):
+                    continue
+                self.faixas.aprender(self._chave_de_entrada(chave, item), resultado.classe)
+                if not self._cache_expirado(resultado):
+                    self.cache.inserir(self._chave_de_entrada(chave, item), resultado)
+            self.estatisticas.update(estatisticas)
+            return
+        
+        if not self.armazenamento:
+            self.carregar_cache_arquivo(arquivo_json)
+            return
+        
+        try:
+            if self.armazenamento.contar() == 0 and os.path.exists(arquivo_json):
+                self.armazenamento.importar_json(arquivo_json, self.validade)
+            
+            self.estatisticas.update(self.armazenamento.carregar_estatisticas())
+            self._estatisticas_gravadas = self.estatisticas.copia()
+            print(f"📂 Cache SQLite: {self.total_entradas()} entradas válidas")
+            
+            self._abrir_indices()
+        except Exception as e:
+            print(f"⚠️ Erro ao carregar cache SQLite: {e}")
+    
+    def _abrir_indices(self):
+        """
+        Lê o filtro de Bloom e o índice de faixas salvos; se o banco mudou
+        desde que foram salvos (execução interrompida, importação, limpeza) ou
+        se o filtro lotou, são refeitos numa única passada pelas chaves do banco
+        """
+        if not self.arquivo_filtro and not self.arquivo_faixas:
+            return
+        total = self.armazenamento.contar()
+        
+        refazer_filtro = False
+        if self.arquivo_filtro:
+            filtro = FiltroBloom.carregar(self.arquivo_filtro)
+            refazer_filtro = filtro is None or filtro.cheio or filtro.referencia != total
+            if refazer_filtro:
+                filtro = FiltroBloom(capacidade=max(CAPACIDADE_FILTRO_PADRAO, total * 2),
+                                     taxa_falsos_positivos=self.taxa_falsos_filtro)
+            self.filtro = filtro
+        
+        refazer_faixas = False
+        if self.arquivo_faixas:
+            faixas = IndiceFaixasOAB.carregar(self.arquivo_faixas)
+            refazer_faixas = faixas is None or faixas.referencia != total
+            if not refazer_faixas:
+                self.faixas = faixas
+        
+        if refazer_filtro or refazer_faixas:
+            for chave, entrada in self.armazenamento.iterar():
+                if refazer_filtro:
+                    self.filtro.adicionar(chave)
+                if refazer_faixas:
+                    self.faixas.aprender(chave, entrada.get('classe'))
+            self._salvar_indices()
+        
+        if self.filtro is not None:
+            print(f"🌸 Filtro de Bloom {'reconstruído' if refazer_filtro else 'carregado'}: {len(self.filtro)} chaves")
+        if self.arquivo_faixas:
+            print(f"📏 Faixas de inscrição {'reconstruídas' if refazer_faixas else 'carregadas'}: "
+                  f"{len(self.faixas.numeros)} UFs")
+    
+    def _salvar_indices(self):
+        """Grava filtro e faixas junto com a contagem do banco que eles representam"""
+        try:
+            total = self.armazenamento.contar()
+            if self.filtro is not None:
+                self.filtro.referencia = total
+                self.filtro.salvar(self.arquivo_filtro)
+            if self.arquivo_faixas:
+                self.faixas.referencia = total
+                self.faixas.salvar(self.arquivo_faixas)
+        except Exception as e:
+            print(f"⚠️ Erro ao gravar índices do cache: {e}")
+    
+    def persistir(self, arquivo_json: str = "cache_oab.json"):
+        """
+        Persiste o cache (entradas do SQLite já foram gravadas uma a uma;
+        resta gravar as estatísticas; o diário é compactado no snapshot)
+        """
+        if self.diario:
+            self.diario.compactar(self.validade, self.estatisticas.copia())
+            return
+        
+        if not self.armazenamento:
+            self.salvar_cache_arquivo(arquivo_json)
+            return
+        
+        try:
+            # Incrementos: outros processos podem estar somando no mesmo banco;
+            # o retrato evita perder o que outras threads somarem no meio
+            with self._lock_persistencia:
+                atuais = self.estatisticas.copia()
+                incrementos = {nome: valor - self._estatisticas_gravadas.get(nome, 0)
+                               for nome, valor in atuais.items()}
+                self.armazenamento.somar_estatisticas(incrementos)
+                self._estatisticas_gravadas = atuais
+            self._salvar_indices()
+            print(f"💾 Cache persistente atualizado: {self.armazenamento.arquivo}")
+        except Exception as e:
+            print(f"⚠️ Erro ao gravar estatísticas do cache: {e}")
+    
     def salvar_cache_arquivo(self, arquivo: str = "cache_oab.json"):
         """Salva cache em arquivo para persistência"""
         try:
-            dados_cache = {}
-            for chave, resultado in self.cache.items():
-                dados_cache[chave] = {
-                    'numero_oab': resultado.numero_oab,
-                    'estado': resultado.estado,
-                    'nome': resultado.nome,
-                    'erro': resultado.erro,
-                    'sucesso': resultado.sucesso,
-                    'timestamp': resultado.timestamp.isoformat()
-                }
+            dados_cache = {str(chave): resultado.para_dict() for chave, resultado in self.cache.itens()}
             
             with open(arquivo, 'w', encoding='utf-8') as f:
                 json.dump({
                     'cache': dados_cache,
-                    'estatisticas': self.estatisticas
+                    'estatisticas': self.estatisticas.copia()
                 }, f, indent=2, ensure_ascii=False)
             
             print(f"💾 Cache salvo em: {arquivo}")
@@ -255,18 +878,12 @@ class CacheConsultas:
             # Carregar cache
             cache_dados = dados.get('cache', {})
             for chave, item in cache_dados.items():
-                resultado = ResultadoCache(
-                    numero_oab=item['numero_oab'],
-                    estado=item['estado'],
-                    nome=item.get('nome'),
-                    erro=item.get('erro'),
-                    sucesso=item.get('sucesso', False),
-                    timestamp=datetime.fromisoformat(item['timestamp'])
-                )
+                resultado = ResultadoCache.de_dict(item)
+                self.faixas.aprender(self._chave_de_entrada(chave, item), resultado.classe)
                 
                 # Verificar se não expirou
                 if not self._cache_expirado(resultado):
-                    self.cache[chave] = resultado
+                    self.cache.inserir(self._chave_de_entrada(chave, item), resultado)
             
             # Carregar estatísticas
             if 'estatisticas' in dados:
@@ -364,31 +981,59 @@ class SupabaseConnector:
         Returns:
             True se é OAB válida, False caso contrário
         """
-        try:
-            usuarios_clean = usuarios_str.strip().upper()
-            
-            # Deve ter pelo menos 5 caracteres (estado + 3 dígitos mínimo)
-            if len(usuarios_clean) < 5:
-                return False
-            
-            # Deve começar com estado válido (2 letras)
-            possivel_estado = usuarios_clean[:2]
-            if possivel_estado not in estados_validos:
-                return False
-            
-            # Resto deve ser número
-            resto = usuarios_clean[2:]
-            if not resto.isdigit():
-                return False
+        chave = interpretar_oab(usuarios_str)
+        return chave is not None and chave.estado in estados_validos
+    
+    def buscar_nomes_resolvidos(self, usuarios: List[str], tamanho_lote: int = 100,
+                                tamanho_pagina: int = 1000) -> Dict[str, Dict[str, int]]:
+        """
+        Busca nomes já preenchidos em outras linhas para os mesmos usuários
+        
+        O filtro IN compara o texto exato da coluna: cada usuário é procurado
+        como veio e normalizado (maiúsculas, sem espaços nas bordas). Linhas
+        gravadas em outra grafia (ex.: "sp388221") não são encontradas
+        
+        Args:
+            usuarios: Valores de usuario (OAB) a procurar
+            tamanho_lote: Usuários por filtro IN
+            tamanho_pagina: Linhas por página da consulta
             
-            # Número deve ter tamanho apropriado
-            if len(resto) < 4 or len(resto) > 8:
-                return False
+        Returns:
+            Dict usuario normalizado -> {nome: quantidade de linhas com esse nome}
+        """
+        nomes: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        usuarios = sorted({valor for usuario in usuarios for valor in (usuario, usuario.strip().upper())})
+        
+        try:
+            for inicio in range(0, len(usuarios), tamanho_lote):
+                lote = usuarios[inicio:inicio + tamanho_lote]
+                pagina = 0
+                
+                while True:
+                    response = (self.client.table('erros_processados')
+                                .select('usuario, nome_procurador')
+                                .in_('usuario', lote)
+                                .not_.is_('nome_procurador', 'null')
+                                .range(pagina * tamanho_pagina, (pagina + 1) * tamanho_pagina - 1)
+                                .execute())
+                    linhas = response.data or []
+                    
+                    for item in linhas:
+                        nome = (item.get('nome_procurador') or '').strip()
+                        # Linhas marcadas como erro não são nomes resolvidos
+                        if nome and not nome.upper().startswith('ERRO'):
+                            nomes[item['usuario'].strip().upper()][nome] += 1
+                    
+                    if len(linhas) < tamanho_pagina:
+                        break
+                    pagina += 1
             
-            return True
+            print(f"📚 Nomes já resolvidos no banco: {len(nomes)} usuários")
+            return {usuario: dict(contagem) for usuario, contagem in nomes.items()}
             
-        except Exception:
-            return False
+        except Exception as e:
+            print(f"❌ Erro ao buscar nomes resolvidos: {e}")
+            return {usuario: dict(contagem) for usuario, contagem in nomes.items()}
     
     def atualizar_nome_procurador(self, registro_id: int, nome_procurador: str) -> bool:
         """
@@ -435,6 +1080,40 @@ class SupabaseConnector:
         
         return sucessos
     
+    def substituir_nome_procurador(self, usuario: str, nome_anterior: str, nome_procurador: str) -> int:
+        """
+        Grava um nome corrigido nas linhas da OAB que ainda estão pendentes ou
+        que têm o nome anterior (linhas com outro nome não são tocadas)
+        
+        Args:
+            usuario: Valor de usuario (OAB) das linhas
+            nome_anterior: Nome gravado antes ("" = só as pendentes)
+            nome_procurador: Nome novo
+            
+        Returns:
+            Número de registros atualizados
+        """
+        atualizados = 0
+        try:
+            response = (self.client.table('erros_processados')
+                        .update({'nome_procurador': nome_procurador})
+                        .eq('usuario', usuario)
+                        .is_('nome_procurador', 'null')
+                        .execute())
+            atualizados += len(response.data or [])
+            
+            if nome_anterior:
+                response = (self.client.table('erros_processados')
+                            .update({'nome_procurador': nome_procurador})
+                            .eq('usuario', usuario)
+                            .eq('nome_procurador', nome_anterior)
+                            .execute())
+                atualizados += len(response.data or [])
+        except Exception as e:
+            print(f"❌ Erro ao substituir nome de {usuario}: {e}")
+        
+        return atualizados
+    
     def marcar_erro_consulta(self, registro_id: int, erro: str) -> bool:
         """
         Marca um registro como erro de consulta
@@ -475,11 +1154,112 @@ class SupabaseConnector:
                 sucessos += 1
         
         return sucessos
+    
+    # ===========================================
+    # CACHE L2 (tabela cache_consultas_oab)
+    # ===========================================
+    
+    def buscar_cache_compartilhado(self, chaves: List[ChaveOAB], tamanho_lote: int = 200) -> Dict[ChaveOAB, Dict]:
+        """
+        Lê em lote as consultas já feitas por qualquer máquina
+        
+        Args:
+            chaves: OABs a procurar
+            tamanho_lote: Números por filtro IN (por UF)
+            
+        Returns:
+            Dict ChaveOAB -> entrada no formato do cache_oab.json
+        """
+        por_estado: Dict[str, List[int]] = defaultdict(list)
+        for chave in set(chaves):
+            por_estado[chave.estado].append(chave.numero)
+        
+        entradas: Dict[ChaveOAB, Dict] = {}
+        try:
+            for estado, numeros in por_estado.items():
+                numeros.sort()
+                for inicio in range(0, len(numeros), tamanho_lote):
+                    response = (self.client.table(TABELA_CACHE_L2)
+                                .select('estado, numero, nome, erro, sucesso, classe, consultado_em')
+                                .eq('estado', estado)
+                                .in_('numero', numeros[inicio:inicio + tamanho_lote])
+                                .execute())
+                    for linha in response.data or []:
+                        chave = chave_oab(linha['numero'], linha['estado'])
+                        if chave is None:
+                            continue
+                        # timestamptz -> horário local sem fuso (como o cache local grava)
+                        consultado_em = datetime.fromisoformat(linha['consultado_em']).astimezone()
+                        entradas[chave] = {
+                            'numero_oab': chave.inscricao,
+                            'estado': chave.estado,
+                            'nome': linha.get('nome'),
+                            'erro': linha.get('erro'),
+                            'sucesso': bool(linha.get('sucesso')),
+                            'timestamp': consultado_em.replace(tzinfo=None).isoformat(),
+                            'classe': linha.get('classe') or ''
+                        }
+            
+            print(f"🌐 Cache L2: {len(entradas)}/{len(set(chaves))} OABs já consultadas por outras máquinas")
+        except Exception as e:
+            print(f"⚠️ Erro ao ler cache L2: {e}")
+        
+        return entradas
+    
+    def gravar_cache_compartilhado(self, entradas: List[Dict], tamanho_lote: int = 500) -> int:
+        """
+        Grava em lote as consultas feitas aqui pela função do banco
+        gravar_cache_consultas_oab: a linha de uma OAB só é substituída se
+        consultado_em for mais novo (um envio atrasado de outra máquina não
+        sobrescreve uma consulta mais recente)
+        
+        Args:
+            entradas: Entradas no formato do cache_oab.json
+            tamanho_lote: Linhas por chamada
+            
+        Returns:
+            Quantidade de linhas inseridas ou atualizadas no L2
+        """
+        linhas = {}
+        for entrada in entradas:
+            chave = chave_oab(entrada['numero_oab'], entrada['estado'])
+            if chave is None:
+                continue
+            consultado_em = datetime.fromisoformat(entrada['timestamp']).astimezone()
+            # Uma linha por OAB no lote (a mais recente): o upsert não aceita repetidas
+            anterior = linhas.get(chave)
+            if anterior is not None and anterior[0] >= consultado_em:
+                continue
+            linhas[chave] = (consultado_em, {
+                'estado': chave.estado,
+                'numero': chave.numero,
+                'nome': entrada.get('nome'),
+                'erro': entrada.get('erro'),
+                'sucesso': bool(entrada.get('sucesso')),
+                'classe': entrada.get('classe'),
+                'consultado_em': consultado_em.isoformat()
+            })
+        
+        linhas = [linha for _, linha in linhas.values()]
+        gravadas = 0
+        for inicio in range(0, len(linhas), tamanho_lote):
+            lote = linhas[inicio:inicio + tamanho_lote]
+            response = self.client.rpc(FUNCAO_GRAVAR_CACHE_L2, {'linhas': lote}).execute()
+            gravadas += int(response.data or 0)
+        
+        return gravadas
 
 class OABSupabaseIntegrator:
     """Classe principal que integra o Bot OAB com Supabase - VERSÃO COM CACHE"""
     
-    def __init__(self, supabase_url: str, supabase_key: str, usar_cache_persistente: bool = True):
+    def __init__(self, supabase_url: str, supabase_key: str, usar_cache_persistente: bool = True,
+                 arquivo_cache_db: Optional[str] = None, usar_diario_cache: bool = False,
+                 max_entradas_cache: Optional[int] = Config.CACHE_MAX_ENTRADAS,
+                 max_bytes_cache: Optional[int] = Config.CACHE_MAX_BYTES, aquecer_cache: bool = True,
+                 cache_compartilhado: bool = False, renovar_em_segundo_plano: bool = False,
+                 arquivo_cache_registros: Optional[str] = None, usar_filtro_bloom: bool = True,
+                 consultar_improvaveis: bool = True, cache_l2_supabase: bool = False,
+                 lote_cache_l2: int = 50):
         """
         Inicializa o integrador
         
@@ -487,26 +1267,95 @@ class OABSupabaseIntegrator:
             supabase_url: URL do Supabase
             supabase_key: Chave de API do Supabase
             usar_cache_persistente: Se deve salvar/carregar cache de arquivo
+            arquivo_cache_db: Banco SQLite do cache (None = cache_oab.json)
+            usar_diario_cache: Grava cada consulta em um diário append-only e
+                compacta no cache_oab.json (em vez de reescrevê-lo inteiro)
+            max_entradas_cache: Limite de entradas do cache em memória (LRU;
+                None = sem limite; só com SQLite/registros/diário)
+            max_bytes_cache: Limite de bytes do cache em memória (None = sem
+                limite; só com SQLite/registros/diário)
+            aquecer_cache: Antes de consultar o site, usa os nomes já
+                preenchidos em outras linhas de erros_processados
+            cache_compartilhado: Vários integradores na mesma máquina usam o
+                mesmo banco SQLite (arquivo_cache_db ou cache_oab.db)
+            renovar_em_segundo_plano: Entradas antigas (mas ainda válidas) são
+                usadas na hora e reconsultadas em segundo plano
+            arquivo_cache_registros: Índice de registros via mmap (cache_oab.idx),
+                para caches com milhões de OABs (um único processo gravando)
+            usar_filtro_bloom: OABs que com certeza não estão no banco/registros
+                são descartadas sem consultá-los (filtro salvo em <arquivo>.bloom)
+            consultar_improvaveis: OABs muito acima da faixa confirmada
+                na UF vão para o fim da fila; com False ficam pendentes (não são
+                consultadas nem marcadas como erro)
+            cache_l2_supabase: Usa a tabela cache_consultas_oab como cache
+                compartilhado entre máquinas (lida em lote antes de abrir o
+                navegador; consultas novas gravadas em lote)
+            lote_cache_l2: Consultas novas acumuladas antes de cada envio ao L2
         """
         self.supabase = SupabaseConnector(supabase_url, supabase_key)
         self.bot_oab = None
         
         # 🔄 NOVO: Sistema de cache
-        self.cache = CacheConsultas(expirar_apos_horas=24)
-        self.usar_cache_persistente = usar_cache_persistente
+        armazenamento = None
+        diario = None
+        if cache_compartilhado:
+            # Entre processos só o SQLite é seguro (o JSON seria sobrescrito)
+            armazenamento = ArmazenamentoSQLite(arquivo_cache_db or ARQUIVO_DB_PADRAO)
+        elif usar_cache_persistente and arquivo_cache_registros:
+            armazenamento = ArquivoRegistrosOAB(arquivo_cache_registros)
+        elif usar_cache_persistente and arquivo_cache_db:
+            armazenamento = ArmazenamentoSQLite(arquivo_cache_db)
+        elif usar_cache_persistente and usar_diario_cache:
+            diario = DiarioCache(limite_registros=Config.CACHE_LIMITE_DIARIO)
+        
+        arquivo_filtro = None
+        arquivo_faixas = None
+        if armazenamento is not None:
+            arquivo_faixas = f"{armazenamento.arquivo}.faixas.json"
+            if usar_filtro_bloom:
+                arquivo_filtro = f"{armazenamento.arquivo}.bloom"
+        
+        self.cache = CacheConsultas(armazenamento=armazenamento, diario=diario,
+                                    validade_por_classe=Config.obter_validade_cache(),
+                                    max_entradas=max_entradas_cache, max_bytes=max_bytes_cache,
+                                    compartilhado=cache_compartilhado,
+                                    renovar_apos_horas=Config.obter_renovacao_cache() if renovar_em_segundo_plano else None,
+                                    arquivo_filtro=arquivo_filtro, arquivo_faixas=arquivo_faixas,
+                                    compartilhar_l2=cache_l2_supabase)
+        self.usar_cache_persistente = usar_cache_persistente or cache_compartilhado
+        self.aquecer_cache = aquecer_cache
+        self.consultar_improvaveis = consultar_improvaveis
+        self.cache_l2_supabase = cache_l2_supabase
+        self.lote_cache_l2 = lote_cache_l2
+        
+        # Renovação em segundo plano: uma thread reconsulta as entradas antigas;
+        # o navegador é compartilhado com a thread principal via _lock_bot
+        self.renovar_em_segundo_plano = renovar_em_segundo_plano
+        self._lock_bot = threading.RLock()
+        self._fila_renovacao: "queue.Queue[Optional[ChaveOAB]]" = queue.Queue()
+        self._renovacoes_pendentes: Set = set()
+        self._lock_renovacao = threading.Lock()
+        self._parar_renovacao = threading.Event()
+        self._thread_renovacao: Optional[threading.Thread] = None
         
         # Carregar cache persistente se habilitado
         if self.usar_cache_persistente:
-            self.cache.carregar_cache_arquivo()
+            self.cache.carregar()
         
-        self.estatisticas = {
+        self.estatisticas = ContadoresAtomicos({
             'total_processados': 0,
             'sucessos': 0,
             'erros': 0,
             'tempo_inicio': time.time(),
             'consultas_evitadas': 0,  # NOVO: consultas evitadas pelo cache
-            'registros_duplicados': 0  # NOVO: registros com OAB duplicada
-        }
+            'registros_duplicados': 0,  # NOVO: registros com OAB duplicada
+            'oabs_aquecidas': 0,  # OABs resolvidas pelas próprias linhas do banco
+            'renovacoes_agendadas': 0,  # Entradas antigas usadas e reconsultadas
+            'renovacoes_concluidas': 0,
+            'oabs_improvaveis': 0,  # Acima da faixa confirmada na UF
+            'oabs_cache_l2': 0,  # Resolvidas por consultas de outras máquinas
+            'enviadas_cache_l2': 0
+        })
     
     def iniciar_bot(self) -> bool:
         """
@@ -517,7 +1366,7 @@ class OABSupabaseIntegrator:
         """
         try:
             print("🤖 Iniciando Bot OAB...")
-            self.bot_oab = BotOABCorrigido(headless=True, timeout=15)
+            self.bot_oab = BotOABCorrigido(headless=True, timeout=15, ocr_detalhes=self.criar_ocr_detalhes())
             
             if not self.bot_oab.acessar_site():
                 print("❌ Falha ao acessar site da OAB")
@@ -530,6 +1379,71 @@ class OABSupabaseIntegrator:
             print(f"❌ Erro ao iniciar bot: {e}")
             return False
     
+    def criar_ocr_detalhes(self) -> Optional[OCRDetalhes]:
+        """
+        OCR da imagem de detalhes conforme o Config (adiado, servidor OCR, léxico)
+        
+        Returns:
+            OCRDetalhes, ou None se Config.OCR_DETALHES estiver desligado
+        """
+        if not Config.OCR_DETALHES:
+            return None
+        
+        if Config.OCR_ADIADO:
+            print(f"🌙 OCR de detalhes adiado: imagens no spool {Config.OCR_PASTA_SPOOL}")
+            return OCRDetalhes(spool=SpoolOCR(Config.OCR_PASTA_SPOOL))
+        
+        cliente_ocr = None
+        if Config.OCR_USAR_SERVIDOR:
+            if Config.OCR_SERVIDOR_CHAVE:
+                cliente_ocr = ClienteOCR(Config.OCR_SERVIDOR_CHAVE,
+                                         (Config.OCR_SERVIDOR_HOST, Config.OCR_SERVIDOR_PORTA))
+                print(f"🔍 OCR de detalhes pelo servidor {Config.OCR_SERVIDOR_HOST}:{Config.OCR_SERVIDOR_PORTA}")
+            else:
+                print("⚠️ OCR_SERVIDOR_CHAVE não definida, usando OCR local")
+        
+        # Nomes do mesmo cache da consulta (cache_oab.json no modo JSON/diário)
+        lexico = None
+        if Config.OCR_LEXICO:
+            lexico = LexicoOCR(arquivo_cache=Config.CACHE_ARQUIVO_JSON, armazenamento=self.cache.armazenamento)
+        
+        return OCRDetalhes(cliente_ocr=cliente_ocr, lexico=lexico)
+    
+    def aplicar_ocr_adiado(self, resultados: List[ResultadoOAB]) -> int:
+        """
+        Grava no cache e no Supabase os nomes lidos pelo OCR adiado
+        (run_ocr_adiado.py) que diferem do que a consulta gravou
+        
+        Args:
+            resultados: Resultados devolvidos por processar_spool
+            
+        Returns:
+            Número de registros atualizados no Supabase
+        """
+        entradas = 0
+        atualizados = 0
+        for resultado in resultados:
+            chave = resultado.chave
+            if chave is None or not resultado.sucesso:
+                continue
+            nome_limpo = self.limpar_nome(resultado.nome)
+            if not nome_limpo:
+                continue
+            
+            nome_anterior = self.cache.atualizar_nome(chave.inscricao, chave.estado, resultado.nome)
+            if nome_anterior is None:
+                continue
+            entradas += 1
+            
+            # As linhas do banco receberam o nome anterior já limpo
+            atualizados += self.supabase.substituir_nome_procurador(
+                chave.usuario, self.limpar_nome(nome_anterior) if nome_anterior else "", nome_limpo)
+        
+        if entradas and self.usar_cache_persistente:
+            self.cache.persistir()
+        print(f"🌙 OCR adiado: {entradas} entradas do cache e {atualizados} registros atualizados")
+        return atualizados
+    
     def extrair_numero_oab(self, usuarios_str: str) -> Tuple[Optional[str], Optional[str]]:
         """
         Extrai número OAB e estado da string usuarios
@@ -541,55 +1455,14 @@ class OABSupabaseIntegrator:
         Returns:
             Tupla (numero_oab, estado) ou (None, None) se não encontrar
         """
-        try:
-            # Limpar string
-            usuarios_clean = usuarios_str.strip().upper()
-            
-            # VALIDAÇÃO 1: Deve começar com estado válido (2 letras)
-            estados_validos = ['AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DF', 'ES', 'GO', 
-                             'MA', 'MT', 'MS', 'MG', 'PA', 'PB', 'PR', 'PE', 'PI', 
-                             'RJ', 'RN', 'RS', 'RO', 'RR', 'SC', 'SP', 'SE', 'TO']
-            
-            # Verificar se começa com estado válido
-            if len(usuarios_clean) < 3:
-                return None, None
-            
-            possivel_estado = usuarios_clean[:2]
-            
-            if possivel_estado not in estados_validos:
-                return None, None
-            
-            # VALIDAÇÃO 2: Resto deve ser número
-            resto = usuarios_clean[2:]
-            
-            if not resto.isdigit():
-                return None, None
-            
-            # VALIDAÇÃO 3: Número deve ter tamanho apropriado
-            if len(resto) < 4 or len(resto) > 8:
-                return None, None
-            
-            estado = possivel_estado
-            numero = resto
-            
-            # REGRA ESPECIAL: Remover zero inicial se existir
-            if numero.startswith('0') and len(numero) > 1:
-                numero_original = numero
-                numero = numero.lstrip('0')
-                
-                # Verificar se restou algum número após remover zeros
-                if not numero:
-                    print(f"⚠️ Número inválido (só zeros): {usuarios_str}")
-                    return None, None
-                
-                print(f"🔧 Zero inicial removido: {numero_original} → {numero}")
-            
-            return numero, estado
-            
-        except Exception as e:
+        chave = interpretar_oab(usuarios_str)
+        if chave is None:
             return None, None
+        
+        # Zeros à esquerda já removidos: SP012345 e SP12345 viram a mesma OAB
+        return chave.inscricao, chave.estado
     
-    def agrupar_registros_por_oab(self, registros: List[RegistroErro]) -> Dict[str, List[RegistroErro]]:
+    def agrupar_registros_por_oab(self, registros: List[RegistroErro]) -> Dict[ChaveOAB, List[RegistroErro]]:
         """
         NOVO: Agrupa registros por número OAB para evitar consultas duplicadas
         
@@ -597,16 +1470,15 @@ class OABSupabaseIntegrator:
             registros: Lista de registros
             
         Returns:
-            Dict onde chave é "NUMERO/ESTADO" e valor é lista de registros
+            Dict onde chave é a ChaveOAB canônica e valor é lista de registros
         """
         grupos = defaultdict(list)
         registros_invalidos = []
         
         for registro in registros:
-            numero_oab, estado = self.extrair_numero_oab(registro.usuario)
+            chave = interpretar_oab(registro.usuario)
             
-            if numero_oab and estado:
-                chave = f"{numero_oab}/{estado}"
+            if chave:
                 grupos[chave].append(registro)
             else:
                 registros_invalidos.append(registro)
@@ -637,6 +1509,137 @@ class OABSupabaseIntegrator:
         
         return dict(grupos)
     
+    def aquecer_cache_resolvidos(self, grupos_oab: Dict[ChaveOAB, List[RegistroErro]]) -> int:
+        """
+        Pré-passo: carrega no cache os nomes que o banco já tem para as OABs pendentes
+        Linhas pendentes cobertas por esses nomes são preenchidas sem consultar o site
+        
+        Args:
+            grupos_oab: Grupos ChaveOAB -> registros pendentes
+            
+        Returns:
+            Quantidade de OABs incluídas no cache
+        """
+        usuarios_por_oab = {
+            oab_key: {registro.usuario.strip().upper() for registro in registros}
+            for oab_key, registros in grupos_oab.items()
+        }
+        # Valores como estão no banco (a busca acrescenta a forma normalizada)
+        todos_usuarios = {registro.usuario for registros in grupos_oab.values() for registro in registros}
+        if not todos_usuarios:
+            return 0
+        
+        print(f"\n🔥 Aquecendo cache com nomes já resolvidos no banco...")
+        resolvidos = self.supabase.buscar_nomes_resolvidos(list(todos_usuarios))
+        
+        aquecidas = 0
+        conflitos = 0
+        for oab_key, usuarios in usuarios_por_oab.items():
+            # Soma as variantes do mesmo usuário (ex.: SP012345 e SP12345)
+            contagem = defaultdict(int)
+            for usuario in usuarios:
+                for nome, quantidade in resolvidos.get(usuario, {}).items():
+                    nome_limpo = self.limpar_nome(nome)
+                    if nome_limpo:
+                        contagem[nome_limpo] += quantidade
+            
+            if not contagem:
+                continue
+            if len(contagem) > 1:
+                conflitos += 1
+            
+            # Nome mais frequente entre as linhas já resolvidas
+            nome = max(contagem.items(), key=lambda item: item[1])[0]
+            if self.cache.aquecer(oab_key.inscricao, oab_key.estado, nome):
+                aquecidas += 1
+        
+        self.estatisticas.incrementar('oabs_aquecidas', aquecidas)
+        print(f"🔥 OABs resolvidas pelo próprio banco: {aquecidas}/{len(grupos_oab)}")
+        if conflitos:
+            print(f"⚠️ OABs com nomes divergentes no banco (usado o mais frequente): {conflitos}")
+        
+        return aquecidas
+    
+    def carregar_cache_l2(self, grupos_oab: Dict[ChaveOAB, List[RegistroErro]]) -> int:
+        """
+        Pré-passo: lê em lote do cache L2 as OABs pendentes que não estão no
+        cache local
+        
+        Args:
+            grupos_oab: Grupos ChaveOAB -> registros pendentes
+            
+        Returns:
+            Quantidade de OABs incluídas no cache local
+        """
+        ausentes = [k for k in grupos_oab if not self.cache.em_cache(k.inscricao, k.estado)]
+        if not ausentes:
+            return 0
+        
+        print(f"\n🌐 Consultando cache L2 para {len(ausentes)} OABs...")
+        incluidas = self.cache.importar_compartilhado(self.supabase.buscar_cache_compartilhado(ausentes))
+        self.estatisticas.incrementar('oabs_cache_l2', incluidas)
+        print(f"🌐 OABs resolvidas pelo cache L2: {incluidas}/{len(ausentes)}")
+        return incluidas
+    
+    def enviar_cache_l2(self) -> int:
+        """
+        Envia em lote ao cache L2 as consultas novas desta máquina
+        
+        Returns:
+            Quantidade de entradas enviadas (0 se falhar; elas voltam para a fila)
+        """
+        fila = self.cache.retirar_fila_l2()
+        if not fila:
+            return 0
+        try:
+            enviadas = self.supabase.gravar_cache_compartilhado(fila)
+        except Exception as e:
+            print(f"⚠️ Erro ao gravar cache L2 (tentará de novo): {e}")
+            self.cache.devolver_fila_l2(fila)
+            return 0
+        
+        self.estatisticas.incrementar('enviadas_cache_l2', enviadas)
+        print(f"🌐 Cache L2 atualizado: {enviadas} consultas enviadas")
+        return enviadas
+    
+    def priorizar_grupos(self, grupos_oab: Dict[ChaveOAB, List[RegistroErro]]) -> Dict[ChaveOAB, List[RegistroErro]]:
+        """
+        Separa as OABs improváveis (muito acima da faixa confirmada
+        na UF) que ainda exigiriam consulta ao site
+        
+        Args:
+            grupos_oab: Grupos ChaveOAB -> registros pendentes
+            
+        Returns:
+            Grupos reordenados: improváveis no fim (ou removidos, se
+            consultar_improvaveis=False)
+        """
+        provaveis = {}
+        improvaveis = {}
+        for oab_key, registros in grupos_oab.items():
+            if self.cache.improvavel(oab_key.inscricao, oab_key.estado) and \
+                    not self.cache.em_cache(oab_key.inscricao, oab_key.estado):
+                improvaveis[oab_key] = registros
+            else:
+                provaveis[oab_key] = registros
+        
+        if not improvaveis:
+            return grupos_oab
+        
+        self.estatisticas.incrementar('oabs_improvaveis', len(improvaveis))
+        print(f"\n📏 OABs improváveis para a seccional: {len(improvaveis)}")
+        for oab_key in improvaveis:
+            print(f"   {oab_key.usuario} (maior provável em {oab_key.estado}: "
+                  f"{self.cache.faixas.limite(oab_key.estado)})")
+        
+        if not self.consultar_improvaveis:
+            print("⏭️ Improváveis ficam pendentes nesta execução")
+            return provaveis
+        
+        print("⏬ Improváveis serão consultadas por último")
+        provaveis.update(improvaveis)
+        return provaveis
+    
     def contem_palavra_advogado(self, nome: str) -> bool:
         """
         Verifica se o nome contém a palavra 'advogado' ou suas variações
@@ -665,38 +1668,177 @@ class OABSupabaseIntegrator:
         
         return False
     
-    def processar_oab_unica(self, numero_oab: str, estado: str) -> ResultadoOAB:
+    def processar_oab_unica(self, numero_oab: str, estado: str,
+                            aceitar_desatualizado: Optional[bool] = None) -> ResultadoOAB:
         """
         NOVO: Processa uma OAB única, usando cache se disponível
         
         Args:
             numero_oab: Número da OAB
             estado: Estado da OAB
+            aceitar_desatualizado: Usa a entrada antiga (ainda válida) e agenda a
+                renovação em segundo plano (None = renovar_em_segundo_plano)
             
         Returns:
-            ResultadoOAB com o resultado
+            ResultadoOAB com o resultado (erro ERRO_EM_CONSULTA se outro
+            worker ainda está com a OAB reservada depois da espera)
         """
-        # 1. Verificar cache primeiro
+        if aceitar_desatualizado is None:
+            aceitar_desatualizado = self.renovar_em_segundo_plano
+        
+        # 1. Verificar cache primeiro (entradas expiradas nem chegam aqui)
         resultado_cache = self.cache.consultar_cache(numero_oab, estado)
         
         if resultado_cache:
-            # Usar resultado do cache
-            resultado = ResultadoOAB(inscricao=numero_oab, estado=estado)
+            if aceitar_desatualizado and self.cache.precisa_renovar(resultado_cache):
+                self.agendar_renovacao(numero_oab, estado)
+            return self._resultado_do_cache(numero_oab, estado, resultado_cache)
+        
+        # 1.1 Outro worker já está consultando esta OAB: aguardar o resultado dele
+        if not self.cache.reservar_consulta(numero_oab, estado):
+            print(f"⏳ {numero_oab}/{estado} em consulta por outro worker, aguardando...")
+            resultado_cache = self.cache.aguardar_consulta(numero_oab, estado)
+            if resultado_cache:
+                return self._resultado_do_cache(numero_oab, estado, resultado_cache)
+            
+            # Reserva liberada sem resultado: tenta de novo; se outro worker
+            # ainda (ou já) está com ela, não consulta em dobro
+            if not self.cache.reservar_consulta(numero_oab, estado):
+                print(f"⏭️ {numero_oab}/{estado} segue em consulta por outro worker, fica pendente")
+                return ResultadoOAB(inscricao=numero_oab, estado=estado, erro=ERRO_EM_CONSULTA)
+        
+        try:
+            return self._consultar_site(numero_oab, estado)
+        finally:
+            self.cache.liberar_consulta(numero_oab, estado)
+    
+    def _resultado_do_cache(self, numero_oab: str, estado: str, resultado_cache: ResultadoCache) -> ResultadoOAB:
+        """Converte a entrada do cache no ResultadoOAB da consulta"""
+        resultado = ResultadoOAB(inscricao=numero_oab, estado=estado)
+        
+        if resultado_cache.sucesso:
+            resultado.nome = resultado_cache.nome
+            resultado.sucesso = True
+            print(f"📋 Cache: {numero_oab}/{estado} → {resultado_cache.nome}")
+        else:
+            resultado.erro = resultado_cache.erro
+            resultado.sucesso = False
+            print(f"📋 Cache: {numero_oab}/{estado} → ERRO: {resultado_cache.erro}")
+        
+        return resultado
+    
+    # ===========================================
+    # RENOVAÇÃO EM SEGUNDO PLANO (STALE-WHILE-REVALIDATE)
+    # ===========================================
+    
+    def agendar_renovacao(self, numero_oab: str, estado: str) -> bool:
+        """
+        Agenda a reconsulta de uma OAB cuja entrada no cache está antiga
+        
+        Returns:
+            True se foi agendada (False se já estava na fila)
+        """
+        chave = chave_oab(numero_oab, estado)
+        with self._lock_renovacao:
+            if chave is None or chave in self._renovacoes_pendentes or self._parar_renovacao.is_set():
+                return False
+            self._renovacoes_pendentes.add(chave)
+        self._fila_renovacao.put(chave)
+        self.estatisticas.incrementar('renovacoes_agendadas')
+        print(f"🔁 Renovação agendada: {chave}")
+        
+        with self._lock_renovacao:
+            if not self._thread_renovacao or not self._thread_renovacao.is_alive():
+                self._thread_renovacao = threading.Thread(target=self._executar_renovacoes, daemon=True)
+                self._thread_renovacao.start()
+        return True
+    
+    def _executar_renovacoes(self):
+        """Thread de renovação: reconsulta as OABs da fila até ser parada"""
+        while not self._parar_renovacao.is_set():
+            chave = self._fila_renovacao.get()
+            if chave is None:
+                break
             
-            if resultado_cache.sucesso:
-                resultado.nome = resultado_cache.nome
-                resultado.sucesso = True
-                print(f"📋 Cache: {numero_oab}/{estado} → {resultado_cache.nome}")
-            else:
-                resultado.erro = resultado_cache.erro
-                resultado.sucesso = False
-                print(f"📋 Cache: {numero_oab}/{estado} → ERRO: {resultado_cache.erro}")
+            try:
+                # Outro worker já está consultando: o resultado dele renova a entrada
+                if self.cache.reservar_consulta(chave.inscricao, chave.estado):
+                    try:
+                        self._consultar_site(chave.inscricao, chave.estado, renovacao=True)
+                        self.estatisticas.incrementar('renovacoes_concluidas')
+                    finally:
+                        self.cache.liberar_consulta(chave.inscricao, chave.estado)
+            except Exception as e:
+                print(f"⚠️ Erro ao renovar {chave}: {e}")
+            finally:
+                with self._lock_renovacao:
+                    self._renovacoes_pendentes.discard(chave)
+    
+    def parar_renovacoes(self, timeout: Optional[float] = None):
+        """
+        Encerra a thread de renovação (a consulta em andamento termina; as
+        renovações ainda na fila são descartadas e continuam antigas no cache)
+        
+        Args:
+            timeout: Tempo máximo de espera pela consulta em andamento
+        """
+        self._parar_renovacao.set()
+        self._fila_renovacao.put(None)
+        if self._thread_renovacao and self._thread_renovacao.is_alive():
+            self._thread_renovacao.join(timeout)
+        
+        with self._lock_renovacao:
+            nao_concluidas = len(self._renovacoes_pendentes)
+        if nao_concluidas:
+            print(f"🔁 Renovações não concluídas (ficam para a próxima execução): {nao_concluidas}")
+    
+    def _consultar_site(self, numero_oab: str, estado: str, renovacao: bool = False) -> ResultadoOAB:
+        """
+        Consulta a OAB no site (com novas tentativas) e grava no cache
+        O navegador é usado por uma thread de cada vez (principal ou renovação)
+        
+        Args:
+            numero_oab: Número da OAB
+            estado: Estado da OAB
+            renovacao: Reconsulta de uma entrada antiga; falhas passageiras não
+                substituem a entrada que ainda é válida
             
+        Returns:
+            ResultadoOAB com o resultado
+        """
+        with self._lock_bot:
+            resultado = self._consultar_site_com_tentativas(numero_oab, estado)
+        
+        # Navegador não abriu: nada foi consultado, nada a gravar
+        if not self.bot_oab:
             return resultado
         
+        # 3. Salvar no cache (tanto sucesso quanto erro)
+        if renovacao and classificar_resultado(resultado.sucesso, resultado.erro) == CLASSE_TRANSITORIO:
+            print(f"↩️ Renovação de {numero_oab}/{estado} falhou ({resultado.erro}); mantida a entrada anterior")
+        else:
+            self.cache.salvar_cache(numero_oab, estado, resultado)
+        
+        # Outras inscrições que vieram na mesma página (só nomes que passariam na limpeza)
+        adicionais = [(inscricao, uf, self.limpar_nome(nome))
+                      for inscricao, uf, nome in resultado.resultados_adicionais if self.limpar_nome(nome)]
+        if adicionais:
+            self.cache.salvar_adicionais(adicionais, chave_oab(numero_oab, estado))
+        
+        return resultado
+    
+    def _consultar_site_com_tentativas(self, numero_oab: str, estado: str) -> ResultadoOAB:
+        """Consulta no site com até 3 tentativas (não grava no cache)"""
         # 2. Cache miss - fazer consulta real
         print(f"🔍 Consultando OAB {numero_oab}/{estado} (nova consulta)")
         
+        # O navegador só é aberto quando alguma OAB realmente precisa do site
+        if not self.bot_oab and not self.iniciar_bot():
+            resultado = ResultadoOAB(inscricao=numero_oab, estado=estado)
+            resultado.erro = "Falha ao iniciar bot"
+            resultado.sucesso = False
+            return resultado
+        
         max_tentativas = 3  # Máximo de tentativas para refazer a consulta
         tentativa_atual = 0
         
@@ -725,9 +1867,6 @@ class OABSupabaseIntegrator:
                     else:
                         print(f"✅ Nome válido extraído: {resultado.nome}")
                 
-                # 3. Salvar no cache (tanto sucesso quanto erro)
-                self.cache.salvar_cache(numero_oab, estado, resultado)
-                
                 return resultado
                 
             except Exception as e:
@@ -739,9 +1878,6 @@ class OABSupabaseIntegrator:
                     resultado.erro = f"Erro na consulta após {max_tentativas} tentativas: {str(e)}"
                     resultado.sucesso = False
                     
-                    # Salvar erro no cache também
-                    self.cache.salvar_cache(numero_oab, estado, resultado)
-                    
                     return resultado
                 else:
                     continue  # Tentar novamente
@@ -752,12 +1888,12 @@ class OABSupabaseIntegrator:
         resultado.sucesso = False
         return resultado
     
-    def processar_grupo_registros(self, oab_key: str, registros: List[RegistroErro]) -> bool:
+    def processar_grupo_registros(self, oab_key: ChaveOAB, registros: List[RegistroErro]) -> bool:
         """
         NOVO: Processa um grupo de registros com a mesma OAB
         
         Args:
-            oab_key: Chave da OAB (formato: "NUMERO/ESTADO")
+            oab_key: Chave canônica da OAB (str: "NUMERO/ESTADO")
             registros: Lista de registros com a mesma OAB
             
         Returns:
@@ -766,14 +1902,16 @@ class OABSupabaseIntegrator:
         try:
             print(f"\n🔄 Processando grupo: {oab_key} ({len(registros)} registros)")
             
-            # Extrair número e estado
-            numero_oab, estado = oab_key.split('/')
-            
             # Fazer uma única consulta para todos os registros do grupo
-            resultado = self.processar_oab_unica(numero_oab, estado)
+            resultado = self.processar_oab_unica(oab_key.inscricao, oab_key.estado)
             
             registro_ids = [reg.id for reg in registros]
             
+            # O outro worker grava o resultado; aqui os registros ficam pendentes
+            if resultado.erro == ERRO_EM_CONSULTA:
+                print(f"⏭️ Mantidos pendentes: {len(registros)} registros")
+                return False
+            
             if resultado.sucesso and resultado.nome:
                 # Limpar e validar nome
                 nome_limpo = self.limpar_nome(resultado.nome)
@@ -785,7 +1923,7 @@ class OABSupabaseIntegrator:
                     print(f"✅ Sucesso: {nome_limpo}")
                     print(f"💾 Atualizados: {sucessos}/{len(registros)} registros")
                     
-                    self.estatisticas['sucessos'] += sucessos
+                    self.estatisticas.incrementar('sucessos', sucessos)
                     return True
                 else:
                     erro = "Nome inválido após limpeza"
@@ -794,7 +1932,7 @@ class OABSupabaseIntegrator:
                     print(f"❌ Erro: {erro}")
                     print(f"🚫 Marcados como erro: {erros_marcados}/{len(registros)} registros")
                     
-                    self.estatisticas['erros'] += erros_marcados
+                    self.estatisticas.incrementar('erros', erros_marcados)
                     return False
             else:
                 # Marcar erro para todos os registros do grupo
@@ -804,7 +1942,7 @@ class OABSupabaseIntegrator:
                 print(f"❌ Erro: {erro}")
                 print(f"🚫 Marcados como erro: {erros_marcados}/{len(registros)} registros")
                 
-                self.estatisticas['erros'] += erros_marcados
+                self.estatisticas.incrementar('erros', erros_marcados)
                 return False
                 
         except Exception as e:
@@ -813,7 +1951,7 @@ class OABSupabaseIntegrator:
             # Marcar erro para todos
             registro_ids = [reg.id for reg in registros]
             erros_marcados = self.supabase.marcar_erro_multiplos(registro_ids, str(e))
-            self.estatisticas['erros'] += erros_marcados
+            self.estatisticas.incrementar('erros', erros_marcados)
             
             return False
     
@@ -843,11 +1981,14 @@ class OABSupabaseIntegrator:
             print("❌ Nenhum registro com OAB válida encontrado")
             return self.obter_estatisticas()
         
+        # 2.1 Aquecer o cache com nomes já resolvidos em outras linhas
+        if self.aquecer_cache:
+            self.aquecer_cache_resolvidos(grupos_oab)
+        
         # 3. Calcular economia esperada
         todas_oabs = []
         for oab_key, regs in grupos_oab.items():
-            numero, estado = oab_key.split('/')
-            todas_oabs.extend([(numero, estado)] * len(regs))
+            todas_oabs.extend([(oab_key.inscricao, oab_key.estado)] * len(regs))
         
         economia = self.cache.calcular_economia(todas_oabs)
         
@@ -857,8 +1998,18 @@ class OABSupabaseIntegrator:
         print(f"⚡ Consultas evitadas: {economia['duplicatas_evitadas']}")
         print(f"📈 Economia: {economia['economia_percentual']:.1f}%")
         
-        # 4. Iniciar bot se necessário
-        if not self.bot_oab and not self.iniciar_bot():
+        # 2.2 Consultas já feitas por outras máquinas (cache L2)
+        if self.cache_l2_supabase:
+            self.carregar_cache_l2(grupos_oab)
+        
+        # 3.1 Números improváveis para a UF: fim da fila (ou ficam pendentes)
+        grupos_oab = self.priorizar_grupos(grupos_oab)
+        
+        # 4. Iniciar bot se necessário (nem abre o navegador se o cache cobrir tudo)
+        pendentes_site = [k for k in grupos_oab if not self.cache.em_cache(k.inscricao, k.estado)]
+        if not pendentes_site:
+            print("🎯 Todas as OABs já estão no cache: navegador não será aberto")
+        elif not self.bot_oab and not self.iniciar_bot():
             print("❌ Falha ao iniciar bot. Abortando...")
             return self.obter_estatisticas()
         
@@ -872,9 +2023,12 @@ class OABSupabaseIntegrator:
             
             try:
                 self.processar_grupo_registros(oab_key, registros_grupo)
-                self.estatisticas['total_processados'] += len(registros_grupo)
+                self.estatisticas.incrementar('total_processados', len(registros_grupo))
                 grupos_processados += 1
                 
+                if self.cache_l2_supabase and self.cache.tamanho_fila_l2() >= self.lote_cache_l2:
+                    self.enviar_cache_l2()
+                
                 # Pausa entre consultas para não sobrecarregar o servidor
                 if i < total_grupos:
                     print("⏳ Aguardando 2 segundos...")
@@ -885,12 +2039,14 @@ class OABSupabaseIntegrator:
                 break
             except Exception as e:
                 print(f"❌ Erro inesperado no grupo {oab_key}: {e}")
-                self.estatisticas['erros'] += len(registros_grupo)
+                self.estatisticas.incrementar('erros', len(registros_grupo))
                 continue
         
-        # 6. Salvar cache persistente se habilitado
+        # 6. Salvar cache persistente se habilitado (e enviar o restante ao L2)
+        if self.cache_l2_supabase:
+            self.enviar_cache_l2()
         if self.usar_cache_persistente:
-            self.cache.salvar_cache_arquivo()
+            self.cache.persistir()
         
         # 7. Mostrar estatísticas finais
         self.imprimir_estatisticas()
@@ -950,10 +2106,16 @@ class OABSupabaseIntegrator:
             'consultas_reais': total_consultas_reais,
             'consultas_evitadas': total_consultas_evitadas,
             'registros_duplicados': self.estatisticas['registros_duplicados'],
+            'oabs_aquecidas': self.estatisticas['oabs_aquecidas'],
+            'renovacoes_agendadas': self.estatisticas['renovacoes_agendadas'],
+            'renovacoes_concluidas': self.estatisticas['renovacoes_concluidas'],
+            'oabs_improvaveis': self.estatisticas['oabs_improvaveis'],
+            'oabs_cache_l2': self.estatisticas['oabs_cache_l2'],
+            'enviadas_cache_l2': self.estatisticas['enviadas_cache_l2'],
             'economia_percentual': (total_consultas_evitadas / max(1, total_consultas_reais + total_consultas_evitadas)) * 100,
             'cache_hits': self.cache.estatisticas['cache_hits'],
             'cache_misses': self.cache.estatisticas['cache_misses'],
-            'entradas_cache': len(self.cache.cache)
+            'entradas_cache': self.cache.total_entradas()
         }
     
     def formatar_tempo(self, segundos: float) -> str:
@@ -995,6 +2157,13 @@ class OABSupabaseIntegrator:
         print(f"⚡ Consultas evitadas (duplicatas): {stats['consultas_evitadas']}")
         print(f"📈 Economia de consultas: {stats['economia_percentual']:.1f}%")
         print(f"👥 Registros com OAB duplicada: {stats['registros_duplicados']}")
+        print(f"🔥 OABs resolvidas pelo próprio banco: {stats['oabs_aquecidas']}")
+        if stats['renovacoes_agendadas']:
+            print(f"🔁 Renovações em segundo plano: {stats['renovacoes_concluidas']}/{stats['renovacoes_agendadas']}")
+        if stats['oabs_improvaveis']:
+            print(f"📏 OABs improváveis para a seccional: {stats['oabs_improvaveis']}")
+        if self.cache_l2_supabase:
+            print(f"🌐 Cache L2: {stats['oabs_cache_l2']} OABs recebidas, {stats['enviadas_cache_l2']} enviadas")
         
         if stats['total_processados'] > 0:
             tempo_medio = stats['tempo_total_segundos'] / stats['consultas_reais'] if stats['consultas_reais'] > 0 else 0
@@ -1050,6 +2219,10 @@ class OABSupabaseIntegrator:
             # Processar usando cache
             resultado = self.processar_oab_unica(numero_oab, estado)
             
+            if resultado.erro == ERRO_EM_CONSULTA:
+                print(f"⏭️ Registro {registro_id} mantido pendente")
+                return False
+            
             if resultado.sucesso and resultado.nome:
                 nome_limpo = self.limpar_nome(resultado.nome)
                 
@@ -1077,40 +2250,39 @@ class OABSupabaseIntegrator:
     
     def limpar_cache_expirado(self):
         """NOVO: Remove entradas expiradas do cache"""
-        cache_limpo = {}
-        removidos = 0
-        
-        for chave, resultado in self.cache.cache.items():
-            if not self.cache._cache_expirado(resultado):
-                cache_limpo[chave] = resultado
-            else:
-                removidos += 1
-        
-        self.cache.cache = cache_limpo
+        removidos = self.cache.remover_expirados()
         
         if removidos > 0:
             print(f"🧹 Cache limpo: {removidos} entradas expiradas removidas")
-            print(f"📊 Entradas restantes: {len(self.cache.cache)}")
+            print(f"📊 Entradas restantes: {self.cache.total_entradas()}")
     
     def estatisticas_cache(self) -> Dict:
         """NOVO: Retorna estatísticas detalhadas do cache"""
         return {
-            'entradas_ativas': len(self.cache.cache),
+            'entradas_ativas': self.cache.total_entradas(),
             'cache_hits': self.cache.estatisticas['cache_hits'],
             'cache_misses': self.cache.estatisticas['cache_misses'],
             'consultas_novas': self.cache.estatisticas['consultas_novas'],
             'consultas_cache': self.cache.estatisticas['consultas_cache'],
             'taxa_hit': (self.cache.estatisticas['cache_hits'] / 
                         max(1, self.cache.estatisticas['cache_hits'] + self.cache.estatisticas['cache_misses'])) * 100,
-            'duplicatas_evitadas': self.cache.estatisticas['duplicatas_evitadas']
+            'duplicatas_evitadas': self.cache.estatisticas['duplicatas_evitadas'],
+            'memoria': self.cache.cache.metricas()
         }
     
     def fechar(self):
         """Fecha conexões e limpa recursos - VERSÃO COM CACHE"""
         try:
+            # A renovação em andamento ainda grava no cache antes de persistir
+            self.parar_renovacoes()
+            
+            # Consultas que ainda não foram para o cache L2
+            if self.cache_l2_supabase:
+                self.enviar_cache_l2()
+            
             # Salvar cache se habilitado
             if self.usar_cache_persistente:
-                self.cache.salvar_cache_arquivo()
+                self.cache.persistir()
                 print("💾 Cache salvo em arquivo")
             
             # Fechar bot
@@ -1124,6 +2296,13 @@ class OABSupabaseIntegrator:
             print(f"🎯 Taxa de acerto: {stats_cache['taxa_hit']:.1f}%")
             print(f"⚡ Duplicatas evitadas: {stats_cache['duplicatas_evitadas']}")
             
+            if self.cache.armazenamento:
+                if self.cache.compartilhado:
+                    self.cache.armazenamento.liberar_reservas_do_dono(self.cache.identificador + ':%')
+                self.cache.armazenamento.fechar()
+            if self.cache.diario:
+                self.cache.diario.fechar()
+            
             print("🔒 Recursos liberados")
             
         except Exception as e:
@@ -47,6 +47,80 @@ class Config:
     # Número máximo de tentativas por consulta
     MAX_TENTATIVAS = 3
     
+    # ===========================================
+    # CONFIGURAÇÕES DO SERVIDOR OCR
+    # ===========================================
+    
+    # OCR da imagem de detalhes (telefone, endereço, situação) em cada consulta
+    # do integrador; desligado, só os dados da linha de resultado são lidos
+    OCR_DETALHES = False
+    
+    # Envia as imagens ao servidor OCR compartilhado (cai no OCR local se ele
+    # não responder); exige OCR_SERVIDOR_CHAVE
+    OCR_USAR_SERVIDOR = False
+    
+    # Só grava a imagem de detalhes no spool; o OCR roda depois em lote
+    # (run_ocr_adiado.py), que grava os nomes de volta no cache e no Supabase
+    OCR_ADIADO = False
+    
+    # Léxico com os nomes já resolvidos no cache no OCR local (user-words do
+    # Tesseract + correção do nome lido)
+    OCR_LEXICO = False
+    OCR_PASTA_SPOOL = "ocr_adiado"
+    
+    # Endereço do servidor OCR compartilhado (run_servidor_ocr.py)
+    OCR_SERVIDOR_HOST = "localhost"
+    OCR_SERVIDOR_PORTA = 6010
+    
+    # Chave de autenticação do servidor OCR (sem padrão: o servidor não sobe
+    # sem ela, pois desserializa os pedidos recebidos)
+    OCR_SERVIDOR_CHAVE = os.environ.get("OCR_SERVIDOR_CHAVE", "").encode()
+    
+    # Workers do servidor (None = núcleos da máquina)
+    OCR_WORKERS = None
+    
+    # Agrupamento de pedidos em lotes
+    OCR_TAMANHO_LOTE = 8
+    OCR_ESPERA_LOTE = 0.05  # segundos
+    
+    # ===========================================
+    # CONFIGURAÇÕES DO CACHE DE CONSULTAS
+    # ===========================================
+    
+    # Cache em JSON (formato de importação/exportação)
+    CACHE_ARQUIVO_JSON = "cache_oab.json"
+    
+    # Banco SQLite do cache (upsert por entrada, abertura instantânea)
+    CACHE_ARQUIVO_DB = "cache_oab.db"
+    
+    # Registros de tamanho fixo via mmap (cadastro nacional inteiro; um processo gravando)
+    CACHE_ARQUIVO_REGISTROS = "cache_oab.idx"
+    
+    # Validade uniforme das entradas (0 = nunca expira)
+    CACHE_EXPIRAR_HORAS = 24
+    
+    # Validade por classe de resultado (None = nunca expira, 0 = não grava)
+    CACHE_VALIDADE_SUCESSO_HORAS = 24 * 180       # nome confirmado
+    CACHE_VALIDADE_NAO_ENCONTRADO_HORAS = 24 * 7  # "Inscrição não encontrada"
+    CACHE_VALIDADE_TRANSITORIO_HORAS = 1          # timeouts, exceções do navegador
+    CACHE_VALIDADE_ADICIONAL_HORAS = 24 * 30      # outras linhas da página de resultado
+    CACHE_VALIDADE_AQUECIDO_HORAS = 24            # nomes copiados de erros_processados
+    
+    # Renovação em segundo plano (stale-while-revalidate): a partir desta idade a
+    # entrada ainda é usada, mas uma nova consulta é agendada (None = não renova)
+    CACHE_RENOVAR_SUCESSO_HORAS = 24 * 30
+    CACHE_RENOVAR_NAO_ENCONTRADO_HORAS = 24
+    CACHE_RENOVAR_TRANSITORIO_HORAS = None
+    CACHE_RENOVAR_ADICIONAL_HORAS = 24 * 7
+    CACHE_RENOVAR_AQUECIDO_HORAS = None
+    
+    # Diário append-only: linhas que disparam a compactação no cache_oab.json
+    CACHE_LIMITE_DIARIO = 500
+    
+    # Limites do cache em memória (None = sem limite; LRU ao ultrapassar)
+    CACHE_MAX_ENTRADAS = 100000
+    CACHE_MAX_BYTES = 64 * 1024 * 1024
+    
     # ===========================================
     # CONFIGURAÇÕES DE PROCESSAMENTO
     # ===========================================
@@ -185,6 +259,28 @@ class Config:
             'max_oab': cls.MAX_DIGITOS_OAB
         }
     
+    @classmethod
+    def obter_validade_cache(cls) -> Dict[str, Optional[float]]:
+        """Validade (horas) do cache por classe de resultado"""
+        return {
+            'sucesso': cls.CACHE_VALIDADE_SUCESSO_HORAS,
+            'nao_encontrado': cls.CACHE_VALIDADE_NAO_ENCONTRADO_HORAS,
+            'transitorio': cls.CACHE_VALIDADE_TRANSITORIO_HORAS,
+            'adicional': cls.CACHE_VALIDADE_ADICIONAL_HORAS,
+            'aquecido': cls.CACHE_VALIDADE_AQUECIDO_HORAS
+        }
+    
+    @classmethod
+    def obter_renovacao_cache(cls) -> Dict[str, Optional[float]]:
+        """Idade (horas) a partir da qual a entrada é renovada em segundo plano"""
+        return {
+            'sucesso': cls.CACHE_RENOVAR_SUCESSO_HORAS,
+            'nao_encontrado': cls.CACHE_RENOVAR_NAO_ENCONTRADO_HORAS,
+            'transitorio': cls.CACHE_RENOVAR_TRANSITORIO_HORAS,
+            'adicional': cls.CACHE_RENOVAR_ADICIONAL_HORAS,
+            'aquecido': cls.CACHE_RENOVAR_AQUECIDO_HORAS
+        }
+    
     @classmethod
     def validar_estado(cls, estado: str) -> bool:
         """Valida se o estado é válido"""
@@ -7,27 +7,66 @@ Corrige problemas de detecção de resultados que existem mas não são encontra
 
 import os
 import re
+import json
 import time
+import html
+import base64
 import requests
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from PIL import Image, ImageEnhance, ImageFilter
+from PIL import Image
 import pytesseract
 from io import BytesIO
 from ..models.resultado_oab import ResultadoOAB
+from .scanner_ocr import CamposOCR, escanear_texto_ocr, limpar_texto_ocr, avaliar_qualidade_ocr, aplicar_campos_ocr
+from .motor_ocr import MotorOCR, LeituraOCR, gerar_variantes, CAMPOS_REQUERIDOS_PADRAO
+
+# URL da imagem de detalhes (RenderDetail) dentro de JSON/HTML
+PADRAO_URL_RENDER_DETAIL = re.compile(r'["\'(]?((?:https?://cna\.oab\.org\.br)?/[^"\'()\s<>]*RenderDetail[^"\'()\s<>]*)', re.IGNORECASE)
+
+# URL de detalhes exposta pela linha de resultado (onclick, data-*, href)
+PADRAO_URL_DETALHE_LINHA = re.compile(r'["\'(]\s*((?:https?://cna\.oab\.org\.br)?/[^"\'()\s<>]*Detail[^"\'()\s<>]*)', re.IGNORECASE)
+
+# Máximo de respostas de imagem guardadas do log de performance (CDP)
+MAX_RESPOSTAS_IMAGEM = 32
 
 class DataExtractorCorrigido:
     """Classe responsável pela extração de dados das páginas - VERSÃO CORRIGIDA"""
     
-    def __init__(self, driver, wait, pasta_debug=None):
+    def __init__(self, driver, wait, pasta_debug=None, campos_ocr_requeridos=CAMPOS_REQUERIDOS_PADRAO,
+                 cliente_ocr=None, spool_ocr=None, lexico_ocr=None):
         self.driver = driver
         self.wait = wait
         self.pasta_debug = pasta_debug
+        self.campos_ocr_requeridos = tuple(campos_ocr_requeridos)
+        
+        # Cliente do servidor OCR compartilhado (None = OCR local)
+        self.cliente_ocr = cliente_ocr
+        
+        # Spool de OCR adiado (None = OCR na hora)
+        self.spool_ocr = spool_ocr
+        
+        # Respostas de imagem vistas no log de performance (CDP), URL -> requestId
+        self._respostas_imagem = OrderedDict()
+        self._downloads_concluidos = set()
+        
+        # Uma sessão HTTP por thread (requests.Session não é thread-safe), os
+        # cookies do navegador copiados na thread do driver e o pool que baixa
+        # as imagens de detalhes
+        self._sessoes_thread = threading.local()
+        self._sessoes = []
+        self._lock_sessoes = threading.Lock()
+        self._cookies = {}
+        self._executor_imagens = ThreadPoolExecutor(max_workers=2)
         
         # Configurar Tesseract OCR
         self._configurar_tesseract()
+        self.motor_ocr = MotorOCR(idioma=getattr(self, 'idioma_ocr', 'eng'), lexico=lexico_ocr)
         
         print("🔧 DataExtractor inicializado com detecção melhorada")
 
@@ -103,11 +142,25 @@ class DataExtractorCorrigido:
             if elemento_resultado:
                 print("✅ Elemento de resultado encontrado!")
                 
+                # Imagem de detalhes direto da linha, em paralelo com a extração do DOM
+                futuro_imagem = self._iniciar_busca_imagem_linha(elemento_resultado)
+                
                 # Extrair dados básicos
                 resultado = self._extrair_dados_basicos_melhorado(elemento_resultado, resultado)
                 
+                imagem_linha = None
+                if futuro_imagem is not None:
+                    try:
+                        imagem_linha = futuro_imagem.result(timeout=35)
+                    except Exception as e:
+                        print(f"⚠️ Download da imagem da linha falhou: {e}")
+                
+                if imagem_linha is not None:
+                    print("🖼️ Imagem obtida sem abrir a modal - aplicando OCR...")
+                    resultado = self._processar_imagem_detalhe(imagem_linha, resultado)
+                
                 # 🔧 ESTRATÉGIA 3: Tentar abrir modal de detalhes
-                if self._tentar_abrir_detalhes(elemento_resultado):
+                elif self._tentar_abrir_detalhes(elemento_resultado):
                     print("🖼️ Modal de detalhes aberto - aplicando OCR...")
                     resultado = self._extrair_dados_modal_ocr(resultado)
                     self._fechar_modal()
@@ -632,6 +685,9 @@ class DataExtractorCorrigido:
         try:
             print("🔍 Tentando abrir modal de detalhes...")
             
+            # Respostas de modais anteriores não podem ser confundidas com a nova
+            self._descartar_eventos_rede()
+            
             # Estratégias para clicar no elemento
             estrategias = [
                 lambda: elemento.click(),
@@ -708,33 +764,47 @@ class DataExtractorCorrigido:
             
             print(f"📥 Baixando imagem: {img_url}")
             
-            # Baixar e processar imagem
-            imagem_pil = self._baixar_imagem(img_url)
+            # Ler a imagem já carregada pelo navegador (CDP); baixar só se falhar
+            imagem_pil = self._capturar_imagem_cdp(img_url) or self._baixar_imagem(img_url)
             if not imagem_pil:
                 print("❌ Erro ao baixar imagem")
                 return resultado
             
+            return self._processar_imagem_detalhe(imagem_pil, resultado)
+            
+        except Exception as e:
+            print(f"❌ Erro na extração OCR da modal: {e}")
+            return resultado
+    
+    def _processar_imagem_detalhe(self, imagem_pil: Image.Image, resultado: ResultadoOAB) -> ResultadoOAB:
+        """Aplica o OCR (ou enfileira no spool) sobre a imagem de detalhes"""
+        try:
             # Salvar para debug
             self._salvar_imagem_debug(imagem_pil, resultado)
             
-            # Aplicar OCR
-            texto_extraido = self._aplicar_ocr_otimizado(imagem_pil)
+            # Modo OCR adiado: só guarda a imagem (run_ocr_adiado.py processa depois)
+            if self.spool_ocr:
+                self.spool_ocr.adicionar(imagem_pil, resultado)
+                return resultado
+            
+            # Aplicar OCR (campos já fundidos entre as passadas)
+            leitura = self._aplicar_ocr_otimizado(imagem_pil, resultado.inscricao)
             
-            if texto_extraido:
-                print(f"📝 Texto extraído: {len(texto_extraido)} caracteres")
+            if leitura.texto:
+                print(f"📝 Texto extraído: {len(leitura.texto)} caracteres")
                 
-                # Processar texto extraído
-                resultado = self._processar_texto_ocr(texto_extraido, resultado)
+                # Aplicar campos extraídos
+                resultado = self._aplicar_campos_ocr(leitura.campos, resultado)
                 
                 # Salvar texto para debug
-                self._salvar_texto_ocr_debug(texto_extraido, resultado)
+                self._salvar_texto_ocr_debug(leitura.texto, resultado)
             else:
                 print("❌ OCR não conseguiu extrair texto")
             
             return resultado
             
         except Exception as e:
-            print(f"❌ Erro na extração OCR da modal: {e}")
+            print(f"❌ Erro no OCR da imagem de detalhes: {e}")
             return resultado
     
     def _encontrar_imagem_modal(self):
@@ -769,253 +839,233 @@ class DataExtractorCorrigido:
             print(f"❌ Erro ao encontrar imagem: {e}")
             return None
     
-    def _baixar_imagem(self, img_url: str) -> Image.Image:
-        """Baixa imagem da modal"""
+    def _capturar_imagem_cdp(self, img_url: str, timeout: float = 2.0) -> Image.Image:
+        """
+        Obtém a imagem da modal direto da camada de rede do Chrome
+        (Network.getResponseBody), sem nova requisição ao servidor
+        
+        Args:
+            img_url: URL (src) da imagem da modal
+            timeout: Tempo máximo esperando o navegador terminar o download
+            
+        Returns:
+            Imagem PIL ou None (usar _baixar_imagem)
+        """
         try:
-            # Completar URL se relativa
-            if img_url.startswith('/'):
-                img_url = "https://cna.oab.org.br" + img_url
+            limite = time.time() + timeout
+            
+            while True:
+                self._registrar_eventos_rede()
+                
+                # Só a resposta da URL exata da imagem (senão, download HTTP)
+                request_id = self._respostas_imagem.get(img_url)
+                
+                if request_id and request_id in self._downloads_concluidos:
+                    break
+                
+                if time.time() >= limite:
+                    return None
+                time.sleep(0.1)
             
-            # Usar cookies do navegador
-            cookies = self.driver.get_cookies()
-            session = requests.Session()
+            corpo = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
             
-            for cookie in cookies:
-                session.cookies.set(cookie['name'], cookie['value'])
+            if corpo.get('base64Encoded'):
+                conteudo = base64.b64decode(corpo['body'])
+            else:
+                conteudo = corpo['body'].encode('latin-1')
+            
+            imagem = Image.open(BytesIO(conteudo))
+            imagem.load()
+            print(f"✅ Imagem obtida do navegador (CDP): {imagem.size}")
+            
+            return imagem
             
-            headers = {
+        except Exception as e:
+            print(f"⚠️ Imagem não disponível via CDP: {e}")
+            return None
+    
+    def _registrar_eventos_rede(self):
+        """Lê o log de performance e guarda as respostas de imagem da modal"""
+        for entrada in self.driver.get_log('performance'):
+            try:
+                mensagem = json.loads(entrada['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            
+            metodo = mensagem.get('method')
+            params = mensagem.get('params', {})
+            
+            if metodo == 'Network.responseReceived':
+                resposta = params.get('response', {})
+                url = resposta.get('url', '')
+                if 'renderdetail' in url.lower() or resposta.get('mimeType', '').startswith('image/'):
+                    self._respostas_imagem[url] = params.get('requestId')
+                    self._respostas_imagem.move_to_end(url)
+                    
+                    # Limitar às respostas mais recentes
+                    while len(self._respostas_imagem) > MAX_RESPOSTAS_IMAGEM:
+                        _, request_id = self._respostas_imagem.popitem(last=False)
+                        self._downloads_concluidos.discard(request_id)
+            elif metodo == 'Network.loadingFinished':
+                request_id = params.get('requestId')
+                if request_id in self._respostas_imagem.values():
+                    self._downloads_concluidos.add(request_id)
+    
+    def _descartar_eventos_rede(self):
+        """Esvazia o log de performance e as respostas já registradas"""
+        try:
+            self.driver.get_log('performance')
+        except Exception:
+            pass
+        self._respostas_imagem.clear()
+        self._downloads_concluidos.clear()
+    
+    def _sessao_http(self) -> requests.Session:
+        """Sessão HTTP da thread atual (pool de conexões) com os cookies do navegador"""
+        sessao = getattr(self._sessoes_thread, 'sessao', None)
+        if sessao is None:
+            sessao = requests.Session()
+            adaptador = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            sessao.mount('https://', adaptador)
+            sessao.headers.update({
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 'Referer': 'https://cna.oab.org.br/',
                 'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8'
-            }
+            })
+            self._sessoes_thread.sessao = sessao
+            with self._lock_sessoes:
+                self._sessoes.append(sessao)
+        
+        sessao.cookies.update(self._cookies)
+        return sessao
+    
+    def _sincronizar_cookies(self):
+        """Guarda os cookies do navegador para as sessões (sempre na thread do driver)"""
+        self._cookies = {cookie['name']: cookie['value'] for cookie in self.driver.get_cookies()}
+    
+    def _baixar_imagem(self, img_url: str) -> Image.Image:
+        """Baixa imagem da modal"""
+        try:
+            self._sincronizar_cookies()
+            return self._buscar_imagem_detalhe(img_url)
+            
+        except Exception as e:
+            print(f"❌ Erro ao baixar imagem: {e}")
+            return None
+    
+    def _buscar_imagem_detalhe(self, url: str, seguir_indirecao: bool = True) -> Image.Image:
+        """
+        Busca a imagem de detalhes pela sessão da thread (pode rodar no pool)
+        Aceita a URL da RenderDetail ou a URL de detalhe que devolve o caminho dela
+        
+        Args:
+            url: URL da imagem ou do endpoint de detalhe
+            seguir_indirecao: Segue o caminho devolvido pelo endpoint (uma vez só)
+        
+        Returns:
+            Imagem PIL ou None
+        """
+        try:
+            # Completar URL se relativa
+            if url.startswith('/'):
+                url = "https://cna.oab.org.br" + url
             
-            response = session.get(img_url, headers=headers, timeout=30)
+            response = self._sessao_http().get(url, timeout=30)
             response.raise_for_status()
             
+            # Endpoint de detalhe (JSON/HTML) que aponta para a RenderDetail
+            if not response.headers.get('Content-Type', '').startswith('image/'):
+                match = PADRAO_URL_RENDER_DETAIL.search(response.text.replace('\\/', '/'))
+                if not match or not seguir_indirecao:
+                    return None
+                return self._buscar_imagem_detalhe(html.unescape(match.group(1)), seguir_indirecao=False)
+            
             imagem = Image.open(BytesIO(response.content))
+            imagem.load()
             print(f"✅ Imagem baixada: {imagem.size}")
             
             return imagem
             
         except Exception as e:
-            print(f"❌ Erro ao baixar imagem: {e}")
+            print(f"❌ Erro ao buscar imagem de detalhes: {e}")
             return None
     
-    def _aplicar_ocr_otimizado(self, imagem: Image.Image) -> str:
+    def _derivar_url_detalhe(self, elemento) -> str:
         """
-        🔧 VERSÃO OTIMIZADA: Aplica OCR na imagem com múltiplas tentativas
+        Deriva a URL de detalhes a partir da linha de resultado
+        (atributos onclick/data-*/href no HTML da linha)
+        
+        Returns:
+            URL encontrada ou "" se a linha não a expõe
         """
         try:
-            print("🔍 Aplicando OCR otimizado...")
-            
-            # Pré-processar imagem
-            imagens_processadas = self._preprocessar_imagem_multiplas(imagem)
-            
-            # Configurações de OCR para tentar
-            configuracoes = [
-                f'--oem 3 --psm 6 -l {self.idioma_ocr}',
-                '--oem 3 --psm 4',
-                '--oem 3 --psm 11',
-                '--oem 3 --psm 12',
-                '--psm 6',
-                ''  # Configuração padrão
-            ]
+            html_linha = elemento.get_attribute('outerHTML') or ''
+            match = PADRAO_URL_DETALHE_LINHA.search(html.unescape(html_linha))
+            return match.group(1) if match else ""
+        except Exception:
+            return ""
+    
+    def _iniciar_busca_imagem_linha(self, elemento):
+        """
+        Dispara em paralelo o download da imagem de detalhes da linha
+        
+        Returns:
+            Future com a imagem, ou None se a URL não pôde ser derivada
+        """
+        url = self._derivar_url_detalhe(elemento)
+        if not url:
+            return None
+        
+        print(f"📥 Imagem de detalhes derivada da linha: {url}")
+        self._sincronizar_cookies()
+        return self._executor_imagens.submit(self._buscar_imagem_detalhe, url)
+    
+    def _aplicar_ocr_otimizado(self, imagem: Image.Image, inscricao: str = "") -> LeituraOCR:
+        """
+        🔧 VERSÃO OTIMIZADA: Aplica OCR guardando o melhor valor de cada campo
+        entre as passadas e parando quando os campos requeridos estão validados
+        """
+        try:
+            leitura = None
             
-            melhor_resultado = ""
-            melhor_score = 0
+            # Servidor OCR compartilhado, se configurado
+            if self.cliente_ocr:
+                print("🔍 Enviando imagem ao servidor OCR...")
+                leitura = self.cliente_ocr.reconhecer(imagem, inscricao, self.campos_ocr_requeridos)
             
-            for config in configuracoes:
-                for nome_img, img_processada in imagens_processadas.items():
-                    try:
-                        if config:
-                            texto = pytesseract.image_to_string(img_processada, config=config)
-                        else:
-                            texto = pytesseract.image_to_string(img_processada)
-                        
-                        texto_limpo = self._limpar_texto_ocr(texto)
-                        score = self._avaliar_qualidade_ocr(texto_limpo)
-                        
-                        if score > melhor_score:
-                            melhor_resultado = texto_limpo
-                            melhor_score = score
-                            print(f"   ✅ Novo melhor resultado (score: {score})")
-                        
-                        if score >= 80:  # Score muito bom
-                            break
-                            
-                    except Exception as e:
-                        continue
-                
-                if melhor_score >= 80:
-                    break
+            # OCR local (padrão ou servidor indisponível)
+            if leitura is None:
+                print("🔍 Aplicando OCR otimizado...")
+                leitura = self.motor_ocr.reconhecer(imagem, inscricao, self.campos_ocr_requeridos)
             
-            print(f"📝 Melhor resultado OCR (score: {melhor_score}): {len(melhor_resultado)} chars")
-            return melhor_resultado
+            print(f"📝 Melhor resultado OCR (conf: {leitura.confianca:.0f}, score: {leitura.score}): "
+                  f"{len(leitura.texto)} chars")
+            return leitura
             
         except Exception as e:
             print(f"❌ Erro no OCR: {e}")
-            return ""
+            return LeituraOCR()
     
     def _preprocessar_imagem_multiplas(self, imagem: Image.Image) -> dict:
         """Cria múltiplas versões processadas da imagem"""
-        imagens = {}
-        
-        try:
-            if imagem.mode != 'RGB':
-                imagem = imagem.convert('RGB')
-            
-            # 1. Original redimensionada
-            largura, altura = imagem.size
-            img_resize = imagem.resize((largura * 2, altura * 2), Image.Resampling.LANCZOS)
-            imagens['resize_2x'] = img_resize
-            
-            # 2. Escala de cinza
-            img_gray = img_resize.convert('L')
-            imagens['gray'] = img_gray
-            
-            # 3. Alto contraste
-            enhancer = ImageEnhance.Contrast(img_gray)
-            img_contrast = enhancer.enhance(2.0)
-            imagens['high_contrast'] = img_contrast
-            
-            # 4. Brightness ajustado
-            enhancer_bright = ImageEnhance.Brightness(img_gray)
-            img_bright = enhancer_bright.enhance(1.2)
-            imagens['bright'] = img_bright
-            
-            # 5. Sharpening
-            img_sharp = img_gray.filter(ImageFilter.SHARPEN)
-            imagens['sharp'] = img_sharp
-            
-            # 6. Versão combinada
-            img_combined = img_contrast.filter(ImageFilter.SHARPEN)
-            enhancer_final = ImageEnhance.Brightness(img_combined)
-            img_final = enhancer_final.enhance(1.1)
-            imagens['combined'] = img_final
-            
-        except Exception as e:
-            print(f"⚠️ Erro no pré-processamento: {e}")
-            imagens['original'] = imagem
-        
-        return imagens
+        return dict(gerar_variantes(imagem))
     
     def _avaliar_qualidade_ocr(self, texto: str) -> int:
         """Avalia qualidade do texto extraído (0-100)"""
-        if not texto or len(texto) < 10:
-            return 0
-        
-        score = 0
-        
-        # Pontos por comprimento
-        if len(texto) >= 50:
-            score += 20
-        elif len(texto) >= 30:
-            score += 10
-        
-        # Pontos por palavras-chave
-        palavras_importantes = ['ADVOGAD', 'INSCRI', 'SECCIONAL', 'SITUA', 'REGULAR', 
-                              'ENDERECO', 'TELEFONE', 'PROFISSIONAL']
-        
-        for palavra in palavras_importantes:
-            if palavra in texto.upper():
-                score += 8
-        
-        # Pontos por números (inscrição)
-        if re.search(r'\d{3,}', texto):
-            score += 15
-        
-        # Pontos por estrutura
-        linhas = [l.strip() for l in texto.split('\n') if l.strip()]
-        if len(linhas) >= 5:
-            score += 10
-        
-        # Penalizar caracteres estranhos
-        caracteres_estranhos = len(re.findall(r'[^\w\s:()[\].-/áéíóúàèìòùâêîôûãõçñÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ]', texto))
-        if caracteres_estranhos > len(texto) * 0.1:
-            score -= 20
-        
-        return min(100, max(0, score))
+        return avaliar_qualidade_ocr(texto)
     
     def _limpar_texto_ocr(self, texto: str) -> str:
         """Limpa texto extraído do OCR"""
-        if not texto:
-            return ""
-        
-        # Remover caracteres estranhos
-        texto = re.sub(r'[^\w\s:()[\].-/áéíóúàèìòùâêîôûãõçñÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ]', ' ', texto)
-        
-        # Corrigir espaços múltiplos
-        texto = re.sub(r'\s+', ' ', texto)
-        
-        # Corrigir quebras de linha
-        texto = re.sub(r'\n\s*\n', '\n', texto)
-        
-        # Remover linhas muito curtas
-        linhas = texto.split('\n')
-        linhas_validas = []
-        
-        for linha in linhas:
-            linha_limpa = linha.strip()
-            if len(linha_limpa) > 1:
-                linhas_validas.append(linha_limpa)
-        
-        return '\n'.join(linhas_validas)
+        return limpar_texto_ocr(texto)
     
     def _processar_texto_ocr(self, texto: str, resultado: ResultadoOAB) -> ResultadoOAB:
-        """Processa texto extraído do OCR"""
-        try:
-            print("🔍 Processando texto do OCR...")
-            
-            # Usar extrator especializado
-            extrator = ModalExtractorOCR()
-            
-            # Nome completo
-            nome_melhorado = extrator.extrair_nome_completo(texto)
-            if nome_melhorado and len(nome_melhorado) > len(resultado.nome or ''):
-                resultado.nome = nome_melhorado
-                print(f"✅ Nome atualizado: {resultado.nome}")
-            
-            # Inscrição
-            inscricao_modal = extrator.extrair_inscricao(texto, resultado.inscricao)
-            if inscricao_modal:
-                resultado.numero_carteira = inscricao_modal
-                print(f"✅ Número carteira: {resultado.numero_carteira}")
-            
-            # Telefones
-            telefones = extrator.extrair_telefones(texto)
-            if telefones:
-                resultado.telefone = telefones
-                print(f"✅ Telefones: {resultado.telefone}")
-            
-            # Endereço
-            endereco_prof = extrator.extrair_endereco_profissional(texto)
-            if endereco_prof:
-                resultado.endereco = endereco_prof
-                print(f"✅ Endereço: {resultado.endereco}")
-            
-            # Situação
-            situacao = extrator.extrair_situacao(texto)
-            if situacao:
-                resultado.situacao = situacao
-                print(f"✅ Situação: {resultado.situacao}")
-            
-            # Email
-            email = extrator.extrair_email(texto)
-            if email:
-                resultado.email = email
-                print(f"✅ Email: {resultado.email}")
-            
-            # Data de inscrição
-            data_inscricao = extrator.extrair_data_inscricao(texto)
-            if data_inscricao:
-                resultado.data_inscricao = data_inscricao
-                print(f"✅ Data inscrição: {resultado.data_inscricao}")
-            
-            return resultado
-            
-        except Exception as e:
-            print(f"❌ Erro ao processar texto OCR: {e}")
-            return resultado
+        """Processa texto extraído do OCR (scanner compilado, passagem única)"""
+        print("🔍 Processando texto do OCR...")
+        return self._aplicar_campos_ocr(escanear_texto_ocr(texto, resultado.inscricao), resultado)
+    
+    def _aplicar_campos_ocr(self, campos: CamposOCR, resultado: ResultadoOAB) -> ResultadoOAB:
+        """Copia os campos extraídos do OCR para o resultado"""
+        return aplicar_campos_ocr(campos, resultado)
     
     def _salvar_imagem_debug(self, imagem: Image.Image, resultado: ResultadoOAB):
         """Salva imagem para debug"""
@@ -1088,179 +1138,11 @@ class DataExtractorCorrigido:
                 
         except Exception as e:
             print(f"⚠️ Erro ao fechar modal: {e}")
-
-
-class ModalExtractorOCR:
-    """Classe para extração de dados do texto extraído via OCR"""
     
-    def extrair_nome_completo(self, texto_ocr: str) -> str:
-        """Extrai nome completo do texto OCR"""
-        padroes_nome = [
-            r'^([A-ZÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ][A-Za-záéíóúàèìòùâêîôûãõçñ\s]{8,60})',
-            r'Nome[:\s]*([A-ZÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ][A-Za-záéíóúàèìòùâêîôûãõçñ\s]{5,60})',
-            r'([A-ZÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ]{2,}(?:\s+[A-ZÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ]{2,})+)',
-        ]
-        
-        linhas = texto_ocr.split('\n')
-        
-        for linha in linhas[:5]:
-            linha = linha.strip()
-            for padrao in padroes_nome:
-                match = re.search(padrao, linha, re.MULTILINE)
-                if match:
-                    nome = match.group(1).strip()
-                    
-                    if (8 <= len(nome) <= 60 and 
-                        ' ' in nome and 
-                        len(nome.split()) >= 2 and
-                        not any(palavra in nome.upper() for palavra in 
-                               ['INSCRICAO', 'SECCIONAL', 'TELEFONE', 'ENDERECO']) and
-                        all(char.isalpha() or char.isspace() or char in 'ÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÇÑ' 
-                            for char in nome)):
-                        return nome
-        
-        return ""
-
-    def extrair_inscricao(self, texto_ocr: str, inscricao_original: str) -> str:
-        """Extrai número da inscrição do texto OCR"""
-        padroes_inscricao = [
-            r'Inscri[cç][aã]o[:\s]*(\d{4,8})',
-            r'N[uú]mero[:\s]*(\d{4,8})',
-            rf'({re.escape(inscricao_original)})',
-        ]
-        
-        for padrao in padroes_inscricao:
-            match = re.search(padrao, texto_ocr, re.IGNORECASE)
-            if match:
-                numero = match.group(1)
-                if numero.isdigit() and 4 <= len(numero) <= 8:
-                    return numero
-        
-        return inscricao_original
-
-    def extrair_telefones(self, texto_ocr: str) -> str:
-        """Extrai telefones do texto OCR"""
-        telefones_encontrados = []
-        
-        try:
-            padroes_telefone = [
-                r'Telefone\s*Profissional[:\s]*\((\d{2})\)\s*(\d{4,5})[-\s]?(\d{4})',
-                r'Telefone[:\s]*\((\d{2})\)\s*(\d{4,5})[-\s]?(\d{4})',
-                r'\((\d{2})\)\s*(\d{4,5})[-\s]?(\d{4})',
-                r'(\d{2})\s+(\d{4,5})[-\s]?(\d{4})',
-            ]
-            
-            for padrao in padroes_telefone:
-                matches = re.finditer(padrao, texto_ocr, re.IGNORECASE)
-                for match in matches:
-                    if len(match.groups()) == 3:
-                        ddd, num1, num2 = match.groups()
-                        telefone = f"({ddd}) {num1}-{num2}"
-                        
-                        if (len(ddd) == 2 and ddd.isdigit() and 
-                            len(num1) in [4, 5] and num1.isdigit() and 
-                            len(num2) == 4 and num2.isdigit()):
-                            
-                            if telefone not in telefones_encontrados:
-                                telefones_encontrados.append(telefone)
-            
-            return " | ".join(telefones_encontrados) if telefones_encontrados else ""
-            
-        except Exception as e:
-            print(f"⚠️ Erro ao extrair telefones: {e}")
-            return ""
-
-    def extrair_endereco_profissional(self, texto_ocr: str) -> str:
-        """Extrai endereço profissional do texto OCR"""
-        try:
-            padroes_endereco = [
-                r'Endere[cç]o\s+Profissional[:\s]*([^\n]+?)(?:Telefone|$)',
-                r'Endere[cç]o[:\s]*([^\n]+?)(?:Telefone|$)',
-                r'(RUA\s+[^,\n]+(?:,\s*N[°º]?\s*\d+)?[^,\n]*)',
-                r'(AVENIDA\s+[^,\n]+(?:,\s*N[°º]?\s*\d+)?[^,\n]*)',
-            ]
-            
-            for padrao in padroes_endereco:
-                match = re.search(padrao, texto_ocr, re.IGNORECASE)
-                if match:
-                    endereco = match.group(1).strip()
-                    
-                    # Limpar telefones do endereço
-                    endereco = re.sub(r'Telefone[:\s]*\([0-9\s\)\(-]+', '', endereco, flags=re.IGNORECASE)
-                    endereco = re.sub(r'\(\d{2}\)\s*\d{4,5}[-\s]?\d{4}', '', endereco)
-                    
-                    if 10 <= len(endereco) <= 200:
-                        return endereco.strip()
-            
-            return ""
-            
-        except Exception as e:
-            print(f"⚠️ Erro ao extrair endereço: {e}")
-            return ""
-
-    def extrair_situacao(self, texto_ocr: str) -> str:
-        """Extrai situação do advogado"""
-        padroes_situacao = [
-            r'SITUA[CÇ][AÃ]O\s+REGULAR',
-            r'REGULAR',
-            r'SITUA[CÇ][AÃ]O[:\s]*([A-Z\s]+)',
-            r'(ATIVO|ATIVA|LICENCIADO|LICENCIADA)',
-        ]
-        
-        for padrao in padroes_situacao:
-            match = re.search(padrao, texto_ocr, re.IGNORECASE)
-            if match:
-                if padrao in [r'SITUA[CÇ][AÃ]O\s+REGULAR', r'REGULAR']:
-                    return 'SITUAÇÃO REGULAR'
-                
-                situacao = match.group(1) if match.groups() else match.group(0)
-                situacao = situacao.strip().upper()
-                
-                if 'REGULAR' in situacao:
-                    return 'SITUAÇÃO REGULAR'
-                elif situacao in ['ATIVO', 'ATIVA']:
-                    return 'ATIVO'
-                elif 4 <= len(situacao) <= 30:
-                    return situacao
-        
-        return ""
-
-    def extrair_email(self, texto_ocr: str) -> str:
-        """Extrai email do texto OCR"""
-        padroes_email = [
-            r'Email[:\s]*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'E-mail[:\s]*([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-        ]
-        
-        for padrao in padroes_email:
-            match = re.search(padrao, texto_ocr, re.IGNORECASE)
-            if match:
-                email = match.group(1) if match.groups() else match.group(0)
-                email = email.strip().lower()
-                
-                if ('@' in email and '.' in email and 
-                    5 <= len(email) <= 100 and
-                    not any(char in email for char in [' ', '\n', '\t'])):
-                    return email
-        
-        return ""
-
-    def extrair_data_inscricao(self, texto_ocr: str) -> str:
-        """Extrai data de inscrição"""
-        padroes_data = [
-            r'Data[:\s]*Inscri[cç][aã]o[:\s]*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
-            r'Inscrito\s+em[:\s]*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
-            r'(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})',
-        ]
-        
-        for padrao in padroes_data:
-            match = re.search(padrao, texto_ocr, re.IGNORECASE)
-            if match:
-                data = match.group(1) if match.groups() else match.group(0)
-                data = data.strip()
-                
-                if re.match(r'\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4}', data):
-                    return data
-        
-        return ""
\ No newline at end of file
+    def fechar(self):
+        """Encerra o pool de downloads e as sessões HTTP"""
+        self._executor_imagens.shutdown(wait=False, cancel_futures=True)
+        with self._lock_sessoes:
+            for sessao in self._sessoes:
+                sessao.close()
+            self._sessoes.clear()
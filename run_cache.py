@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Manutenção do cache de consultas OAB (banco SQLite ou arquivo de registros)
+Importa/exporta o cache_oab.json, remove entradas expiradas e mostra
+estatísticas sem carregar o cache inteiro
+
+Uso:
+    python run_cache.py importar [--json cache_oab.json] [--db cache_oab.db]
+    python run_cache.py exportar [--json cache_oab.json] [--db cache_oab.db]
+    python run_cache.py limpar [--horas 24]   (sem --horas: validade por classe do config)
+    python run_cache.py estatisticas
+    python run_cache.py compactar --registros cache_oab.idx   (só registros mmap)
+    python run_cache.py buscar "jose da silva" [--prefixo] [--pesquisas Pesquisa]
+
+Com --registros os comandos usam o arquivo de registros (mmap) em vez do banco
+"""
+
+import os
+import sys
+import argparse
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from bot_oab.cache import ArmazenamentoSQLite, ArquivoRegistrosOAB, IndiceNomesOAB
+from bot_oab.cache.politica_cache import horas_para_segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manutenção do cache de consultas do Bot OAB')
+    parser.add_argument('comando', choices=['importar', 'exportar', 'limpar', 'estatisticas', 'compactar', 'buscar'])
+    parser.add_argument('termo', nargs='?', default=None, help='Nome (ou parte dele) para o comando buscar')
+    parser.add_argument('--db', default=Config.CACHE_ARQUIVO_DB, help='Banco SQLite do cache')
+    parser.add_argument('--registros', nargs='?', const=Config.CACHE_ARQUIVO_REGISTROS, default=None,
+                        help='Usa o arquivo de registros mmap (padrão: cache_oab.idx)')
+    parser.add_argument('--json', default=Config.CACHE_ARQUIVO_JSON, help='Arquivo JSON do cache')
+    parser.add_argument('--horas', type=float, default=None,
+                        help='Validade uniforme em horas (0 = sem expiração; padrão: validade por classe)')
+    parser.add_argument('--prefixo', action='store_true',
+                        help='buscar: o nome começa com o termo (padrão: contém todas as palavras)')
+    parser.add_argument('--pesquisas', nargs='?', const='Pesquisa', default=None,
+                        help='buscar: inclui os resultados exportados (padrão: pasta Pesquisa)')
+    parser.add_argument('--limite', type=int, default=20, help='buscar: máximo de resultados')
+    args = parser.parse_args()
+    
+    if args.comando == 'buscar' and not args.termo:
+        parser.error("buscar exige o nome a procurar")
+
+    if args.horas is None:
+        validade = horas_para_segundos(Config.obter_validade_cache())
+    else:
+        validade = args.horas * 3600 if args.horas > 0 else None
+
+    print("🗄️ Cache de consultas - Bot OAB")
+    print("=" * 40)
+
+    if args.registros:
+        armazenamento = ArquivoRegistrosOAB(args.registros)
+    else:
+        armazenamento = ArmazenamentoSQLite(args.db)
+    try:
+        if args.comando == 'importar':
+            armazenamento.importar_json(args.json, validade)
+
+        elif args.comando == 'exportar':
+            armazenamento.exportar_json(args.json, validade)
+
+        elif args.comando == 'limpar':
+            if not validade:
+                print("♾️ Sem validade definida: nada a remover")
+            else:
+                removidos = armazenamento.remover_expirados(validade)
+                print(f"🧹 Entradas expiradas removidas: {removidos}")
+
+        elif args.comando == 'compactar':
+            if not args.registros:
+                print("⚠️ compactar vale só para o arquivo de registros (--registros)")
+            else:
+                armazenamento.compactar()
+
+        elif args.comando == 'buscar':
+            buscar_nome(armazenamento, args)
+            return
+
+        print(f"🗃️ Entradas armazenadas: {armazenamento.contar()}")
+        # No arquivo de registros a contagem por validade varre o índice inteiro
+        validas = armazenamento.contar_validas(validade) if args.registros else armazenamento.contar(validade)
+        print(f"✅ Entradas válidas: {validas}")
+        for nome, valor in armazenamento.carregar_estatisticas().items():
+            print(f"   {nome}: {valor}")
+    finally:
+        armazenamento.fechar()
+
+
+def buscar_nome(armazenamento, args):
+    """Procura o nome no cache (banco + JSON) e, se pedido, nas pesquisas exportadas"""
+    indice = IndiceNomesOAB()
+    indice.adicionar_cache_json(args.json)
+    indice.adicionar_entradas(armazenamento.iterar())
+    if args.pesquisas:
+        indice.adicionar_exportados(args.pesquisas)
+    print(f"📇 Nomes indexados: {len(indice)}")
+    
+    if args.prefixo:
+        encontrados = indice.buscar_prefixo(args.termo, args.limite)
+    else:
+        encontrados = indice.buscar_palavras(args.termo, args.limite)
+    
+    if not encontrados:
+        print(f"🔍 Nenhum nome encontrado para: {args.termo}")
+        return
+    print(f"🔍 {len(encontrados)} resultado(s) para: {args.termo}")
+    for inscricao, estado, nome in encontrados:
+        print(f"   {estado}{inscricao:<10} {nome}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Processa o spool de OCR adiado
+Reconhece todas as imagens pendentes em uma única execução do Tesseract,
+grava os nomes lidos no cache e no Supabase e exporta os ResultadoOAB
+atualizados (JSON/CSV na pasta Pesquisa)
+
+Uso:
+    python run_ocr_adiado.py [--pasta ocr_adiado] [--sem-fallback] [--manter-imagens]
+    python run_ocr_adiado.py --db cache_oab.db   (cache persistente do integrador)
+    python run_ocr_adiado.py --somente-exportar  (sem gravar no cache/Supabase)
+"""
+
+import os
+import sys
+import argparse
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from bot_oab.cache import ArmazenamentoSQLite, ArquivoRegistrosOAB
+from bot_oab.extractors.ocr_lote import SpoolOCR, processar_spool, PASTA_SPOOL_PADRAO
+from bot_oab.extractors.lexico_ocr import LexicoOCR
+from bot_oab.utils.data_exporters import DataExporter
+from bot_oab_supabase import OABSupabaseIntegrator
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OCR adiado em lote do Bot OAB')
+    parser.add_argument('--pasta', default=PASTA_SPOOL_PADRAO, help='Pasta do spool')
+    parser.add_argument('--idioma', default='por', help='Idioma do Tesseract')
+    parser.add_argument('--sem-fallback', action='store_true', help='Não reprocessar leituras fracas individualmente')
+    parser.add_argument('--manter-imagens', action='store_true', help='Não apagar imagens processadas')
+    parser.add_argument('--sem-lexico', action='store_true', help='Não usar o léxico de nomes do cache')
+    parser.add_argument('--json', default=Config.CACHE_ARQUIVO_JSON, help='Cache JSON (léxico sem --db/--registros)')
+    parser.add_argument('--db', default=None, help='Banco SQLite do cache (léxico e gravação)')
+    parser.add_argument('--registros', default=None, help='Arquivo de registros mmap do cache (léxico e gravação)')
+    parser.add_argument('--somente-exportar', action='store_true',
+                        help='Não gravar os nomes lidos no cache nem no Supabase')
+    args = parser.parse_args()
+
+    print("🌙 OCR adiado - Bot OAB")
+    print("=" * 40)
+
+    spool = SpoolOCR(args.pasta)
+    print(f"📋 Pendentes: {len(spool.pendentes())}")
+
+    # O integrador abre o mesmo cache da consulta (léxico e gravação dos nomes)
+    integrador = None
+    armazenamento = None
+    if not args.somente_exportar:
+        integrador = OABSupabaseIntegrator(Config.SUPABASE_URL, Config.SUPABASE_KEY,
+                                           arquivo_cache_db=args.db,
+                                           arquivo_cache_registros=args.registros,
+                                           aquecer_cache=False)
+        armazenamento = integrador.cache.armazenamento
+    elif args.registros:
+        armazenamento = ArquivoRegistrosOAB(args.registros)
+    elif args.db:
+        armazenamento = ArmazenamentoSQLite(args.db)
+
+    try:
+        resultados = processar_spool(
+            spool,
+            idioma=args.idioma,
+            fallback_individual=not args.sem_fallback,
+            remover_imagens=not args.manter_imagens,
+            lexico=None if args.sem_lexico else LexicoOCR(arquivo_cache=args.json, armazenamento=armazenamento)
+        )
+        if integrador and resultados:
+            integrador.aplicar_ocr_adiado(resultados)
+    finally:
+        if integrador:
+            integrador.fechar()
+        elif armazenamento:
+            armazenamento.fechar()
+
+    if resultados:
+        exportador = DataExporter()
+        exportador.salvar_json(resultados, "ocr_adiado.json")
+        exportador.salvar_csv(resultados, "ocr_adiado.csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servidor OCR compartilhado
+Um único processo com o Tesseract atende todos os bots (run_supabase_integration,
+main.py, ...) que usem ClienteOCR. Navegadores e OCR escalam separadamente.
+
+Uso (a chave compartilhada com os clientes vem do ambiente):
+    OCR_SERVIDOR_CHAVE=<chave> python run_servidor_ocr.py [--workers 4] [--porta 6010] [--socket /tmp/ocr.sock]
+"""
+
+import os
+import sys
+import argparse
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from bot_oab.extractors.servico_ocr import ServidorOCR
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor OCR compartilhado do Bot OAB')
+    parser.add_argument('--workers', type=int, default=Config.OCR_WORKERS, help='Processos OCR (padrão: núcleos)')
+    parser.add_argument('--host', default=Config.OCR_SERVIDOR_HOST, help='Host TCP')
+    parser.add_argument('--porta', type=int, default=Config.OCR_SERVIDOR_PORTA, help='Porta TCP')
+    parser.add_argument('--socket', default=None, help='Caminho de Unix socket (substitui host/porta)')
+    parser.add_argument('--lote', type=int, default=Config.OCR_TAMANHO_LOTE, help='Pedidos por lote')
+    parser.add_argument('--espera', type=float, default=Config.OCR_ESPERA_LOTE, help='Espera máxima do lote (s)')
+    parser.add_argument('--idioma', default='por', help='Idioma do Tesseract')
+    args = parser.parse_args()
+
+    endereco = args.socket or (args.host, args.porta)
+
+    print("🖼️ Servidor OCR - Bot OAB")
+    print("=" * 40)
+
+    if not Config.OCR_SERVIDOR_CHAVE:
+        print("❌ Defina a variável de ambiente OCR_SERVIDOR_CHAVE (chave compartilhada com os clientes)")
+        sys.exit(1)
+
+    servidor = ServidorOCR(
+        chave=Config.OCR_SERVIDOR_CHAVE,
+        endereco=endereco,
+        workers=args.workers,
+        tamanho_lote=args.lote,
+        espera_lote=args.espera,
+        idioma=args.idioma
+    )
+
+    try:
+        servidor.iniciar()
+    except KeyboardInterrupt:
+        print("\n⏹️ Interrompido pelo usuário")
+        servidor.parar()
+
+
+if __name__ == "__main__":
+    main()
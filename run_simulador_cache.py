@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Simulador de políticas do cache de consultas OAB
+Reexecuta as consultas das execuções passadas (logs/, Pesquisa/ e dumps de
+usuarios pendentes) contra configurações candidatas e compara a taxa de
+acerto e as consultas ao site evitadas
+
+Uso:
+    python run_simulador_cache.py
+    python run_simulador_cache.py --pendentes pendentes.txt --pendentes dump.json@2025-07-20T10:00
+    python run_simulador_cache.py --configs candidatas.json --saida resultado.json
+
+candidatas.json: lista de {"nome", "validade_horas": {classe: horas},
+"max_entradas", "aquecimento": ["cache", "pesquisa"]}
+"""
+
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Config
+from bot_oab.cache import ArmazenamentoSQLite, ArquivoRegistrosOAB
+from bot_oab.cache.simulador_cache import (ConfiguracaoCache, ler_logs, ler_pesquisas, ler_pendentes,
+                                           ler_entradas_cache, simular_configuracoes)
+from bot_oab.cache.politica_cache import CLASSES_RESULTADO, CLASSE_TRANSITORIO
+
+
+def configuracoes_padrao():
+    """Política atual do config e variações para comparação"""
+    atual = Config.obter_validade_cache()
+    uniforme = Config.CACHE_EXPIRAR_HORAS or None
+    return [
+        ConfiguracaoCache('sem cache', {classe: 0 for classe in CLASSES_RESULTADO}),
+        ConfiguracaoCache(f'uniforme {Config.CACHE_EXPIRAR_HORAS}h',
+                          {classe: uniforme for classe in CLASSES_RESULTADO}),
+        ConfiguracaoCache('por classe (config)', atual),
+        ConfiguracaoCache('por classe + aquecimento', atual, aquecimento=('cache', 'pesquisa')),
+        ConfiguracaoCache('por classe, 100 entradas', atual, max_entradas=100),
+        ConfiguracaoCache('sem expiração', {**{classe: None for classe in CLASSES_RESULTADO},
+                                            CLASSE_TRANSITORIO: atual.get(CLASSE_TRANSITORIO)}),
+    ]
+
+
+def carregar_configuracoes(arquivo):
+    """Configurações candidatas de um JSON (lista de objetos)"""
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        return [ConfiguracaoCache.de_dict(item) for item in json.load(f)]
+
+
+def ler_dumps_pendentes(especificacoes):
+    """--pendentes arquivo[@AAAA-MM-DDTHH:MM] (sem data: modificação do arquivo)"""
+    eventos = []
+    for especificacao in especificacoes or []:
+        arquivo, _, data = especificacao.partition('@')
+        momento = datetime.fromisoformat(data).timestamp() if data else None
+        eventos.extend(ler_pendentes(arquivo, momento))
+    return eventos
+
+
+def ler_aquecimento(args):
+    """Resultados já conhecidos: cache persistente e resultados exportados"""
+    entradas = []
+    if os.path.exists(args.json):
+        with open(args.json, 'r', encoding='utf-8') as f:
+            entradas.extend(json.load(f).get('cache', {}).items())
+    for arquivo, classe in ((args.db, ArmazenamentoSQLite), (args.registros, ArquivoRegistrosOAB)):
+        if arquivo and os.path.exists(arquivo):
+            armazenamento = classe(arquivo)
+            try:
+                entradas.extend(armazenamento.iterar())
+            finally:
+                armazenamento.fechar()
+
+    return {
+        'cache': ler_entradas_cache(entradas),
+        'pesquisa': [evento for evento in ler_pesquisas(args.pesquisas) if evento.classe]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulador de políticas do cache do Bot OAB')
+    parser.add_argument('--logs', default=Config.PASTA_LOGS, help='Pasta dos logs de processamento')
+    parser.add_argument('--pesquisas', default='Pesquisa', help='Pasta das sessões de pesquisa')
+    parser.add_argument('--pendentes', action='append',
+                        help='Dump de usuarios pendentes (arquivo[@data ISO]); pode repetir')
+    parser.add_argument('--sem-logs', action='store_true', help='Não usa os logs como consultas')
+    parser.add_argument('--sem-pesquisas', action='store_true', help='Não usa a pasta Pesquisa como consultas')
+    parser.add_argument('--configs', default=None, help='JSON com as configurações candidatas')
+    parser.add_argument('--json', default=Config.CACHE_ARQUIVO_JSON, help='Cache JSON (aquecimento)')
+    parser.add_argument('--db', default=None, help='Banco SQLite do cache (aquecimento)')
+    parser.add_argument('--registros', default=None, help='Arquivo de registros mmap (aquecimento)')
+    parser.add_argument('--classe-padrao', default='sucesso', choices=CLASSES_RESULTADO,
+                        help='Classe assumida quando o resultado da consulta é desconhecido')
+    parser.add_argument('--saida', default=None, help='Grava os resultados em JSON')
+    args = parser.parse_args()
+
+    print("🧪 Simulador de cache - Bot OAB")
+    print("=" * 40)
+
+    eventos = []
+    if not args.sem_logs:
+        eventos_logs = ler_logs(args.logs)
+        print(f"📜 Consultas nos logs: {len(eventos_logs)}")
+        eventos.extend(eventos_logs)
+    if not args.sem_pesquisas:
+        eventos_pesquisas = ler_pesquisas(args.pesquisas)
+        print(f"📁 Consultas nas sessões de pesquisa: {len(eventos_pesquisas)}")
+        eventos.extend(eventos_pesquisas)
+    eventos_pendentes = ler_dumps_pendentes(args.pendentes)
+    if args.pendentes:
+        print(f"📋 Linhas pendentes nos dumps: {len(eventos_pendentes)}")
+    eventos.extend(eventos_pendentes)
+    eventos.sort(key=lambda evento: evento.momento)
+
+    if not eventos:
+        print("❌ Nenhuma consulta encontrada no histórico")
+        return
+
+    configuracoes = carregar_configuracoes(args.configs) if args.configs else configuracoes_padrao()
+    aquecimento = ler_aquecimento(args)
+    print(f"🔥 Aquecimento: {len(aquecimento['cache'])} do cache, {len(aquecimento['pesquisa'])} exportados")
+    print(f"🔑 OABs distintas (mínimo de consultas sem aquecimento): {len({evento.chave for evento in eventos})}")
+
+    resultados = simular_configuracoes(eventos, configuracoes, aquecimento, args.classe_padrao)
+
+    print(f"\n{'Configuração':<30} {'Consultas':>9} {'Acertos':>8} {'Taxa':>7} {'Site':>6} {'Aquecidos':>9}")
+    print("-" * 74)
+    for resultado in resultados:
+        print(f"{resultado['configuracao']:<30} {resultado['consultas']:>9} {resultado['acertos']:>8} "
+              f"{resultado['taxa_acerto']:>6.1f}% {resultado['consultas_site']:>6} "
+              f"{resultado['acertos_aquecimento']:>9}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+        print(f"💾 Resultados salvos em: {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
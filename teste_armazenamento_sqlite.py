@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do cache de consultas em SQLite (ArmazenamentoSQLite)
+Confere o upsert por entrada, a validade na leitura e na remoção, as
+estatísticas somadas entre processos e a ida e volta pelo cache_oab.json
+
+Uso:
+    python teste_armazenamento_sqlite.py
+"""
+
+import os
+import sys
+import json
+import tempfile
+from datetime import datetime, timedelta
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache import ArmazenamentoSQLite
+
+
+def entrada(numero, estado, nome="", erro=None, horas_atras=0):
+    """Entrada no formato do cache_oab.json"""
+    momento = datetime.now() - timedelta(hours=horas_atras)
+    return {
+        'numero_oab': str(numero),
+        'estado': estado,
+        'nome': nome,
+        'erro': erro,
+        'sucesso': bool(nome),
+        'timestamp': momento.isoformat()
+    }
+
+
+def testar_upsert():
+    """Gravar a mesma chave substitui a entrada, sem duplicar"""
+    with tempfile.TemporaryDirectory() as pasta:
+        armazenamento = ArmazenamentoSQLite(os.path.join(pasta, "cache.db"))
+        try:
+            armazenamento.gravar("147520/SP", entrada(147520, "SP", "MARIA DA SILVA"))
+            armazenamento.gravar("147520/SP", entrada(147520, "SP", "MARIA DA SILVA SANTOS"))
+            assert armazenamento.gravar_varios({
+                "2345/RJ": entrada(2345, "RJ", erro="Inscrição não encontrada"),
+                "147520/SP": entrada(147520, "SP", "MARIA DA SILVA SANTOS JR")
+            }) == 2
+
+            assert armazenamento.contar() == 2, armazenamento.contar()
+            lida = armazenamento.obter("147520/SP")
+            assert lida['nome'] == "MARIA DA SILVA SANTOS JR" and lida['sucesso'] is True, lida
+            assert lida['classe'] == 'sucesso', lida
+
+            erro = armazenamento.obter("2345/RJ")
+            assert erro['sucesso'] is False and erro['classe'] == 'nao_encontrado', erro
+
+            armazenamento.remover("2345/RJ")
+            assert armazenamento.obter("2345/RJ") is None
+        finally:
+            armazenamento.fechar()
+
+
+def testar_validade_por_classe():
+    """A validade vale por classe na leitura, na contagem e na remoção"""
+    with tempfile.TemporaryDirectory() as pasta:
+        armazenamento = ArmazenamentoSQLite(os.path.join(pasta, "cache.db"))
+        validade = {'sucesso': 72 * 3600, 'nao_encontrado': 24 * 3600}
+        try:
+            armazenamento.gravar("1234/MG", entrada(1234, "MG", "JOSE PEREIRA", horas_atras=48))
+            armazenamento.gravar("5678/MG", entrada(5678, "MG", erro="Inscrição não encontrada", horas_atras=48))
+
+            assert armazenamento.obter("1234/MG", validade) is not None
+            assert armazenamento.obter("5678/MG", validade) is None
+            assert armazenamento.obter("5678/MG") is not None  # sem validade não expira
+            assert armazenamento.contar(validade) == 1
+            assert dict(armazenamento.iterar(validade)).keys() == {"1234/MG"}
+
+            assert armazenamento.remover_expirados(validade) == 1
+            assert armazenamento.contar() == 1
+        finally:
+            armazenamento.fechar()
+
+
+def testar_estatisticas_somadas():
+    """somar_estatisticas acumula sobre o valor gravado (vários processos)"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "cache.db")
+        processo_a = ArmazenamentoSQLite(arquivo)
+        processo_b = ArmazenamentoSQLite(arquivo)
+        try:
+            processo_a.gravar_estatisticas({'cache_hits': 10, 'cache_misses': 2})
+            processo_a.somar_estatisticas({'cache_hits': 3})
+            processo_b.somar_estatisticas({'cache_hits': 4, 'cache_misses': 0})
+            assert processo_a.carregar_estatisticas() == {'cache_hits': 17, 'cache_misses': 2}
+        finally:
+            processo_a.fechar()
+            processo_b.fechar()
+
+
+def testar_importar_e_exportar_json():
+    """Importação do cache_oab.json ignora expiradas e canoniza as chaves"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo_json = os.path.join(pasta, "cache_oab.json")
+        with open(arquivo_json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'cache': {
+                    "012345/SP": entrada("012345", "SP", "ANA SOUZA"),
+                    "9999/PR": entrada(9999, "PR", "VELHO", horas_atras=24 * 400)
+                },
+                'estatisticas': {'cache_hits': 5}
+            }, f)
+
+        armazenamento = ArmazenamentoSQLite(os.path.join(pasta, "cache.db"))
+        try:
+            assert armazenamento.importar_json(arquivo_json, validade=24 * 3600 * 180) == 1
+            assert armazenamento.obter("12345/SP")['nome'] == "ANA SOUZA"
+            assert armazenamento.carregar_estatisticas() == {'cache_hits': 5}
+
+            exportado = os.path.join(pasta, "exportado.json")
+            assert armazenamento.exportar_json(exportado) == 1
+            with open(exportado, 'r', encoding='utf-8') as f:
+                assert list(json.load(f)['cache']) == ["12345/SP"]
+        finally:
+            armazenamento.fechar()
+
+
+def main():
+    testes = [testar_upsert, testar_validade_por_classe, testar_estatisticas_somadas,
+              testar_importar_e_exportar_json]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
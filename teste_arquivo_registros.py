@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do cache em arquivo de registros (ArquivoRegistrosOAB)
+Confere gravação e leitura depois de reabrir o arquivo, o crescimento do
+índice e a compactação dos dados
+
+Uso:
+    python teste_arquivo_registros.py
+"""
+
+import os
+import sys
+import glob
+import tempfile
+from datetime import datetime, timedelta
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache import ArquivoRegistrosOAB
+
+
+def entrada(numero, estado, nome="", erro=None, horas_atras=0):
+    """Entrada no formato do cache_oab.json"""
+    momento = datetime.now() - timedelta(hours=horas_atras)
+    return {
+        'numero_oab': str(numero),
+        'estado': estado,
+        'nome': nome,
+        'erro': erro,
+        'sucesso': bool(nome),
+        'timestamp': momento.isoformat()
+    }
+
+
+def testar_gravar_e_reabrir():
+    """Entradas gravadas continuam legíveis depois de fechar e reabrir"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "cache.idx")
+        registros = ArquivoRegistrosOAB(arquivo)
+        registros.gravar("147520/SP", entrada(147520, "SP", "MARIA DA SILVA"))
+        registros.gravar("2345/RJ", entrada(2345, "RJ", erro="Inscrição não encontrada"))
+        registros.gravar("147520/SP", entrada(147520, "SP", "MARIA DA SILVA SANTOS"))
+        registros.fechar()
+
+        registros = ArquivoRegistrosOAB(arquivo)
+        try:
+            lida = registros.obter("147520/SP")
+            assert lida is not None and lida['nome'] == "MARIA DA SILVA SANTOS", lida
+            assert lida['sucesso'] is True, lida
+            # Outras grafias da mesma inscrição chegam na mesma entrada
+            assert registros.obter("SP147520")['nome'] == "MARIA DA SILVA SANTOS"
+
+            erro = registros.obter("2345/RJ")
+            assert erro is not None and erro['erro'] == "Inscrição não encontrada", erro
+            assert erro['sucesso'] is False, erro
+
+            assert registros.obter("999/SP") is None
+            assert registros.contar() == 2, registros.contar()
+            assert dict(registros.iterar()).keys() == {"147520/SP", "2345/RJ"}
+
+            registros.remover("2345/RJ")
+            assert registros.obter("2345/RJ") is None
+            assert registros.contar() == 1, registros.contar()
+        finally:
+            registros.fechar()
+
+
+def testar_validade():
+    """Entradas mais antigas que a validade não são devolvidas"""
+    with tempfile.TemporaryDirectory() as pasta:
+        registros = ArquivoRegistrosOAB(os.path.join(pasta, "cache.idx"))
+        try:
+            registros.gravar("1234/MG", entrada(1234, "MG", "JOSE PEREIRA", horas_atras=48))
+            assert registros.obter("1234/MG") is not None
+            assert registros.obter("1234/MG", validade=24 * 3600) is None
+            # contar() vem do cabeçalho: a expirada conta até ser removida
+            assert registros.contar(validade=24 * 3600) == 1
+            assert registros.contar_validas(validade=24 * 3600) == 0
+            assert registros.contar_validas(validade=72 * 3600) == 1
+            assert registros.remover_expirados(24 * 3600) == 1
+            assert registros.contar() == 0, registros.contar()
+        finally:
+            registros.fechar()
+
+
+def testar_crescimento_do_indice():
+    """O índice dobra de tamanho sem perder entradas"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "cache.idx")
+        registros = ArquivoRegistrosOAB(arquivo, capacidade_inicial=16)
+        registros.gravar_varios({f"{numero}/PR": entrada(numero, "PR", f"ADVOGADO {numero}")
+                                 for numero in range(1000, 1050)})
+        assert registros.capacidade > 16, registros.capacidade
+        registros.fechar()
+
+        registros = ArquivoRegistrosOAB(arquivo)
+        try:
+            assert registros.contar() == 50, registros.contar()
+            for numero in range(1000, 1050):
+                assert registros.obter(f"{numero}/PR")['nome'] == f"ADVOGADO {numero}", numero
+        finally:
+            registros.fechar()
+
+
+def testar_compactacao():
+    """Compactar mantém só as entradas vivas e troca a geração dos dados"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "cache.idx")
+        registros = ArquivoRegistrosOAB(arquivo)
+        for versao in range(3):
+            registros.gravar_varios({f"{numero}/SC": entrada(numero, "SC", f"NOME {numero} V{versao}")
+                                     for numero in range(5000, 5020)})
+        for numero in range(5000, 5005):
+            registros.remover(f"{numero}/SC")
+
+        geracao = registros.geracao
+        tamanho_antes = os.path.getsize(registros._arquivo_dados(geracao))
+        assert registros.compactar() == 15
+        assert registros.geracao == geracao + 1, registros.geracao
+        assert os.path.getsize(registros._arquivo_dados(registros.geracao)) < tamanho_antes
+        registros.fechar()
+
+        # Só os dados da geração atual ficam no disco
+        assert len(glob.glob(os.path.join(pasta, "*.dat"))) == 1, os.listdir(pasta)
+
+        registros = ArquivoRegistrosOAB(arquivo)
+        try:
+            assert registros.contar() == 15, registros.contar()
+            assert registros.obter("5000/SC") is None
+            for numero in range(5005, 5020):
+                assert registros.obter(f"{numero}/SC")['nome'] == f"NOME {numero} V2", numero
+
+            # Gravações depois da compactação continuam funcionando
+            registros.gravar("5000/SC", entrada(5000, "SC", "NOME 5000 NOVO"))
+            assert registros.obter("5000/SC")['nome'] == "NOME 5000 NOVO"
+            assert registros.contar() == 16, registros.contar()
+        finally:
+            registros.fechar()
+
+
+def main():
+    testes = [testar_gravar_e_reabrir, testar_validade, testar_crescimento_do_indice, testar_compactacao]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
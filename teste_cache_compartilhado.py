@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do cache compartilhado entre processos (reservas no SQLite)
+Confere que só um worker consulta cada OAB, que os demais aproveitam o
+resultado dele e que uma OAB ainda reservada não é consultada em dobro
+
+Uso:
+    python teste_cache_compartilhado.py
+"""
+
+import os
+import sys
+import tempfile
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache import ArmazenamentoSQLite
+from bot_oab.models.resultado_oab import ResultadoOAB
+from bot_oab_supabase import CacheConsultas, OABSupabaseIntegrator, ERRO_EM_CONSULTA
+
+
+def criar_worker(arquivo, identificador):
+    """CacheConsultas de um worker (cada um com a sua conexão ao banco)"""
+    cache = CacheConsultas(armazenamento=ArmazenamentoSQLite(arquivo), compartilhado=True)
+    cache.identificador = identificador
+    return cache
+
+
+def criar_integrador(cache, consultas):
+    """Integrador sem Supabase nem navegador: a consulta ao site só é registrada"""
+    integrador = OABSupabaseIntegrator.__new__(OABSupabaseIntegrator)
+    integrador.cache = cache
+    integrador.renovar_em_segundo_plano = False
+
+    def consultar_site(numero_oab, estado, renovacao=False):
+        consultas.append((numero_oab, estado))
+        resultado = ResultadoOAB(numero_oab, estado, nome="MARIA DA SILVA", sucesso=True)
+        cache.salvar_cache(numero_oab, estado, resultado)
+        return resultado
+
+    integrador._consultar_site = consultar_site
+    return integrador
+
+
+def testar_reserva_exclusiva():
+    """Com a OAB reservada por um worker, o outro não consegue reservar"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "cache.db")
+        worker_a = criar_worker(arquivo, "maquina-a:1")
+        worker_b = criar_worker(arquivo, "maquina-b:1")
+        try:
+            assert worker_a.reservar_consulta("123456", "SP")
+            assert worker_a.reservar_consulta("123456", "SP")  # a reserva já é dele
+            assert not worker_b.reservar_consulta("123456", "SP")
+
+            worker_b.liberar_consulta("123456", "SP")  # só o dono libera
+            assert not worker_b.reservar_consulta("123456", "SP")
+
+            worker_a.liberar_consulta("123456", "SP")
+            assert worker_b.reservar_consulta("123456", "SP")
+        finally:
+            worker_a.armazenamento.fechar()
+            worker_b.armazenamento.fechar()
+
+
+def testar_aguardar_resultado_do_outro():
+    """O worker que aguarda recebe o resultado gravado pelo dono da reserva"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "cache.db")
+        worker_a = criar_worker(arquivo, "maquina-a:1")
+        worker_b = criar_worker(arquivo, "maquina-b:1")
+        try:
+            assert worker_a.reservar_consulta("123456", "SP")
+            worker_a.salvar_cache("123456", "SP", ResultadoOAB("123456", "SP", nome="MARIA DA SILVA", sucesso=True))
+
+            resultado = worker_b.aguardar_consulta("123456", "SP", timeout=2, intervalo=0.05)
+            assert resultado is not None and resultado.nome == "MARIA DA SILVA", resultado
+            assert worker_b.estatisticas['duplicatas_evitadas'] == 1
+        finally:
+            worker_a.armazenamento.fechar()
+            worker_b.armazenamento.fechar()
+
+
+def testar_reserva_liberada_sem_resultado():
+    """Reserva liberada sem resultado: o worker que aguardava consulta ele mesmo"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "cache.db")
+        worker_a = criar_worker(arquivo, "maquina-a:1")
+        worker_b = criar_worker(arquivo, "maquina-b:1")
+        consultas = []
+        try:
+            assert worker_a.reservar_consulta("123456", "SP")
+            integrador = criar_integrador(worker_b, consultas)
+            worker_b.aguardar_consulta = lambda numero, estado: worker_a.liberar_consulta(numero, estado)
+
+            resultado = integrador.processar_oab_unica("123456", "SP")
+            assert resultado.sucesso and consultas == [("123456", "SP")], consultas
+            # A reserva do worker que consultou foi liberada no fim
+            assert worker_a.reservar_consulta("123456", "SP")
+        finally:
+            worker_a.armazenamento.fechar()
+            worker_b.armazenamento.fechar()
+
+
+def testar_reserva_mantida_sem_consulta_dobrada():
+    """Esgotada a espera com a OAB ainda reservada, não consulta nem libera a reserva do outro"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "cache.db")
+        worker_a = criar_worker(arquivo, "maquina-a:1")
+        worker_b = criar_worker(arquivo, "maquina-b:1")
+        consultas = []
+        try:
+            assert worker_a.reservar_consulta("123456", "SP")
+            integrador = criar_integrador(worker_b, consultas)
+            worker_b.aguardar_consulta = lambda numero, estado: None
+
+            resultado = integrador.processar_oab_unica("123456", "SP")
+            assert not resultado.sucesso and resultado.erro == ERRO_EM_CONSULTA, resultado
+            assert consultas == [], consultas
+            assert not worker_b.reservar_consulta("123456", "SP")
+        finally:
+            worker_a.armazenamento.fechar()
+            worker_b.armazenamento.fechar()
+
+
+def main():
+    testes = [testar_reserva_exclusiva, testar_aguardar_resultado_do_outro,
+              testar_reserva_liberada_sem_resultado, testar_reserva_mantida_sem_consulta_dobrada]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
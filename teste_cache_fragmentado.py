@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do cache em memória fragmentado (CacheLRUFragmentado)
+Confere as métricas somadas com os limites configurados, a inserção
+atômica só quando ausente e o uso por várias threads ao mesmo tempo
+
+Uso:
+    python teste_cache_fragmentado.py
+"""
+
+import os
+import sys
+import threading
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache import CacheLRUFragmentado, ContadoresAtomicos
+
+
+def testar_metricas_com_limites_configurados():
+    """As métricas trazem os limites configurados, não a soma dos fragmentos"""
+    cache = CacheLRUFragmentado(fragmentos=4, max_entradas=10, max_bytes=1000,
+                                medir=lambda chave, valor: 100)
+    # Chaves inteiras: hash fixo, dois itens por fragmento (sem descarte)
+    for numero in range(6):
+        cache.inserir(numero, numero)
+
+    metricas = cache.metricas()
+    assert metricas['max_entradas'] == 10 and metricas['max_bytes'] == 1000, metricas
+    assert metricas['entradas'] == len(cache) == 6, metricas
+    assert metricas['bytes_residentes'] == 600, metricas
+    assert metricas['evicoes'] == 0, metricas
+    # O pico é o do fragmento mais cheio, não a soma dos picos
+    assert metricas['bytes_maximo_fragmento'] == 200, metricas
+
+    sem_limite = CacheLRUFragmentado(fragmentos=2).metricas()
+    assert sem_limite['max_entradas'] is None and sem_limite['max_bytes'] is None, sem_limite
+
+
+def testar_inserir_se_ausente():
+    """Só insere quando não há entrada válida para a chave"""
+    expiradas = set()
+    cache = CacheLRUFragmentado(fragmentos=2, expirado=lambda valor: valor in expiradas)
+
+    assert cache.inserir_se_ausente("123456/SP", "PRIMEIRO")
+    assert not cache.inserir_se_ausente("123456/SP", "SEGUNDO")
+    assert cache.obter("123456/SP") == "PRIMEIRO"
+
+    # Entrada expirada não impede a nova
+    expiradas.add("PRIMEIRO")
+    assert cache.inserir_se_ausente("123456/SP", "TERCEIRO")
+    assert cache.obter("123456/SP") == "TERCEIRO"
+
+
+def testar_varias_threads():
+    """Threads disputando as mesmas chaves: um único vencedor por chave e contadores exatos"""
+    cache = CacheLRUFragmentado(fragmentos=4)
+    contadores = ContadoresAtomicos({'inseridas': 0})
+    largada = threading.Barrier(8)
+
+    def trabalhar(thread):
+        largada.wait()
+        for numero in range(500):
+            if cache.inserir_se_ausente(f"{numero}/MG", thread):
+                contadores.incrementar('inseridas')
+            cache.obter(f"{numero}/MG")
+
+    threads = [threading.Thread(target=trabalhar, args=(thread,)) for thread in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == 500, len(cache)
+    assert contadores['inseridas'] == 500, contadores
+    assert len(dict(cache.itens())) == 500
+
+
+def main():
+    testes = [testar_metricas_com_limites_configurados, testar_inserir_se_ausente, testar_varias_threads]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do cache L2 compartilhado entre as máquinas (tabela no Supabase)
+Usa um cliente falso que segue a regra da função gravar_cache_consultas_oab
+(a linha só é substituída por uma consulta mais nova) e confere a leitura,
+o envio em lote e a precedência entre a entrada local e a do L2
+
+Uso:
+    python teste_cache_l2.py
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache import ContadoresAtomicos
+from bot_oab.models.chave_oab import chave_oab
+from bot_oab.models.resultado_oab import ResultadoOAB
+from bot_oab_supabase import (CacheConsultas, OABSupabaseIntegrator, SupabaseConnector,
+                              TABELA_CACHE_L2, FUNCAO_GRAVAR_CACHE_L2)
+
+
+class RespostaFalsa:
+    """Resposta com .data, como a do cliente do Supabase"""
+
+    def __init__(self, data):
+        self.data = data
+
+
+class ConsultaFalsa:
+    """table(...).select(...).eq(...).in_(...).execute() sobre as linhas do cliente"""
+
+    def __init__(self, linhas):
+        self.linhas = linhas
+        self.filtros = []
+
+    def select(self, colunas):
+        return self
+
+    def eq(self, coluna, valor):
+        self.filtros.append(lambda linha: linha[coluna] == valor)
+        return self
+
+    def in_(self, coluna, valores):
+        self.filtros.append(lambda linha: linha[coluna] in valores)
+        return self
+
+    def execute(self):
+        return RespostaFalsa([dict(linha) for linha in self.linhas.values()
+                              if all(filtro(linha) for filtro in self.filtros)])
+
+
+class ClienteL2Falso:
+    """Tabela cache_consultas_oab em memória, chave (estado, numero)"""
+
+    def __init__(self):
+        self.linhas = {}
+        self.chamadas_rpc = []
+
+    def table(self, nome):
+        assert nome == TABELA_CACHE_L2
+        return ConsultaFalsa(self.linhas)
+
+    def rpc(self, nome, parametros):
+        assert nome == FUNCAO_GRAVAR_CACHE_L2
+        self.chamadas_rpc.append(parametros['linhas'])
+        chaves = [(linha['estado'], linha['numero']) for linha in parametros['linhas']]
+        assert len(chaves) == len(set(chaves)), "OAB repetida no mesmo lote"
+
+        gravadas = 0
+        for linha in parametros['linhas']:
+            chave = (linha['estado'], linha['numero'])
+            atual = self.linhas.get(chave)
+            if atual is None or (datetime.fromisoformat(atual['consultado_em'])
+                                 < datetime.fromisoformat(linha['consultado_em'])):
+                self.linhas[chave] = dict(linha)
+                gravadas += 1
+        return ExecucaoFalsa(gravadas)
+
+
+class ClienteIndisponivel:
+    """Cliente sem rede: toda chamada falha"""
+
+    def rpc(self, nome, parametros):
+        raise ConnectionError("sem rede")
+
+
+class ExecucaoFalsa:
+    """rpc(...).execute() devolvendo a quantidade de linhas gravadas"""
+
+    def __init__(self, gravadas):
+        self.gravadas = gravadas
+
+    def execute(self):
+        return RespostaFalsa(self.gravadas)
+
+
+def criar_conector(cliente):
+    """SupabaseConnector sem conexão real, sobre o cliente falso"""
+    conector = SupabaseConnector.__new__(SupabaseConnector)
+    conector.client = cliente
+    return conector
+
+
+def entrada(numero, estado, nome, horas_atras=0):
+    """Entrada de sucesso no formato do cache_oab.json"""
+    return {'numero_oab': numero, 'estado': estado, 'nome': nome, 'erro': None, 'sucesso': True,
+            'classe': 'sucesso', 'timestamp': (datetime.now() - timedelta(hours=horas_atras)).isoformat()}
+
+
+def testar_envio_mantem_a_mais_recente():
+    """No lote vai uma linha por OAB (a mais nova); o L2 não volta para uma consulta antiga"""
+    cliente = ClienteL2Falso()
+    conector = criar_conector(cliente)
+
+    gravadas = conector.gravar_cache_compartilhado([
+        entrada("147520", "SP", "MARIA DA SILVA", horas_atras=2),
+        entrada("147520", "SP", "MARIA DA SILVA SANTOS", horas_atras=1),
+        entrada("2345", "RJ", "JOAO SOUZA"),
+    ])
+    assert gravadas == 2 and len(cliente.chamadas_rpc[0]) == 2, cliente.chamadas_rpc
+    assert cliente.linhas[("SP", 147520)]['nome'] == "MARIA DA SILVA SANTOS"
+
+    # Envio atrasado de outra máquina, com consulta mais antiga
+    assert conector.gravar_cache_compartilhado([entrada("147520", "SP", "NOME ANTIGO", horas_atras=5)]) == 0
+    assert cliente.linhas[("SP", 147520)]['nome'] == "MARIA DA SILVA SANTOS"
+
+
+def testar_leitura_em_lote():
+    """A leitura devolve as OABs pedidas no formato do cache local"""
+    cliente = ClienteL2Falso()
+    conector = criar_conector(cliente)
+    conector.gravar_cache_compartilhado([entrada("147520", "SP", "MARIA DA SILVA"),
+                                         entrada("2345", "RJ", "JOAO SOUZA")])
+
+    entradas = conector.buscar_cache_compartilhado([chave_oab("147520", "SP"), chave_oab("999999", "SP")])
+    assert list(entradas) == [chave_oab("147520", "SP")], entradas
+    lida = entradas[chave_oab("147520", "SP")]
+    assert lida['nome'] == "MARIA DA SILVA" and lida['classe'] == 'sucesso', lida
+    assert abs(datetime.fromisoformat(lida['timestamp']) - datetime.now()) < timedelta(minutes=1), lida
+
+
+def testar_importacao_respeita_a_local_mais_nova():
+    """Entrada do L2 só substitui a local se for mais recente"""
+    cache = CacheConsultas()
+    cache.salvar_cache("147520", "SP", ResultadoOAB("147520", "SP", nome="NOME LOCAL", sucesso=True))
+
+    incluidas = cache.importar_compartilhado({
+        chave_oab("147520", "SP"): entrada("147520", "SP", "NOME ANTIGO DO L2", horas_atras=3),
+        chave_oab("2345", "RJ"): entrada("2345", "RJ", "JOAO SOUZA", horas_atras=3),
+    })
+    assert incluidas == 1, incluidas
+    assert cache.consultar_cache("147520", "SP").nome == "NOME LOCAL"
+    assert cache.consultar_cache("2345", "RJ").nome == "JOAO SOUZA"
+
+    cache.importar_compartilhado({chave_oab("147520", "SP"): entrada("147520", "SP", "NOME NOVO DO L2")})
+    assert cache.consultar_cache("147520", "SP").nome == "NOME NOVO DO L2"
+
+
+def testar_integrador_envia_e_devolve_fila():
+    """Consultas novas vão para o L2; se o envio falhar voltam para a fila"""
+    cliente = ClienteL2Falso()
+    integrador = OABSupabaseIntegrator.__new__(OABSupabaseIntegrator)
+    integrador.cache = CacheConsultas(compartilhar_l2=True)
+    integrador.supabase = criar_conector(cliente)
+    integrador.estatisticas = ContadoresAtomicos({'enviadas_cache_l2': 0})
+
+    integrador.cache.salvar_cache("147520", "SP", ResultadoOAB("147520", "SP", nome="MARIA DA SILVA", sucesso=True))
+    integrador.cache.salvar_cache("1234", "SP", ResultadoOAB("1234", "SP", erro="Timeout ao carregar a página"))
+    assert integrador.cache.tamanho_fila_l2() == 1  # falha passageira não vai para o L2
+
+    integrador.supabase.client = ClienteIndisponivel()
+    assert integrador.enviar_cache_l2() == 0
+    assert integrador.cache.tamanho_fila_l2() == 1
+
+    integrador.supabase.client = cliente
+    assert integrador.enviar_cache_l2() == 1
+    assert integrador.cache.tamanho_fila_l2() == 0
+    assert integrador.estatisticas['enviadas_cache_l2'] == 1
+    assert cliente.linhas[("SP", 147520)]['nome'] == "MARIA DA SILVA"
+
+
+def main():
+    testes = [testar_envio_mantem_a_mais_recente, testar_leitura_em_lote,
+              testar_importacao_respeita_a_local_mais_nova, testar_integrador_envia_e_devolve_fila]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do cache em memória limitado (CacheLRU)
+Confere o descarte LRU por entradas e por bytes, a expiração no acesso e
+que o modo JSON puro do CacheConsultas não perde entradas do cache_oab.json
+
+Uso:
+    python teste_cache_lru.py
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache import CacheLRU
+
+
+def testar_descarte_por_entradas():
+    """Passando do limite sai a entrada menos usada recentemente"""
+    cache = CacheLRU(max_entradas=3)
+    for chave in ("A", "B", "C"):
+        cache.inserir(chave, chave.lower())
+
+    # "A" usada por último: "B" passa a ser a menos usada
+    assert cache.obter("A") == "a"
+    cache.inserir("D", "d")
+
+    assert len(cache) == 3, len(cache)
+    assert "B" not in cache
+    assert [chave for chave, _ in cache.itens()] == ["C", "A", "D"]
+    assert cache.metricas()['evicoes'] == 1, cache.metricas()
+
+
+def testar_descarte_por_bytes():
+    """O limite de bytes vale sobre a soma estimada das entradas"""
+    cache = CacheLRU(max_bytes=250, medir=lambda chave, valor: 100)
+    cache.inserir("A", 1)
+    cache.inserir("B", 2)
+    assert cache.bytes_residentes == 200, cache.bytes_residentes
+
+    cache.inserir("C", 3)
+    assert "A" not in cache and len(cache) == 2
+    assert cache.bytes_residentes == 200, cache.bytes_residentes
+
+    # Substituir uma entrada não conta os bytes duas vezes
+    cache.inserir("C", 4)
+    assert cache.bytes_residentes == 200, cache.bytes_residentes
+    assert cache.metricas()['bytes_maximo'] == 300, cache.metricas()
+
+
+def testar_expiracao_no_acesso():
+    """Entradas expiradas não são devolvidas e saem do cache no acesso"""
+    expiradas = {"VELHA"}
+    cache = CacheLRU(expirado=lambda valor: valor in expiradas)
+    cache.inserir("A", "VELHA")
+    cache.inserir("B", "NOVA")
+
+    assert "A" in cache
+    assert cache.obter("A", "ausente") == "ausente"
+    assert "A" not in cache
+    assert cache.obter("B") == "NOVA"
+    assert cache.metricas()['expiradas'] == 1, cache.metricas()
+
+
+def testar_expiradas_saem_antes_das_validas():
+    """Sem espaço, as expiradas são descartadas antes de qualquer entrada válida"""
+    expiradas = set()
+    cache = CacheLRU(max_entradas=2, expirado=lambda valor: valor in expiradas, intervalo_varredura=0)
+    cache.inserir("A", "a")
+    cache.inserir("B", "b")
+    expiradas.add("b")
+
+    cache.inserir("C", "c")
+    assert "A" in cache and "C" in cache and "B" not in cache
+    assert cache.metricas()['evicoes'] == 0, cache.metricas()
+    assert cache.remover_expirados() == 0
+
+
+def testar_json_puro_sem_limites():
+    """No modo JSON puro a memória é a única cópia: nada é descartado"""
+    from bot_oab.models.resultado_oab import ResultadoOAB
+    from bot_oab_supabase import CacheConsultas
+
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "cache_oab.json")
+        cache = CacheConsultas(max_entradas=2, max_bytes=1)
+        for numero in range(100001, 100011):
+            resultado = ResultadoOAB(str(numero), "SP", nome=f"ADVOGADO {numero}", sucesso=True)
+            cache.salvar_cache(str(numero), "SP", resultado)
+        cache.salvar_cache_arquivo(arquivo)
+
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)['cache']) == 10
+
+
+def main():
+    testes = [testar_descarte_por_entradas, testar_descarte_por_bytes, testar_expiracao_no_acesso,
+              testar_expiradas_saem_antes_das_validas, testar_json_puro_sem_limites]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
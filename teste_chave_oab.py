@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do identificador canônico da OAB (ChaveOAB)
+Confere o parser do usuario do banco / chave do cache e a normalização dos
+números lidos do site
+
+Uso:
+    python teste_chave_oab.py
+"""
+
+import os
+import sys
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.models.chave_oab import ChaveOAB, chave_oab, interpretar_oab, normalizar_numero
+
+
+def testar_formatos_aceitos():
+    """Todas as grafias da mesma inscrição viram a mesma chave"""
+    esperada = ChaveOAB('SP', 12345)
+    for texto in ("SP12345", "SP012345", "sp 12345", "SP/12345", "12345/SP", "12.345-SP", " SP12345 "):
+        assert interpretar_oab(texto) == esperada, texto
+
+    assert str(esperada) == "12345/SP"
+    assert esperada.usuario == "SP12345"
+    assert esperada.inscricao == "12345"
+
+
+def testar_formatos_rejeitados():
+    """Matrículas, UFs inválidas e números fora do tamanho não são OAB"""
+    for texto in ("M356437", "123456", "XX12345", "SP123", "SP123456789", "SP123ABC", "SP0000", "", None):
+        assert interpretar_oab(texto) is None, texto
+
+
+def testar_chave_oab():
+    """Número e UF separados (linhas do site, entradas do cache)"""
+    assert chave_oab("012345", "sp") == ChaveOAB('SP', 12345)
+    assert chave_oab(" 12.345 ", "SP") == ChaveOAB('SP', 12345)
+    assert chave_oab(12345, "SP") == ChaveOAB('SP', 12345)
+    assert chave_oab("12345", "XX") is None
+    assert chave_oab("", "SP") is None
+
+
+def testar_numero_estrito():
+    """Números com letras ou sufixos não são confundidos com a inscrição"""
+    for texto in ("12345-A", "E12345", "12345/SP", "12 345 B"):
+        assert normalizar_numero(texto) is None, texto
+        assert chave_oab(texto, "SP") is None, texto
+
+    assert normalizar_numero("000") is None
+    assert normalizar_numero("0012.345") == 12345
+
+
+def main():
+    testes = [testar_formatos_aceitos, testar_formatos_rejeitados, testar_chave_oab, testar_numero_estrito]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
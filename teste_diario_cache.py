@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do diário append-only do cache (DiarioCache)
+Confere a reconstrução snapshot + diário, a linha truncada por uma
+interrupção, a compactação (última gravação vence, expiradas saem) e a
+compactação disparada em segundo plano pelo limite de linhas
+
+Uso:
+    python teste_diario_cache.py
+"""
+
+import os
+import sys
+import json
+import glob
+import tempfile
+from datetime import datetime, timedelta
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache import DiarioCache
+
+
+def entrada(numero, estado, nome="", erro=None, horas_atras=0):
+    """Entrada no formato do cache_oab.json"""
+    momento = datetime.now() - timedelta(hours=horas_atras)
+    return {
+        'numero_oab': str(numero),
+        'estado': estado,
+        'nome': nome,
+        'erro': erro,
+        'sucesso': bool(nome),
+        'timestamp': momento.isoformat()
+    }
+
+
+def testar_reconstrucao_com_linha_truncada():
+    """Reabrir reaplica o diário; a linha cortada no meio é ignorada"""
+    with tempfile.TemporaryDirectory() as pasta:
+        snapshot = os.path.join(pasta, "cache_oab.json")
+        diario = DiarioCache(snapshot, limite_registros=0)
+        diario.registrar("147520/SP", entrada(147520, "SP", "MARIA DA SILVA"))
+        diario.registrar("2345/RJ", entrada(2345, "RJ", erro="Inscrição não encontrada"))
+        diario.fechar()
+
+        with open(diario.arquivo_diario, 'a', encoding='utf-8') as f:
+            f.write('{"chave": "999/SP", "entr')
+
+        diario = DiarioCache(snapshot, limite_registros=0)
+        try:
+            entradas, _ = diario.carregar()
+            assert entradas.keys() == {"147520/SP", "2345/RJ"}, entradas.keys()
+            assert diario.registros_diario == 3, diario.registros_diario
+        finally:
+            diario.fechar()
+
+
+def testar_compactacao():
+    """A última gravação de cada chave vence e as expiradas saem do snapshot"""
+    with tempfile.TemporaryDirectory() as pasta:
+        snapshot = os.path.join(pasta, "cache_oab.json")
+        diario = DiarioCache(snapshot, limite_registros=0)
+        try:
+            diario.registrar("147520/SP", entrada(147520, "SP", "MARIA DA SILVA"))
+            diario.registrar("147520/SP", entrada(147520, "SP", "MARIA DA SILVA SANTOS"))
+            diario.registrar("2345/RJ", entrada(2345, "RJ", erro="Inscrição não encontrada", horas_atras=48))
+
+            total = diario.compactar(validade={'sucesso': None, 'nao_encontrado': 24 * 3600},
+                                     estatisticas={'cache_hits': 3})
+            assert total == 1, total
+            assert diario.registros_diario == 0
+            assert os.path.getsize(diario.arquivo_diario) == 0
+            assert glob.glob(diario.arquivo_diario + ".*") == []
+
+            with open(snapshot, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            assert dados['cache']["147520/SP"]['nome'] == "MARIA DA SILVA SANTOS", dados
+            assert dados['estatisticas'] == {'cache_hits': 3}, dados
+
+            # Gravações depois da compactação continuam no diário novo
+            diario.registrar("5678/MG", entrada(5678, "MG", "JOSE PEREIRA"))
+            entradas, estatisticas = diario.carregar()
+            assert entradas.keys() == {"147520/SP", "5678/MG"}, entradas.keys()
+            assert estatisticas == {'cache_hits': 3}
+        finally:
+            diario.fechar()
+
+
+def testar_diario_rotacionado_pendente():
+    """Diário separado por uma compactação interrompida ainda é lido e incorporado"""
+    with tempfile.TemporaryDirectory() as pasta:
+        snapshot = os.path.join(pasta, "cache_oab.json")
+        diario = DiarioCache(snapshot, limite_registros=0)
+        diario.registrar("147520/SP", entrada(147520, "SP", "MARIA DA SILVA"))
+        diario.fechar()
+        os.replace(diario.arquivo_diario, diario.arquivo_diario + ".1")
+
+        diario = DiarioCache(snapshot, limite_registros=0)
+        try:
+            assert "147520/SP" in diario.carregar()[0]
+            assert diario.compactar() == 1
+            assert glob.glob(diario.arquivo_diario + ".*") == []
+        finally:
+            diario.fechar()
+
+
+def testar_compactacao_em_segundo_plano():
+    """Ao atingir o limite de linhas a compactação roda numa thread"""
+    with tempfile.TemporaryDirectory() as pasta:
+        snapshot = os.path.join(pasta, "cache_oab.json")
+        diario = DiarioCache(snapshot, limite_registros=5)
+        for numero in range(10000, 10005):
+            diario.registrar(f"{numero}/PR", entrada(numero, "PR", f"ADVOGADO {numero}"))
+        diario.fechar()  # aguarda a compactação disparada
+
+        with open(snapshot, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)['cache']) == 5
+        assert os.path.getsize(diario.arquivo_diario) == 0
+
+
+def main():
+    testes = [testar_reconstrucao_com_linha_truncada, testar_compactacao,
+              testar_diario_rotacionado_pendente, testar_compactacao_em_segundo_plano]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
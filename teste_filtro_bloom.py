@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do pré-filtro de Bloom das OABs gravadas no cache (FiltroBloom)
+Confere a ausência de falsos negativos, a gravação do filtro e que o
+CacheConsultas refaz o filtro quando o banco mudou desde que ele foi salvo
+
+Uso:
+    python teste_filtro_bloom.py
+"""
+
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache import ArmazenamentoSQLite, FiltroBloom
+from bot_oab.models.resultado_oab import ResultadoOAB
+from bot_oab_supabase import CacheConsultas
+
+
+def entrada(numero, estado, nome):
+    """Entrada de sucesso no formato do cache_oab.json"""
+    return {'numero_oab': str(numero), 'estado': estado, 'nome': nome, 'erro': None,
+            'sucesso': True, 'timestamp': datetime.now().isoformat()}
+
+
+def abrir_cache(arquivo):
+    """CacheConsultas sobre o banco, com o filtro salvo ao lado; devolve também a saída"""
+    saida = io.StringIO()
+    with redirect_stdout(saida):
+        cache = CacheConsultas(armazenamento=ArmazenamentoSQLite(arquivo), arquivo_filtro=arquivo + ".bloom",
+                               taxa_falsos_filtro=1e-6)
+        cache.carregar()
+    return cache, saida.getvalue()
+
+
+def testar_sem_falsos_negativos():
+    """Toda chave incluída é encontrada; passar da capacidade marca o filtro como cheio"""
+    filtro = FiltroBloom(capacidade=100, taxa_falsos_positivos=0.01)
+    filtro.adicionar_varias(f"{numero}/SP" for numero in range(10000, 10100))
+    assert all(f"{numero}/SP" in filtro for numero in range(10000, 10100))
+    # Chave repetida (ou que não acende bit novo) não conta de novo
+    filtro.adicionar("10000/SP")
+    assert len(filtro) <= 100 and not filtro.cheio
+
+    filtro.adicionar_varias(f"{numero}/MG" for numero in range(10000, 10050))
+    assert filtro.cheio
+
+
+def testar_salvar_e_carregar():
+    """O filtro salvo volta com as mesmas chaves e a referência; arquivo inválido é descartado"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "cache.bloom")
+        filtro = FiltroBloom(capacidade=1000)
+        filtro.adicionar_varias(f"{numero}/RJ" for numero in range(20000, 20500))
+        filtro.referencia = 500
+        filtro.salvar(arquivo)
+
+        carregado = FiltroBloom.carregar(arquivo)
+        assert carregado is not None and carregado.referencia == 500 and len(carregado) == len(filtro)
+        assert all(f"{numero}/RJ" in carregado for numero in range(20000, 20500))
+
+        with open(arquivo, 'wb') as f:
+            f.write(b'lixo')
+        assert FiltroBloom.carregar(arquivo) is None
+
+
+def testar_filtro_refeito_quando_banco_muda():
+    """Banco alterado por fora do CacheConsultas: o filtro é refeito e não esconde a chave nova"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "cache.db")
+        externo = ArmazenamentoSQLite(arquivo)
+        externo.gravar("147520/SP", entrada(147520, "SP", "MARIA DA SILVA"))
+
+        cache, saida = abrir_cache(arquivo)
+        assert "Filtro de Bloom reconstruído" in saida, saida
+        assert cache.consultar_cache("999999", "SP") is None
+        assert cache.estatisticas['filtro_descartes'] == 1
+        cache.salvar_cache("222222", "SP", ResultadoOAB("222222", "SP", nome="JOAO SOUZA", sucesso=True))
+        cache.persistir()
+        cache.armazenamento.fechar()
+
+        # Sem mudança no banco o filtro salvo é reaproveitado
+        cache, saida = abrir_cache(arquivo)
+        assert "Filtro de Bloom carregado" in saida, saida
+        assert cache.consultar_cache("222222", "SP").nome == "JOAO SOUZA"
+        cache.armazenamento.fechar()
+
+        # Outro processo grava sem passar pelo filtro
+        externo.gravar("555555/RJ", entrada(555555, "RJ", "ANA PEREIRA"))
+        cache, saida = abrir_cache(arquivo)
+        try:
+            assert "Filtro de Bloom reconstruído" in saida, saida
+            assert cache.consultar_cache("555555", "RJ").nome == "ANA PEREIRA"
+        finally:
+            cache.armazenamento.fechar()
+            externo.fechar()
+
+
+def main():
+    testes = [testar_sem_falsos_negativos, testar_salvar_e_carregar, testar_filtro_refeito_quando_banco_muda]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
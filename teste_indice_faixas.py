@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do índice de faixas de inscrição por seccional (IndiceFaixasOAB)
+Confere que só as consultas confirmadas pelo site contam, uma vez por OAB,
+que um número fora da curva não estica a faixa e a gravação do índice
+
+Uso:
+    python teste_indice_faixas.py
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache import IndiceFaixasOAB
+from bot_oab.cache.politica_cache import CLASSE_SUCESSO, CLASSE_ADICIONAL, CLASSE_AQUECIDO
+from bot_oab.models.chave_oab import chave_oab
+
+
+def testar_conta_oabs_distintas():
+    """A mesma OAB gravada várias vezes é uma amostra só"""
+    indice = IndiceFaixasOAB(amostras_minimas=3)
+    for _ in range(10):
+        indice.aprender("100000/SP", CLASSE_SUCESSO)
+    indice.aprender("100001/SP", CLASSE_SUCESSO)
+
+    assert len(indice) == 2, len(indice)
+    assert indice.limite("SP") is None
+
+    indice.aprender("100002/SP", CLASSE_SUCESSO)
+    assert indice.limite("SP") is not None
+
+
+def testar_so_sucesso_confirmado():
+    """Adicionais, aquecidas e chaves inválidas não entram no índice"""
+    indice = IndiceFaixasOAB()
+    assert not indice.aprender("900000/RJ", CLASSE_ADICIONAL)
+    assert not indice.aprender("900001/RJ", CLASSE_AQUECIDO)
+    assert not indice.aprender("não é oab", CLASSE_SUCESSO)
+    assert indice.aprender(chave_oab("1234", "RJ"), CLASSE_SUCESSO)
+    assert indice.numeros == {"RJ": [1234]}, indice.numeros
+
+
+def testar_percentil_descarta_fora_da_curva():
+    """Um número digitado errado que passou não define a faixa da UF"""
+    indice = IndiceFaixasOAB(percentil=0.95, folga=0.05, margem_minima=1000, amostras_minimas=20)
+    for numero in range(100000, 500000, 10000):  # 40 inscrições até 490000
+        indice.aprender(f"{numero}/MG", CLASSE_SUCESSO)
+    indice.aprender("9999999/MG", CLASSE_SUCESSO)
+
+    limite = indice.limite("MG")
+    assert limite is not None and limite < 600000, limite
+    assert indice.improvavel(chave_oab("9999998", "MG"))
+    assert not indice.improvavel(chave_oab("495000", "MG"))
+
+    # Com percentil 1.0 vale o maior número confirmado
+    indice.percentil = 1.0
+    assert indice.limite("MG") == int(9999999 * 1.05), indice.limite("MG")
+
+
+def testar_salvar_e_carregar():
+    """O índice salvo volta com os mesmos números; formato antigo é reconstruído"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "cache.faixas.json")
+        indice = IndiceFaixasOAB(amostras_minimas=2)
+        for numero in (30000, 10000, 20000, 10000):
+            indice.aprender(f"{numero}/PR", CLASSE_SUCESSO)
+        indice.referencia = 7
+        indice.salvar(arquivo)
+
+        carregado = IndiceFaixasOAB.carregar(arquivo, amostras_minimas=2)
+        assert carregado is not None and carregado.referencia == 7
+        assert carregado.numeros == {"PR": [10000, 20000, 30000]}, carregado.numeros
+        assert carregado.limite("PR") == indice.limite("PR")
+
+        # Arquivo com só o maior número por UF: não dá para tirar o percentil
+        with open(arquivo, 'w', encoding='utf-8') as f:
+            json.dump({'referencia': 7, 'maximos': {"PR": 30000}, 'amostras': {"PR": 4}}, f)
+        assert IndiceFaixasOAB.carregar(arquivo) is None
+
+
+def main():
+    testes = [testar_conta_oabs_distintas, testar_so_sucesso_confirmado,
+              testar_percentil_descarta_fora_da_curva, testar_salvar_e_carregar]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do índice reverso nome -> OAB (IndiceNomesOAB)
+Confere a busca por prefixo e por palavras sem acentos, a troca do nome de
+uma inscrição, a leitura das pesquisas exportadas e a busca pelo
+CacheConsultas
+
+Uso:
+    python teste_indice_nomes.py
+"""
+
+import os
+import csv
+import sys
+import json
+import tempfile
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache import IndiceNomesOAB, normalizar_nome
+
+
+def criar_indice():
+    """Índice com alguns nomes parecidos"""
+    indice = IndiceNomesOAB()
+    indice.adicionar("147520/SP", "José da Silva")
+    indice.adicionar("2345/RJ", "JOANA SILVA")
+    indice.adicionar("98765/MG", "MARIA JOSÉ SOUZA")
+    indice.adicionar("55555/SP", "SILVANA COSTA")
+    return indice
+
+
+def testar_normalizacao():
+    """Sem acentos, maiúsculas e um espaço entre as palavras"""
+    assert normalizar_nome("  José  d'Ávila-Júnior ") == "JOSE D AVILA JUNIOR"
+    assert normalizar_nome(None) == ""
+
+
+def testar_busca_por_prefixo():
+    """O nome completo começa com o texto"""
+    indice = criar_indice()
+    assert indice.buscar_prefixo("jose da sil") == [("147520", "SP", "José da Silva")]
+    assert indice.buscar_prefixo("SILVA") == [("55555", "SP", "SILVANA COSTA")]
+    assert indice.buscar_prefixo("   ") == []
+
+
+def testar_busca_por_palavras():
+    """Todas as palavras, em qualquer ordem, como início de palavra do nome"""
+    indice = criar_indice()
+    assert [r[0] for r in indice.buscar_palavras("silva jo")] == ["2345", "147520"]
+    assert [r[0] for r in indice.buscar_palavras("jose")] == ["147520", "98765"]
+    assert [r[0] for r in indice.buscar_palavras("silva")] == ["2345", "147520", "55555"]
+    assert len(indice.buscar_palavras("silva", limite=1)) == 1
+    assert indice.buscar_palavras("ilva") == []
+
+
+def testar_troca_de_nome():
+    """Nome novo da mesma inscrição substitui o antigo no índice"""
+    indice = criar_indice()
+    indice.adicionar("SP147520", "JOSE DA SILVA PEREIRA")
+    assert len(indice) == 4
+    assert indice.buscar_palavras("pereira") == [("147520", "SP", "JOSE DA SILVA PEREIRA")]
+    assert indice.buscar_prefixo("jose da silva") == [("147520", "SP", "JOSE DA SILVA PEREIRA")]
+
+    indice.adicionar("2345/RJ", "JOANA COSTA")
+    assert [r[0] for r in indice.buscar_palavras("silva")] == ["147520", "55555"]
+
+
+def testar_pesquisas_exportadas():
+    """Resultados com sucesso dos JSON e CSV exportados entram no índice"""
+    with tempfile.TemporaryDirectory() as pasta:
+        sessao = os.path.join(pasta, "sessao_1")
+        os.makedirs(sessao)
+        with open(os.path.join(sessao, "resultados.json"), 'w', encoding='utf-8') as f:
+            json.dump({'resultados': [
+                {'inscricao': "147520", 'estado': "SP", 'nome': "JOSE DA SILVA", 'sucesso': True},
+                {'inscricao': "999", 'estado': "SP", 'nome': "", 'sucesso': False}
+            ]}, f)
+        with open(os.path.join(sessao, "resultados.csv"), 'w', newline='', encoding='utf-8') as f:
+            escritor = csv.DictWriter(f, fieldnames=['inscricao', 'estado', 'nome', 'sucesso'])
+            escritor.writeheader()
+            escritor.writerow({'inscricao': "2345", 'estado': "RJ", 'nome': "JOANA SILVA", 'sucesso': "True"})
+
+        indice = IndiceNomesOAB()
+        assert indice.adicionar_exportados(pasta) == 2
+        assert [r[0] for r in indice.buscar_palavras("silva")] == ["2345", "147520"]
+
+
+def testar_busca_pelo_cache():
+    """O CacheConsultas monta o índice e inclui os nomes gravados depois"""
+    from bot_oab.models.resultado_oab import ResultadoOAB
+    from bot_oab_supabase import CacheConsultas
+
+    cache = CacheConsultas()
+    cache.salvar_cache("147520", "SP", ResultadoOAB("147520", "SP", nome="JOSÉ DA SILVA", sucesso=True))
+    cache.salvar_cache("2345", "RJ", ResultadoOAB("2345", "RJ", erro="Inscrição não encontrada"))
+    assert cache.buscar_nome("jose") == [("147520", "SP", "JOSÉ DA SILVA")]
+
+    cache.salvar_cache("98765", "MG", ResultadoOAB("98765", "MG", nome="MARIA JOSE SOUZA", sucesso=True))
+    assert [r[0] for r in cache.buscar_nome("jose")] == ["147520", "98765"]
+    assert cache.buscar_nome("maria j", prefixo=True) == [("98765", "MG", "MARIA JOSE SOUZA")]
+
+
+def main():
+    testes = [testar_normalizacao, testar_busca_por_prefixo, testar_busca_por_palavras, testar_troca_de_nome,
+              testar_pesquisas_exportadas, testar_busca_pelo_cache]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da validade do cache por classe de resultado
+Confere a classificação dos resultados, a expiração por classe e que o
+CacheConsultas não grava classes com validade 0 nem devolve expiradas
+
+Uso:
+    python teste_politica_cache.py
+"""
+
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache.politica_cache import (CLASSE_SUCESSO, CLASSE_NAO_ENCONTRADO, CLASSE_TRANSITORIO,
+                                          CLASSES_RESULTADO, classificar_resultado, expirado,
+                                          horas_para_segundos, validade_por_classe)
+
+
+def testar_classificacao():
+    """Sucesso, inscrição inexistente e falhas passageiras caem em classes diferentes"""
+    assert classificar_resultado(True, None) == CLASSE_SUCESSO
+    assert classificar_resultado(False, "Inscrição não encontrada") == CLASSE_NAO_ENCONTRADO
+    assert classificar_resultado(False, "Nenhum resultado encontrado para 1234/SP") == CLASSE_NAO_ENCONTRADO
+    assert classificar_resultado(False, "Timeout ao carregar a página") == CLASSE_TRANSITORIO
+    assert classificar_resultado(False, None) == CLASSE_TRANSITORIO
+
+
+def testar_expiracao_por_classe():
+    """Cada classe expira com a sua validade; None nunca expira"""
+    validade = horas_para_segundos({CLASSE_SUCESSO: None, CLASSE_NAO_ENCONTRADO: 24, CLASSE_TRANSITORIO: 1})
+    agora = time.time()
+    dois_dias = agora - 48 * 3600
+
+    assert not expirado(CLASSE_SUCESSO, dois_dias, validade, agora)
+    assert expirado(CLASSE_NAO_ENCONTRADO, dois_dias, validade, agora)
+    assert not expirado(CLASSE_NAO_ENCONTRADO, agora - 3600, validade, agora)
+    assert expirado(CLASSE_TRANSITORIO, agora - 2 * 3600, validade, agora)
+
+    # Validade uniforme vale para todas as classes
+    assert validade_por_classe(3600).keys() == set(CLASSES_RESULTADO)
+    assert expirado(CLASSE_SUCESSO, dois_dias, 3600, agora)
+
+
+def testar_cache_consultas_por_classe():
+    """Classe com validade 0 não é gravada; a expirada não é devolvida"""
+    from bot_oab.models.resultado_oab import ResultadoOAB
+    from bot_oab_supabase import CacheConsultas
+
+    cache = CacheConsultas(validade_por_classe={'sucesso': 24 * 180, 'nao_encontrado': 24 * 7,
+                                                'transitorio': 0})
+
+    cache.salvar_cache("1234", "SP", ResultadoOAB("1234", "SP", erro="Timeout ao carregar a página"))
+    assert cache.consultar_cache("1234", "SP") is None
+
+    cache.salvar_cache("5678", "SP", ResultadoOAB("5678", "SP", erro="Inscrição não encontrada"))
+    cache.salvar_cache("147520", "SP", ResultadoOAB("147520", "SP", nome="MARIA DA SILVA", sucesso=True))
+    for numero in ("5678", "147520"):
+        cache.consultar_cache(numero, "SP").timestamp = datetime.now() - timedelta(days=30)
+
+    assert cache.consultar_cache("5678", "SP") is None
+    assert cache.consultar_cache("147520", "SP").nome == "MARIA DA SILVA"
+
+
+def main():
+    testes = [testar_classificacao, testar_expiracao_por_classe, testar_cache_consultas_por_classe]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
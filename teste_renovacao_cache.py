@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da renovação em segundo plano (stale-while-revalidate)
+Confere que a entrada antiga é usada na hora, que a reconsulta é agendada
+uma única vez por OAB e que a thread de renovação grava o resultado novo
+
+Uso:
+    python teste_renovacao_cache.py
+"""
+
+import os
+import sys
+import queue
+import threading
+from datetime import datetime, timedelta
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache import ContadoresAtomicos
+from bot_oab.models.resultado_oab import ResultadoOAB
+from bot_oab_supabase import CacheConsultas, OABSupabaseIntegrator
+
+
+def criar_integrador(consultas, iniciada=None, liberar_consulta=None):
+    """Integrador sem Supabase nem navegador; a consulta ao site devolve um nome novo"""
+    integrador = OABSupabaseIntegrator.__new__(OABSupabaseIntegrator)
+    integrador.cache = CacheConsultas(validade_por_classe={'sucesso': 24 * 180},
+                                      renovar_apos_horas={'sucesso': 24 * 30})
+    integrador.renovar_em_segundo_plano = True
+    integrador._fila_renovacao = queue.Queue()
+    integrador._renovacoes_pendentes = set()
+    integrador._lock_renovacao = threading.Lock()
+    integrador._parar_renovacao = threading.Event()
+    integrador._thread_renovacao = None
+    integrador.estatisticas = ContadoresAtomicos({'renovacoes_agendadas': 0, 'renovacoes_concluidas': 0})
+
+    def consultar_site(numero_oab, estado, renovacao=False):
+        if iniciada:
+            iniciada.set()
+        if liberar_consulta:
+            liberar_consulta.wait(5)
+        consultas.append((numero_oab, estado, renovacao))
+        resultado = ResultadoOAB(numero_oab, estado, nome="NOME RENOVADO", sucesso=True)
+        integrador.cache.salvar_cache(numero_oab, estado, resultado)
+        return resultado
+
+    integrador._consultar_site = consultar_site
+    return integrador
+
+
+def gravar_antiga(integrador, numero, estado, nome, dias):
+    """Entrada de sucesso consultada há alguns dias"""
+    integrador.cache.salvar_cache(numero, estado, ResultadoOAB(numero, estado, nome=nome, sucesso=True))
+    integrador.cache.consultar_cache(numero, estado).timestamp = datetime.now() - timedelta(days=dias)
+
+
+def testar_entrada_recente_sem_renovacao():
+    """Entrada mais nova que a idade de renovação não agenda nada"""
+    consultas = []
+    integrador = criar_integrador(consultas)
+    gravar_antiga(integrador, "123456", "SP", "NOME ANTIGO", dias=5)
+
+    resultado = integrador.processar_oab_unica("123456", "SP")
+    assert resultado.nome == "NOME ANTIGO"
+    assert integrador.estatisticas['renovacoes_agendadas'] == 0
+    assert integrador._thread_renovacao is None
+
+
+def testar_entrada_antiga_usada_e_renovada():
+    """A entrada antiga responde na hora; a thread grava o resultado novo"""
+    consultas = []
+    iniciada = threading.Event()
+    liberar = threading.Event()
+    integrador = criar_integrador(consultas, iniciada, liberar)
+    gravar_antiga(integrador, "123456", "SP", "NOME ANTIGO", dias=40)
+
+    resultado = integrador.processar_oab_unica("123456", "SP")
+    assert resultado.nome == "NOME ANTIGO", resultado
+
+    # A mesma OAB não entra duas vezes na fila enquanto a renovação não termina
+    assert iniciada.wait(5)
+    assert not integrador.agendar_renovacao("123456", "SP")
+    assert integrador.estatisticas['renovacoes_agendadas'] == 1
+
+    # A consulta em andamento termina antes da thread parar
+    liberar.set()
+    integrador.parar_renovacoes(timeout=5)
+
+    assert consultas == [("123456", "SP", True)], consultas
+    assert integrador.estatisticas['renovacoes_concluidas'] == 1
+    assert not integrador._renovacoes_pendentes
+    assert integrador.cache.consultar_cache("123456", "SP").nome == "NOME RENOVADO"
+
+
+def testar_parada_descarta_fila():
+    """Depois de parar, novas renovações não são aceitas"""
+    consultas = []
+    integrador = criar_integrador(consultas)
+    integrador.parar_renovacoes(timeout=1)
+
+    assert not integrador.agendar_renovacao("654321", "RJ")
+    assert consultas == []
+
+
+def main():
+    testes = [testar_entrada_recente_sem_renovacao, testar_entrada_antiga_usada_e_renovada,
+              testar_parada_descarta_fila]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
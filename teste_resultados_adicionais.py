@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do aproveitamento das outras linhas da página de resultado
+Confere que as inscrições extras entram no cache como 'adicional', sem
+substituir entradas existentes, e que uma consulta direta as substitui
+
+Uso:
+    python teste_resultados_adicionais.py
+"""
+
+import os
+import sys
+import threading
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache.politica_cache import CLASSE_ADICIONAL, CLASSE_SUCESSO
+from bot_oab.models.chave_oab import chave_oab
+from bot_oab.models.resultado_oab import ResultadoOAB
+from bot_oab_supabase import CacheConsultas, OABSupabaseIntegrator
+
+
+def testar_adicionais_no_cache():
+    """Extras entram como 'adicional'; a consultada, as já existentes e as inválidas ficam de fora"""
+    cache = CacheConsultas()
+    cache.salvar_cache("222222", "SP", ResultadoOAB("222222", "SP", nome="JOAO SOUZA", sucesso=True))
+
+    incluidas = cache.salvar_adicionais([
+        ("111111", "SP", "MARIA DA SILVA"),     # a própria consulta
+        ("222222", "SP", "OUTRO NOME"),         # já em cache
+        ("333333", "SP", "ANA PEREIRA"),
+        ("444444", "RJ", "CARLOS LIMA"),
+        ("abc", "SP", "NOME QUALQUER"),         # inscrição inválida
+        ("555555", "SP", ""),                   # sem nome
+    ], consultada=chave_oab("111111", "SP"))
+
+    assert incluidas == 2, incluidas
+    assert cache.consultar_cache("111111", "SP") is None
+    assert cache.consultar_cache("222222", "SP").nome == "JOAO SOUZA"
+    adicional = cache.consultar_cache("333333", "SP")
+    assert adicional.nome == "ANA PEREIRA" and adicional.classe == CLASSE_ADICIONAL, adicional
+    assert cache.estatisticas['entradas_adicionais'] == 2
+
+
+def testar_consulta_direta_substitui_adicional():
+    """A consulta da própria OAB substitui a entrada de menor confiança"""
+    cache = CacheConsultas()
+    cache.salvar_adicionais([("333333", "SP", "ANA PEREIRA")])
+    cache.salvar_cache("333333", "SP", ResultadoOAB("333333", "SP", nome="ANA PEREIRA SANTOS", sucesso=True))
+
+    resultado = cache.consultar_cache("333333", "SP")
+    assert resultado.nome == "ANA PEREIRA SANTOS" and resultado.classe == CLASSE_SUCESSO, resultado
+
+
+def testar_adicionais_desligados():
+    """Com validade 0 para 'adicional' nada é aproveitado"""
+    cache = CacheConsultas(validade_por_classe={'sucesso': None, CLASSE_ADICIONAL: 0})
+    assert cache.salvar_adicionais([("333333", "SP", "ANA PEREIRA")]) == 0
+    assert cache.consultar_cache("333333", "SP") is None
+
+
+def testar_integrador_aproveita_linhas_validas():
+    """O integrador grava só as linhas extras com nome que passa na limpeza"""
+    integrador = OABSupabaseIntegrator.__new__(OABSupabaseIntegrator)
+    integrador.cache = CacheConsultas()
+    integrador._lock_bot = threading.Lock()
+    integrador.bot_oab = object()
+
+    resultado = ResultadoOAB("111111", "SP", nome="MARIA DA SILVA", sucesso=True)
+    resultado.resultados_adicionais = [("333333", "SP", "  ANA   PEREIRA "), ("444444", "SP", "ERRO 404")]
+    integrador._consultar_site_com_tentativas = lambda numero, estado: resultado
+
+    integrador._consultar_site("111111", "SP")
+    assert integrador.cache.consultar_cache("333333", "SP").nome == "ANA PEREIRA"
+    assert integrador.cache.consultar_cache("444444", "SP") is None
+
+
+def main():
+    testes = [testar_adicionais_no_cache, testar_consulta_direta_substitui_adicional,
+              testar_adicionais_desligados, testar_integrador_aproveita_linhas_validas]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
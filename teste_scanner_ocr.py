@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do scanner de campos OCR com o texto de uma modal em várias linhas
+Confere que a limpeza preserva as quebras de linha e que o scanner extrai
+nome, inscrição, telefones, endereço e situação
+
+Uso:
+    python teste_scanner_ocr.py
+"""
+
+import os
+import sys
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.extractors.scanner_ocr import escanear_texto_ocr, limpar_texto_ocr
+
+# Texto como sai do Tesseract: ruído, tabs e linhas em branco entre os campos
+TEXTO_MODAL = (
+    "  MARIA APARECIDA DOS SANTOS  \n"
+    "ADVOGADA\n"
+    "\n"
+    "Inscrição: 147520 \t Seccional: SP\n"
+    "Subseção: SÃO PAULO | \n"
+    "Endereço Profissional: RUA DAS FLORES, Nº 120, CENTRO\n"
+    "Telefone Profissional: (11) 3333-4444   (11) 98888-7777\n"
+    "SITUAÇÃO REGULAR ~\n"
+)
+
+
+def testar_limpeza_preserva_linhas():
+    """Cada linha da modal continua em uma linha, sem espaços nas bordas"""
+    texto = limpar_texto_ocr(TEXTO_MODAL)
+    linhas = texto.split('\n')
+
+    assert linhas[0] == "MARIA APARECIDA DOS SANTOS", linhas[0]
+    assert linhas[1] == "ADVOGADA", linhas[1]
+    assert "" not in linhas, linhas
+    assert all(linha == linha.strip() for linha in linhas), linhas
+    assert "\t" not in texto and "|" not in texto and "~" not in texto, texto
+    assert len(linhas) == 7, linhas
+
+
+def testar_scanner_multilinha():
+    """Campos extraídos do texto limpo em várias linhas"""
+    campos = escanear_texto_ocr(limpar_texto_ocr(TEXTO_MODAL), "147520")
+
+    assert campos.nome == "MARIA APARECIDA DOS SANTOS", campos.nome
+    assert campos.inscricao == "147520", campos.inscricao
+    assert campos.inscricao_confirmada
+    assert campos.telefone == "(11) 3333-4444 | (11) 98888-7777", campos.telefone
+    # O endereço termina na quebra de linha, sem engolir o telefone
+    assert campos.endereco == "RUA DAS FLORES Nº 120 CENTRO", campos.endereco
+    assert campos.situacao == "SITUAÇÃO REGULAR", campos.situacao
+    assert campos.tipo == "ADVOGADA", campos.tipo
+
+
+def testar_nome_fora_do_cabecalho():
+    """Nomes depois das primeiras linhas da modal não são considerados"""
+    texto = "\n".join(["Inscrição: 1234"] * 6 + ["JOAO DA SILVA"])
+    campos = escanear_texto_ocr(limpar_texto_ocr(texto), "1234")
+
+    assert campos.nome == "", campos.nome
+
+
+def main():
+    testes = [testar_limpeza_preserva_linhas, testar_scanner_multilinha, testar_nome_fora_do_cabecalho]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do simulador de políticas de cache (simulador_cache)
+Confere acertos, expiração por classe e descarte por capacidade na
+reexecução, o aquecimento valendo só para consultas posteriores e a leitura
+dos logs e dos dumps de pendentes
+
+Uso:
+    python teste_simulador_cache.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+# Adicionar o diretório atual ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bot_oab.cache.politica_cache import CLASSE_SUCESSO, CLASSE_NAO_ENCONTRADO
+from bot_oab.cache.simulador_cache import (ConfiguracaoCache, EventoConsulta, ler_logs, ler_pendentes,
+                                           simular, simular_configuracoes)
+from bot_oab.models.chave_oab import chave_oab
+
+HORA = 3600.0
+
+
+def consulta(horas, numero, estado="SP", classe=None, origem="logs"):
+    """Evento de consulta a tantas horas do início"""
+    return EventoConsulta(horas * HORA, chave_oab(numero, estado), classe, origem)
+
+
+def testar_acertos_e_expiracao_por_classe():
+    """A repetição acerta até a validade da classe vencer"""
+    eventos = [
+        consulta(0, "147520", classe=CLASSE_SUCESSO), consulta(1, "147520"), consulta(100, "147520"),
+        consulta(0, "2345", classe=CLASSE_NAO_ENCONTRADO), consulta(30, "2345"),
+    ]
+    eventos.sort(key=lambda evento: evento.momento)
+    configuracao = ConfiguracaoCache("curta", validade_horas={CLASSE_SUCESSO: 48, CLASSE_NAO_ENCONTRADO: 24})
+
+    resultado = simular(eventos, configuracao)
+    assert resultado['consultas'] == 5, resultado
+    assert resultado['acertos'] == 1, resultado
+    assert resultado['consultas_site'] == 4 and resultado['primeiras_consultas'] == 2, resultado
+    assert resultado['expiradas'] == 2, resultado
+
+
+def testar_descarte_por_capacidade():
+    """Com poucas entradas o LRU descarta e a repetição volta ao site"""
+    eventos = [consulta(0, "10000"), consulta(1, "20000"), consulta(2, "10000")]
+    sem_limite = simular(eventos, ConfiguracaoCache("ilimitado"))
+    uma_entrada = simular(eventos, ConfiguracaoCache("uma", max_entradas=1))
+
+    assert sem_limite['acertos'] == 1 and sem_limite['evicoes'] == 0, sem_limite
+    assert uma_entrada['acertos'] == 0 and uma_entrada['evicoes'] == 2, uma_entrada
+
+    ordem = [item['configuracao'] for item in simular_configuracoes(
+        eventos, [ConfiguracaoCache("uma", max_entradas=1), ConfiguracaoCache("ilimitado")])]
+    assert ordem == ["ilimitado", "uma"], ordem
+
+
+def testar_aquecimento_so_posterior():
+    """Resultado conhecido no mesmo instante da consulta não conta; depois dele, sim"""
+    eventos = [consulta(5, "147520", origem='pesquisa'), consulta(10, "2345")]
+    conhecidos = {'pesquisa': [consulta(5, "147520", classe=CLASSE_SUCESSO, origem='pesquisa'),
+                               consulta(8, "2345", classe=CLASSE_SUCESSO, origem='pesquisa')]}
+
+    aquecida = simular(eventos, ConfiguracaoCache("aquecida", aquecimento=('pesquisa',)), conhecidos)
+    assert aquecida['acertos'] == 1 and aquecida['acertos_aquecimento'] == 1, aquecida
+    assert aquecida['consultas_site'] == 1, aquecida
+
+    # Configuração que não lista a fonte ignora os resultados conhecidos
+    fria = simular(eventos, ConfiguracaoCache("fria"), conhecidos)
+    assert fria['acertos'] == 0 and fria['consultas_site'] == 2, fria
+
+
+def testar_ler_logs():
+    """Consultas do log com o sucesso do mesmo registro e a virada da meia-noite"""
+    with tempfile.TemporaryDirectory() as pasta:
+        with open(os.path.join(pasta, "processamento.log"), 'w', encoding='utf-8') as f:
+            f.write("Iniciado em: 20/07/2025 23:58:00\n"
+                    "[23:58:10] Processando registro 1: SP147520\n"
+                    "[23:58:20] SUCESSO: Registro 1\n"
+                    "[00:01:05] Processando registro 2: RJ2345\n"
+                    "[00:01:30] ERRO: Falha ao processar registro 2\n")
+
+        eventos = ler_logs(pasta)
+        assert [str(evento.chave) for evento in eventos] == ["147520/SP", "2345/RJ"], eventos
+        assert eventos[0].classe == CLASSE_SUCESSO and eventos[1].classe is None, eventos
+        assert datetime.fromtimestamp(eventos[1].momento).day == 21, eventos[1]
+
+
+def testar_ler_pendentes():
+    """Dump em texto: uma consulta por usuario com OAB válida"""
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "pendentes.txt")
+        with open(arquivo, 'w', encoding='utf-8') as f:
+            f.write("SP147520\nnao e oab\nRJ2345\n")
+
+        eventos = ler_pendentes(arquivo, momento=1000.0)
+        assert [str(evento.chave) for evento in eventos] == ["147520/SP", "2345/RJ"], eventos
+        assert eventos[0].momento < eventos[1].momento and eventos[0].origem == 'pendentes'
+
+
+def main():
+    testes = [testar_acertos_e_expiracao_por_classe, testar_descarte_por_capacidade,
+              testar_aquecimento_so_posterior, testar_ler_logs, testar_ler_pendentes]
+    falhas = 0
+    for teste in testes:
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except AssertionError as e:
+            falhas += 1
+            print(f"❌ {teste.__name__}: {e}")
+
+    print(f"\n📊 {len(testes) - falhas}/{len(testes)} testes passaram")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()